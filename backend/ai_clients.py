@@ -0,0 +1,168 @@
+"""
+AI Client Pool
+AI 공급자별 비동기 클라이언트와 HTTP 연결 풀 관리
+
+- 공급자마다 SDK 기본 HTTP 클라이언트 하나를 만들어 keep-alive 연결을 재사용 (호출마다 클라이언트를 만들지 않음)
+- OpenAI 호환 공급자(OpenAI, Groq, DeepSeek, Novita 등)와 Anthropic 모두 SDK 의 비동기 클라이언트 사용
+- 타임아웃/최대 연결 수/keep-alive 유지 시간은 환경변수로 설정
+- AI_PROVIDER_BASE_URL_<공급자> 로 엔드포인트를 바꿀 수 있어 로컬 스텁 서버(ai_stub_provider.py)로 테스트 가능
+"""
+
+import hashlib
+import importlib
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient as OpenAIHttpClient
+    HAS_OPENAI = True
+except ImportError:
+    HAS_OPENAI = False
+
+try:
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient as AnthropicHttpClient
+    HAS_ANTHROPIC = True
+except ImportError:
+    HAS_ANTHROPIC = False
+
+# 공급자별 기본 엔드포인트 (None 이면 SDK 기본값)
+PROVIDER_BASE_URLS: Dict[str, Optional[str]] = {
+    "openai": None,
+    "anthropic": None,
+    "groq": "https://api.groq.com/openai/v1",
+    "deepseek": "https://api.deepseek.com/v1",
+    "minimax": "https://api.minimax.chat/v1",
+    "cohere": "https://api.cohere.ai/v1",
+    "together": "https://api.together.xyz/v1",
+    "perplexity": "https://api.perplexity.ai",
+    "mistral": "https://api.mistral.ai/v1",
+    "novita": "https://api.novita.ai/v3/openai",
+}
+
+
+@dataclass
+class AIHttpSettings:
+    """공급자별 HTTP 연결 풀 설정"""
+    timeout: float = 60.0
+    connect_timeout: float = 10.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    max_retries: int = 2
+
+    @classmethod
+    def from_env(cls) -> "AIHttpSettings":
+        return cls(
+            timeout=float(os.getenv("AI_HTTP_TIMEOUT_SECONDS", cls.timeout)),
+            connect_timeout=float(os.getenv("AI_HTTP_CONNECT_TIMEOUT_SECONDS", cls.connect_timeout)),
+            max_connections=int(os.getenv("AI_HTTP_MAX_CONNECTIONS", cls.max_connections)),
+            max_keepalive=int(os.getenv("AI_HTTP_MAX_KEEPALIVE", cls.max_keepalive)),
+            keepalive_expiry=float(os.getenv("AI_HTTP_KEEPALIVE_EXPIRY", cls.keepalive_expiry)),
+            max_retries=int(os.getenv("AI_MAX_RETRIES", cls.max_retries)),
+        )
+
+
+def _httpx_module(client_class):
+    """SDK 의 HTTP 클라이언트가 기반으로 하는 httpx 패키지 (SDK 버전에 따라 httpx 또는 httpx2)"""
+    base = next(cls for cls in client_class.__mro__ if cls.__name__ == "AsyncClient")
+    return importlib.import_module(base.__module__.split(".")[0])
+
+
+def _key_fingerprint(api_key: str) -> str:
+    """클라이언트 캐시 키 - API 키 원문 대신 해시 사용"""
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+
+
+class AIClientPool:
+    """공급자별 HTTP 연결 풀과 SDK 클라이언트 캐시"""
+
+    def __init__(self, settings: Optional[AIHttpSettings] = None):
+        self.settings = settings or AIHttpSettings.from_env()
+        self._http_clients: Dict[str, Any] = {}
+        self._sdk_clients: Dict[Tuple[str, str, str, Optional[str]], Any] = {}
+
+    def base_url(self, provider: str, base_url: Optional[str] = None) -> Optional[str]:
+        """엔드포인트 결정 - 환경변수 재정의 > 공급자 설정값 > 기본값"""
+        override = os.getenv(f"AI_PROVIDER_BASE_URL_{provider.upper()}")
+        return override or base_url or PROVIDER_BASE_URLS.get(provider)
+
+    def http_client(self, provider: str, client_class):
+        """공급자 전용 HTTP 클라이언트 (처음 요청 시 생성 후 재사용)
+
+        client_class 는 SDK 가 제공하는 기본 HTTP 클라이언트 클래스 (SDK 와 같은 httpx 패키지를 사용해야 함)
+        """
+        client = self._http_clients.get(provider)
+        if client is None or client.is_closed:
+            settings = self.settings
+            httpx = _httpx_module(client_class)
+            client = client_class(
+                timeout=httpx.Timeout(settings.timeout, connect=settings.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.max_connections,
+                    max_keepalive_connections=settings.max_keepalive,
+                    keepalive_expiry=settings.keepalive_expiry,
+                ),
+                follow_redirects=True,
+            )
+            self._http_clients[provider] = client
+        return client
+
+    def openai_compatible(self, provider: str, api_key: str, base_url: Optional[str] = None):
+        """OpenAI 호환 공급자의 AsyncOpenAI 클라이언트"""
+        if not HAS_OPENAI:
+            raise RuntimeError("OpenAI library not available")
+        resolved = self.base_url(provider, base_url)
+        cache_key = ("openai", provider, _key_fingerprint(api_key), resolved)
+        client = self._sdk_clients.get(cache_key)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=resolved,
+                max_retries=self.settings.max_retries,
+                http_client=self.http_client(provider, OpenAIHttpClient),
+            )
+            self._sdk_clients[cache_key] = client
+        return client
+
+    def anthropic(self, api_key: str, provider: str = "anthropic", base_url: Optional[str] = None):
+        """Anthropic AsyncAnthropic 클라이언트"""
+        if not HAS_ANTHROPIC:
+            raise RuntimeError("Anthropic library not available")
+        resolved = self.base_url(provider, base_url)
+        cache_key = ("anthropic", provider, _key_fingerprint(api_key), resolved)
+        client = self._sdk_clients.get(cache_key)
+        if client is None:
+            client = AsyncAnthropic(
+                api_key=api_key,
+                base_url=resolved,
+                max_retries=self.settings.max_retries,
+                http_client=self.http_client(provider, AnthropicHttpClient),
+            )
+            self._sdk_clients[cache_key] = client
+        return client
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """연결 풀 현황"""
+        return {
+            "providers": sorted(provider for provider, client in self._http_clients.items() if not client.is_closed),
+            "sdk_clients": len(self._sdk_clients),
+            "settings": asdict(self.settings),
+        }
+
+    async def aclose(self) -> None:
+        """모든 공급자의 연결 풀 종료 (서버 종료 시)"""
+        for provider, client in list(self._http_clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close AI HTTP client for {provider}: {e}")
+        self._http_clients.clear()
+        self._sdk_clients.clear()
+
+
+# Global AI client pool instance
+ai_client_pool = AIClientPool()
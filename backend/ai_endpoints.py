@@ -3,7 +3,7 @@ AI 기능 API 엔드포인트
 중소기업 지원사업 평가 시스템의 AI 기능들을 제공하는 REST API
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks, Query
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 import aiofiles
@@ -17,6 +17,7 @@ from enhanced_permissions import (
     Permission, check_permission, check_ai_execution_permission,
     permission_checker
 )
+from similarity_index import SIMILARITY_THRESHOLD, similarity_index
 
 logger = logging.getLogger(__name__)
 
@@ -165,17 +166,11 @@ async def check_plagiarism(
         if not has_permission:
             raise HTTPException(status_code=403, detail="표절 검사 실행 권한이 없습니다")
         
-        # 기존 문서들 조회 (실제 구현에서는 DB에서 조회)
-        # TODO: 실제 프로젝트의 다른 회사 문서들을 조회하는 로직 구현
-        existing_documents = [
-            "샘플 문서 1의 내용입니다...",
-            "샘플 문서 2의 내용입니다...",
-        ]
-        
-        # 표절 검사 실행
-        plagiarism_results = await ai_service.detect_plagiarism_similarity(
-            document_text=request.document_text,
-            existing_documents=existing_documents
+        # 유사도 인덱스에서 LSH 후보만 조회한 뒤 MinHash 서명으로 유사도 확인
+        plagiarism_results = await similarity_index.query(
+            request.document_text,
+            project_id=request.project_id,
+            exclude_company_id=request.exclude_company_id
         )
         
         logger.info(f"표절 검사 완료", extra={
@@ -190,6 +185,8 @@ async def check_plagiarism(
             "recommendation": "높은 유사도가 발견된 경우 추가 검토가 필요합니다." if plagiarism_results.get('overall_risk') == 'high' else "유사도 검사 결과 문제없습니다."
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"표절 검사 오류: {e}", extra={
             'user_id': current_user.id,
@@ -197,6 +194,49 @@ async def check_plagiarism(
         })
         raise HTTPException(status_code=500, detail=f"표절 검사 중 오류가 발생했습니다: {str(e)}")
 
+@ai_router.get("/check-plagiarism/projects/{project_id}/pairs")
+async def find_similar_document_pairs(
+    project_id: str,
+    threshold: float = Query(SIMILARITY_THRESHOLD, ge=0.0, le=1.0),
+    include_same_company: bool = False,
+    limit: int = Query(500, ge=1, le=5000),
+    current_user: User = Depends(get_current_user)
+):
+    """프로젝트 전체 문서 간 유사 문서 쌍 일괄 검사"""
+    has_permission = await permission_checker.has_permission(
+        current_user, Permission.AI_ANALYSIS_EXECUTE, project_id
+    )
+    if not has_permission:
+        raise HTTPException(status_code=403, detail="표절 검사 실행 권한이 없습니다")
+    
+    try:
+        results = await similarity_index.find_similar_pairs(
+            project_id, threshold=threshold, exclude_same_company=not include_same_company, limit=limit
+        )
+    except Exception as e:
+        logger.error(f"유사 문서 쌍 검사 오류: {e}", extra={
+            'user_id': current_user.id,
+            'error': str(e)
+        })
+        raise HTTPException(status_code=500, detail=f"유사 문서 쌍 검사 중 오류가 발생했습니다: {str(e)}")
+    
+    logger.info(f"유사 문서 쌍 검사 완료: 프로젝트 {project_id}, 유사 쌍 {results['similar_pairs_found']}건", extra={
+        'user_id': current_user.id,
+        'documents_indexed': results['documents_indexed'],
+        'similar_pairs_found': results['similar_pairs_found']
+    })
+    return {"success": True, "results": results}
+
+@ai_router.post("/check-plagiarism/projects/{project_id}/reindex")
+async def reindex_project_documents(
+    project_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(check_admin_or_secretary)
+):
+    """프로젝트 업로드 파일 유사도 색인 (색인되지 않은 파일만, 백그라운드 실행)"""
+    background_tasks.add_task(similarity_index.index_project, project_id)
+    return {"success": True, "message": "유사도 색인 작업이 시작되었습니다", "project_id": project_id}
+
 @ai_router.post("/extract-information")
 async def extract_key_information(
     request: DocumentAnalysisRequest,
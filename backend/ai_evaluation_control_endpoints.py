@@ -3,7 +3,7 @@ AI 평가 실행 권한 제어 API 엔드포인트
 관리자와 간사가 AI 자동 평가를 실행하고 제어하는 시스템
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Dict, Any, Optional
 import logging
 from pydantic import BaseModel, Field
@@ -15,6 +15,8 @@ import json
 from models import User
 from security import get_current_user
 from enhanced_permissions import Permission, check_permission, permission_checker
+from job_queue import JobCancelled, JobContext, JobLeaseLost, TERMINAL_STATUSES, job_handler, job_queue, public_job
+from scoring_engine import score_sheet
 
 logger = logging.getLogger(__name__)
 
@@ -87,9 +89,16 @@ class AIEvaluationApproval(BaseModel):
     reason: Optional[str] = Field(None, description="승인/거부 사유")
     score_adjustments: Optional[Dict[str, float]] = Field(None, description="점수 조정")
 
-# 작업 저장소 (실제로는 데이터베이스 사용)
-ai_evaluation_jobs = {}
-ai_evaluation_results = {}
+# AI 평가 작업은 영속 작업 큐(job_queue), 결과는 ai_evaluation_results 컬렉션에 저장
+AI_EVALUATION_JOB_TYPE = "ai_evaluation"
+
+async def find_ai_evaluation_result(db, evaluation_id: str) -> Optional[Dict[str, Any]]:
+    """평가의 최신 AI 평가 결과 조회"""
+    return await db.ai_evaluation_results.find_one(
+        {"evaluation_id": evaluation_id},
+        {"_id": 0},
+        sort=[("evaluation_timestamp", -1)]
+    )
 
 async def check_ai_evaluation_permission(user: User, action: str, project_id: str = None) -> bool:
     """AI 평가 권한 확인"""
@@ -253,7 +262,6 @@ async def execute_ai_evaluation(evaluation_id: str, template: Dict, config: Dict
         # 점수 및 코멘트 추출
         ai_scores = {}
         ai_comments = {}
-        total_score = 0
         
         for criterion in criteria:
             criterion_id = criterion.get("id")
@@ -266,10 +274,10 @@ async def execute_ai_evaluation(evaluation_id: str, template: Dict, config: Dict
             
             ai_scores[criterion_id] = score
             ai_comments[criterion_id] = comment
-            
-            # 가중치 적용
-            weight = criterion.get("weight", 1.0)
-            total_score += score * weight
+        
+        # 가중치 적용 (가점 항목 포함 가중 합계)
+        sheet_score = score_sheet(criteria, ai_scores)
+        total_score = sheet_score.weighted_total + sheet_score.bonus_total
         
         # 신뢰도 점수 계산 (예시 로직)
         confidence_score = min(0.95, 0.7 + (len(file_analysis) * 0.1))
@@ -294,9 +302,6 @@ async def execute_ai_evaluation(evaluation_id: str, template: Dict, config: Dict
             risk_factors=ai_response.get("risk_factors", [])
         )
         
-        # 결과 저장
-        ai_evaluation_results[evaluation_id] = result
-        
         # 데이터베이스에 AI 평가 결과 저장
         await db.ai_evaluation_results.insert_one(result.dict())
         
@@ -308,84 +313,87 @@ async def execute_ai_evaluation(evaluation_id: str, template: Dict, config: Dict
         logger.error(f"AI 평가 실행 오류 ({evaluation_id}): {e}")
         raise
 
-async def process_ai_evaluation_job(job_id: str, request_data: AIEvaluationRequest, config: AIEvaluationJobConfig, user: User):
-    """AI 평가 작업 처리"""
-    try:
-        job = ai_evaluation_jobs[job_id]
-        job["status"] = "processing"
-        job["started_at"] = datetime.utcnow()
-        job["total_evaluations"] = len(request_data.evaluation_ids)
-        
-        from server import db
-        
-        # 템플릿 조회
-        template = await db.evaluation_templates.find_one({"_id": request_data.template_id})
-        if not template:
-            raise ValueError(f"템플릿을 찾을 수 없습니다: {request_data.template_id}")
-        
-        # AI 공급자 설정
-        providers = await get_available_ai_providers()
-        if not providers and not request_data.ai_provider:
-            raise ValueError("사용 가능한 AI 공급자가 없습니다")
-        
-        provider = request_data.ai_provider or providers[0].get("name")
-        model = request_data.ai_model or "default"
-        
-        # 평가 설정
-        eval_config = {
-            "ai_provider": provider,
-            "ai_model": model,
-            "evaluation_mode": request_data.evaluation_mode,
-            "include_file_analysis": request_data.include_file_analysis,
-            "custom_prompt": request_data.custom_prompt
-        }
-        
-        # 동시 실행 제한
-        semaphore = asyncio.Semaphore(config.max_concurrent_evaluations)
-        
-        async def evaluate_single(evaluation_id: str):
-            async with semaphore:
-                try:
-                    result = await execute_ai_evaluation(evaluation_id, template, eval_config)
-                    job["completed_evaluations"] += 1
-                    job["confidence_scores"].append(result.confidence_score)
-                    job["processing_times"].append(result.processing_time_seconds)
-                    return result
-                except Exception as e:
-                    job["failed_evaluations"] += 1
-                    job["error_messages"].append(f"{evaluation_id}: {str(e)}")
-                    logger.error(f"개별 평가 실패 ({evaluation_id}): {e}")
-                    return None
-                finally:
-                    # 진행률 업데이트
-                    completed = job["completed_evaluations"] + job["failed_evaluations"]
-                    job["progress"] = int((completed / job["total_evaluations"]) * 100)
-        
-        # 모든 평가 병렬 실행
-        tasks = [evaluate_single(eval_id) for eval_id in request_data.evaluation_ids]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 평균 점수 계산
-        valid_results = [r for r in results if isinstance(r, AIEvaluationResult)]
-        if valid_results:
-            job["average_score"] = sum(r.total_ai_score for r in valid_results) / len(valid_results)
-        
-        # 작업 완료
-        job["status"] = "completed" if job["failed_evaluations"] == 0 else "completed_with_errors"
-        job["completed_at"] = datetime.utcnow()
-        job["progress"] = 100
-        
-        logger.info(f"AI 평가 작업 완료: {job_id}, 성공: {job['completed_evaluations']}, 실패: {job['failed_evaluations']}")
-        
-    except Exception as e:
-        job["status"] = "failed"
-        job["error_messages"].append(f"작업 실행 오류: {str(e)}")
-        logger.error(f"AI 평가 작업 실패: {job_id}, 오류: {e}")
+@job_handler(AI_EVALUATION_JOB_TYPE)
+async def process_ai_evaluation_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """AI 평가 작업 처리 (작업 큐 워커에서 실행)"""
+    request_data = AIEvaluationRequest(**payload["request_data"])
+    config = AIEvaluationJobConfig(**payload["config"])
+    job = {
+        "total_evaluations": len(request_data.evaluation_ids),
+        "completed_evaluations": 0,
+        "failed_evaluations": 0,
+        "error_messages": [],
+        "confidence_scores": [],
+        "processing_times": []
+    }
+    await ctx.progress(0, **job)
+    
+    from server import db
+    
+    # 템플릿 조회
+    template = await db.evaluation_templates.find_one({"_id": request_data.template_id})
+    if not template:
+        raise ValueError(f"템플릿을 찾을 수 없습니다: {request_data.template_id}")
+    
+    # AI 공급자 설정
+    providers = await get_available_ai_providers()
+    if not providers and not request_data.ai_provider:
+        raise ValueError("사용 가능한 AI 공급자가 없습니다")
+    
+    provider = request_data.ai_provider or providers[0].get("name")
+    model = request_data.ai_model or "default"
+    
+    # 평가 설정
+    eval_config = {
+        "ai_provider": provider,
+        "ai_model": model,
+        "evaluation_mode": request_data.evaluation_mode,
+        "include_file_analysis": request_data.include_file_analysis,
+        "custom_prompt": request_data.custom_prompt
+    }
+    
+    # 동시 실행 제한
+    semaphore = asyncio.Semaphore(config.max_concurrent_evaluations)
+    
+    async def evaluate_single(evaluation_id: str):
+        async with semaphore:
+            try:
+                result = await execute_ai_evaluation(evaluation_id, template, eval_config)
+                job["completed_evaluations"] += 1
+                job["confidence_scores"].append(result.confidence_score)
+                job["processing_times"].append(result.processing_time_seconds)
+                return result
+            except Exception as e:
+                job["failed_evaluations"] += 1
+                job["error_messages"].append(f"{evaluation_id}: {str(e)}")
+                logger.error(f"개별 평가 실패 ({evaluation_id}): {e}")
+                return None
+            finally:
+                # 진행률 기록 (임대 연장 및 취소 확인 포함)
+                completed = job["completed_evaluations"] + job["failed_evaluations"]
+                await ctx.progress(int((completed / job["total_evaluations"]) * 100), **job)
+    
+    # 모든 평가 병렬 실행
+    tasks = [evaluate_single(eval_id) for eval_id in request_data.evaluation_ids]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for r in results:
+        if isinstance(r, (JobCancelled, JobLeaseLost)):
+            raise r
+    
+    # 평균 점수 계산
+    valid_results = [r for r in results if isinstance(r, AIEvaluationResult)]
+    if valid_results:
+        job["average_score"] = sum(r.total_ai_score for r in valid_results) / len(valid_results)
+    
+    # 작업 완료
+    ctx.completion_status = "completed" if job["failed_evaluations"] == 0 else "completed_with_errors"
+    
+    logger.info(f"AI 평가 작업 완료: {ctx.job_id}, 성공: {job['completed_evaluations']}, 실패: {job['failed_evaluations']}")
+    return job
 
 @ai_evaluation_control_router.post("/execute", operation_id="execute_ai_evaluations_post")
 async def execute_ai_evaluations(
     request_data: AIEvaluationRequest,
-    background_tasks: BackgroundTasks,
     config: AIEvaluationJobConfig = AIEvaluationJobConfig(),
     current_user: User = Depends(get_current_user)
 ):
@@ -400,25 +408,22 @@ async def execute_ai_evaluations(
         if not request_data.evaluation_ids:
             raise HTTPException(status_code=400, detail="평가 ID가 필요합니다")
         
-        # 작업 생성
-        job_id = str(uuid.uuid4())
+        # 작업 생성 (재시도 횟수는 작업 설정을 따름)
         job_data = AIEvaluationJob(
-            job_id=job_id,
             request_data=request_data,
             config=config,
-            created_by=current_user.id
-        ).dict()
-        
-        ai_evaluation_jobs[job_id] = job_data
-        
-        # 백그라운드 작업 시작
-        background_tasks.add_task(
-            process_ai_evaluation_job,
-            job_id,
-            request_data,
-            config,
-            current_user
+            created_by=current_user.id,
+            total_evaluations=len(request_data.evaluation_ids)
+        ).dict(exclude={"status", "progress", "started_at", "completed_at", "created_by"})
+        
+        job = await job_queue.enqueue(
+            AI_EVALUATION_JOB_TYPE,
+            {"request_data": request_data.dict(), "config": config.dict()},
+            created_by=current_user.id,
+            max_attempts=config.retry_count + 1,
+            **job_data
         )
+        job_id = job["job_id"]
         
         logger.info(f"AI 평가 작업 시작: {job_id}", extra={
             'user_id': current_user.id,
@@ -451,14 +456,13 @@ async def get_ai_evaluation_job_status(
         if not has_permission:
             raise HTTPException(status_code=403, detail="AI 평가 작업 조회 권한이 없습니다")
         
-        if job_id not in ai_evaluation_jobs:
+        job_data = await job_queue.get(job_id, [AI_EVALUATION_JOB_TYPE])
+        if not job_data:
             raise HTTPException(status_code=404, detail="AI 평가 작업을 찾을 수 없습니다")
         
-        job_data = ai_evaluation_jobs[job_id]
-        
         return {
             "success": True,
-            "job": job_data
+            "job": public_job(job_data)
         }
         
     except HTTPException:
@@ -480,23 +484,14 @@ async def get_ai_evaluation_jobs(
         if not has_permission:
             raise HTTPException(status_code=403, detail="AI 평가 작업 목록 조회 권한이 없습니다")
         
-        # 작업 목록 필터링
-        jobs = []
-        for job_data in ai_evaluation_jobs.values():
-            if status and job_data["status"] != status:
-                continue
-                
-            # 일반 사용자는 자신의 작업만 조회
-            if current_user.role not in ["admin"] and job_data["created_by"] != current_user.id:
-                continue
-                
-            jobs.append(job_data)
-        
-        # 생성일 기준 내림차순 정렬
-        jobs.sort(key=lambda x: x.get("started_at", x.get("created_at", datetime.min)), reverse=True)
-        
-        # 제한된 수만 반환
-        jobs = jobs[:limit]
+        # 일반 사용자는 자신의 작업만 조회, 생성일 기준 내림차순으로 제한된 수만 반환
+        jobs = await job_queue.list(
+            [AI_EVALUATION_JOB_TYPE],
+            status=status,
+            created_by=None if current_user.role == "admin" else current_user.id,
+            limit=limit
+        )
+        jobs = [public_job(job) for job in jobs]
         
         return {
             "success": True,
@@ -522,14 +517,15 @@ async def get_ai_evaluation_result(
         if not has_permission:
             raise HTTPException(status_code=403, detail="AI 평가 결과 조회 권한이 없습니다")
         
-        if evaluation_id not in ai_evaluation_results:
-            raise HTTPException(status_code=404, detail="AI 평가 결과를 찾을 수 없습니다")
+        from server import db
         
-        result = ai_evaluation_results[evaluation_id]
+        result = await find_ai_evaluation_result(db, evaluation_id)
+        if not result:
+            raise HTTPException(status_code=404, detail="AI 평가 결과를 찾을 수 없습니다")
         
         return {
             "success": True,
-            "result": result.dict() if hasattr(result, 'dict') else result
+            "result": result
         }
         
     except HTTPException:
@@ -557,11 +553,10 @@ async def approve_ai_evaluation(
             raise HTTPException(status_code=404, detail="평가를 찾을 수 없습니다")
         
         # AI 평가 결과 확인
-        if approval_data.evaluation_id not in ai_evaluation_results:
+        ai_result = await find_ai_evaluation_result(db, approval_data.evaluation_id)
+        if not ai_result:
             raise HTTPException(status_code=404, detail="AI 평가 결과를 찾을 수 없습니다")
         
-        ai_result = ai_evaluation_results[approval_data.evaluation_id]
-        
         # 승인/거부 처리
         if approval_data.action == "approve":
             # AI 점수를 실제 평가 점수로 적용
@@ -582,13 +577,8 @@ async def approve_ai_evaluation(
                 # 총점 재계산
                 template = await db.evaluation_templates.find_one({"_id": evaluation.get("template_id")})
                 if template:
-                    total_score = 0
-                    for criterion in template.get("criteria", []):
-                        criterion_id = criterion.get("id")
-                        score = update_data["ai_scores"].get(criterion_id, 0)
-                        weight = criterion.get("weight", 1.0)
-                        total_score += score * weight
-                    update_data["ai_total_score"] = total_score
+                    sheet_score = score_sheet(template.get("criteria", []), update_data["ai_scores"])
+                    update_data["ai_total_score"] = sheet_score.weighted_total + sheet_score.bonus_total
             
             message = "AI 평가 결과가 승인되었습니다"
             
@@ -659,19 +649,18 @@ async def cancel_ai_evaluation_job(
         if current_user.role not in ["admin", "secretary"]:
             raise HTTPException(status_code=403, detail="AI 평가 작업 취소 권한이 없습니다")
         
-        if job_id not in ai_evaluation_jobs:
+        job = await job_queue.get(job_id, [AI_EVALUATION_JOB_TYPE])
+        if not job:
             raise HTTPException(status_code=404, detail="AI 평가 작업을 찾을 수 없습니다")
         
-        job = ai_evaluation_jobs[job_id]
-        
         # 작업이 이미 완료된 경우
-        if job["status"] in ["completed", "completed_with_errors", "failed"]:
+        if job["status"] in TERMINAL_STATUSES:
             raise HTTPException(status_code=400, detail="이미 완료된 작업은 취소할 수 없습니다")
         
-        # 작업 취소
-        job["status"] = "cancelled"
-        job["completed_at"] = datetime.utcnow()
-        job["error_messages"].append(f"사용자 {current_user.user_name}에 의해 취소됨")
+        # 작업 취소 - 대기 중이면 즉시, 처리 중이면 워커가 다음 하트비트에서 중단
+        job = await job_queue.cancel(job_id, reason=f"사용자 {current_user.user_name}에 의해 취소됨")
+        if not job:
+            raise HTTPException(status_code=400, detail="이미 완료된 작업은 취소할 수 없습니다")
         
         logger.info(f"AI 평가 작업 취소: {job_id}", extra={
             'user_id': current_user.id,
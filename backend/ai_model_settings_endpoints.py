@@ -17,12 +17,10 @@ import os
 
 logger = logging.getLogger(__name__)
 
-# AI Provider clients
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# AI Provider clients (공급자별 연결 풀을 공유하는 비동기 클라이언트)
+from ai_clients import HAS_ANTHROPIC, HAS_OPENAI as OPENAI_AVAILABLE, ai_client_pool
+
+if not OPENAI_AVAILABLE:
     logger.warning("OpenAI library not available")
 
 from models import User
@@ -115,8 +113,8 @@ class ModelTemplate(BaseModel):
 
 # AI Model Client Functions
 
-def create_novita_client(api_key: str = None) -> OpenAI:
-    """Novita AI 클라이언트 생성"""
+def create_novita_client(api_key: str = None):
+    """Novita AI 클라이언트 (공유 연결 풀 기반 AsyncOpenAI)"""
     if not OPENAI_AVAILABLE:
         raise HTTPException(status_code=500, detail="OpenAI library not available")
     
@@ -124,125 +122,155 @@ def create_novita_client(api_key: str = None) -> OpenAI:
     if not api_key:
         raise HTTPException(status_code=500, detail="Novita API key not configured")
     
-    return OpenAI(
-        base_url="https://api.novita.ai/v3/openai",
-        api_key=api_key
+    return ai_client_pool.openai_compatible("novita", api_key)
+
+def _model_result(model_config: AIModelConfig, content: str, response_time: float, token_count: float) -> Dict[str, Any]:
+    return {
+        "response": content,
+        "response_time": response_time,
+        "token_count": int(token_count),
+        "cost": token_count * model_config.cost_per_token,
+        "quality_score": model_config.quality_score,
+        "error": None
+    }
+
+def _model_error(e: Exception) -> Dict[str, Any]:
+    return {
+        "response": "",
+        "response_time": 0.0,
+        "token_count": 0,
+        "cost": 0.0,
+        "quality_score": 0.0,
+        "error": str(e)
+    }
+
+def _mock_result(model_config: AIModelConfig, prompt: str) -> Dict[str, Any]:
+    """API 키가 없는 제공업체 모델 (Mock 응답)"""
+    if model_config.provider == ModelProvider.OPENAI:
+        return {
+            "response": f"[Mock] OpenAI {model_config.model_name} response to: {prompt[:50]}...",
+            "response_time": 1.2,
+            "token_count": 100,
+            "cost": 0.002,
+            "quality_score": model_config.quality_score,
+            "error": None
+        }
+    return {
+        "response": f"[Mock] {model_config.provider.upper()} {model_config.model_name} response to: {prompt[:50]}...",
+        "response_time": 1.5,
+        "token_count": 120,
+        "cost": 0.001,
+        "quality_score": model_config.quality_score,
+        "error": None
+    }
+
+async def call_openai_compatible_model(client, model_config: AIModelConfig, prompt: str, **kwargs) -> Dict[str, Any]:
+    """OpenAI 호환 API 모델 호출 (이벤트 루프를 막지 않는 비동기 호출)"""
+    start_time = time.time()
+    
+    # 기본 매개변수 설정
+    params = {
+        "model": model_config.model_name,
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a professional AI assistant."
+            },
+            {
+                "role": "user", 
+                "content": prompt
+            }
+        ],
+        "max_tokens": kwargs.get('max_tokens', model_config.max_tokens),
+        "temperature": kwargs.get('temperature', 0.7),
+        "stream": kwargs.get('stream', False)
+    }
+    
+    # 모델별 특별 설정
+    if 'deepseek' in model_config.model_name:
+        params["temperature"] = min(params["temperature"], 1.0)  # DeepSeek 온도 제한
+    elif 'claude' in model_config.model_name:
+        params["temperature"] = min(params["temperature"], 1.0)  # Claude 온도 제한
+    elif 'codestral' in model_config.model_name:
+        # 코딩 특화 모델은 낮은 온도로 설정
+        params["temperature"] = min(params["temperature"], 0.3)
+    elif 'phi-3' in model_config.model_name:
+        # Phi-3은 Microsoft의 효율적인 모델
+        params["temperature"] = min(params["temperature"], 0.8)
+    
+    response = await client.chat.completions.create(**params)
+    
+    token_count = None
+    if params["stream"]:
+        # 스트리밍 응답 처리
+        content = ""
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                content += chunk.choices[0].delta.content
+    else:
+        content = response.choices[0].message.content or ""
+        if response.usage:
+            token_count = response.usage.total_tokens
+    
+    if token_count is None:
+        token_count = len(content.split()) * 1.3  # 사용량 정보가 없으면 간단히 추정
+    
+    return _model_result(model_config, content, time.time() - start_time, token_count)
+
+async def call_anthropic_model(model_config: AIModelConfig, prompt: str, **kwargs) -> Dict[str, Any]:
+    """Anthropic 모델 호출"""
+    client = ai_client_pool.anthropic(os.getenv("ANTHROPIC_API_KEY") or os.getenv("CLAUDE_API_KEY"))
+    start_time = time.time()
+    
+    response = await client.messages.create(
+        model=model_config.model_name,
+        max_tokens=kwargs.get('max_tokens', model_config.max_tokens),
+        temperature=min(kwargs.get('temperature', 0.7), 1.0),
+        system="You are a professional AI assistant.",
+        messages=[{"role": "user", "content": prompt}]
     )
+    
+    content = "".join(block.text for block in response.content if getattr(block, "text", None))
+    token_count = response.usage.input_tokens + response.usage.output_tokens
+    return _model_result(model_config, content, time.time() - start_time, token_count)
 
 async def call_novita_model(model_config: AIModelConfig, prompt: str, **kwargs) -> Dict[str, Any]:
     """Novita AI 모델 호출"""
     try:
         client = create_novita_client()
-        
-        start_time = time.time()
-        
-        # 기본 매개변수 설정
-        params = {
-            "model": model_config.model_name,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a professional AI assistant."
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ],
-            "max_tokens": kwargs.get('max_tokens', model_config.max_tokens),
-            "temperature": kwargs.get('temperature', 0.7),
-            "stream": kwargs.get('stream', False)
-        }
-        
-        # 모델별 특별 설정
-        if 'deepseek' in model_config.model_name:
-            params["temperature"] = min(params["temperature"], 1.0)  # DeepSeek 온도 제한
-        elif 'claude' in model_config.model_name:
-            params["temperature"] = min(params["temperature"], 1.0)  # Claude 온도 제한
-        elif 'codestral' in model_config.model_name:
-            # 코딩 특화 모델은 낮은 온도로 설정
-            params["temperature"] = min(params["temperature"], 0.3)
-        elif 'phi-3' in model_config.model_name:
-            # Phi-3은 Microsoft의 효율적인 모델
-            params["temperature"] = min(params["temperature"], 0.8)
-        
-        response = client.chat.completions.create(**params)
-        
-        end_time = time.time()
-        response_time = end_time - start_time
-        
-        # 응답 처리
-        if kwargs.get('stream', False):
-            # 스트리밍 응답 처리
-            content = ""
-            for chunk in response:
-                if chunk.choices[0].delta.content:
-                    content += chunk.choices[0].delta.content
-        else:
-            content = response.choices[0].message.content
-        
-        # 토큰 수 추정 (실제로는 response.usage.total_tokens 사용 가능)
-        token_count = len(content.split()) * 1.3  # 간단한 토큰 수 추정
-        
-        # 비용 계산
-        cost = token_count * model_config.cost_per_token
-        
-        return {
-            "response": content,
-            "response_time": response_time,
-            "token_count": int(token_count),
-            "cost": cost,
-            "quality_score": model_config.quality_score,
-            "error": None
-        }
+        return await call_openai_compatible_model(client, model_config, prompt, **kwargs)
         
     except Exception as e:
         logger.error(f"Novita AI 모델 호출 오류: {e}")
-        return {
-            "response": "",
-            "response_time": 0.0,
-            "token_count": 0,
-            "cost": 0.0,
-            "quality_score": 0.0,
-            "error": str(e)
-        }
+        return _model_error(e)
 
 async def call_ai_model(model_config: AIModelConfig, prompt: str, **kwargs) -> Dict[str, Any]:
-    """통합 AI 모델 호출 함수"""
+    """통합 AI 모델 호출 함수
+    
+    API 키가 설정된 제공업체(Novita/OpenAI/Anthropic)와 엔드포인트가 지정된 로컬 모델은
+    공유 연결 풀을 통해 실제로 호출하고, 그 외에는 Mock 응답을 반환합니다.
+    """
     try:
         if model_config.provider == ModelProvider.NOVITA:
             return await call_novita_model(model_config, prompt, **kwargs)
-        elif model_config.provider == ModelProvider.OPENAI:
-            # OpenAI 모델 호출 로직 (기존)
-            return {
-                "response": f"[Mock] OpenAI {model_config.model_name} response to: {prompt[:50]}...",
-                "response_time": 1.2,
-                "token_count": 100,
-                "cost": 0.002,
-                "quality_score": model_config.quality_score,
-                "error": None
-            }
+        elif model_config.provider == ModelProvider.OPENAI and OPENAI_AVAILABLE and os.getenv("OPENAI_API_KEY"):
+            client = ai_client_pool.openai_compatible("openai", os.getenv("OPENAI_API_KEY"))
+            return await call_openai_compatible_model(client, model_config, prompt, **kwargs)
+        elif model_config.provider == ModelProvider.ANTHROPIC and HAS_ANTHROPIC and (
+            os.getenv("ANTHROPIC_API_KEY") or os.getenv("CLAUDE_API_KEY")
+        ):
+            return await call_anthropic_model(model_config, prompt, **kwargs)
+        elif model_config.provider == ModelProvider.LOCAL and OPENAI_AVAILABLE and model_config.api_endpoint:
+            client = ai_client_pool.openai_compatible(
+                "local", os.getenv("LOCAL_AI_API_KEY", "local"), model_config.api_endpoint
+            )
+            return await call_openai_compatible_model(client, model_config, prompt, **kwargs)
         else:
-            # 다른 제공업체 모델 (Mock 응답)
-            return {
-                "response": f"[Mock] {model_config.provider.upper()} {model_config.model_name} response to: {prompt[:50]}...",
-                "response_time": 1.5,
-                "token_count": 120,
-                "cost": 0.001,
-                "quality_score": model_config.quality_score,
-                "error": None
-            }
+            return _mock_result(model_config, prompt)
             
     except Exception as e:
         logger.error(f"AI 모델 호출 오류: {e}")
-        return {
-            "response": "",
-            "response_time": 0.0,
-            "token_count": 0,
-            "cost": 0.0,
-            "quality_score": 0.0,
-            "error": str(e)
-        }
+        return _model_error(e)
 
 # 모델 템플릿 정의
 
@@ -0,0 +1,270 @@
+"""
+AI Response Cache
+AI 문서 분석/점수 제안/정보 추출 결과를 내용 주소(content-addressed) 키로 저장하는 캐시
+
+- 키: (정규화한 문서 텍스트, 프롬프트 템플릿 버전, 공급자, 모델, 호출 매개변수)의 SHA-256
+  같은 사업계획서를 여러 평가위원이 다시 분석해도 LLM 을 한 번만 호출
+- 1차: cache_service (프로세스 내 LRU + Redis), 2차: MongoDB ai_response_cache 컬렉션
+- MongoDB 는 expires_at TTL 인덱스로 만료하고, 최대 건수/최대 용량을 넘으면 오래 사용되지 않은 항목부터 삭제
+- 적중률, 절약한 토큰 수/비용(USD) 집계 → EnhancedAIService.get_cost_optimization_stats
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import unicodedata
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from pymongo import ASCENDING, IndexModel
+
+from cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
+AI_CACHE_TTL_SECONDS = int(os.getenv("AI_CACHE_TTL_SECONDS", str(30 * 86400)))
+AI_CACHE_MEMORY_TTL_SECONDS = int(os.getenv("AI_CACHE_MEMORY_TTL_SECONDS", "86400"))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "20000"))
+AI_CACHE_MAX_BYTES = int(os.getenv("AI_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+AI_CACHE_EVICT_EVERY = int(os.getenv("AI_CACHE_EVICT_EVERY", "50"))
+
+CACHE_KEY_PREFIX = "ai_response:"
+
+# 결과 생성 시각 등 매번 달라지는 필드 - 키 계산 시 제외
+VOLATILE_FIELDS = {"analyzed_at", "suggested_at", "extracted_at", "cached_at", "cache"}
+
+_WHITESPACE = re.compile(r"[ \t\u00a0\u3000]+")
+_BLANK_LINES = re.compile(r"\n{2,}")
+
+
+def normalize_document_text(text: str) -> str:
+    """유니코드 정규화(NFC)와 공백 정리 - 추출 방식에 따른 공백 차이가 다른 키가 되지 않도록"""
+    text = unicodedata.normalize("NFC", text or "").replace("\r\n", "\n").replace("\r", "\n")
+    lines = [_WHITESPACE.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n", "\n".join(lines)).strip()
+
+
+def stable_payload(value: Any) -> Any:
+    """키 계산용 사본 - 변동 필드 제거"""
+    if isinstance(value, dict):
+        return {k: stable_payload(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [stable_payload(v) for v in value]
+    return value
+
+
+def make_cache_key(kind: str, document_text: str, prompt_version: str, provider: str, model: str,
+                   params: Optional[Dict[str, Any]] = None) -> str:
+    """응답 캐시 키 (SHA-256 hex)"""
+    material = json.dumps(
+        {
+            "kind": kind,
+            "text": normalize_document_text(document_text),
+            "prompt_version": prompt_version,
+            "provider": provider,
+            "model": model,
+            "params": stable_payload(params or {}),
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class AICacheStats:
+    """응답 캐시 적중/절약 집계 (프로세스 단위)"""
+    hits: int = 0
+    memory_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    tokens_saved: int = 0
+    cost_saved_usd: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class AIResponseCache:
+    """AI 응답 캐시 (cache_service + MongoDB)"""
+
+    def __init__(self, db=None, cache=cache_service, ttl: int = AI_CACHE_TTL_SECONDS,
+                 max_entries: int = AI_CACHE_MAX_ENTRIES, max_bytes: int = AI_CACHE_MAX_BYTES,
+                 evict_every: int = AI_CACHE_EVICT_EVERY, enabled: bool = AI_CACHE_ENABLED):
+        self.db = db
+        self.cache = cache
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evict_every = max(1, evict_every)
+        self.enabled = enabled
+        self.stats = AICacheStats()
+        self._stores_since_evict = 0
+
+    @property
+    def collection(self):
+        return self.db.ai_response_cache if self.db is not None else None
+
+    async def ensure_indexes(self) -> None:
+        """키 고유 인덱스, 만료 TTL 인덱스, 사용 시각 인덱스(축출 순서) 생성"""
+        if self.collection is None:
+            return
+        try:
+            await self.collection.create_indexes([
+                IndexModel([("key", ASCENDING)], unique=True, name="uniq_key"),
+                IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_expires_at"),
+                IndexModel([("last_used_at", ASCENDING)], name="last_used_at"),
+            ])
+        except Exception as e:
+            logger.warning(f"Failed to create indexes for ai_response_cache: {e}")
+
+    def _record_hit(self, entry: Dict[str, Any], memory: bool) -> Dict[str, Any]:
+        self.stats.hits += 1
+        if memory:
+            self.stats.memory_hits += 1
+        self.stats.tokens_saved += int(entry.get("tokens") or 0)
+        self.stats.cost_saved_usd += float(entry.get("cost_usd") or 0.0)
+        result = copy.deepcopy(entry["result"])
+        if isinstance(result, dict):
+            result["cache"] = {"hit": True, "key": entry["key"], "cached_at": entry.get("created_at")}
+        return result
+
+    async def get(self, key: str) -> Optional[Any]:
+        """캐시된 결과 (없으면 None) - 적중 시 result.cache.hit = True"""
+        if not self.enabled:
+            return None
+
+        if self.cache is not None:
+            entry = await self.cache.get(CACHE_KEY_PREFIX + key)
+            if entry is not None:
+                if self.collection is not None:
+                    try:
+                        await self.collection.update_one(
+                            {"key": key}, {"$inc": {"hits": 1}, "$set": {"last_used_at": datetime.utcnow()}}
+                        )
+                    except Exception as e:
+                        logger.debug(f"AI cache hit bookkeeping failed: {e}")
+                return self._record_hit(entry, memory=True)
+
+        if self.collection is not None:
+            now = datetime.utcnow()
+            try:
+                doc = await self.collection.find_one_and_update(
+                    {"key": key, "expires_at": {"$gt": now}},
+                    {"$inc": {"hits": 1}, "$set": {"last_used_at": now}},
+                    projection={"_id": 0},
+                )
+            except Exception as e:
+                logger.warning(f"AI cache lookup failed: {e}")
+                doc = None
+            if doc is not None:
+                entry = self._entry(key, doc["result"], doc.get("kind"), doc.get("provider"), doc.get("model"),
+                                    doc.get("tokens"), doc.get("cost_usd"), doc.get("created_at"))
+                await self._remember(entry)
+                return self._record_hit(entry, memory=False)
+
+        self.stats.misses += 1
+        return None
+
+    @staticmethod
+    def _entry(key, result, kind, provider, model, tokens, cost_usd, created_at) -> Dict[str, Any]:
+        created = created_at.isoformat() if isinstance(created_at, datetime) else created_at
+        return {
+            "key": key, "result": result, "kind": kind, "provider": provider, "model": model,
+            "tokens": int(tokens or 0), "cost_usd": float(cost_usd or 0.0), "created_at": created,
+        }
+
+    async def _remember(self, entry: Dict[str, Any]) -> None:
+        if self.cache is not None:
+            await self.cache.set(CACHE_KEY_PREFIX + entry["key"], entry, ttl=min(self.ttl, AI_CACHE_MEMORY_TTL_SECONDS))
+
+    async def set(self, key: str, result: Any, kind: str, provider: str, model: str,
+                  tokens: int = 0, cost_usd: float = 0.0) -> None:
+        """결과 저장 - tokens/cost_usd 는 적중 시 절약량으로 집계되는 원래 호출 비용"""
+        if not self.enabled:
+            return
+        now = datetime.utcnow()
+        entry = self._entry(key, result, kind, provider, model, tokens, cost_usd, now)
+        await self._remember(entry)
+        self.stats.stores += 1
+
+        if self.collection is None:
+            return
+        size = len(json.dumps(result, ensure_ascii=False, default=str).encode("utf-8"))
+        try:
+            await self.collection.update_one(
+                {"key": key},
+                {
+                    "$set": {
+                        "result": result, "kind": kind, "provider": provider, "model": model,
+                        "tokens": entry["tokens"], "cost_usd": entry["cost_usd"], "size": size,
+                        "created_at": now, "last_used_at": now,
+                        "expires_at": now + timedelta(seconds=self.ttl),
+                    },
+                    "$setOnInsert": {"hits": 0},
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning(f"AI cache store failed: {e}")
+            return
+
+        self._stores_since_evict += 1
+        if self._stores_since_evict >= self.evict_every:
+            self._stores_since_evict = 0
+            await self.evict()
+
+    async def evict(self) -> int:
+        """최대 건수/용량 초과분을 마지막 사용 시각이 오래된 순으로 삭제"""
+        if self.collection is None:
+            return 0
+        try:
+            count = await self.collection.count_documents({})
+            totals = await self.collection.aggregate([{"$group": {"_id": None, "bytes": {"$sum": "$size"}}}]).to_list(1)
+            total_bytes = totals[0]["bytes"] if totals else 0
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                return 0
+
+            victims = []
+            cursor = self.collection.find({}, {"_id": 0, "key": 1, "size": 1}).sort("last_used_at", ASCENDING)
+            async for doc in cursor:
+                if count <= self.max_entries and total_bytes <= self.max_bytes:
+                    break
+                victims.append(doc["key"])
+                count -= 1
+                total_bytes -= doc.get("size") or 0
+
+            if victims:
+                await self.collection.delete_many({"key": {"$in": victims}})
+                if self.cache is not None:
+                    for key in victims:
+                        await self.cache.delete(CACHE_KEY_PREFIX + key)
+                self.stats.evictions += len(victims)
+            return len(victims)
+        except Exception as e:
+            logger.warning(f"AI cache eviction failed: {e}")
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중률과 절약한 토큰/비용"""
+        stats = asdict(self.stats)
+        stats["cost_saved_usd"] = round(stats["cost_saved_usd"], 6)
+        stats["hit_rate"] = round(self.stats.hit_rate, 4)
+        stats["enabled"] = self.enabled
+        stats["ttl_seconds"] = self.ttl
+        stats["max_entries"] = self.max_entries
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+
+# Global AI response cache instance (db is attached at server startup)
+ai_response_cache = AIResponseCache()
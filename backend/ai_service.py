@@ -14,14 +14,11 @@ from pathlib import Path
 # AI 모델 라이브러리들
 try:
     import openai
-    from anthropic import AsyncAnthropic
-    HAS_OPENAI = True
-    HAS_ANTHROPIC = True
 except ImportError:
-    HAS_OPENAI = False
-    HAS_ANTHROPIC = False
     print("⚠️ AI 라이브러리가 설치되지 않았습니다. pip install openai anthropic 를 실행하세요.")
 
+from ai_clients import HAS_ANTHROPIC, HAS_OPENAI, ai_client_pool
+
 # 텍스트 처리용
 import re
 from collections import Counter
@@ -42,10 +39,10 @@ class AIEvaluationService:
         
         if openai_key and HAS_OPENAI:
             openai.api_key = openai_key
-            self.openai_client = openai.AsyncOpenAI(api_key=openai_key)
+            self.openai_client = ai_client_pool.openai_compatible("openai", openai_key)
             
         if anthropic_key and HAS_ANTHROPIC:
-            self.anthropic_client = AsyncAnthropic(api_key=anthropic_key)
+            self.anthropic_client = ai_client_pool.anthropic(anthropic_key)
             
         # 평가 기준 템플릿들
         self.evaluation_templates = {
@@ -16,25 +16,34 @@ from motor.motor_asyncio import AsyncIOMotorClient
 
 # AI 모델 라이브러리들
 try:
-    import openai
-    from anthropic import AsyncAnthropic
     import google.generativeai as genai
-    HAS_OPENAI = True
-    HAS_ANTHROPIC = True
     HAS_GOOGLE = True
 except ImportError as e:
-    HAS_OPENAI = False
-    HAS_ANTHROPIC = False
     HAS_GOOGLE = False
     print(f"AI 라이브러리가 설치되지 않았습니다: {e}")
 
+from ai_clients import HAS_ANTHROPIC, HAS_OPENAI, PROVIDER_BASE_URLS, ai_client_pool
+from ai_response_cache import ai_response_cache, make_cache_key, stable_payload
+from document_pipeline import (
+    AI_CHUNK_CONCURRENCY, chunk_document, chunk_token_budget, map_chunks, merge_chunk_analyses, token_counter
+)
+from similarity_index import shingle_hashes
+
 # 텍스트 처리용
 import re
 from collections import Counter
 import math
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# 프롬프트 템플릿 버전 - 프롬프트를 바꾸면 올려서 이전 응답 캐시를 무효화
+PROMPT_VERSIONS = {
+    "document_analysis": "2",
+    "score_suggestion": "1",
+    "key_information": "1",
+}
+
 class EnhancedAIService:
     """향상된 AI 기반 평가 지원 서비스"""
     
@@ -117,7 +126,7 @@ class EnhancedAIService:
     
     async def load_ai_providers(self):
         """데이터베이스에서 AI 공급자 설정 로드"""
-        if not self.ai_providers_collection:
+        if self.ai_providers_collection is None:
             logger.warning("데이터베이스가 연결되지 않았습니다. 환경변수 기반으로 동작합니다.")
             await self._fallback_to_env_config()
             return
@@ -161,77 +170,26 @@ class EnhancedAIService:
             await self._fallback_to_env_config()
     
     async def _create_ai_client(self, provider_name: str, api_key: str, api_endpoint: Optional[str] = None):
-        """AI 공급자별 클라이언트 생성"""
+        """AI 공급자별 클라이언트 생성 (공급자별 연결 풀을 공유하는 비동기 클라이언트)"""
         try:
-            # OpenAI (ChatGPT) 모델들
-            if provider_name == "openai" and HAS_OPENAI:
-                return openai.AsyncOpenAI(api_key=api_key)
-                
             # Anthropic Claude 모델들
-            elif provider_name == "anthropic" and HAS_ANTHROPIC:
-                return AsyncAnthropic(api_key=api_key)
+            if provider_name == "anthropic" and HAS_ANTHROPIC:
+                return ai_client_pool.anthropic(api_key)
                 
             # Google Gemini 모델들
             elif provider_name == "google" and HAS_GOOGLE:
                 genai.configure(api_key=api_key)
                 return genai.GenerativeModel('gemini-pro')
-                
-            # Groq (Llama, Mixtral 등)
-            elif provider_name == "groq" and HAS_OPENAI:
-                return openai.AsyncOpenAI(
-                    api_key=api_key,
-                    base_url="https://api.groq.com/openai/v1"
-                )
             
-            # DeepSeek 모델들
-            elif provider_name == "deepseek" and HAS_OPENAI:
-                return openai.AsyncOpenAI(
-                    api_key=api_key,
-                    base_url="https://api.deepseek.com/v1"
-                )
-            
-            # MiniMax 모델들
-            elif provider_name == "minimax" and HAS_OPENAI:
-                # MiniMax는 자체 API 구조를 사용하지만 OpenAI 호환 형식도 지원
-                return openai.AsyncOpenAI(
-                    api_key=api_key,
-                    base_url=api_endpoint or "https://api.minimax.chat/v1"
-                )
-            
-            # Cohere 모델들
-            elif provider_name == "cohere" and HAS_OPENAI:
-                return openai.AsyncOpenAI(
-                    api_key=api_key,
-                    base_url="https://api.cohere.ai/v1"
-                )
-            
-            # Together AI (다양한 오픈소스 모델 제공)
-            elif provider_name == "together" and HAS_OPENAI:
-                return openai.AsyncOpenAI(
-                    api_key=api_key,
-                    base_url="https://api.together.xyz/v1"
-                )
-            
-            # Perplexity AI
-            elif provider_name == "perplexity" and HAS_OPENAI:
-                return openai.AsyncOpenAI(
-                    api_key=api_key,
-                    base_url="https://api.perplexity.ai"
-                )
-            
-            # Mistral AI
-            elif provider_name == "mistral" and HAS_OPENAI:
-                return openai.AsyncOpenAI(
-                    api_key=api_key,
-                    base_url="https://api.mistral.ai/v1"
-                )
+            # OpenAI 및 OpenAI 호환 공급자 (Groq, DeepSeek, MiniMax, Cohere, Together, Perplexity, Mistral)
+            # MiniMax 는 자체 API 구조를 사용하지만 OpenAI 호환 형식도 지원
+            elif provider_name in PROVIDER_BASE_URLS and HAS_OPENAI:
+                base_url = api_endpoint if provider_name == "minimax" else None
+                return ai_client_pool.openai_compatible(provider_name, api_key, base_url)
             
             # 커스텀 엔드포인트 (자체 호스팅 모델 등)
             elif provider_name == "custom" and HAS_OPENAI and api_endpoint:
-                return openai.AsyncOpenAI(
-                    api_key=api_key,
-                    base_url=api_endpoint
-                )
+                return ai_client_pool.openai_compatible(provider_name, api_key, api_endpoint)
             
             else:
                 logger.warning(f"지원하지 않는 AI 공급자이거나 라이브러리가 없습니다: {provider_name}")
@@ -245,69 +203,23 @@ class EnhancedAIService:
         """환경변수 기반 폴백 설정"""
         logger.info("환경변수 기반 AI 설정으로 폴백합니다.")
         
-        # OpenAI 설정
-        openai_key = os.getenv("OPENAI_API_KEY")
-        if openai_key and HAS_OPENAI:
-            self.active_clients["openai"] = openai.AsyncOpenAI(api_key=openai_key)
-            self.provider_configs["openai"] = {
-                "display_name": "OpenAI ChatGPT",
-                "max_tokens": 4096,
-                "temperature": 0.3,
-                "priority": 1
-            }
-        
-        # Anthropic 설정
-        anthropic_key = os.getenv("ANTHROPIC_API_KEY") or os.getenv("CLAUDE_API_KEY")
-        if anthropic_key and HAS_ANTHROPIC:
-            self.active_clients["anthropic"] = AsyncAnthropic(api_key=anthropic_key)
-            self.provider_configs["anthropic"] = {
-                "display_name": "Anthropic Claude",
-                "max_tokens": 4096,
-                "temperature": 0.3,
-                "priority": 2
-            }
-        
-        # Groq 설정
-        groq_key = os.getenv("GROQ_API_KEY")
-        if groq_key and HAS_OPENAI:
-            self.active_clients["groq"] = openai.AsyncOpenAI(
-                api_key=groq_key,
-                base_url="https://api.groq.com/openai/v1"
-            )
-            self.provider_configs["groq"] = {
-                "display_name": "Groq (Llama3)",
-                "max_tokens": 8192,
-                "temperature": 0.3,
-                "priority": 3
-            }
-        
-        # DeepSeek 설정
-        deepseek_key = os.getenv("DEEPSEEK_API_KEY")
-        if deepseek_key and HAS_OPENAI:
-            self.active_clients["deepseek"] = openai.AsyncOpenAI(
-                api_key=deepseek_key,
-                base_url="https://api.deepseek.com/v1"
-            )
-            self.provider_configs["deepseek"] = {
-                "display_name": "DeepSeek",
-                "max_tokens": 4096,
-                "temperature": 0.3,
-                "priority": 4
-            }
+        env_providers = [
+            ("openai", os.getenv("OPENAI_API_KEY"), {"display_name": "OpenAI ChatGPT", "max_tokens": 4096}),
+            ("anthropic", os.getenv("ANTHROPIC_API_KEY") or os.getenv("CLAUDE_API_KEY"),
+             {"display_name": "Anthropic Claude", "max_tokens": 4096}),
+            ("groq", os.getenv("GROQ_API_KEY"), {"display_name": "Groq (Llama3)", "max_tokens": 8192}),
+            ("deepseek", os.getenv("DEEPSEEK_API_KEY"), {"display_name": "DeepSeek", "max_tokens": 4096}),
+            # 1M 토큰 컨텍스트
+            ("minimax", os.getenv("MINIMAX_API_KEY"), {"display_name": "MiniMax", "max_tokens": 1000000}),
+        ]
         
-        # MiniMax 설정
-        minimax_key = os.getenv("MINIMAX_API_KEY")
-        if minimax_key and HAS_OPENAI:
-            self.active_clients["minimax"] = openai.AsyncOpenAI(
-                api_key=minimax_key,
-                base_url="https://api.minimax.chat/v1"
-            )
-            self.provider_configs["minimax"] = {
-                "display_name": "MiniMax",
-                "max_tokens": 1000000,  # 1M 토큰 컨텍스트
-                "temperature": 0.3,
-                "priority": 5
-            }
+        for priority, (provider_name, api_key, config) in enumerate(env_providers, start=1):
+            if not api_key:
+                continue
+            client = await self._create_ai_client(provider_name, api_key)
+            if client:
+                self.active_clients[provider_name] = client
+                self.provider_configs[provider_name] = {**config, "temperature": 0.3, "priority": priority}
     
     def get_primary_provider(self) -> Optional[str]:
         """우선순위가 가장 높은 공급자 반환"""
@@ -328,30 +240,22 @@ class EnhancedAIService:
         if not provider_name or provider_name not in self.active_clients:
             return self._fallback_document_analysis(document_text)
         
+        # 같은 문서/프롬프트/모델의 분석 결과가 캐시에 있으면 LLM 호출 없이 반환
+        config = self.provider_configs[provider_name]
+        model = self._analysis_model(provider_name, document_text, document_type, config)
+        cache_key, cached = await self._cached_response("document_analysis", document_text, provider_name, model, {
+            "document_type": document_type,
+            "temperature": config["temperature"],
+            "max_tokens": config["max_tokens"]
+        })
+        if cached is not None:
+            return cached
+        
         try:
-            client = self.active_clients[provider_name]
-            config = self.provider_configs[provider_name]
-            
-            # 공급자별 분석 실행
-            if provider_name == "openai":
-                result = await self._analyze_with_openai(client, document_text, document_type, config)
-            elif provider_name == "anthropic":
-                result = await self._analyze_with_anthropic(client, document_text, document_type, config)
-            elif provider_name == "google":
-                result = await self._analyze_with_google(client, document_text, document_type, config)
-            elif provider_name == "groq":
-                result = await self._analyze_with_groq(client, document_text, document_type, config)
-            elif provider_name == "deepseek":
-                result = await self._analyze_with_deepseek(client, document_text, document_type, config)
-            elif provider_name == "minimax":
-                result = await self._analyze_with_minimax(client, document_text, document_type, config)
-            elif provider_name in ["together", "perplexity", "mistral", "cohere", "custom"]:
-                result = await self._analyze_with_openai_compatible(client, document_text, document_type, config, provider_name)
-            else:
-                result = self._fallback_document_analysis(document_text)
+            result = await self._analyze_in_chunks(provider_name, document_text, document_type, model)
             
-            result["ai_provider"] = provider_name
-            result["analyzed_at"] = datetime.utcnow().isoformat()
+            await self._store_response(cache_key, "document_analysis", result, provider_name, model,
+                                       self._create_analysis_prompt(document_text, document_type))
             
             # 분석 작업 기록 저장
             await self._save_analysis_job("document_analysis", {
@@ -377,6 +281,65 @@ class EnhancedAIService:
             # 모든 공급자 실패시 폴백
             return self._fallback_document_analysis(document_text)
     
+    async def _analyze_with_provider(self, provider_name: str, client, document_text: str, document_type: str, config: Dict) -> Dict[str, Any]:
+        """공급자별 분석 실행"""
+        if provider_name == "openai":
+            return await self._analyze_with_openai(client, document_text, document_type, config)
+        elif provider_name == "anthropic":
+            return await self._analyze_with_anthropic(client, document_text, document_type, config)
+        elif provider_name == "google":
+            return await self._analyze_with_google(client, document_text, document_type, config)
+        elif provider_name == "groq":
+            return await self._analyze_with_groq(client, document_text, document_type, config)
+        elif provider_name == "deepseek":
+            return await self._analyze_with_deepseek(client, document_text, document_type, config)
+        elif provider_name == "minimax":
+            return await self._analyze_with_minimax(client, document_text, document_type, config)
+        elif provider_name in ["together", "perplexity", "mistral", "cohere", "custom"]:
+            return await self._analyze_with_openai_compatible(client, document_text, document_type, config, provider_name)
+        else:
+            return self._fallback_document_analysis(document_text)
+    
+    async def _analyze_in_chunks(self, provider_name: str, document_text: str, document_type: str, model: str) -> Dict[str, Any]:
+        """모델 컨텍스트에 맞춰 문서를 청크로 나눠 분석 (map) 후 결과 병합 (reduce)
+        
+        문서가 한 청크에 들어가면 한 번만 호출합니다.
+        """
+        client = self.active_clients[provider_name]
+        config = self.provider_configs[provider_name]
+        chunks = self.plan_document_chunks(document_text, model, document_type, min(config["max_tokens"], 3000))
+        
+        if len(chunks) <= 1:
+            result = await self._analyze_with_provider(provider_name, client, document_text, document_type, config)
+        else:
+            outcomes = await map_chunks(
+                chunks,
+                lambda chunk: self._analyze_with_provider(provider_name, client, chunk.text, document_type, config),
+                AI_CHUNK_CONCURRENCY
+            )
+            succeeded = [(chunk, outcome) for chunk, outcome in zip(chunks, outcomes) if not isinstance(outcome, Exception)]
+            if not succeeded:
+                raise outcomes[0]
+            if len(succeeded) < len(chunks):
+                logger.warning(f"문서 청크 분석 일부 실패 ({provider_name}): {len(chunks) - len(succeeded)}/{len(chunks)}")
+            result = merge_chunk_analyses(succeeded)
+            result["failed_chunks"] = len(chunks) - len(succeeded)
+        
+        result["ai_provider"] = provider_name
+        result["analyzed_at"] = datetime.utcnow().isoformat()
+        return result
+    
+    def plan_document_chunks(self, document_text: str, model: str, document_type: str = "business_plan", output_tokens: int = 3000):
+        """분석 프롬프트와 출력 토큰을 제외한 모델 컨텍스트에 맞춘 청크 목록"""
+        prompt_tokens = token_counter.count(self._create_analysis_prompt("", document_type), model)
+        return chunk_document(document_text, model, chunk_token_budget(model, prompt_tokens, output_tokens))
+    
+    async def _retry_with_provider(self, provider_name: str, document_text: str, document_type: str) -> Dict[str, Any]:
+        """백업 공급자로 문서 분석 재시도"""
+        config = self.provider_configs[provider_name]
+        model = self._analysis_model(provider_name, document_text, document_type, config)
+        return await self._analyze_in_chunks(provider_name, document_text, document_type, model)
+    
     async def _analyze_with_openai(self, client, document_text: str, document_type: str, config: Dict) -> Dict[str, Any]:
         """OpenAI를 사용한 문서 분석"""
         prompt = self._create_analysis_prompt(document_text, document_type)
@@ -412,7 +375,7 @@ class EnhancedAIService:
         """Google Gemini를 사용한 문서 분석"""
         prompt = self._create_analysis_prompt(document_text, document_type)
         
-        response = client.generate_content(prompt)
+        response = await client.generate_content_async(prompt)
         result_text = response.text
         return self._parse_analysis_response(result_text)
     
@@ -422,7 +385,7 @@ class EnhancedAIService:
         
         # 비용 효율적인 모델 선택
         optimal_model = self._select_optimal_groq_model(
-            document_length=len(document_text),
+            document_tokens=token_counter.count(document_text),
             analysis_type=document_type,
             budget_priority=config.get("budget_priority", "balanced")
         )
@@ -451,7 +414,7 @@ class EnhancedAIService:
         prompt = self._create_analysis_prompt(document_text, document_type)
         
         # DeepSeek 최적 모델 선택
-        model = self._select_deepseek_model(len(document_text))
+        model = self._select_deepseek_model(token_counter.count(document_text))
         
         response = await client.chat.completions.create(
             model=model,
@@ -495,7 +458,7 @@ class EnhancedAIService:
         prompt = self._create_analysis_prompt(document_text, document_type)
         
         # 공급자별 최적 모델 선택
-        model = self._select_provider_model(provider_name, len(document_text))
+        model = self._select_provider_model(provider_name, token_counter.count(document_text))
         
         response = await client.chat.completions.create(
             model=model,
@@ -532,7 +495,7 @@ class EnhancedAIService:
 - 전체적인 평가 요약 (2-3문장)
 
 문서 내용:
-{document_text[:4000]}
+{document_text}
 
 응답은 JSON 형태로 해주세요.
 """
@@ -620,10 +583,26 @@ class EnhancedAIService:
 응답은 JSON 형태로 해주세요.
 """
 
+            model = {
+                "openai": "gpt-4o-mini",
+                "groq": "llama3-70b-8192",
+                "anthropic": "claude-3-haiku-20240307",
+                "google": "gemini-pro"
+            }.get(provider_name, "default")
+            cache_key, cached = await self._cached_response(
+                "score_suggestion",
+                json.dumps(stable_payload(document_analysis), ensure_ascii=False, sort_keys=True, default=str),
+                provider_name, model,
+                {"template_type": template_type, "template": template,
+                 "temperature": config["temperature"], "max_tokens": config["max_tokens"]}
+            )
+            if cached is not None:
+                return cached
+
             # 공급자별 점수 제안 실행
             if provider_name in ["openai", "groq"]:
                 response = await client.chat.completions.create(
-                    model="gpt-4o-mini" if provider_name == "openai" else "llama3-70b-8192",
+                    model=model,
                     messages=[{"role": "user", "content": prompt}],
                     temperature=config["temperature"],
                     max_tokens=min(config["max_tokens"], 2000)
@@ -640,7 +619,7 @@ class EnhancedAIService:
                 result_text = response.content[0].text
                 
             elif provider_name == "google":
-                response = client.generate_content(prompt)
+                response = await client.generate_content_async(prompt)
                 result_text = response.text
             
             try:
@@ -652,12 +631,46 @@ class EnhancedAIService:
             result["template_type"] = template_type
             result["suggested_at"] = datetime.utcnow().isoformat()
             
+            await self._store_response(cache_key, "score_suggestion", result, provider_name, model, prompt + result_text)
+            
             return result
             
         except Exception as e:
             logger.error(f"AI 점수 제안 오류 ({provider_name}): {e}")
             return self._fallback_score_suggestion(document_analysis, template)
     
+    def _analysis_model(self, provider_name: str, document_text: str, document_type: str, config: Dict) -> str:
+        """문서 분석에 사용할 모델 (_analyze_with_* 의 모델 선택과 동일, 응답 캐시 키에 포함)"""
+        if provider_name == "openai":
+            return "gpt-4o-mini"
+        elif provider_name == "anthropic":
+            return "claude-3-haiku-20240307"
+        elif provider_name == "google":
+            return "gemini-pro"
+        elif provider_name == "groq":
+            return self._select_optimal_groq_model(
+                token_counter.count(document_text), document_type, config.get("budget_priority", "balanced")
+            )
+        elif provider_name == "deepseek":
+            return self._select_deepseek_model(token_counter.count(document_text))
+        elif provider_name == "minimax":
+            return "minimax-text-01" if len(document_text) > 50000 else "minimax-m1-40k"
+        return self._select_provider_model(provider_name, token_counter.count(document_text))
+    
+    async def _cached_response(self, kind: str, text: str, provider_name: str, model: str, params: Dict) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """응답 캐시 키와 캐시된 결과 (없으면 None)"""
+        cache_key = make_cache_key(kind, text, PROMPT_VERSIONS[kind], provider_name, model, params)
+        return cache_key, await ai_response_cache.get(cache_key)
+    
+    async def _store_response(self, cache_key: str, kind: str, result: Dict[str, Any], provider_name: str, model: str, billed_text: str):
+        """LLM 응답을 캐시에 저장 (적중 시 절약액으로 집계할 원래 호출 비용 포함)"""
+        cost = self._calculate_token_cost(billed_text, model)
+        await ai_response_cache.set(
+            cache_key, result, kind, provider_name, model,
+            tokens=cost["estimated_tokens"],
+            cost_usd=cost["estimated_tokens"] / 1_000_000 * cost["cost_per_million_tokens"]
+        )
+    
     async def _save_analysis_job(self, job_type: str, input_data: Dict, result_data: Dict, provider_used: str):
         """분석 작업 기록 저장"""
         if not self.ai_jobs_collection:
@@ -793,18 +806,16 @@ class EnhancedAIService:
         }
     
     def _calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """두 텍스트 간의 유사도 계산"""
+        """두 텍스트 간의 유사도 계산 (유사도 인덱스와 같은 문자 n-gram 기준 Jaccard)"""
         try:
-            words1 = set(text1.lower().split())
-            words2 = set(text2.lower().split())
+            shingles1 = shingle_hashes(text1)
+            shingles2 = shingle_hashes(text2)
             
-            intersection = words1.intersection(words2)
-            union = words1.union(words2)
-            
-            if len(union) == 0:
+            union = np.union1d(shingles1, shingles2).size
+            if union == 0:
                 return 0.0
             
-            return len(intersection) / len(union)
+            return np.intersect1d(shingles1, shingles2, assume_unique=True).size / union
             
         except:
             return 0.0
@@ -874,11 +885,10 @@ class EnhancedAIService:
         
         return extracted
     
-    def _select_optimal_groq_model(self, document_length: int, analysis_type: str, budget_priority: str = "balanced") -> str:
-        """비용 효율성을 고려한 최적 Groq 모델 선택"""
+    def _select_optimal_groq_model(self, document_tokens: int, analysis_type: str, budget_priority: str = "balanced") -> str:
+        """비용 효율성을 고려한 최적 Groq 모델 선택 (document_tokens 는 token_counter 로 센 문서 토큰 수)"""
         
-        # 토큰 수 추정 (문자 수 / 4)
-        estimated_tokens = document_length // 4
+        estimated_tokens = document_tokens
         
         # 초장문 문서 처리 (50K+ 토큰) - MiniMax 권장하지만 Groq에서는 최대 컨텍스트 모델 사용
         if estimated_tokens > 50000:
@@ -909,9 +919,9 @@ class EnhancedAIService:
             else:
                 return "mixtral-8x7b-32768"  # 긴 문서 처리
     
-    def _select_deepseek_model(self, document_length: int) -> str:
-        """DeepSeek 최적 모델 선택"""
-        estimated_tokens = document_length // 4
+    def _select_deepseek_model(self, document_tokens: int) -> str:
+        """DeepSeek 최적 모델 선택 (document_tokens 는 token_counter 로 센 문서 토큰 수)"""
+        estimated_tokens = document_tokens
         
         if estimated_tokens > 100000:
             return "deepseek-chat"  # 긴 컨텍스트
@@ -920,9 +930,9 @@ class EnhancedAIService:
         else:
             return "deepseek-chat"  # 기본 모델
     
-    def _select_provider_model(self, provider_name: str, document_length: int) -> str:
-        """공급자별 최적 모델 선택"""
-        estimated_tokens = document_length // 4
+    def _select_provider_model(self, provider_name: str, document_tokens: int) -> str:
+        """공급자별 최적 모델 선택 (document_tokens 는 token_counter 로 센 문서 토큰 수)"""
+        estimated_tokens = document_tokens
         
         models = {
             "together": {
@@ -962,8 +972,8 @@ class EnhancedAIService:
     def _calculate_token_cost(self, text: str, model: str) -> Dict[str, float]:
         """모델별 토큰 비용 계산"""
         
-        # 토큰 수 추정 (문자 수 / 4)
-        estimated_tokens = len(text) // 4
+        # 모델 계열별 토크나이저로 토큰 수 계산 (문서 분석 청크 분할과 같은 계산기)
+        estimated_tokens = token_counter.count(text, model)
         tokens_in_millions = estimated_tokens / 1_000_000
         
         # 모델별 비용 정보 (blended 가격 기준, $/1M 토큰)
@@ -1041,6 +1051,7 @@ class EnhancedAIService:
     def get_cost_optimization_stats(self) -> Dict[str, Any]:
         """비용 최적화 통계 반환"""
         return {
+            "response_cache": ai_response_cache.get_stats(),
             "available_models": {
                 "groq": [
                     {
@@ -1107,9 +1118,21 @@ class EnhancedAIService:
 JSON 형태로 응답해주세요.
 """
 
+            model = {
+                "openai": "gpt-4o-mini",
+                "groq": "llama3-8b-8192",
+                "anthropic": "claude-3-haiku-20240307",
+                "google": "gemini-pro"
+            }.get(provider_name, "default")
+            cache_key, cached = await self._cached_response(
+                "key_information", document_text[:2000], provider_name, model, {"temperature": 0.1, "max_tokens": 800}
+            )
+            if cached is not None:
+                return cached
+
             if provider_name in ["openai", "groq"]:
                 response = await client.chat.completions.create(
-                    model="gpt-4o-mini" if provider_name == "openai" else "llama3-8b-8192",
+                    model=model,
                     messages=[{"role": "user", "content": prompt}],
                     temperature=0.1,
                     max_tokens=800
@@ -1126,13 +1149,16 @@ JSON 형태로 응답해주세요.
                 result_text = response.content[0].text
                 
             elif provider_name == "google":
-                response = client.generate_content(prompt)
+                response = await client.generate_content_async(prompt)
                 result_text = response.text
             
             try:
-                return json.loads(result_text)
+                result = json.loads(result_text)
             except:
-                return {"ai_extraction": result_text}
+                result = {"ai_extraction": result_text}
+            
+            await self._store_response(cache_key, "key_information", result, provider_name, model, prompt + result_text)
+            return result
                 
         except Exception as e:
             logger.error(f"AI 정보 추출 오류: {e}")
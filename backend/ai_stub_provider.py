@@ -0,0 +1,120 @@
+"""
+AI Stub Provider
+OpenAI 호환(/v1/chat/completions)과 Anthropic(/v1/messages) 응답 형식을 흉내내는 로컬 스텁 서버
+
+실제 API 키 없이 AI 호출 경로(연결 풀, 동시 호출, 스트리밍)를 테스트/부하 측정할 때 사용합니다.
+
+    AI_STUB_LATENCY_SECONDS=0.5 python ai_stub_provider.py --port 8099
+    AI_PROVIDER_BASE_URL_NOVITA=http://127.0.0.1:8099/v1 NOVITA_API_KEY=stub ...
+    AI_PROVIDER_BASE_URL_ANTHROPIC=http://127.0.0.1:8099 ANTHROPIC_API_KEY=stub ...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            parts.extend(block.get("text", "") for block in content if isinstance(block, dict))
+        elif content:
+            parts.append(str(content))
+    return " ".join(parts)
+
+
+def create_stub_app(latency: Optional[float] = None) -> FastAPI:
+    """스텁 앱 생성 - latency 초만큼 비동기로 대기한 뒤 응답 (app.state.latency 로 변경 가능)"""
+    app = FastAPI(title="AI Stub Provider")
+    app.state.latency = float(os.getenv("AI_STUB_LATENCY_SECONDS", "0")) if latency is None else latency
+    app.state.requests = 0
+    app.state.client_ports = set()
+
+    async def _simulate(request: Request) -> Dict[str, Any]:
+        app.state.requests += 1
+        if request.client:
+            # 연결 재사용 확인용 - keep-alive 가 동작하면 포트 수가 최대 연결 수 이하로 유지
+            app.state.client_ports.add(request.client.port)
+        if app.state.latency:
+            await asyncio.sleep(app.state.latency)
+        return await request.json()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "requests": app.state.requests}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await _simulate(request)
+        model = body.get("model", "stub-model")
+        content = f"[Stub] {model} response to: {_prompt_text(body.get('messages', []))[:50]}"
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            async def events():
+                for word in content.split(" "):
+                    chunk = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                        "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        prompt_tokens = len(_prompt_text(body.get("messages", [])).split())
+        completion_tokens = len(content.split())
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await _simulate(request)
+        model = body.get("model", "stub-model")
+        content = f"[Stub] {model} response to: {_prompt_text(body.get('messages', []))[:50]}"
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:12]}",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": content}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": len(_prompt_text(body.get("messages", [])).split()),
+                "output_tokens": len(content.split()),
+            },
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="AI provider stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=None, help="응답 지연 (초)")
+    args = parser.parse_args()
+    uvicorn.run(create_stub_app(args.latency), host=args.host, port=args.port)
@@ -0,0 +1,175 @@
+"""
+Assignment Engine
+평가위원 × 기업 배정을 집합 연산과 일괄 삽입으로 처리하는 배정 엔진
+
+- 대상 기업을 $in 조회 한 번으로 불러와 project_id 를 확인
+- 이미 존재하는 (evaluator_id, company_id, template_id) 조합을 조회 한 번으로 가져와 메모리에서 차집합 계산
+- 누락된 평가지만 순서 없는(unordered) insert_many 한 번으로 저장
+- 고유 복합 인덱스가 동시 요청에 의한 중복 생성을 막고, 중복 키 오류는 '이미 존재'로 집계 (멱등성)
+"""
+
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import BulkWriteError
+
+from dashboard_counters import dashboard_counters
+from models import AssignmentCreate, EvaluationSheet
+from project_analytics import project_stats_service
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+ASSIGNMENT_STATUS = "draft"
+
+AssignmentKey = Tuple[str, str, str]
+
+
+async def ensure_assignment_indexes(db) -> bool:
+    """배정 멱등성을 위한 고유 복합 인덱스 생성
+
+    template_id 가 없는 과거 평가지는 중복이 있을 수 있어 인덱스 대상에서 제외합니다.
+    결과는 assignment_engine.index_ready/index_error 에 기록되어 /health 에 노출됩니다.
+    """
+    try:
+        await db.evaluation_sheets.create_indexes([
+            IndexModel(
+                [("evaluator_id", ASCENDING), ("company_id", ASCENDING), ("template_id", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"template_id": {"$type": "string"}},
+                name="uniq_evaluator_company_template",
+            )
+        ])
+    except Exception as e:
+        # 인덱스 없이는 동시 배정 요청이 같은 평가지를 중복 생성할 수 있음
+        logger.error(f"Failed to create assignment unique index for evaluation_sheets; "
+                     f"concurrent assignments may create duplicate sheets: {e}")
+        assignment_engine.index_ready, assignment_engine.index_error = False, str(e)
+        return False
+    assignment_engine.index_ready, assignment_engine.index_error = True, None
+    return True
+
+
+class AssignmentEngine:
+    """평가 배정 일괄 생성 엔진"""
+
+    def __init__(self, db=None):
+        self.db = db
+        self.index_ready = False
+        self.index_error: Optional[str] = None
+
+    async def _load_companies(self, company_ids: Iterable[str]) -> Dict[str, str]:
+        """company_id -> project_id"""
+        cursor = self.db.companies.find({"id": {"$in": list(company_ids)}}, {"_id": 0, "id": 1, "project_id": 1})
+        return {doc["id"]: doc.get("project_id") async for doc in cursor}
+
+    async def _load_existing(
+        self, evaluator_ids: Set[str], company_ids: Set[str], template_ids: Set[str]
+    ) -> Set[AssignmentKey]:
+        """요청 범위의 기존 배정 조합 (조회 한 번, 필요한 필드만)"""
+        cursor = self.db.evaluation_sheets.find(
+            {
+                "evaluator_id": {"$in": list(evaluator_ids)},
+                "company_id": {"$in": list(company_ids)},
+                "template_id": {"$in": list(template_ids)},
+            },
+            {"_id": 0, "evaluator_id": 1, "company_id": 1, "template_id": 1},
+        )
+        return {(doc["evaluator_id"], doc["company_id"], doc["template_id"]) async for doc in cursor}
+
+    async def assign(self, assignments: List[AssignmentCreate]) -> Dict[str, Any]:
+        """배정 요청 목록을 처리하고 생성/건너뜀 요약을 반환
+
+        새 평가지 수는 대시보드 카운터와 프로젝트 통계의 기업별 assigned 에 증분 반영합니다.
+        반환값의 project_ids 는 새 평가지가 생긴 프로젝트 목록입니다.
+        """
+        evaluator_ids = {e for a in assignments for e in a.evaluator_ids}
+        company_ids = {c for a in assignments for c in a.company_ids}
+        template_ids = {a.template_id for a in assignments}
+        requested = sum(len(a.evaluator_ids) * len(a.company_ids) for a in assignments)
+
+        summary: Dict[str, Any] = {
+            "requested": requested,
+            "created": 0,
+            "skipped_existing": 0,
+            "skipped_duplicate": 0,
+            "skipped_missing_company": 0,
+            "failed": 0,
+            "missing_company_ids": [],
+            "project_ids": [],
+        }
+        if not requested:
+            return summary
+
+        companies = await self._load_companies(company_ids)
+        existing = await self._load_existing(evaluator_ids, company_ids, template_ids)
+
+        missing_companies = company_ids - companies.keys()
+        summary["missing_company_ids"] = sorted(missing_companies)
+
+        documents: List[Dict[str, Any]] = []
+        planned: Set[AssignmentKey] = set()
+        for assignment in assignments:
+            for evaluator_id in assignment.evaluator_ids:
+                for company_id in assignment.company_ids:
+                    if company_id in missing_companies:
+                        summary["skipped_missing_company"] += 1
+                        continue
+                    key = (evaluator_id, company_id, assignment.template_id)
+                    if key in existing:
+                        summary["skipped_existing"] += 1
+                        continue
+                    if key in planned:
+                        summary["skipped_duplicate"] += 1
+                        continue
+                    planned.add(key)
+                    sheet = EvaluationSheet(
+                        evaluator_id=evaluator_id,
+                        company_id=company_id,
+                        project_id=companies[company_id],
+                        template_id=assignment.template_id,
+                        status=ASSIGNMENT_STATUS,
+                        deadline=assignment.deadline,
+                    )
+                    documents.append(sheet.model_dump())
+
+        if not documents:
+            return summary
+
+        failed_indexes: Set[int] = set()
+        try:
+            await self.db.evaluation_sheets.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                failed_indexes.add(write_error["index"])
+                if write_error.get("code") == DUPLICATE_KEY_ERROR:
+                    # 동시에 들어온 같은 배정 요청이 먼저 저장된 경우
+                    summary["skipped_existing"] += 1
+                else:
+                    summary["failed"] += 1
+                    logger.error(f"Assignment insert failed: {write_error.get('errmsg')}", extra={
+                        'custom_operation': 'assignment_engine',
+                        'custom_evaluator_id': documents[write_error["index"]]["evaluator_id"],
+                        'custom_company_id': documents[write_error["index"]]["company_id"],
+                    })
+
+        created = [doc for index, doc in enumerate(documents) if index not in failed_indexes]
+        created_per_project: Counter = Counter(doc["project_id"] for doc in created)
+        summary["created"] = sum(created_per_project.values())
+        summary["project_ids"] = sorted(p for p in created_per_project if p)
+
+        created_per_company: Dict[str, Counter] = {}
+        for doc in created:
+            created_per_company.setdefault(doc["project_id"], Counter())[doc["company_id"]] += 1
+
+        for project_id, count in created_per_project.items():
+            await dashboard_counters.sheets_created(project_id, ASSIGNMENT_STATUS, count)
+            await project_stats_service.sheets_assigned(project_id, created_per_company[project_id])
+
+        return summary
+
+
+# Global assignment engine instance (db is attached at server startup)
+assignment_engine = AssignmentEngine()
@@ -3,28 +3,123 @@
 """
 Redis Cache Service
 High-performance caching layer for the Online Evaluation System
+
+Two cache levels:
+- L1: bounded in-process LRU with TTL (no network round-trip, no JSON decode on hit)
+- L2: Redis, shared by all workers
+
+Invalidation is tag based (Redis sets of member keys) instead of KEYS pattern
+scans, and every write/invalidation is published on a Redis channel so other
+workers evict their L1 copies. get_or_set() adds single-flight recompute and
+stale-while-revalidate to protect the loaders against cache stampedes.
 """
 
 import redis.asyncio as redis
+import asyncio
+import fnmatch
 import json
 import os
-from typing import Any, Optional, Union
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 import logging
-from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
+INVALIDATION_CHANNEL = "cache:invalidate"
+TAG_KEY_PREFIX = "cache:tag:"
+
+
+@dataclass
+class CacheMetrics:
+    """Cache hit/miss counters"""
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    loads: int = 0
+
+    @property
+    def total_requests(self) -> int:
+        return self.l1_hits + self.l2_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.total_requests
+        return ((self.l1_hits + self.l2_hits) / total * 100) if total else 0.0
+
+
+class LRUCache:
+    """Size-bounded in-process LRU cache
+
+    Entries are stored as (value, fresh_until, expires_at). A value past
+    fresh_until is stale but may still be served by stale-while-revalidate
+    until expires_at, after which it is dropped.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float, float]]" = OrderedDict()
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, fresh_until, expires_at = entry
+        if (now or time.time()) >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value, fresh_until
+
+    def set(self, key: str, value: Any, fresh_until: float, expires_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (value, fresh_until, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def pop_matching(self, pattern: str) -> None:
+        for key in [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+
 class CacheService:
-    """Redis-based caching service for improved performance"""
-    
-    def __init__(self, redis_url: str = None):
-        """Initialize Redis connection"""
+    """Two-tier (in-process LRU + Redis) caching service for improved performance"""
+
+    def __init__(self, redis_url: str = None, l1_max_entries: int = None, l1_ttl: int = None):
+        """Initialize cache levels (Redis connection is opened by connect())"""
         self.redis_url = redis_url or os.getenv('REDIS_URL', 'redis://localhost:6379')
         self.redis_client = None
         self.default_ttl = 300  # 5 minutes default TTL
-        
+        # L1 entries live at most l1_ttl seconds so a missed pub/sub message only causes bounded staleness
+        self.l1_ttl = l1_ttl if l1_ttl is not None else int(os.getenv('CACHE_L1_TTL', '30'))
+        self.l1 = LRUCache(l1_max_entries if l1_max_entries is not None else int(os.getenv('CACHE_L1_MAX_ENTRIES', '1000')))
+        self.tag_ttl = 86400  # tag sets outlive their member keys; dead members are harmless
+        self.instance_id = uuid.uuid4().hex
+        self.metrics = CacheMetrics()
+        self._inflight: Dict[str, "asyncio.Task"] = {}
+        self._listener_task: Optional["asyncio.Task"] = None
+        # topic -> handler for messages other workers publish (e.g. permission cache invalidation)
+        self._message_handlers: Dict[str, Callable[[Optional[Dict[str, Any]]], None]] = {}
+
     async def connect(self):
-        """Establish Redis connection"""
+        """Establish Redis connection and subscribe to L1 invalidation messages"""
         try:
             self.redis_client = redis.from_url(
                 self.redis_url,
@@ -34,16 +129,20 @@ class CacheService:
             )
             # Test connection
             await self.redis_client.ping()
+            self._listener_task = asyncio.create_task(self._listen_invalidations())
             logger.info("✅ Redis cache service connected successfully")
         except Exception as e:
-            logger.warning(f"⚠️ Redis not available, falling back to no-cache mode: {e}")
+            logger.warning(f"⚠️ Redis not available, falling back to in-process cache only: {e}")
             self.redis_client = None
-    
+
     async def disconnect(self):
         """Close Redis connection"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
         if self.redis_client:
             await self.redis_client.close()
-    
+
     async def ping(self) -> bool:
         """Test Redis connection"""
         if not self.redis_client:
@@ -54,111 +153,348 @@ class CacheService:
         except Exception as e:
             logger.error(f"Redis ping error: {e}")
             return False
-    
-    async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+
+    # ------------------------------------------------------------------
+    # Internal read/write helpers
+    # ------------------------------------------------------------------
+
+    async def _read(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, fresh_until) from L1, then L2, or None"""
+        now = time.time()
+        entry = self.l1.get(key, now)
+        if entry is not None:
+            self.metrics.l1_hits += 1
+            return entry
+
+        if self.redis_client:
+            try:
+                raw = await self.redis_client.get(key)
+            except Exception as e:
+                logger.error(f"Cache get error for key {key}: {e}")
+                raw = None
+            if raw:
+                data = json.loads(raw)
+                if isinstance(data, dict) and "__v" in data:
+                    value, fresh_until, stale_until = data["__v"], data["f"], data["s"]
+                else:
+                    # Values written before the envelope format are treated as fresh
+                    value, fresh_until, stale_until = data, now + self.l1_ttl, now + self.l1_ttl
+                self.l1.set(key, value, fresh_until, min(stale_until, now + self.l1_ttl))
+                self.metrics.l2_hits += 1
+                return value, fresh_until
+
+        self.metrics.misses += 1
+        return None
+
+    async def _publish(self, keys: Iterable[str] = (), patterns: Iterable[str] = ()) -> None:
+        """Tell other workers to drop their L1 copies"""
         if not self.redis_client:
-            return None
-            
+            return
+        message = {"origin": self.instance_id, "keys": list(keys), "patterns": list(patterns)}
+        if not message["keys"] and not message["patterns"]:
+            return
         try:
-            value = await self.redis_client.get(key)
-            if value:
-                return json.loads(value)
-            return None
+            await self.redis_client.publish(INVALIDATION_CHANNEL, json.dumps(message))
         except Exception as e:
-            logger.error(f"Cache get error for key {key}: {e}")
-            return None
-    
-    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
-        """Set value in cache with TTL"""
+            logger.error(f"Cache invalidation publish error: {e}")
+
+    def add_message_handler(self, topic: str, handler: Callable[[Optional[Dict[str, Any]]], None]) -> None:
+        """Run handler for messages other workers publish on topic
+
+        handler(None) is called when messages may have been missed (listener reconnect),
+        so the owner should drop everything it caches.
+        """
+        self._message_handlers[topic] = handler
+
+    async def publish_message(self, topic: str, data: Dict[str, Any]) -> None:
+        """Send a message to the handlers other workers registered for topic"""
         if not self.redis_client:
+            return
+        try:
+            await self.redis_client.publish(
+                INVALIDATION_CHANNEL, json.dumps({"origin": self.instance_id, "topic": topic, "data": data})
+            )
+        except Exception as e:
+            logger.error(f"Cache message publish error ({topic}): {e}")
+
+    def _notify_handlers(self, topic: Optional[str], data: Optional[Dict[str, Any]]) -> None:
+        handlers = self._message_handlers.items() if topic is None else [(topic, self._message_handlers.get(topic))]
+        for name, handler in handlers:
+            if handler is None:
+                continue
+            try:
+                handler(data)
+            except Exception as e:
+                logger.error(f"Cache message handler error ({name}): {e}")
+
+    async def _listen_invalidations(self) -> None:
+        """Evict L1 entries invalidated by other workers (reconnects on failure)"""
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Messages may have been missed while disconnected
+                logger.warning(f"Cache invalidation listener error: {e}")
+                self.l1.clear()
+                self._notify_handlers(None, None)
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    def _apply_invalidation(self, data: Any) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.instance_id:
+            return
+        if "topic" in message:
+            self._notify_handlers(message["topic"], message.get("data"))
+            return
+        for key in message.get("keys", []):
+            self.l1.pop(key)
+        for pattern in message.get("patterns", []):
+            self.l1.pop_matching(pattern)
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"{TAG_KEY_PREFIX}{tag}"
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a fresh value from cache (L1, then Redis)"""
+        entry = await self._read(key)
+        if entry is None:
+            return None
+        value, fresh_until = entry
+        return value if time.time() < fresh_until else None
+
+    async def set(self, key: str, value: Any, ttl: int = None, tags: Optional[List[str]] = None,
+                  stale_ttl: int = 0) -> bool:
+        """Set value in cache with TTL
+
+        tags register the key for invalidate_tags(); stale_ttl keeps the value
+        around for stale-while-revalidate after it stops being fresh.
+        """
+        ttl = ttl or self.default_ttl
+        now = time.time()
+        fresh_until = now + ttl
+        stale_until = fresh_until + stale_ttl
+
+        try:
+            payload = json.dumps(value, default=str)
+        except Exception as e:
+            logger.error(f"Cache set error for key {key}: {e}")
             return False
-            
+
+        # L1 keeps the JSON-normalized value so L1 and L2 hits return the same shape
+        self.l1.set(key, json.loads(payload), fresh_until, min(stale_until, now + self.l1_ttl))
+
+        if not self.redis_client:
+            return True
+
         try:
-            ttl = ttl or self.default_ttl
-            serialized_value = json.dumps(value, default=str)
-            await self.redis_client.setex(key, ttl, serialized_value)
+            envelope = f'{{"__v":{payload},"f":{fresh_until},"s":{stale_until}}}'
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(key, ttl + stale_ttl, envelope)
+                for tag in tags or ():
+                    pipe.sadd(self._tag_key(tag), key)
+                    pipe.expire(self._tag_key(tag), max(self.tag_ttl, ttl + stale_ttl))
+                await pipe.execute()
+            await self._publish(keys=[key])
             return True
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
-    
+
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
+        self.l1.pop(key)
         if not self.redis_client:
-            return False
-            
+            return True
+
         try:
             await self.redis_client.delete(key)
+            await self._publish(keys=[key])
             return True
         except Exception as e:
             logger.error(f"Cache delete error for key {key}: {e}")
             return False
-    
-    async def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern"""
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every key registered under the given tags"""
         if not self.redis_client:
+            # Tag membership lives in Redis; without it, fall back to clearing L1
+            self.l1.clear()
             return 0
-            
+
         try:
-            keys = await self.redis_client.keys(pattern)
-            if keys:
-                return await self.redis_client.delete(*keys)
+            tag_keys = [self._tag_key(tag) for tag in tags]
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+            keys = sorted(set().union(*members))
+
+            for key in keys:
+                self.l1.pop(key)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                if keys:
+                    pipe.delete(*keys)
+                pipe.delete(*tag_keys)
+                results = await pipe.execute()
+            await self._publish(keys=keys)
+            return results[0] if keys else 0
+        except Exception as e:
+            logger.error(f"Cache tag invalidation error for {tags}: {e}")
+            return 0
+
+    async def delete_pattern(self, pattern: str) -> int:
+        """Delete all keys matching pattern (incremental SCAN, never KEYS)"""
+        self.l1.pop_matching(pattern)
+        if not self.redis_client:
             return 0
+
+        try:
+            deleted = 0
+            batch = []
+            async for key in self.redis_client.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += await self.redis_client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis_client.delete(*batch)
+            await self._publish(patterns=[pattern])
+            return deleted
         except Exception as e:
             logger.error(f"Cache delete pattern error for {pattern}: {e}")
             return 0
-    
+
+    async def get_or_set(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: int = None,
+                         tags: Optional[List[str]] = None, stale_ttl: int = 0) -> Any:
+        """Return the cached value or compute it with loader()
+
+        Concurrent misses for the same key share one loader call (single-flight).
+        A stale value within stale_ttl is returned immediately while a single
+        background refresh recomputes it (stale-while-revalidate).
+        """
+        entry = await self._read(key)
+        if entry is not None:
+            value, fresh_until = entry
+            if time.time() < fresh_until:
+                return value
+            self.metrics.stale_hits += 1
+            self._start_load(key, loader, ttl, tags, stale_ttl)
+            return value
+
+        return await asyncio.shield(self._start_load(key, loader, ttl, tags, stale_ttl))
+
+    def _start_load(self, key, loader, ttl, tags, stale_ttl) -> "asyncio.Task":
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader, ttl, tags, stale_ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_load(key, t))
+        return task
+
+    def _finish_load(self, key: str, task: "asyncio.Task") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Cache loader error for key {key}: {task.exception()}")
+
+    async def _load(self, key, loader, ttl, tags, stale_ttl) -> Any:
+        self.metrics.loads += 1
+        value = await loader()
+        if value is not None:
+            await self.set(key, value, ttl, tags=tags, stale_ttl=stale_ttl)
+        return value
+
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
+        if key in self.l1:
+            return True
         if not self.redis_client:
             return False
-            
+
         try:
             return await self.redis_client.exists(key)
         except Exception as e:
             logger.error(f"Cache exists error for key {key}: {e}")
             return False
-    
+
     async def increment(self, key: str, amount: int = 1) -> int:
         """Increment counter"""
         if not self.redis_client:
             return 0
-            
+
         try:
             return await self.redis_client.incr(key, amount)
         except Exception as e:
             logger.error(f"Cache increment error for key {key}: {e}")
             return 0
-    
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Cache hit/miss metrics for this worker"""
+        return {
+            "l1_hits": self.metrics.l1_hits,
+            "l2_hits": self.metrics.l2_hits,
+            "misses": self.metrics.misses,
+            "stale_hits": self.metrics.stale_hits,
+            "loads": self.metrics.loads,
+            "hit_rate": round(self.metrics.hit_rate, 1),
+            "l1_size": len(self.l1),
+            "inflight_loads": len(self._inflight),
+        }
+
+    @staticmethod
+    def user_tag(user_id: str) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def project_tag(project_id: str) -> str:
+        return f"project:{project_id}"
+
     async def get_user_cache_key(self, user_id: str, suffix: str = "") -> str:
         """Generate user-specific cache key"""
         return f"user:{user_id}:{suffix}" if suffix else f"user:{user_id}"
-    
+
     async def get_project_cache_key(self, project_id: str, suffix: str = "") -> str:
         """Generate project-specific cache key"""
         return f"project:{project_id}:{suffix}" if suffix else f"project:{project_id}"
-    
+
     async def cache_user_data(self, user_id: str, user_data: dict, ttl: int = 600) -> bool:
         """Cache user data for 10 minutes"""
         key = await self.get_user_cache_key(user_id, "profile")
-        return await self.set(key, user_data, ttl)
-    
+        return await self.set(key, user_data, ttl, tags=[self.user_tag(user_id)])
+
     async def get_cached_user_data(self, user_id: str) -> Optional[dict]:
         """Get cached user data"""
         key = await self.get_user_cache_key(user_id, "profile")
         return await self.get(key)
-    
+
     async def invalidate_user_cache(self, user_id: str) -> int:
         """Invalidate all user-related cache"""
-        pattern = f"user:{user_id}:*"
-        return await self.delete_pattern(pattern)
-    
+        return await self.invalidate_tags(self.user_tag(user_id))
+
     async def cache_dashboard_data(self, user_id: str, dashboard_data: dict, ttl: int = 300) -> bool:
         """Cache dashboard data for 5 minutes"""
         key = await self.get_user_cache_key(user_id, "dashboard")
-        return await self.set(key, dashboard_data, ttl)
-    
+        return await self.set(key, dashboard_data, ttl, tags=[self.user_tag(user_id)])
+
     async def get_cached_dashboard_data(self, user_id: str) -> Optional[dict]:
         """Get cached dashboard data"""
         key = await self.get_user_cache_key(user_id, "dashboard")
@@ -0,0 +1,206 @@
+"""
+Content-Addressed Store
+ZIP 캐시와 내보내기 문서 저장소가 함께 쓰는 콘텐츠 주소 디스크 저장소
+
+- 내용은 SHA-256 경로(objects/ab/<sha256><suffix>)에 한 번만 저장하고 요청 키는 refs/<키> 로 가리킴
+- 역참조 색인 owners/<sha256>/<키> - 참조를 지울 때 refs/ 전체를 읽지 않고 남은 참조가 있는지 확인
+- 임시 파일에 기록한 뒤 완료 시 이동 (중단된 기록은 저장소에 남지 않음)
+- 전체 크기가 max_bytes 를 넘으면 오래 사용하지 않은 내용부터 삭제
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class StoredObject:
+    """저장소에 저장된 내용"""
+    sha256: str
+    path: Path
+    size: int
+
+    def link_to(self, path: Path) -> Path:
+        """캐시 정리(invalidate/LRU)와 관계없이 남아야 하는 경로(작업 결과 등)로 연결 - 하드 링크, 안 되면 복사"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        try:
+            os.link(self.path, tmp_path)
+        except FileNotFoundError:
+            # 그 사이 캐시에서 삭제됨 - 작업이 재시도되면 다시 생성
+            raise
+        except OSError:
+            # 다른 파일 시스템 등 하드 링크를 지원하지 않는 경우
+            shutil.copyfile(self.path, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+
+class ContentWriter:
+    """기록 중인 내용을 임시 파일에 쓰고 완료 시 콘텐츠 주소 경로로 이동"""
+
+    def __init__(self, store: "ContentAddressedStore", key: str):
+        self.store = store
+        self.key = key
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._tmp_path = store.cache_dir / "tmp" / f"{uuid.uuid4().hex}.part"
+        # 첫 기록 시 생성 - 캐시 적중/응답 전에 버려지는 작성기는 파일 핸들을 만들지 않음
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            self._tmp_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self._tmp_path, "wb")
+        return self._file
+
+    def _close(self) -> None:
+        self._open().close()
+
+    def write(self, data: bytes) -> None:
+        self._hash.update(data)
+        self._size += len(data)
+        self._open().write(data)
+
+    def commit(self) -> StoredObject:
+        self._close()
+        return self.store._commit(self.key, self._tmp_path, self._hash.hexdigest(), self._size)
+
+    def save_as(self, path: Path) -> Path:
+        """저장소에 저장하지 않고 지정한 경로로 이동 (일부 항목이 실패한 아카이브 등)"""
+        self._close()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._tmp_path, path)
+        return path
+
+    def abort(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        try:
+            self._tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ContentAddressedStore:
+    """콘텐츠 주소 저장소 (objects/ab/<sha256><suffix>, refs/<요청 키>, owners/<sha256>/<요청 키>)"""
+
+    suffix = ".bin"
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def request_key(parts: Dict[str, Any]) -> str:
+        """요청 입력(대상 문서와 버전, 형식, 옵션)의 SHA-256 - 입력이 같으면 같은 키"""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.cache_dir / "objects" / sha256[:2] / f"{sha256}{self.suffix}"
+
+    def _ref_path(self, key: str) -> Path:
+        return self.cache_dir / "refs" / key
+
+    def _owners_dir(self, sha256: str) -> Path:
+        return self.cache_dir / "owners" / sha256
+
+    def _read_ref(self, key: str) -> Optional[str]:
+        try:
+            return self._ref_path(key).read_text().strip()
+        except FileNotFoundError:
+            return None
+
+    def lookup(self, key: str) -> Optional[StoredObject]:
+        """요청 키에 해당하는 내용 (없거나 삭제되었으면 None)"""
+        try:
+            sha256 = self._ref_path(key).read_text().strip()
+            path = self._object_path(sha256)
+            size = path.stat().st_size
+            # 최근 사용 시각 갱신 (정리 시 오래 사용하지 않은 내용부터 삭제)
+            os.utime(path)
+        except FileNotFoundError:
+            # 참조만 남고 내용은 정리됨 (stat 과 utime 사이에 삭제된 경우 포함)
+            return None
+        return StoredObject(sha256, path, size)
+
+    def open_writer(self, key: str) -> ContentWriter:
+        return ContentWriter(self, key)
+
+    def _commit(self, key: str, tmp_path: Path, sha256: str, size: int) -> StoredObject:
+        path = self._object_path(sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            # 내용이 같은 파일이 이미 있음 - 참조만 추가
+            tmp_path.unlink()
+            os.utime(path)
+        else:
+            os.replace(tmp_path, path)
+        owner = self._owners_dir(sha256) / key
+        owner.parent.mkdir(parents=True, exist_ok=True)
+        owner.touch()
+        previous = self._read_ref(key)
+        ref_path = self._ref_path(key)
+        ref_path.parent.mkdir(parents=True, exist_ok=True)
+        ref_tmp = ref_path.with_name(f".{key}.{uuid.uuid4().hex}")
+        ref_tmp.write_text(sha256)
+        os.replace(ref_tmp, ref_path)
+        if previous is not None and previous != sha256:
+            # 같은 키가 다른 내용을 가리키게 됨 - 이전 내용의 역참조 제거
+            self._release_owner(previous, key)
+        self.prune(keep=path)
+        return StoredObject(sha256, path, size)
+
+    def _release_owner(self, sha256: str, key: str) -> bool:
+        """역참조 제거 - 남은 참조가 없으면 내용도 삭제하고 True 반환"""
+        owners_dir = self._owners_dir(sha256)
+        (owners_dir / key).unlink(missing_ok=True)
+        try:
+            owners_dir.rmdir()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            # 다른 키가 아직 같은 내용을 가리킴
+            return False
+        self._object_path(sha256).unlink(missing_ok=True)
+        return True
+
+    def release(self, key: str) -> bool:
+        """요청 키의 참조 삭제 (같은 내용을 가리키는 다른 키가 없으면 내용도 삭제), 참조가 있었으면 True"""
+        sha256 = self._read_ref(key)
+        if sha256 is None:
+            return False
+        try:
+            self._ref_path(key).unlink()
+        except FileNotFoundError:
+            # 다른 요청이 먼저 삭제함
+            return False
+        self._release_owner(sha256, key)
+        return True
+
+    def prune(self, keep: Optional[Path] = None) -> int:
+        """최대 크기를 넘으면 오래 사용하지 않은 내용부터 삭제 (keep 은 제외), 삭제한 개수 반환"""
+        objects = [(entry.stat(), entry) for entry in (self.cache_dir / "objects").glob(f"*/*{self.suffix}")]
+        total = sum(stat.st_size for stat, _ in objects)
+        removed = 0
+        for stat, entry in sorted(objects, key=lambda item: item[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                continue
+            total -= stat.st_size
+            removed += 1
+        # 삭제된 내용을 가리키는 참조는 lookup 에서 None 이 되며 다음 저장 시 덮어씀
+        return removed
@@ -0,0 +1,254 @@
+"""
+Dashboard Counters
+대시보드 통계용 증분 카운터 - 생성/제출/삭제 시 $inc 로 원자적으로 갱신하고,
+주기적인 전체 재집계(reconcile)로 누락된 변경을 보정합니다.
+
+대시보드 조회는 count_documents 스캔 대신 카운터 문서 1건 조회(O(1))로 처리됩니다.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_COLLECTION = "dashboard_counters"
+GLOBAL_COUNTER_ID = "global"
+RECONCILE_INTERVAL_SECONDS = int(os.getenv("COUNTERS_RECONCILE_INTERVAL_SECONDS", "900"))
+RECONCILE_LEASE_ID = "lease:reconcile"
+
+
+def _project_counter_id(project_id: str) -> str:
+    return f"project:{project_id}"
+
+
+def _status_key(status: Optional[str]) -> str:
+    return f"sheets_by_status.{status or 'unknown'}"
+
+
+class DashboardCounters:
+    """전역 및 프로젝트별 대시보드 카운터 관리"""
+
+    def __init__(self, db=None, owner_id: Optional[str] = None):
+        self.db = db
+        self.owner_id = owner_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    @property
+    def collection(self):
+        return self.db[COUNTERS_COLLECTION]
+
+    async def increment(self, changes: Dict[str, int], project_id: Optional[str] = None, session=None) -> None:
+        """전역 카운터(및 프로젝트 카운터)에 $inc 적용
+
+        카운터 갱신 실패가 요청 처리를 실패시키지 않도록 오류는 기록만 하며,
+        누락분은 다음 재집계에서 보정됩니다.
+        session 이 있으면 원본 변경과 같은 트랜잭션에서 적용하고 오류는 전달합니다 (함께 롤백/재시도 -
+        커밋과 증분 사이에 재집계가 실행되어 두 번 반영되는 일이 없음).
+        """
+        if self.db is None or not changes:
+            return
+
+        try:
+            now = datetime.utcnow()
+            await self.collection.update_one(
+                {"_id": GLOBAL_COUNTER_ID},
+                {"$inc": changes, "$set": {"updated_at": now}},
+                upsert=True,
+                session=session,
+            )
+
+            project_changes = {k: v for k, v in changes.items() if k.startswith("sheets")}
+            if project_id and project_changes:
+                await self.collection.update_one(
+                    {"_id": _project_counter_id(project_id)},
+                    {"$inc": project_changes, "$set": {"project_id": project_id, "updated_at": now}},
+                    upsert=True,
+                    session=session,
+                )
+        except Exception as e:
+            if session is not None:
+                raise
+            logger.error(f"Dashboard counter update failed: {e}")
+
+    async def project_created(self, is_active: bool = True) -> None:
+        changes = {"projects_total": 1}
+        if is_active:
+            changes["projects_active"] = 1
+        await self.increment(changes)
+
+    async def project_deleted(self, is_active: bool = True) -> None:
+        changes = {"projects_total": -1}
+        if is_active:
+            changes["projects_active"] = -1
+        await self.increment(changes)
+
+    async def project_active_changed(self, was_active: bool, is_active: bool) -> None:
+        if bool(was_active) != bool(is_active):
+            await self.increment({"projects_active": 1 if is_active else -1})
+
+    async def company_created(self) -> None:
+        await self.increment({"companies_total": 1})
+
+    async def company_deleted(self) -> None:
+        await self.increment({"companies_total": -1})
+
+    async def user_created(self, role: str, is_active: bool = True, count: int = 1) -> None:
+        if role != "evaluator" or not count:
+            return
+        changes = {"evaluators_total": count}
+        if is_active:
+            changes["evaluators_active"] = count
+        await self.increment(changes)
+
+    async def user_updated(self, old_role: str, old_active: bool, new_role: str, new_active: bool) -> None:
+        """역할 변경·비활성화·재활성화에 따른 평가위원 카운터 보정"""
+        was_evaluator, is_evaluator = old_role == "evaluator", new_role == "evaluator"
+        changes = {
+            "evaluators_total": int(is_evaluator) - int(was_evaluator),
+            "evaluators_active": int(is_evaluator and bool(new_active)) - int(was_evaluator and bool(old_active)),
+        }
+        await self.increment({k: v for k, v in changes.items() if v})
+
+    async def user_deactivated(self, role: str) -> None:
+        await self.user_updated(role, True, role, False)
+
+    async def user_deleted(self, role: str, is_active: bool = True) -> None:
+        await self.user_created(role, is_active, count=-1)
+
+    async def sheets_created(self, project_id: Optional[str], status: Optional[str], count: int = 1) -> None:
+        if count:
+            await self.increment({"sheets_total": count, _status_key(status): count}, project_id)
+
+    async def sheet_status_changed(self, project_id: Optional[str], old_status: Optional[str], new_status: Optional[str],
+                                   session=None) -> None:
+        if old_status != new_status:
+            await self.increment({_status_key(old_status): -1, _status_key(new_status): 1}, project_id, session)
+
+    async def sheet_deleted(self, project_id: Optional[str], status: Optional[str]) -> None:
+        await self.increment({"sheets_total": -1, _status_key(status): -1}, project_id)
+
+    async def get(self) -> Dict[str, Any]:
+        """전역 카운터 조회 (재집계 이력이 없으면 먼저 전체 재집계)"""
+        counters = await self.collection.find_one({"_id": GLOBAL_COUNTER_ID})
+        if not counters or "reconciled_at" not in counters:
+            counters = await self.reconcile()
+        return counters
+
+    async def get_project(self, project_id: str) -> Dict[str, Any]:
+        """프로젝트별 평가지 카운터 조회"""
+        counters = await self.collection.find_one({"_id": _project_counter_id(project_id)})
+        return counters or {"project_id": project_id, "sheets_total": 0, "sheets_by_status": {}}
+
+    async def reconcile(self) -> Dict[str, Any]:
+        """원본 컬렉션을 전체 재집계하여 카운터 문서를 교체
+
+        재집계 도중 발생한 $inc 는 덮어쓰일 수 있으나 다음 주기에 다시 보정됩니다.
+        """
+        (
+            projects_total, projects_active, companies_total,
+            evaluators_total, evaluators_active, status_rows,
+        ) = await asyncio.gather(
+            self.db.projects.count_documents({}),
+            self.db.projects.count_documents({"is_active": True}),
+            self.db.companies.count_documents({}),
+            self.db.users.count_documents({"role": "evaluator"}),
+            self.db.users.count_documents({"role": "evaluator", "is_active": True}),
+            self.db.evaluation_sheets.aggregate([
+                {"$group": {
+                    "_id": {"project_id": "$project_id", "status": "$status"},
+                    "count": {"$sum": 1},
+                }},
+            ]).to_list(None),
+        )
+
+        now = datetime.utcnow()
+        sheets_by_status: Dict[str, int] = {}
+        projects: Dict[str, Dict[str, Any]] = {}
+        for row in status_rows:
+            status = row["_id"].get("status") or "unknown"
+            project_id = row["_id"].get("project_id")
+            sheets_by_status[status] = sheets_by_status.get(status, 0) + row["count"]
+            if project_id:
+                project = projects.setdefault(project_id, {"sheets_total": 0, "sheets_by_status": {}})
+                project["sheets_total"] += row["count"]
+                project["sheets_by_status"][status] = project["sheets_by_status"].get(status, 0) + row["count"]
+
+        counters = {
+            "_id": GLOBAL_COUNTER_ID,
+            "projects_total": projects_total,
+            "projects_active": projects_active,
+            "companies_total": companies_total,
+            "evaluators_total": evaluators_total,
+            "evaluators_active": evaluators_active,
+            "sheets_total": sum(sheets_by_status.values()),
+            "sheets_by_status": sheets_by_status,
+            "updated_at": now,
+            "reconciled_at": now,
+        }
+        await self.collection.replace_one({"_id": GLOBAL_COUNTER_ID}, counters, upsert=True)
+
+        for project_id, project in projects.items():
+            await self.collection.replace_one(
+                {"_id": _project_counter_id(project_id)},
+                {"_id": _project_counter_id(project_id), "project_id": project_id,
+                 **project, "updated_at": now, "reconciled_at": now},
+                upsert=True,
+            )
+
+        # 평가지가 모두 삭제된 프로젝트의 카운터 정리
+        await self.collection.delete_many({
+            "project_id": {"$exists": True, "$nin": list(projects)},
+        })
+
+        logger.info(f"Dashboard counters reconciled ({len(projects)} projects)")
+        return counters
+
+    async def acquire_reconcile_lease(self, lease_seconds: float) -> bool:
+        """재집계 임대 획득 또는 연장 (여러 uvicorn 워커 중 한 곳만 재집계)
+
+        임대가 없거나 만료되었으면 가져오고, 다른 워커가 유효한 임대를 가지고 있으면 False.
+        """
+        now = datetime.utcnow()
+        try:
+            result = await self.collection.update_one(
+                {"_id": RECONCILE_LEASE_ID, "$or": [
+                    {"lease_owner": self.owner_id},
+                    {"lease_expires_at": {"$lt": now}},
+                ]},
+                {"$set": {"lease_owner": self.owner_id, "lease_expires_at": now + timedelta(seconds=lease_seconds)}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return bool(result.matched_count or result.upserted_id)
+
+    async def run_reconcile_loop(self, interval: int = RECONCILE_INTERVAL_SECONDS) -> None:
+        """주기적 전체 재집계 루프 (애플리케이션 수명 동안 백그라운드 실행)
+
+        모든 워커에서 실행되지만 재집계 임대를 가진 워커만 재집계합니다.
+        임대는 주기의 두 배 동안 유지되어, 임대를 가진 워커가 종료되면 다른 워커가 이어받습니다.
+        """
+        while True:
+            try:
+                if await self.acquire_reconcile_lease(interval * 2):
+                    await self.reconcile()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Dashboard counter reconcile failed: {e}")
+            await asyncio.sleep(interval)
+
+
+def sheet_status_count(counters: Dict[str, Any], status: str) -> int:
+    """카운터 문서에서 상태별 평가지 수 조회"""
+    return counters.get("sheets_by_status", {}).get(status, 0)
+
+
+# Global dashboard counters instance (db is attached at server startup)
+dashboard_counters = DashboardCounters()
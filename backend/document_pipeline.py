@@ -0,0 +1,347 @@
+"""
+Document Pipeline
+긴 문서의 AI 분석을 위한 토큰 계산, 구조 기반 청크 분할, 청크별 병렬 분석(map)과 결과 병합(reduce)
+
+- 토큰 수: 모델 계열별 tiktoken 인코딩(o200k_base / cl100k_base)으로 계산
+  tiktoken 이나 인코딩 파일을 쓸 수 없으면 문자 종류별 추정 (한글 1글자 ≈ 1토큰, 영문 4글자 ≈ 1토큰)
+  OpenAI 외 모델(Claude, Llama, Gemini 등)은 로컬 토크나이저가 없어 cl100k_base 로 근사
+- 컨텍스트 한도: AIModelConfig.context_window (등록되지 않은 모델은 계열별 기본값)
+- 청크 분할: FileProcessor 추출 텍스트의 페이지 구분(\\f)과 제목 줄(1. / 가. / Ⅰ. / 제1장 / □ / # 등) 기준
+- 비용 추정(/ai/cost-estimate)과 실제 분석이 같은 토큰 계산기를 사용
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ai_model_management import ai_model_service
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+PAGE_BREAK = "\f"
+AI_CHUNK_MAX_TOKENS = int(os.getenv("AI_CHUNK_MAX_TOKENS", "8000"))
+AI_CHUNK_MIN_TOKENS = int(os.getenv("AI_CHUNK_MIN_TOKENS", "256"))
+AI_CHUNK_CONCURRENCY = int(os.getenv("AI_CHUNK_CONCURRENCY", "4"))
+# 프롬프트/출력 외 여유분 (토큰 추정 오차 대비)
+CONTEXT_SAFETY_RATIO = 0.9
+
+# AIModelConfig 에 등록되지 않은 모델의 계열별 컨텍스트 한도 (앞부분 일치, 위에서부터 먼저 일치하는 항목 사용)
+# 더 구체적인 접두어를 일반 접두어보다 위에 둘 것 (예: llama-3.1-sonar 는 llama-3.1 보다 먼저)
+DEFAULT_CONTEXT_WINDOWS: List[Tuple[str, int]] = [
+    ("gpt-4o", 128000),
+    ("gpt-4.1", 1000000),
+    ("gpt-4-turbo", 128000),
+    ("gpt-4", 8192),
+    ("gpt-3.5-turbo-16k", 16385),
+    ("gpt-3.5", 16385),
+    ("claude", 200000),
+    ("gemini-1.5", 1000000),
+    ("gemini", 30720),
+    ("llama3.1", 128000),
+    ("llama-3.1-sonar", 127000),
+    ("llama-3.1", 128000),
+    ("llama3.3", 128000),
+    ("llama3", 8192),
+    ("mixtral", 32768),
+    ("qwen", 32768),
+    ("qwq", 32768),
+    ("gemma", 8192),
+    ("deepseek", 64000),
+    ("minimax-text-01", 1000000),
+    ("minimax-m1-40k", 40000),
+    ("command-r", 128000),
+    ("command", 4096),
+    ("mistral", 32768),
+]
+DEFAULT_CONTEXT_WINDOW = 8192
+
+_TOKEN_PIECES = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ\u4e00-\u9fff\u3040-\u30ff]|[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_HEADING = re.compile(
+    r"^(#{1,6}\s+\S.*"                      # 마크다운 / DOCX 제목 스타일
+    r"|제\s*\d+\s*[장절관]\s*.*"             # 제1장, 제2절
+    r"|[IVXⅠ-Ⅻ]+\.\s*\S.*"                  # Ⅰ. 사업 개요
+    r"|\d+(\.\d+)*[.)]\s*\S.*"               # 1. / 1.2) 세부 내용
+    r"|[가-하][.)]\s*\S.*"                   # 가. 추진 배경
+    r"|[□■◆◇○●▶]\s*\S.*"                    # □ 사업 목표
+    r"|\[[^\]]{1,40}\])$"                    # [별첨 1]
+)
+_HEADING_MAX_LENGTH = 60
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저가 없을 때의 추정 - 한글/한자/가나 1글자, 영문 단어 4글자, 숫자 3자리, 기호 1개당 1토큰"""
+    total = 0
+    for piece in _TOKEN_PIECES.findall(text or ""):
+        if piece[0].isascii() and piece[0].isalpha():
+            total += math.ceil(len(piece) / 4)
+        elif piece[0].isdigit():
+            total += math.ceil(len(piece) / 3)
+        else:
+            total += 1
+    return total
+
+
+class TokenCounter:
+    """모델 계열별 토큰 계산기 (인코딩은 처음 사용할 때 한 번만 로드)"""
+
+    def __init__(self, use_tiktoken: bool = HAS_TIKTOKEN):
+        self.use_tiktoken = use_tiktoken
+        self._encodings: Dict[str, Any] = {}
+
+    @staticmethod
+    def encoding_name(model: Optional[str]) -> str:
+        name = (model or "").lower().split("/")[-1]
+        if name.startswith(("gpt-4o", "gpt-4.1", "chatgpt-4o", "o1", "o3", "o4")):
+            return "o200k_base"
+        return "cl100k_base"
+
+    def _encoding(self, name: str):
+        if name not in self._encodings:
+            encoding = None
+            if self.use_tiktoken:
+                try:
+                    encoding = tiktoken.get_encoding(name)
+                except Exception as e:
+                    # 인코딩 파일을 내려받을 수 없는 환경 - 실패를 기억해 매번 재시도하지 않음
+                    logger.warning(f"tiktoken encoding {name} unavailable, using estimated token counts: {e}")
+            self._encodings[name] = encoding
+        return self._encodings[name]
+
+    def count(self, text: str, model: Optional[str] = None) -> int:
+        if not text:
+            return 0
+        encoding = self._encoding(self.encoding_name(model))
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return estimate_tokens(text)
+
+    def truncate(self, text: str, max_tokens: int, model: Optional[str] = None) -> Tuple[str, str]:
+        """앞쪽 max_tokens 토큰 분량과 나머지로 분리"""
+        encoding = self._encoding(self.encoding_name(model))
+        if encoding is not None:
+            tokens = encoding.encode(text, disallowed_special=())
+            return encoding.decode(tokens[:max_tokens]), encoding.decode(tokens[max_tokens:])
+        # 추정 모드 - 글자당 평균 토큰 수로 자를 위치를 잡은 뒤 한도 안으로 줄임
+        total = max(1, estimate_tokens(text))
+        cut = max(1, int(len(text) * max_tokens / total))
+        while cut > 1 and estimate_tokens(text[:cut]) > max_tokens:
+            cut = int(cut * 0.9)
+        return text[:cut], text[cut:]
+
+
+def context_window(model: Optional[str]) -> int:
+    """모델 컨텍스트 한도 - AIModelConfig 등록 값 우선"""
+    name = (model or "").lower()
+    short = name.split("/")[-1]
+    for config in ai_model_service.model_registry.values():
+        registered = config.model_name.lower()
+        if name in (registered, config.model_id.lower()) or short == registered.split("/")[-1]:
+            return config.context_window
+    for prefix, window in DEFAULT_CONTEXT_WINDOWS:
+        if short.startswith(prefix):
+            return window
+    return DEFAULT_CONTEXT_WINDOW
+
+
+def chunk_token_budget(model: Optional[str], prompt_tokens: int, output_tokens: int) -> int:
+    """청크 하나에 넣을 수 있는 문서 토큰 수"""
+    available = (context_window(model) - prompt_tokens - output_tokens) * CONTEXT_SAFETY_RATIO
+    return max(AI_CHUNK_MIN_TOKENS, min(int(available), AI_CHUNK_MAX_TOKENS))
+
+
+@dataclass
+class DocumentSection:
+    """제목 하나와 그 아래 본문 (페이지 번호는 1부터)"""
+    heading: Optional[str]
+    text: str
+    page: int
+
+
+@dataclass
+class DocumentChunk:
+    """분석 단위 청크"""
+    index: int
+    text: str
+    tokens: int
+    start_page: int
+    end_page: int
+    headings: List[str] = field(default_factory=list)
+
+    @property
+    def pages(self) -> str:
+        return str(self.start_page) if self.start_page == self.end_page else f"{self.start_page}-{self.end_page}"
+
+
+def is_heading(line: str) -> bool:
+    line = line.strip()
+    return 0 < len(line) <= _HEADING_MAX_LENGTH and bool(_HEADING.match(line))
+
+
+def split_sections(text: str) -> List[DocumentSection]:
+    """페이지 구분과 제목 줄 기준으로 문서를 구획으로 분리"""
+    sections: List[DocumentSection] = []
+    heading: Optional[str] = None
+    pending = False  # 본문이 아직 나오지 않은 제목 (연속된 제목은 하나로 합침)
+    for page_number, page_text in enumerate((text or "").split(PAGE_BREAK), start=1):
+        lines: List[str] = []
+        for line in page_text.splitlines():
+            if is_heading(line):
+                if any(l.strip() for l in lines):
+                    sections.append(DocumentSection(heading, "\n".join(lines).strip(), page_number))
+                    heading = line.strip()
+                else:
+                    heading = f"{heading}\n{line.strip()}" if pending and heading else line.strip()
+                pending, lines = True, []
+            else:
+                lines.append(line)
+        if any(l.strip() for l in lines):
+            sections.append(DocumentSection(heading, "\n".join(lines).strip(), page_number))
+            pending = False
+    return sections
+
+
+def _split_oversized(text: str, max_tokens: int, model: Optional[str], counter: TokenCounter) -> List[str]:
+    """한도를 넘는 구획을 문단 → 문장 → 토큰 단위 순으로 분할"""
+    if counter.count(text, model) <= max_tokens:
+        return [text]
+    for separator in (re.compile(r"\n\s*\n"), re.compile(r"\n"), _SENTENCE_END):
+        parts = [p for p in separator.split(text) if p and p.strip()]
+        if len(parts) > 1:
+            pieces: List[str] = []
+            for part in parts:
+                pieces.extend(_split_oversized(part.strip(), max_tokens, model, counter))
+            return pieces
+    pieces = []
+    rest = text
+    while rest and counter.count(rest, model) > max_tokens:
+        head, rest = counter.truncate(rest, max_tokens, model)
+        pieces.append(head)
+    if rest.strip():
+        pieces.append(rest)
+    return pieces
+
+
+def chunk_document(text: str, model: Optional[str], max_tokens: int,
+                   counter: Optional[TokenCounter] = None) -> List[DocumentChunk]:
+    """구획을 순서대로 max_tokens 이하의 청크로 묶음 (구획 경계를 우선 유지)"""
+    counter = counter or token_counter
+    pieces: List[Tuple[str, int, Optional[str]]] = []
+    for section in split_sections(text):
+        body = f"{section.heading}\n{section.text}" if section.heading else section.text
+        for piece in _split_oversized(body, max_tokens, model, counter):
+            pieces.append((piece, section.page, section.heading))
+
+    chunks: List[DocumentChunk] = []
+    current: List[str] = []
+    current_tokens = 0
+    pages: List[int] = []
+    headings: List[str] = []
+
+    def flush():
+        nonlocal current, current_tokens, pages, headings
+        if current:
+            chunks.append(DocumentChunk(len(chunks), "\n\n".join(current), current_tokens, min(pages), max(pages), headings))
+        current, current_tokens, pages, headings = [], 0, [], []
+
+    for piece, page, heading in pieces:
+        tokens = counter.count(piece, model) + 1
+        if current and current_tokens + tokens > max_tokens:
+            flush()
+        current.append(piece)
+        current_tokens += tokens
+        pages.append(page)
+        if heading and heading not in headings:
+            headings.append(heading)
+    flush()
+    return chunks
+
+
+async def map_chunks(chunks: Sequence[DocumentChunk], analyze: Callable[[DocumentChunk], Awaitable[Dict[str, Any]]],
+                     concurrency: int = AI_CHUNK_CONCURRENCY) -> List[Any]:
+    """청크별 분석을 동시 실행 수 제한 아래 병렬 실행 (실패한 청크는 예외 객체로 반환)"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(chunk: DocumentChunk):
+        async with semaphore:
+            return await analyze(chunk)
+
+    return await asyncio.gather(*(run(chunk) for chunk in chunks), return_exceptions=True)
+
+
+def _interleave(lists: List[List[Any]], limit: int) -> List[Any]:
+    """청크마다 번갈아 가져오며 중복 제거 (앞 청크만 반영되지 않도록)"""
+    merged: List[Any] = []
+    seen = set()
+    for row in range(max((len(l) for l in lists), default=0)):
+        for items in lists:
+            if row < len(items):
+                key = str(items[row]).strip()
+                if key and key not in seen:
+                    seen.add(key)
+                    merged.append(items[row])
+                    if len(merged) >= limit:
+                        return merged
+    return merged
+
+
+def merge_chunk_analyses(results: List[Tuple[DocumentChunk, Dict[str, Any]]], list_limit: int = 5,
+                         keyword_limit: int = 10) -> Dict[str, Any]:
+    """청크별 분석 결과 병합 (reduce)
+
+    - *_score: 청크 토큰 수 가중 평균
+    - keywords: 여러 청크에서 언급된 순으로 상위 keyword_limit 개
+    - strengths / improvements: 청크별로 번갈아 중복 제거
+    - summary: 청크 요약을 순서대로 연결 (chunk_summaries 에 페이지/제목과 함께 보존)
+    """
+    weights = [max(1, chunk.tokens) for chunk, _ in results]
+    total_weight = sum(weights)
+
+    score_fields = sorted({
+        key for _, result in results for key, value in result.items()
+        if key.endswith("_score") and isinstance(value, (int, float)) and not isinstance(value, bool)
+    })
+    merged: Dict[str, Any] = {}
+    for key in score_fields:
+        pairs = [(result[key], w) for (_, result), w in zip(results, weights)
+                 if isinstance(result.get(key), (int, float)) and not isinstance(result.get(key), bool)]
+        merged[key] = round(sum(v * w for v, w in pairs) / sum(w for _, w in pairs), 1)
+
+    keyword_counts: Counter = Counter()
+    first_seen: Dict[str, int] = {}
+    for _, result in results:
+        for keyword in result.get("keywords") or []:
+            keyword = str(keyword).strip()
+            if keyword:
+                keyword_counts[keyword] += 1
+                first_seen.setdefault(keyword, len(first_seen))
+    merged["keywords"] = sorted(keyword_counts, key=lambda k: (-keyword_counts[k], first_seen[k]))[:keyword_limit]
+
+    for key in ("strengths", "improvements"):
+        merged[key] = _interleave([list(result.get(key) or []) for _, result in results], list_limit)
+
+    chunk_summaries = [
+        {"chunk": chunk.index, "pages": chunk.pages, "headings": chunk.headings, "summary": result.get("summary", "")}
+        for chunk, result in results
+    ]
+    merged["summary"] = " ".join(s["summary"] for s in chunk_summaries if s["summary"])
+    merged["chunk_summaries"] = chunk_summaries
+    merged["chunked"] = True
+    merged["chunk_count"] = len(results)
+    merged["document_tokens"] = total_weight
+    return merged
+
+
+# Global token counter instance
+token_counter = TokenCounter()
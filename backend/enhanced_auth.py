@@ -23,7 +23,7 @@ import base64
 
 from security import (
     SecurityConfig, get_current_user, create_access_token, 
-    verify_password, get_password_hash
+    invalidate_user_principal, hash_password_async, verify_password_async
 )
 from models import User, Token, UserResponse
 
@@ -246,21 +246,23 @@ class AccountSecurityManager:
             return False
         
         # Hash new password
-        password_hash = get_password_hash(new_password)
+        password_hash = await hash_password_async(new_password)
         
-        # Update user password
+        # Update user password (bumping token_version revokes previously issued tokens)
         result = await self.db.users.update_one(
             {"_id": user_id},
             {
                 "$set": {
                     "password_hash": password_hash,
                     "password_changed_at": datetime.utcnow()
-                }
+                },
+                "$inc": {"token_version": 1}
             }
         )
         
         if result.modified_count == 0:
             return False
+        await invalidate_user_principal(user_id)
         
         # Mark token as used
         await self.db.password_resets.update_one(
@@ -570,7 +572,7 @@ async def setup_mfa(
     """Setup multi-factor authentication"""
     # Verify current password
     user_doc = await security_manager.db.users.find_one({"_id": current_user.id})
-    if not user_doc or not verify_password(request.password, user_doc["password_hash"]):
+    if not user_doc or not (await verify_password_async(request.password, user_doc["password_hash"]))[0]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid password"
@@ -3,15 +3,16 @@ Enhanced Evaluation Export API Endpoints
 Advanced formatting, templates, personas, and export options for evaluation reports
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import StreamingResponse
-from typing import List, Dict, Any, Optional
+from fastapi.encoders import jsonable_encoder
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 import logging
+import asyncio
 import io
 import json
-import uuid
 import os
 from pydantic import BaseModel, Field
 
@@ -20,9 +21,12 @@ from security import get_current_user, check_admin_or_secretary, db
 from evaluation_print_endpoints import (
     get_evaluation_data, 
     create_individual_evaluation_pdf,
-    print_jobs,
-    PrintJobStatus
+    job_output_path
 )
+from job_queue import JobContext, JobPriority, job_handler, job_queue
+from export_artifact_store import document_version, export_artifact_store
+from content_store import StoredObject
+from zip_stream import stream_zip
 
 logger = logging.getLogger(__name__)
 
@@ -535,7 +539,6 @@ async def preview_enhanced_export(
 async def export_enhanced_evaluation(
     evaluation_id: str,
     options: EnhancedExportOptions,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """Export evaluation with enhanced formatting options"""
@@ -553,32 +556,18 @@ async def export_enhanced_evaluation(
         if options.persona:
             options = await enhanced_export_service.apply_persona_defaults(options, options.persona)
         
-        # Create enhanced export job
-        job_id = str(uuid.uuid4())
-        
-        # Initialize job status
-        print_jobs[job_id] = PrintJobStatus(
-            job_id=job_id,
-            status="pending",
-            created_at=datetime.utcnow()
-        ).dict()
-        
-        # Add enhanced metadata to job
-        print_jobs[job_id].update({
-            "template_used": options.template.value,
-            "persona_used": options.persona.value if options.persona else None,
-            "format_used": options.format.value,
-            "validation_warnings": validation_result.get("warnings", [])
-        })
-        
-        # Start background task with enhanced processing
-        background_tasks.add_task(
-            process_enhanced_export_job,
-            job_id,
-            evaluation_id,
-            options.dict(),
-            current_user
+        # Queue enhanced export job with its metadata (polled via /api/evaluations/print/print-status)
+        job = await job_queue.enqueue(
+            "enhanced_export",
+            {"evaluation_id": evaluation_id, "options": jsonable_encoder(options)},
+            created_by=current_user.id,
+            priority=JobPriority.HIGH,
+            template_used=options.template.value,
+            persona_used=options.persona.value if options.persona else None,
+            format_used=options.format.value,
+            validation_warnings=validation_result.get("warnings", [])
         )
+        job_id = job["job_id"]
         
         logger.info(f"Enhanced export job created: {job_id}", extra={
             'user_id': current_user.id,
@@ -611,7 +600,6 @@ async def export_enhanced_evaluation(
 async def bulk_enhanced_export(
     evaluation_ids: List[str],
     options: EnhancedExportOptions,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(check_admin_or_secretary)
 ) -> Dict[str, Any]:
     """Bulk export multiple evaluations with enhanced formatting"""
@@ -629,33 +617,19 @@ async def bulk_enhanced_export(
         if options.persona:
             options = await enhanced_export_service.apply_persona_defaults(options, options.persona)
         
-        # Create bulk export job
-        job_id = str(uuid.uuid4())
-        
-        # Initialize job status
-        print_jobs[job_id] = PrintJobStatus(
-            job_id=job_id,
-            status="pending",
-            created_at=datetime.utcnow()
-        ).dict()
-        
-        # Add bulk export metadata
-        print_jobs[job_id].update({
-            "export_type": "bulk_enhanced",
-            "total_evaluations": len(evaluation_ids),
-            "template_used": options.template.value,
-            "persona_used": options.persona.value if options.persona else None,
-            "format_used": options.format.value
-        })
-        
-        # Start background task
-        background_tasks.add_task(
-            process_bulk_enhanced_export_job,
-            job_id,
-            evaluation_ids,
-            options.dict(),
-            current_user
+        # Queue bulk export job with its metadata
+        job = await job_queue.enqueue(
+            "bulk_enhanced_export",
+            {"evaluation_ids": evaluation_ids, "options": jsonable_encoder(options)},
+            created_by=current_user.id,
+            priority=JobPriority.LOW,
+            export_type="bulk_enhanced",
+            total_evaluations=len(evaluation_ids),
+            template_used=options.template.value,
+            persona_used=options.persona.value if options.persona else None,
+            format_used=options.format.value
         )
+        job_id = job["job_id"]
         
         logger.info(f"Bulk enhanced export job created: {job_id}", extra={
             'user_id': current_user.id,
@@ -684,126 +658,102 @@ async def bulk_enhanced_export(
 
 # Enhanced Background Processing Functions
 
-async def process_enhanced_export_job(
-    job_id: str, 
-    evaluation_id: str, 
-    options: Dict[str, Any], 
-    user: User
-):
-    """Process enhanced export job with advanced formatting"""
+async def render_enhanced_artifact(evaluation_id: str, options: Dict[str, Any]) -> Tuple[StoredObject, bool, Dict[str, Any]]:
+    """Render (or reuse) an enhanced export; the same evaluation version and options share one stored document"""
+    evaluation_data = await get_evaluation_data(evaluation_id)
+    key = export_artifact_store.fingerprint(
+        "enhanced_export", evaluation_id, document_version(evaluation_data["evaluation"]),
+        evaluation_data, options.get("format", "pdf"), options
+    )
     
-    try:
-        print_jobs[job_id]["status"] = "processing"
-        print_jobs[job_id]["progress"] = 10
-        
-        # Get evaluation data
-        evaluation_data = await get_evaluation_data(evaluation_id)
-        print_jobs[job_id]["progress"] = 30
-        
-        # Enhance data with options
+    async def render() -> bytes:
         enhanced_data = await enhance_evaluation_data_with_options(evaluation_data, options)
-        print_jobs[job_id]["progress"] = 60
-        
-        # Generate enhanced export
         export_content = await generate_enhanced_export(enhanced_data, options)
-        print_jobs[job_id]["progress"] = 90
-        
-        # Save file
-        template_name = options.get("template", "standard")
-        persona_name = options.get("persona", "default")
-        format_type = options.get("format", "pdf")
-        
-        filename = f"enhanced_{evaluation_id}_{template_name}_{persona_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format_type}"
-        file_path = f"outputs/{filename}"
-        
-        os.makedirs("outputs", exist_ok=True)
-        
-        if isinstance(export_content, bytes):
-            with open(file_path, "wb") as f:
-                f.write(export_content)
-        else:
-            # For string content (HTML, etc.)
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(export_content)
-        
-        # Complete job
-        print_jobs[job_id]["status"] = "completed"
-        print_jobs[job_id]["progress"] = 100
-        print_jobs[job_id]["file_path"] = file_path
-        print_jobs[job_id]["completed_at"] = datetime.utcnow()
-        
-        logger.info(f"Enhanced export job completed: {job_id}")
-        
-    except Exception as e:
-        print_jobs[job_id]["status"] = "failed"
-        print_jobs[job_id]["error_message"] = str(e)
-        logger.error(f"Enhanced export job failed: {job_id}, error: {e}")
+        # String content (HTML, etc.) is stored as UTF-8
+        return export_content.encode("utf-8") if isinstance(export_content, str) else export_content
+    
+    artifact, cache_hit = await export_artifact_store.get_or_render(key, render, subjects=[evaluation_id])
+    return artifact, cache_hit, evaluation_data
 
-async def process_bulk_enhanced_export_job(
-    job_id: str,
-    evaluation_ids: List[str],
-    options: Dict[str, Any],
-    user: User
-):
-    """Process bulk enhanced export job"""
+@job_handler("enhanced_export")
+async def process_enhanced_export_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """Process enhanced export job with advanced formatting (runs on a job queue worker)"""
     
-    try:
-        import zipfile
-        
-        print_jobs[job_id]["status"] = "processing"
-        print_jobs[job_id]["progress"] = 5
-        
-        template_name = options.get("template", "standard")
-        persona_name = options.get("persona", "default")
-        format_type = options.get("format", "pdf")
-        
-        zip_filename = f"bulk_enhanced_{template_name}_{persona_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-        file_path = f"outputs/{zip_filename}"
-        
-        os.makedirs("outputs", exist_ok=True)
-        
-        with zipfile.ZipFile(file_path, 'w') as zipf:
-            total_evaluations = len(evaluation_ids)
+    evaluation_id = payload["evaluation_id"]
+    options = payload["options"]
+    await ctx.progress(10)
+    
+    # Get evaluation data and generate the export (served from the artifact store when unchanged)
+    artifact, cache_hit, _ = await render_enhanced_artifact(evaluation_id, options)
+    await ctx.progress(90)
+    
+    template_name = options.get("template", "standard")
+    persona_name = options.get("persona", "default")
+    format_type = options.get("format", "pdf")
+    
+    filename = f"enhanced_{evaluation_id}_{template_name}_{persona_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format_type}"
+    
+    logger.info(f"Enhanced export job completed: {ctx.job_id}", extra={'cache_hit': cache_hit})
+    # Jobs keep their own link so cache invalidation/pruning cannot remove the file before download
+    file_path = await asyncio.to_thread(artifact.link_to, job_output_path(ctx.job_id, filename))
+    return {"file_path": str(file_path), "filename": filename, "cache_hit": cache_hit}
+
+@job_handler("bulk_enhanced_export")
+async def process_bulk_enhanced_export_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """Process bulk enhanced export job (runs on a job queue worker)
+
+    Members are read and compressed off the event loop so other jobs and lease renewals keep running.
+    """
+    
+    evaluation_ids = payload["evaluation_ids"]
+    options = payload["options"]
+    await ctx.progress(5)
+    
+    template_name = options.get("template", "standard")
+    persona_name = options.get("persona", "default")
+    format_type = options.get("format", "pdf")
+    
+    zip_filename = f"bulk_enhanced_{template_name}_{persona_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    file_path = f"outputs/{zip_filename}"
+    
+    os.makedirs("outputs", exist_ok=True)
+    
+    failed_evaluations = []
+    total_evaluations = len(evaluation_ids)
+    
+    async def entries():
+        for i, evaluation_id in enumerate(evaluation_ids):
+            entry = None
+            try:
+                # Generate export content (reuses member documents stored by earlier exports)
+                artifact, _, evaluation_data = await render_enhanced_artifact(evaluation_id, options)
+                export_content = await asyncio.to_thread(artifact.path.read_bytes)
+                
+                # Create filename for this evaluation
+                company_name = (evaluation_data.get("company") or {}).get("name", "unknown")
+                safe_company_name = "".join(c for c in company_name if c.isalnum() or c in (' ', '-', '_')).strip()
+                
+                entry = (f"{safe_company_name}_{template_name}_{evaluation_id}.{format_type}", export_content)
+                
+            except Exception as e:
+                logger.error(f"Failed to process evaluation {evaluation_id} in bulk export: {e}")
+                # Continue with other evaluations
+                failed_evaluations.append(evaluation_id)
             
-            for i, evaluation_id in enumerate(evaluation_ids):
-                try:
-                    # Get and enhance evaluation data
-                    evaluation_data = await get_evaluation_data(evaluation_id)
-                    enhanced_data = await enhance_evaluation_data_with_options(evaluation_data, options)
-                    
-                    # Generate export content
-                    export_content = await generate_enhanced_export(enhanced_data, options)
-                    
-                    # Create filename for this evaluation
-                    company_name = enhanced_data.get("company", {}).get("name", "unknown")
-                    safe_company_name = "".join(c for c in company_name if c.isalnum() or c in (' ', '-', '_')).strip()
-                    
-                    eval_filename = f"{safe_company_name}_{template_name}_{evaluation_id}.{format_type}"
-                    
-                    # Add to zip
-                    zipf.writestr(eval_filename, export_content)
-                    
-                    # Update progress
-                    progress = 10 + int((i + 1) / total_evaluations * 80)
-                    print_jobs[job_id]["progress"] = progress
-                    
-                except Exception as e:
-                    logger.error(f"Failed to process evaluation {evaluation_id} in bulk export: {e}")
-                    # Continue with other evaluations
-                    continue
-        
-        # Complete job
-        print_jobs[job_id]["status"] = "completed"
-        print_jobs[job_id]["progress"] = 100
-        print_jobs[job_id]["file_path"] = file_path
-        print_jobs[job_id]["completed_at"] = datetime.utcnow()
-        
-        logger.info(f"Bulk enhanced export job completed: {job_id}")
-        
-    except Exception as e:
-        print_jobs[job_id]["status"] = "failed"
-        print_jobs[job_id]["error_message"] = str(e)
-        logger.error(f"Bulk enhanced export job failed: {job_id}, error: {e}")
+            if entry is not None:
+                yield entry
+            
+            # Update progress (also renews the lease and picks up cancellation)
+            progress = 10 + int((i + 1) / total_evaluations * 80)
+            await ctx.progress(progress)
+    
+    # Each member is compressed in a worker thread and appended to the archive as it is produced
+    with open(file_path, "wb") as zipf:
+        async for chunk in stream_zip(entries()):
+            await asyncio.to_thread(zipf.write, chunk)
+    
+    logger.info(f"Bulk enhanced export job completed: {ctx.job_id}")
+    return {"file_path": file_path, "failed_evaluations": failed_evaluations}
 
 async def enhance_evaluation_data_with_options(data: Dict, options: Dict) -> Dict:
     """Enhance evaluation data based on export options"""
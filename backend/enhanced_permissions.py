@@ -4,14 +4,19 @@
 """
 
 from enum import Enum
-from typing import List, Dict, Set, Optional, Any
+from typing import List, Dict, Set, FrozenSet, Optional, Any, Tuple
 from fastapi import HTTPException, Depends, status
 from functools import wraps
+from collections import OrderedDict
+from contextvars import ContextVar
 import logging
+import os
+import time
 from datetime import datetime
 
 from models import User
 from security import get_current_user
+from cache_service import cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -172,13 +177,49 @@ PROJECT_ROLE_PERMISSIONS: Dict[ProjectRole, Set[Permission]] = {
     }
 }
 
+# 요청 단위 권한 메모 (PermissionMemoMiddleware 가 요청마다 새 dict 를 설정)
+_request_permission_memo: ContextVar[Optional[Dict[Tuple[str, str, Optional[str]], FrozenSet[Permission]]]] = ContextVar(
+    "request_permission_memo", default=None
+)
+
+class PermissionMemoMiddleware:
+    """요청마다 권한 메모를 새로 시작하는 ASGI 미들웨어"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_permission_memo.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_permission_memo.reset(token)
+
+# cache_service 메시지 주제 - 다른 워커의 권한 캐시 무효화
+PERMISSION_INVALIDATION_TOPIC = "permissions"
+
 class PermissionChecker:
-    """권한 검사 클래스"""
+    """권한 검사 클래스
     
-    def __init__(self, db_client=None):
+    해석된 권한 집합은 (user_id, project_id) 키로 프로세스 내 캐시에 TTL 동안 보관되며,
+    멤버/커스텀 권한/역할 변경 시 broadcast_invalidation 으로 모든 워커의 해당 항목을 무효화합니다
+    (cache_service 의 Redis pub/sub). Redis 가 없거나 메시지가 유실되면 다른 워커는 최대
+    PERMISSION_CACHE_TTL_SECONDS(기본 60초) 동안 이전 권한을 사용할 수 있습니다.
+    """
+    
+    def __init__(self, db_client=None, cache_ttl_seconds: Optional[float] = None, cache_max_entries: Optional[int] = None):
         self._db = None
         self.user_permissions_collection = None
         self.project_members_collection = None
+        self.cache_ttl_seconds = cache_ttl_seconds if cache_ttl_seconds is not None else float(os.getenv("PERMISSION_CACHE_TTL_SECONDS", "60"))
+        self.cache_max_entries = cache_max_entries if cache_max_entries is not None else int(os.getenv("PERMISSION_CACHE_SIZE", "5000"))
+        # (user_id, project_id) -> (role, 권한 집합, 만료 시각)
+        self._permission_cache: "OrderedDict[Tuple[str, Optional[str]], Tuple[str, FrozenSet[Permission], float]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
         if db_client:
             self._db = db_client.online_evaluation
             self.user_permissions_collection = self._db.user_permissions
@@ -196,27 +237,153 @@ class PermissionChecker:
             self.project_members_collection = value.project_members
     
     async def get_user_permissions(self, user: User, project_id: Optional[str] = None) -> Set[Permission]:
-        """사용자의 전체 권한 조회"""
-        permissions = set()
+        """사용자의 전체 권한 조회 (요청 메모 -> 권한 캐시 -> DB 순)"""
+        memo = _request_permission_memo.get()
+        memo_key = (user.id, user.role, project_id)
+        if memo is not None and memo_key in memo:
+            return set(memo[memo_key])
         
-        # 기본 역할 권한
-        if user.role in ROLE_PERMISSIONS:
-            permissions.update(ROLE_PERMISSIONS[Role(user.role)])
+        permissions = self._get_cached_permissions(user, project_id)
+        if permissions is None:
+            project_permissions = None
+            custom_permissions = None
+            
+            # 프로젝트별 권한 추가
+            if project_id and self._db is not None:
+                project_permissions = await self._get_project_permissions(user.id, project_id)
+            
+            # 사용자별 커스텀 권한 추가
+            if self._db is not None:
+                custom_permissions = await self._get_custom_permissions(user.id)
+            
+            permissions = self._resolve_permissions(user.role, project_permissions, custom_permissions)
+            # 조회 오류(None)가 있었다면 잘못된 결과가 남지 않도록 캐시하지 않음
+            failed = (project_id and self._db is not None and project_permissions is None) or \
+                (self._db is not None and custom_permissions is None)
+            if not failed:
+                self._store_cached_permissions(user, project_id, permissions)
         
-        # 프로젝트별 권한 추가
-        if project_id and self._db is not None:
-            project_permissions = await self._get_project_permissions(user.id, project_id)
-            permissions.update(project_permissions)
+        if memo is not None:
+            memo[memo_key] = permissions
+        return set(permissions)
+    
+    async def get_permissions_for_users(self, users: List[User], project_id: Optional[str] = None) -> Dict[str, Set[Permission]]:
+        """여러 사용자의 권한을 일괄 조회 (캐시 미스 사용자는 컬렉션별 $in 쿼리 1회)"""
+        results: Dict[str, Set[Permission]] = {}
+        missing: List[User] = []
+        for user in users:
+            cached = self._get_cached_permissions(user, project_id)
+            if cached is None:
+                missing.append(user)
+            else:
+                results[user.id] = set(cached)
+        
+        if not missing:
+            return results
         
-        # 사용자별 커스텀 권한 추가
+        user_ids = list({user.id for user in missing})
+        project_roles: Dict[str, Set[Permission]] = {}
+        custom_permissions: Dict[str, Set[Permission]] = {}
+        failed = False
         if self._db is not None:
-            custom_permissions = await self._get_custom_permissions(user.id)
+            try:
+                if project_id:
+                    async for member in self.project_members_collection.find(
+                        {"user_id": {"$in": user_ids}, "project_id": project_id, "is_active": True},
+                        {"_id": 0, "user_id": 1, "project_role": 1}
+                    ):
+                        if member.get("project_role"):
+                            project_roles[member["user_id"]] = PROJECT_ROLE_PERMISSIONS.get(ProjectRole(member["project_role"]), set())
+                
+                async for user_perms in self.user_permissions_collection.find(
+                    {"user_id": {"$in": user_ids}, "is_active": True},
+                    {"_id": 0, "user_id": 1, "permissions": 1}
+                ):
+                    custom_permissions[user_perms["user_id"]] = set(Permission(p) for p in user_perms.get("permissions", []))
+            except Exception as e:
+                logger.error(f"일괄 권한 조회 오류: {e}")
+                failed = True
+        
+        for user in missing:
+            permissions = self._resolve_permissions(
+                user.role, project_roles.get(user.id, set()), custom_permissions.get(user.id, set())
+            )
+            if not failed:
+                self._store_cached_permissions(user, project_id, permissions)
+            results[user.id] = set(permissions)
+        
+        return results
+    
+    @staticmethod
+    def _resolve_permissions(role: str, project_permissions: Optional[Set[Permission]], custom_permissions: Optional[Set[Permission]]) -> FrozenSet[Permission]:
+        """역할, 프로젝트, 커스텀 권한을 하나의 집합으로 병합"""
+        permissions = set()
+        
+        # 기본 역할 권한
+        if role in ROLE_PERMISSIONS:
+            permissions.update(ROLE_PERMISSIONS[Role(role)])
+        if project_permissions:
+            permissions.update(project_permissions)
+        if custom_permissions:
             permissions.update(custom_permissions)
         
-        return permissions
+        return frozenset(permissions)
+    
+    def _get_cached_permissions(self, user: User, project_id: Optional[str]) -> Optional[FrozenSet[Permission]]:
+        key = (user.id, project_id)
+        entry = self._permission_cache.get(key)
+        # 역할이 바뀐 경우에도 캐시 미스로 처리
+        if entry is None or entry[0] != user.role or entry[2] <= time.monotonic():
+            if entry is not None:
+                del self._permission_cache[key]
+            self.cache_misses += 1
+            return None
+        self._permission_cache.move_to_end(key)
+        self.cache_hits += 1
+        return entry[1]
+    
+    def _store_cached_permissions(self, user: User, project_id: Optional[str], permissions: FrozenSet[Permission]) -> None:
+        if self.cache_ttl_seconds <= 0 or self.cache_max_entries <= 0:
+            return
+        key = (user.id, project_id)
+        self._permission_cache[key] = (user.role, permissions, time.monotonic() + self.cache_ttl_seconds)
+        self._permission_cache.move_to_end(key)
+        while len(self._permission_cache) > self.cache_max_entries:
+            self._permission_cache.popitem(last=False)
+    
+    def invalidate_user(self, user_id: str, project_id: Optional[str] = None) -> None:
+        """사용자 권한 캐시 무효화 (project_id 지정 시 해당 프로젝트 항목만)"""
+        for key in [key for key in self._permission_cache if key[0] == user_id]:
+            if project_id is None or key[1] == project_id:
+                del self._permission_cache[key]
+        memo = _request_permission_memo.get()
+        if memo:
+            for key in [key for key in memo if key[0] == user_id]:
+                del memo[key]
+    
+    async def broadcast_invalidation(self, user_id: str, project_id: Optional[str] = None) -> None:
+        """이 워커와 다른 워커(cache_service pub/sub)의 사용자 권한 캐시 무효화"""
+        self.invalidate_user(user_id, project_id)
+        await cache_service.publish_message(PERMISSION_INVALIDATION_TOPIC, {"user_id": user_id, "project_id": project_id})
+    
+    def apply_invalidation_message(self, data: Optional[Dict[str, Any]]) -> None:
+        """다른 워커가 보낸 무효화 메시지 처리 (None 이면 메시지 유실 가능성 - 전체 삭제)"""
+        if data is None:
+            self._permission_cache.clear()
+        elif data.get("user_id"):
+            self.invalidate_user(data["user_id"], data.get("project_id"))
+    
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        total = self.cache_hits + self.cache_misses
+        return {
+            "size": len(self._permission_cache),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / total * 100, 1) if total else 0.0,
+        }
     
-    async def _get_project_permissions(self, user_id: str, project_id: str) -> Set[Permission]:
-        """프로젝트별 권한 조회"""
+    async def _get_project_permissions(self, user_id: str, project_id: str) -> Optional[Set[Permission]]:
+        """프로젝트별 권한 조회 (조회 오류 시 None)"""
         try:
             member = await self.project_members_collection.find_one({
                 "user_id": user_id,
@@ -230,11 +397,12 @@ class PermissionChecker:
             
         except Exception as e:
             logger.error(f"프로젝트 권한 조회 오류: {e}")
+            return None
         
         return set()
     
-    async def _get_custom_permissions(self, user_id: str) -> Set[Permission]:
-        """사용자별 커스텀 권한 조회"""
+    async def _get_custom_permissions(self, user_id: str) -> Optional[Set[Permission]]:
+        """사용자별 커스텀 권한 조회 (조회 오류 시 None)"""
         try:
             user_perms = await self.user_permissions_collection.find_one({
                 "user_id": user_id,
@@ -246,6 +414,7 @@ class PermissionChecker:
             
         except Exception as e:
             logger.error(f"커스텀 권한 조회 오류: {e}")
+            return None
         
         return set()
     
@@ -266,6 +435,7 @@ class PermissionChecker:
 
 # 전역 권한 검사 인스턴스
 permission_checker = PermissionChecker()
+cache_service.add_message_handler(PERMISSION_INVALIDATION_TOPIC, permission_checker.apply_invalidation_message)
 
 def require_permission(permission: Permission, project_id_param: Optional[str] = None):
     """권한 필요 데코레이터"""
@@ -407,6 +577,7 @@ async def add_project_member(user_id: str, project_id: str, project_role: Projec
             # 새로 추가
             await permission_checker.project_members_collection.insert_one(member_data)
         
+        await permission_checker.broadcast_invalidation(user_id, project_id)
         logger.info(f"프로젝트 멤버 추가: {user_id} -> {project_id} ({project_role.value})")
         
     except Exception as e:
@@ -423,6 +594,7 @@ async def remove_project_member(user_id: str, project_id: str):
             {"$set": {"is_active": False, "removed_at": datetime.utcnow()}}
         )
         
+        await permission_checker.broadcast_invalidation(user_id, project_id)
         logger.info(f"프로젝트 멤버 제거: {user_id} from {project_id}")
         
     except Exception as e:
@@ -459,6 +631,7 @@ async def grant_custom_permission(user_id: str, permission: Permission):
             
             await permission_checker.user_permissions_collection.insert_one(perm_data)
         
+        await permission_checker.broadcast_invalidation(user_id)
         logger.info(f"커스텀 권한 부여: {user_id} -> {permission.value}")
         
     except Exception as e:
@@ -483,6 +656,7 @@ async def revoke_custom_permission(user_id: str, permission: Permission):
                 {"$set": {"permissions": list(permissions), "updated_at": datetime.utcnow()}}
             )
         
+        await permission_checker.broadcast_invalidation(user_id)
         logger.info(f"커스텀 권한 철회: {user_id} -> {permission.value}")
         
     except Exception as e:
@@ -0,0 +1,256 @@
+"""
+Evaluation PDF
+평가표 PDF 렌더링 함수 (개별 평가표, 위원장 종합 평가표)
+
+웹 앱/DB 에 의존하지 않는 순수 렌더링 모듈 - 출력 API 와 PDF 렌더링 팜(pdf_render_farm)의 워커 프로세스가 함께 사용
+"""
+
+import logging
+from datetime import datetime
+from io import BytesIO
+from typing import Any, Dict
+
+from fastapi import HTTPException
+
+# PDF 생성 라이브러리 (reportlab 사용)
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+    from reportlab.lib.units import cm
+    PDF_ENABLED = True
+except ImportError:
+    PDF_ENABLED = False
+    print("⚠️ PDF 생성 라이브러리가 설치되지 않았습니다. pip install reportlab을 실행하세요.")
+
+from pdf_render_context import LayoutProfile, pdf_render_context
+from scoring_engine import score_sheet, summarize, template_items
+
+logger = logging.getLogger(__name__)
+
+def setup_korean_fonts():
+    """한글 폰트 설정 (프로세스에서 한 번만 등록, 등록되어 있으면 True)"""
+    return pdf_render_context.korean_font is not None
+
+def create_pdf_styles(options: Dict[str, Any] = None):
+    """PDF 스타일 (레이아웃 프로파일별로 캐시된 공유 스타일시트)"""
+    return pdf_render_context.styles("print", LayoutProfile.from_options(options))
+
+def create_individual_evaluation_pdf(evaluation_data: Dict[str, Any], options: Dict[str, Any] = None) -> bytes:
+    """개별 평가표 PDF 생성"""
+    if not PDF_ENABLED:
+        raise HTTPException(status_code=500, detail="PDF 생성 기능이 비활성화되어 있습니다")
+    
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*cm, bottomMargin=1*cm)
+    
+    # 스타일 설정 (템플릿/페르소나별로 컴파일된 스타일과 페이지 장식 재사용)
+    profile = LayoutProfile.from_options(options)
+    styles = pdf_render_context.styles("print", profile)
+    story = []
+    
+    evaluation = evaluation_data["evaluation"]
+    evaluator = evaluation_data["evaluator"]
+    company = evaluation_data["company"]
+    project = evaluation_data["project"]
+    template = evaluation_data["template"]
+    scores = evaluation_data["scores"]
+    
+    # 제목
+    title = f"평가표 - {company.get('name', '알 수 없음')}"
+    story.append(Paragraph(title, styles['KoreanTitle']))
+    story.append(Spacer(1, 12))
+    
+    # 기본 정보 테이블
+    basic_info_data = [
+        ['항목', '내용'],
+        ['프로젝트명', project.get('name', '알 수 없음')],
+        ['기업명', company.get('name', '알 수 없음')],
+        ['평가자', evaluator.get('user_name', '알 수 없음')],
+        ['평가일', evaluation.get('created_at', datetime.utcnow()).strftime('%Y-%m-%d %H:%M')],
+        ['평가 상태', evaluation.get('status', '알 수 없음')]
+    ]
+    
+    basic_info_table = Table(basic_info_data, colWidths=[4*cm, 12*cm])
+    basic_info_table.setStyle(pdf_render_context.table_style('info', profile))
+    
+    story.append(basic_info_table)
+    story.append(Spacer(1, 20))
+    
+    # 평가 기준 및 점수
+    items = template_items(template)
+    if items:
+        story.append(Paragraph("평가 기준 및 점수", styles['KoreanHeading']))
+        
+        # 항목/점수를 정렬된 배열로 계산 (가점 항목은 총점/만점에서 제외)
+        sheet_score = score_sheet(items, scores)
+        
+        criteria_data = [['평가 항목', '배점', '획득 점수', '가중치', '비고']]
+        
+        for row in sheet_score.items:
+            criterion = row['item']
+            criteria_data.append([
+                criterion.get('name', '알 수 없음'),
+                f"{criterion.get('max_score', 0)}점",
+                f"{row['score'] if row['score'] is not None else 0:g}점",
+                f"x{criterion.get('weight', 1.0)}",
+                '가점' if row['bonus'] else ''
+            ])
+        
+        # 총점 행 추가
+        criteria_data.append([
+            '총점',
+            f"{sheet_score.max_weighted:g}점",
+            f"{sheet_score.weighted_total:g}점",
+            '',
+            f"{sheet_score.normalized:.1f}%"
+        ])
+        
+        criteria_table = Table(criteria_data, colWidths=[5*cm, 2*cm, 2.5*cm, 2*cm, 4.5*cm])
+        criteria_table.setStyle(pdf_render_context.table_style('criteria', profile))
+        
+        story.append(criteria_table)
+        story.append(Spacer(1, 20))
+    
+    # 종합 의견
+    if options and options.get('include_comments', True):
+        story.append(Paragraph("종합 의견", styles['KoreanHeading']))
+        
+        comments = evaluation.get('comments', '작성된 의견이 없습니다.')
+        story.append(Paragraph(comments, styles['KoreanNormal']))
+        story.append(Spacer(1, 20))
+    
+    # 서명 영역
+    signature_data = [
+        ['평가자 서명', ''],
+        ['날짜', datetime.now().strftime('%Y년 %m월 %d일')]
+    ]
+    
+    signature_table = Table(signature_data, colWidths=[4*cm, 12*cm])
+    signature_table.setStyle(pdf_render_context.table_style('signature', profile))
+    
+    story.append(signature_table)
+    
+    # PDF 생성
+    doc.build(story, **pdf_render_context.page_callbacks(profile))
+    buffer.seek(0)
+    return buffer.getvalue()
+
+def create_chairman_summary_pdf(project_data: Dict[str, Any], options: Dict[str, Any] = None) -> bytes:
+    """위원장 종합 평가표 PDF 생성"""
+    if not PDF_ENABLED:
+        raise HTTPException(status_code=500, detail="PDF 생성 기능이 비활성화되어 있습니다")
+    
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*cm, bottomMargin=1*cm)
+    
+    # 스타일 설정 (템플릿/페르소나별로 컴파일된 스타일과 페이지 장식 재사용)
+    profile = LayoutProfile.from_options(options)
+    styles = pdf_render_context.styles("print", profile)
+    story = []
+    
+    project = project_data["project"]
+    evaluations = project_data["evaluations"]
+    companies = project_data["companies"]
+    
+    # 제목
+    title = f"평가위원장 종합 평가표 - {project.get('name', '알 수 없음')}"
+    story.append(Paragraph(title, styles['KoreanTitle']))
+    story.append(Spacer(1, 12))
+    
+    # 프로젝트 정보
+    project_info_data = [
+        ['항목', '내용'],
+        ['프로젝트명', project.get('name', '알 수 없음')],
+        ['평가 기간', f"{project.get('start_date', '알 수 없음')} ~ {project.get('end_date', '알 수 없음')}"],
+        ['총 평가 건수', f"{len(evaluations)}건"],
+        ['작성일', datetime.now().strftime('%Y년 %m월 %d일')]
+    ]
+    
+    project_info_table = Table(project_info_data, colWidths=[4*cm, 12*cm])
+    project_info_table.setStyle(pdf_render_context.table_style('info', profile))
+    
+    story.append(project_info_table)
+    story.append(Spacer(1, 20))
+    
+    # 평가 결과 요약
+    if options and options.get('include_statistics', True):
+        story.append(Paragraph("평가 결과 요약", styles['KoreanHeading']))
+        
+        # 기업별 점수 집계
+        company_scores = {}
+        for evaluation in evaluations:
+            company_id = evaluation.get('company_id')
+            if company_id not in company_scores:
+                company_scores[company_id] = []
+            
+            total_score = evaluation.get('total_score', 0)
+            company_scores[company_id].append(total_score)
+        
+        # 요약 테이블 데이터
+        summary_data = [['순위', '기업명', '평균 점수', '최고 점수', '최저 점수', '평가 횟수']]
+        
+        # 평균 점수로 정렬
+        sorted_companies = []
+        for company_id, scores in company_scores.items():
+            company = companies.get(company_id, {})
+            stats = summarize(scores)
+            
+            sorted_companies.append({
+                'company_name': company.get('name', '알 수 없음'),
+                'avg_score': stats['average'],
+                'max_score': stats['max'],
+                'min_score': stats['min'],
+                'count': len(scores)
+            })
+        
+        sorted_companies.sort(key=lambda x: x['avg_score'], reverse=True)
+        
+        for i, company in enumerate(sorted_companies, 1):
+            summary_data.append([
+                str(i),
+                company['company_name'],
+                f"{company['avg_score']:.1f}점",
+                f"{company['max_score']:.1f}점",
+                f"{company['min_score']:.1f}점",
+                f"{company['count']}회"
+            ])
+        
+        summary_table = Table(summary_data, colWidths=[1.5*cm, 4*cm, 2.5*cm, 2.5*cm, 2.5*cm, 3*cm])
+        summary_table.setStyle(pdf_render_context.table_style('summary', profile))
+        
+        story.append(summary_table)
+        story.append(Spacer(1, 20))
+    
+    # 위원장 의견
+    story.append(Paragraph("위원장 종합 의견", styles['KoreanHeading']))
+    
+    opinion_text = """
+    본 평가는 공정하고 객관적인 기준에 따라 실시되었으며, 
+    각 기업의 사업성, 기술성, 혁신성 등을 종합적으로 검토하였습니다.
+    
+    평가 결과를 바탕으로 우수한 기업들이 선정되기를 권고하며,
+    향후 지속적인 모니터링과 지원이 필요합니다.
+    
+    [위원장 의견을 입력하세요]
+    """
+    
+    story.append(Paragraph(opinion_text, styles['KoreanNormal']))
+    story.append(Spacer(1, 30))
+    
+    # 서명 영역
+    signature_data = [
+        ['평가위원장', ''],
+        ['직책/소속', ''],
+        ['서명', ''],
+        ['날짜', datetime.now().strftime('%Y년 %m월 %d일')]
+    ]
+    
+    signature_table = Table(signature_data, colWidths=[4*cm, 12*cm])
+    signature_table.setStyle(pdf_render_context.table_style('chairman_signature', profile))
+    
+    story.append(signature_table)
+    
+    # PDF 생성
+    doc.build(story, **pdf_render_context.page_callbacks(profile))
+    buffer.seek(0)
+    return buffer.getvalue()
@@ -3,73 +3,52 @@
 개별, 전체, 위원장용 평가표 PDF 생성 및 다운로드
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from fastapi.responses import StreamingResponse, FileResponse
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Deque, Tuple
 import logging
 from pydantic import BaseModel, Field
 from datetime import datetime
 import os
-import uuid
 import asyncio
-from io import BytesIO
 import json
-
-# PDF 생성 라이브러리 (reportlab 사용)
-try:
-    from reportlab.lib.pagesizes import A4, letter
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch, cm
-    from reportlab.lib.colors import black, white, grey, lightgrey
-    from reportlab.lib import colors
-    from reportlab.pdfgen import canvas
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-    PDF_ENABLED = True
-except ImportError:
-    PDF_ENABLED = False
-    print("⚠️ PDF 생성 라이브러리가 설치되지 않았습니다. pip install reportlab을 실행하세요.")
+from collections import deque
+from pathlib import Path
 
 from models import User
 from security import get_current_user
 from enhanced_permissions import Permission, check_permission, permission_checker
+from job_queue import COMPLETED_STATUSES, COMPLETED_WITH_ERRORS, JobContext, JobPriority, job_handler, job_queue, public_job
+from evaluation_pdf import create_chairman_summary_pdf, create_individual_evaluation_pdf
+from pdf_render_farm import RenderMetrics, fetch_evaluation_payloads, pdf_render_farm
+from content_store import StoredObject
+from zip_stream import stream_zip, zip_archive_cache, zip_download_response
+from export_artifact_store import document_version, export_artifact_store
 
 logger = logging.getLogger(__name__)
 
 # 평가표 출력 라우터 생성 - Fixed prefix to avoid conflict with evaluation_api.py
 evaluation_print_router = APIRouter(prefix="/api/evaluations/print", tags=["평가표 출력"])
 
-# 데이터베이스 연결
-try:
-    from server import db
-except ImportError:
-    db = None
-    logger.warning("데이터베이스 연결을 찾을 수 없습니다")
-
 # 평가 목록 조회 엔드포인트
 @evaluation_print_router.get("/list")
 async def get_evaluations_list(
     project_id: Optional[str] = Query(None, description="프로젝트 ID 필터"),
     current_user: User = Depends(get_current_user)
 ):
-    """평가 목록 조회"""
+    """평가 목록 조회 (평가위원은 자신의 평가지만)"""
     try:
-        if not db:
-            raise HTTPException(status_code=500, detail="데이터베이스 연결이 없습니다")
-            
+        # server 가 이 모듈을 임포트하는 중에는 db 가 아직 없으므로 호출 시점에 조회
+        from server import db
+        
         # evaluation_sheets 컬렉션에서 조회
         query = {}
         if project_id:
             query["project_id"] = project_id
+        if current_user.role not in ["admin", "secretary"]:
+            query["evaluator_id"] = current_user.id
             
-        evaluations = await db.evaluation_sheets.find(query).to_list(1000)
-        
-        # 만약 evaluation_sheets가 비어있다면 evaluations 컬렉션에서 조회
-        if not evaluations:
-            evaluations = await db.evaluations.find(query).to_list(1000)
-            
-        return evaluations
+        return await db.evaluation_sheets.find(query, {"_id": 0}).to_list(1000)
     except Exception as e:
         logger.error(f"평가 목록 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"평가 목록 조회 실패: {str(e)}")
@@ -95,107 +74,45 @@ class ChairmanSummaryRequest(BaseModel):
 class PrintJobStatus(BaseModel):
     """출력 작업 상태"""
     job_id: str
-    status: str  # "pending", "processing", "completed", "failed"
+    status: str  # "pending", "processing", "completed", "completed_with_errors", "failed"
     progress: int = 0
     file_path: Optional[str] = None
     error_message: Optional[str] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
 
-# 출력 작업 상태 저장소 (실제로는 Redis나 데이터베이스 사용)
-print_jobs = {}
-
-def setup_korean_fonts():
-    """한글 폰트 설정"""
-    try:
-        # 시스템 폰트 경로들
-        font_paths = [
-            "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",  # Ubuntu
-            "/System/Library/Fonts/AppleGothic.ttf",  # macOS
-            "C:/Windows/Fonts/malgun.ttf",  # Windows
-            "./fonts/NanumGothic.ttf"  # 로컬 폰트
-        ]
-        
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                pdfmetrics.registerFont(TTFont('Korean', font_path))
-                return True
-        
-        # 기본 폰트 사용
-        logger.warning("한글 폰트를 찾을 수 없어 기본 폰트를 사용합니다.")
-        return False
-    except Exception as e:
-        logger.error(f"폰트 설정 오류: {e}")
-        return False
+# 출력 작업은 영속 작업 큐(job_queue)에 저장 - 출력 상태/다운로드 API 가 조회하는 작업 유형
+PRINT_JOB_TYPES = ("print", "enhanced_export", "bulk_enhanced_export")
 
-def create_pdf_styles():
-    """PDF 스타일 생성"""
-    styles = getSampleStyleSheet()
-    
-    # 한글 폰트 사용 여부에 따라 폰트 설정
-    font_name = 'Korean' if setup_korean_fonts() else 'Helvetica'
-    
-    # 커스텀 스타일 정의
-    styles.add(ParagraphStyle(
-        name='KoreanTitle',
-        fontName=font_name,
-        fontSize=16,
-        spaceAfter=12,
-        alignment=1,  # 중앙 정렬
-        textColor=colors.black
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='KoreanHeading',
-        fontName=font_name,
-        fontSize=12,
-        spaceBefore=6,
-        spaceAfter=6,
-        textColor=colors.black
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='KoreanNormal',
-        fontName=font_name,
-        fontSize=10,
-        spaceAfter=6,
-        textColor=colors.black
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='KoreanSmall',
-        fontName=font_name,
-        fontSize=8,
-        spaceAfter=4,
-        textColor=colors.grey
-    ))
-    
-    return styles
+def ensure_job_access(job: Dict[str, Any], current_user: User, action: str) -> None:
+    """관리자, 간사 또는 작업 생성자만 출력 작업에 접근"""
+    if current_user.role not in ["admin", "secretary"] and job.get("created_by") != current_user.id:
+        raise HTTPException(status_code=403, detail=f"출력 작업 {action} 권한이 없습니다")
 
 async def get_evaluation_data(evaluation_id: str) -> Dict[str, Any]:
     """평가 데이터 조회"""
     try:
         from server import db
         
-        # 평가 기본 정보 조회
-        evaluation = await db.evaluations.find_one({"_id": evaluation_id})
+        # 평가지 기본 정보 조회
+        evaluation = await db.evaluation_sheets.find_one({"id": evaluation_id})
         if not evaluation:
             raise ValueError(f"평가를 찾을 수 없습니다: {evaluation_id}")
         
         # 평가자 정보 조회
-        evaluator = await db.users.find_one({"_id": evaluation.get("evaluator_id")})
+        evaluator = await db.users.find_one({"id": evaluation.get("evaluator_id")})
         
         # 기업 정보 조회
-        company = await db.companies.find_one({"_id": evaluation.get("company_id")})
+        company = await db.companies.find_one({"id": evaluation.get("company_id")})
         
         # 프로젝트 정보 조회
-        project = await db.projects.find_one({"_id": evaluation.get("project_id")})
+        project = await db.projects.find_one({"id": evaluation.get("project_id")})
         
         # 템플릿 정보 조회
-        template = await db.evaluation_templates.find_one({"_id": evaluation.get("template_id")})
+        template = await db.evaluation_templates.find_one({"id": evaluation.get("template_id")})
         
         # 평가 점수 조회
-        scores = await db.evaluation_scores.find({"evaluation_id": evaluation_id}).to_list(length=None)
+        scores = await db.evaluation_scores.find({"sheet_id": evaluation_id}).to_list(length=None)
         
         return {
             "evaluation": evaluation,
@@ -210,409 +127,256 @@ async def get_evaluation_data(evaluation_id: str) -> Dict[str, Any]:
         logger.error(f"평가 데이터 조회 오류: {e}")
         raise
 
-def create_individual_evaluation_pdf(evaluation_data: Dict[str, Any], options: Dict[str, Any] = None) -> bytes:
-    """개별 평가표 PDF 생성"""
-    if not PDF_ENABLED:
-        raise HTTPException(status_code=500, detail="PDF 생성 기능이 비활성화되어 있습니다")
-    
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*cm, bottomMargin=1*cm)
-    
-    # 스타일 설정
-    styles = create_pdf_styles()
-    story = []
-    
-    evaluation = evaluation_data["evaluation"]
-    evaluator = evaluation_data["evaluator"]
-    company = evaluation_data["company"]
-    project = evaluation_data["project"]
-    template = evaluation_data["template"]
-    scores = evaluation_data["scores"]
-    
-    # 제목
-    title = f"평가표 - {company.get('name', '알 수 없음')}"
-    story.append(Paragraph(title, styles['KoreanTitle']))
-    story.append(Spacer(1, 12))
-    
-    # 기본 정보 테이블
-    basic_info_data = [
-        ['항목', '내용'],
-        ['프로젝트명', project.get('name', '알 수 없음')],
-        ['기업명', company.get('name', '알 수 없음')],
-        ['평가자', evaluator.get('user_name', '알 수 없음')],
-        ['평가일', evaluation.get('created_at', datetime.utcnow()).strftime('%Y-%m-%d %H:%M')],
-        ['평가 상태', evaluation.get('status', '알 수 없음')]
-    ]
-    
-    basic_info_table = Table(basic_info_data, colWidths=[4*cm, 12*cm])
-    basic_info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Korean' if setup_korean_fonts() else 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    story.append(basic_info_table)
-    story.append(Spacer(1, 20))
-    
-    # 평가 기준 및 점수
-    if template and template.get('criteria'):
-        story.append(Paragraph("평가 기준 및 점수", styles['KoreanHeading']))
-        
-        # 점수 데이터를 딕셔너리로 변환
-        score_dict = {score.get('criterion_id'): score for score in scores}
-        
-        criteria_data = [['평가 항목', '배점', '획득 점수', '가중치', '비고']]
-        total_score = 0
-        max_total_score = 0
-        
-        for criterion in template['criteria']:
-            criterion_id = criterion.get('id')
-            score_data = score_dict.get(criterion_id, {})
-            
-            name = criterion.get('name', '알 수 없음')
-            max_score = criterion.get('max_score', 0)
-            weight = criterion.get('weight', 1.0)
-            bonus = '가점' if criterion.get('bonus', False) else ''
-            
-            achieved_score = score_data.get('score', 0)
-            weighted_score = achieved_score * weight
-            
-            criteria_data.append([
-                name,
-                f"{max_score}점",
-                f"{achieved_score}점",
-                f"x{weight}",
-                bonus
-            ])
-            
-            if not criterion.get('bonus', False):
-                total_score += weighted_score
-                max_total_score += max_score * weight
-        
-        # 총점 행 추가
-        criteria_data.append([
-            '총점',
-            f"{max_total_score}점",
-            f"{total_score}점",
-            '',
-            f"{(total_score/max_total_score*100):.1f}%" if max_total_score > 0 else "0%"
-        ])
-        
-        criteria_table = Table(criteria_data, colWidths=[5*cm, 2*cm, 2.5*cm, 2*cm, 4.5*cm])
-        criteria_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Korean' if setup_korean_fonts() else 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, 1), (-1, -2), colors.beige),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, -1), (-1, -1), 10),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT')  # 첫 번째 열은 왼쪽 정렬
-        ]))
-        
-        story.append(criteria_table)
-        story.append(Spacer(1, 20))
-    
-    # 종합 의견
-    if options and options.get('include_comments', True):
-        story.append(Paragraph("종합 의견", styles['KoreanHeading']))
-        
-        comments = evaluation.get('comments', '작성된 의견이 없습니다.')
-        story.append(Paragraph(comments, styles['KoreanNormal']))
-        story.append(Spacer(1, 20))
-    
-    # 서명 영역
-    signature_data = [
-        ['평가자 서명', ''],
-        ['날짜', datetime.now().strftime('%Y년 %m월 %d일')]
-    ]
-    
-    signature_table = Table(signature_data, colWidths=[4*cm, 12*cm])
-    signature_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Korean' if setup_korean_fonts() else 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('LINEBELOW', (1, 0), (1, 0), 1, colors.black),  # 서명란 밑줄
-    ]))
-    
-    story.append(signature_table)
-    
-    # PDF 생성
-    doc.build(story)
-    buffer.seek(0)
-    return buffer.getvalue()
+async def bulk_print_fingerprint(db, evaluation_ids: List[str], template_options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """일괄 출력 캐시 키 입력 - 평가 ID 와 수정 시각, 출력 옵션"""
+    versions = {
+        doc["id"]: doc.get("updated_at") or doc.get("submitted_at") or doc.get("created_at")
+        for doc in await db.evaluation_sheets.find(
+            {"id": {"$in": list(evaluation_ids)}}, {"id": 1, "updated_at": 1, "submitted_at": 1, "created_at": 1}
+        ).to_list(None)
+    }
+    return {
+        "kind": "print-bulk",
+        "evaluations": [(str(evaluation_id), versions.get(evaluation_id)) for evaluation_id in evaluation_ids],
+        "template_options": template_options or {},
+    }
 
-def create_chairman_summary_pdf(project_data: Dict[str, Any], options: Dict[str, Any] = None) -> bytes:
-    """위원장 종합 평가표 PDF 생성"""
-    if not PDF_ENABLED:
-        raise HTTPException(status_code=500, detail="PDF 생성 기능이 비활성화되어 있습니다")
-    
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*cm, bottomMargin=1*cm)
-    
-    # 스타일 설정
-    styles = create_pdf_styles()
-    story = []
-    
-    project = project_data["project"]
-    evaluations = project_data["evaluations"]
-    companies = project_data["companies"]
-    
-    # 제목
-    title = f"평가위원장 종합 평가표 - {project.get('name', '알 수 없음')}"
-    story.append(Paragraph(title, styles['KoreanTitle']))
-    story.append(Spacer(1, 12))
-    
-    # 프로젝트 정보
-    project_info_data = [
-        ['항목', '내용'],
-        ['프로젝트명', project.get('name', '알 수 없음')],
-        ['평가 기간', f"{project.get('start_date', '알 수 없음')} ~ {project.get('end_date', '알 수 없음')}"],
-        ['총 평가 건수', f"{len(evaluations)}건"],
-        ['작성일', datetime.now().strftime('%Y년 %m월 %d일')]
-    ]
-    
-    project_info_table = Table(project_info_data, colWidths=[4*cm, 12*cm])
-    project_info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Korean' if setup_korean_fonts() else 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    story.append(project_info_table)
-    story.append(Spacer(1, 20))
-    
-    # 평가 결과 요약
-    if options and options.get('include_statistics', True):
-        story.append(Paragraph("평가 결과 요약", styles['KoreanHeading']))
-        
-        # 기업별 점수 집계
-        company_scores = {}
-        for evaluation in evaluations:
-            company_id = evaluation.get('company_id')
-            if company_id not in company_scores:
-                company_scores[company_id] = []
-            
-            total_score = evaluation.get('total_score', 0)
-            company_scores[company_id].append(total_score)
-        
-        # 요약 테이블 데이터
-        summary_data = [['순위', '기업명', '평균 점수', '최고 점수', '최저 점수', '평가 횟수']]
-        
-        # 평균 점수로 정렬
-        sorted_companies = []
-        for company_id, scores in company_scores.items():
-            company = companies.get(company_id, {})
-            avg_score = sum(scores) / len(scores) if scores else 0
-            max_score = max(scores) if scores else 0
-            min_score = min(scores) if scores else 0
-            
-            sorted_companies.append({
-                'company_name': company.get('name', '알 수 없음'),
-                'avg_score': avg_score,
-                'max_score': max_score,
-                'min_score': min_score,
-                'count': len(scores)
-            })
-        
-        sorted_companies.sort(key=lambda x: x['avg_score'], reverse=True)
-        
-        for i, company in enumerate(sorted_companies, 1):
-            summary_data.append([
-                str(i),
-                company['company_name'],
-                f"{company['avg_score']:.1f}점",
-                f"{company['max_score']:.1f}점",
-                f"{company['min_score']:.1f}점",
-                f"{company['count']}회"
-            ])
-        
-        summary_table = Table(summary_data, colWidths=[1.5*cm, 4*cm, 2.5*cm, 2.5*cm, 2.5*cm, 3*cm])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Korean' if setup_korean_fonts() else 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT')  # 기업명은 왼쪽 정렬
-        ]))
-        
-        story.append(summary_table)
-        story.append(Spacer(1, 20))
-    
-    # 위원장 의견
-    story.append(Paragraph("위원장 종합 의견", styles['KoreanHeading']))
-    
-    opinion_text = """
-    본 평가는 공정하고 객관적인 기준에 따라 실시되었으며, 
-    각 기업의 사업성, 기술성, 혁신성 등을 종합적으로 검토하였습니다.
-    
-    평가 결과를 바탕으로 우수한 기업들이 선정되기를 권고하며,
-    향후 지속적인 모니터링과 지원이 필요합니다.
-    
-    [위원장 의견을 입력하세요]
+async def accessible_evaluation_ids(db, evaluation_ids: List[str], current_user: User) -> List[str]:
+    """출력할 수 있는 평가 ID (관리자/간사는 전체, 평가위원은 자신의 평가지만, 요청 순서 유지)"""
+    if current_user.role in ["admin", "secretary"]:
+        return list(evaluation_ids)
+    own = {
+        doc["id"]
+        for doc in await db.evaluation_sheets.find(
+            {"id": {"$in": list(evaluation_ids)}, "evaluator_id": current_user.id}, {"id": 1}
+        ).to_list(None)
+    }
+    return [evaluation_id for evaluation_id in evaluation_ids if evaluation_id in own]
+
+def print_artifact_key(evaluation_id: str, payload: Dict[str, Any], template_options: Optional[Dict[str, Any]]) -> str:
+    """평가표 PDF 저장소 키 - 개별 출력과 일괄 출력이 같은 문서를 공유"""
+    return export_artifact_store.fingerprint(
+        "print", evaluation_id, document_version(payload["evaluation"]), payload, "pdf", template_options
+    )
+
+async def render_bulk_entries(
+    db,
+    evaluation_ids: List[str],
+    template_options: Optional[Dict[str, Any]],
+    metrics: Optional[RenderMetrics] = None,
+    failed: Optional[List[Dict[str, Any]]] = None,
+    on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> AsyncIterator[Tuple[str, bytes]]:
+    """평가표를 렌더링 팜으로 생성해 완료되는 순서대로 ZIP 항목(파일명, PDF)으로 내보냄
+    
+    입력이 같은 평가표가 저장소에 있으면 렌더링하지 않고 저장된 문서를 사용하며,
+    새로 렌더링한 평가표는 저장소에 저장 (다음 개별/일괄 출력에서 재사용)
+    찾을 수 없거나 렌더링에 실패한 평가는 failed 에 기록하고 건너뜀
     """
+    failed = failed if failed is not None else []
+    company_names: Dict[str, str] = {}
+    missing: List[str] = []
+    artifact_keys: Dict[str, str] = {}
+    cached: Deque[Tuple[str, Dict[str, Any], StoredObject]] = deque()
+    
+    async def prefetched_batches():
+        # 평가 데이터는 묶음 단위로 미리 조회 - 다음 묶음을 조회하는 동안 앞 묶음이 렌더링됨
+        async for batch in fetch_evaluation_payloads(db, evaluation_ids):
+            ready = []
+            for evaluation_id, payload in batch:
+                if payload is None:
+                    missing.append(evaluation_id)
+                    failed.append({"evaluation_id": evaluation_id, "error": "평가를 찾을 수 없습니다"})
+                    continue
+                company_names[evaluation_id] = (payload["company"] or {}).get("name", "unknown")
+                key = artifact_keys[evaluation_id] = print_artifact_key(evaluation_id, payload, template_options)
+                artifact = export_artifact_store.lookup(key)
+                if artifact is not None:
+                    cached.append((evaluation_id, payload, artifact))
+                else:
+                    ready.append((evaluation_id, payload))
+            yield ready
+    
+    async def read_cached(evaluation_id: str, payload: Dict[str, Any], artifact: StoredObject) -> bytes:
+        try:
+            return await asyncio.to_thread(artifact.path.read_bytes)
+        except FileNotFoundError:
+            # 조회 후 정리(LRU/무효화)된 문서는 직접 렌더링
+            return await asyncio.to_thread(create_individual_evaluation_pdf, payload, template_options)
+    
+    processed = 0
+    
+    async def progressed():
+        nonlocal processed
+        processed += 1
+        if on_progress is not None:
+            await on_progress(processed + len(missing))
+    
+    async for document in pdf_render_farm.render(prefetched_batches(), template_options, metrics=metrics):
+        # 조회하는 동안 저장소에서 찾은 평가표를 먼저 전달
+        while cached:
+            evaluation_id, payload, artifact = cached.popleft()
+            content = await read_cached(evaluation_id, payload, artifact)
+            if metrics is not None:
+                metrics.cache_hits += 1
+            yield f"{company_names[evaluation_id]}_평가표_{evaluation_id}.pdf", content
+            await progressed()
+        if document.ok:
+            await asyncio.to_thread(
+                export_artifact_store.put, artifact_keys[document.key], document.content, [document.key]
+            )
+            yield f"{company_names[document.key]}_평가표_{document.key}.pdf", document.content
+        else:
+            failed.append({"evaluation_id": document.key, "error": document.error})
+        await progressed()
+    
+    while cached:
+        evaluation_id, payload, artifact = cached.popleft()
+        content = await read_cached(evaluation_id, payload, artifact)
+        if metrics is not None:
+            metrics.cache_hits += 1
+        yield f"{company_names[evaluation_id]}_평가표_{evaluation_id}.pdf", content
+        await progressed()
+
+def job_output_path(job_id: str, filename: str) -> Path:
+    """작업 결과 파일 경로 (outputs/jobs/<작업 ID>/<파일명>) - 캐시 정리와 관계없이 다운로드할 때까지 유지"""
+    return Path("outputs") / "jobs" / job_id / filename
+
+@job_handler("print")
+async def process_print_job(request_data: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """출력 작업 처리 (작업 큐 워커에서 실행, 예외 발생 시 백오프 후 재시도)"""
+    await ctx.progress(10)
     
-    story.append(Paragraph(opinion_text, styles['KoreanNormal']))
-    story.append(Spacer(1, 30))
-    
-    # 서명 영역
-    signature_data = [
-        ['평가위원장', ''],
-        ['직책/소속', ''],
-        ['서명', ''],
-        ['날짜', datetime.now().strftime('%Y년 %m월 %d일')]
-    ]
-    
-    signature_table = Table(signature_data, colWidths=[4*cm, 12*cm])
-    signature_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Korean' if setup_korean_fonts() else 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('LINEBELOW', (1, 0), (1, 2), 1, colors.black),  # 서명란 밑줄
-    ]))
+    from server import db
     
-    story.append(signature_table)
+    result_fields: Dict[str, Any] = {}
     
-    # PDF 생성
-    doc.build(story)
-    buffer.seek(0)
-    return buffer.getvalue()
-
-async def process_print_job(job_id: str, request_data: Dict[str, Any], user: User):
-    """비동기 출력 작업 처리"""
-    try:
-        print_jobs[job_id]["status"] = "processing"
-        print_jobs[job_id]["progress"] = 10
+    if request_data["print_type"] == "individual":
+        # 개별 평가표 생성 - 평가와 옵션이 같으면 저장소의 PDF 를 그대로 사용
+        evaluation_id = request_data["evaluation_ids"][0]
+        template_options = request_data.get("template_options", {})
+        evaluation_data = await get_evaluation_data(evaluation_id)
         
-        from server import db
+        await ctx.progress(50)
         
-        if request_data["print_type"] == "individual":
-            # 개별 평가표 생성
-            evaluation_id = request_data["evaluation_ids"][0]
-            evaluation_data = await get_evaluation_data(evaluation_id)
-            
-            print_jobs[job_id]["progress"] = 50
-            
-            pdf_content = create_individual_evaluation_pdf(
-                evaluation_data, 
-                request_data.get("template_options", {})
-            )
-            
-            # 파일 저장
-            filename = f"evaluation_{evaluation_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            file_path = f"outputs/{filename}"
-            
-            os.makedirs("outputs", exist_ok=True)
-            with open(file_path, "wb") as f:
-                f.write(pdf_content)
-            
-        elif request_data["print_type"] == "bulk":
-            # 전체 평가표 생성 (ZIP 파일)
-            import zipfile
-            
-            zip_filename = f"evaluations_bulk_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-            file_path = f"outputs/{zip_filename}"
-            
-            os.makedirs("outputs", exist_ok=True)
-            
-            with zipfile.ZipFile(file_path, 'w') as zipf:
-                total_evaluations = len(request_data["evaluation_ids"])
-                
-                for i, evaluation_id in enumerate(request_data["evaluation_ids"]):
-                    evaluation_data = await get_evaluation_data(evaluation_id)
-                    pdf_content = create_individual_evaluation_pdf(
-                        evaluation_data,
-                        request_data.get("template_options", {})
-                    )
-                    
-                    company_name = evaluation_data["company"].get("name", "unknown")
-                    pdf_filename = f"{company_name}_평가표_{evaluation_id}.pdf"
-                    
-                    zipf.writestr(pdf_filename, pdf_content)
-                    
-                    # 진행률 업데이트
-                    progress = 20 + int((i + 1) / total_evaluations * 70)
-                    print_jobs[job_id]["progress"] = progress
-        
-        elif request_data["print_type"] == "chairman":
-            # 위원장 종합 평가표 생성
-            project_id = request_data.get("project_id")
-            if not project_id:
-                raise ValueError("위원장 평가표 생성에는 프로젝트 ID가 필요합니다")
-            
-            # 프로젝트 데이터 조회
-            project = await db.projects.find_one({"_id": project_id})
-            evaluations = await db.evaluations.find({"project_id": project_id}).to_list(length=None)
-            
-            # 기업 정보 조회
-            company_ids = list(set([eval.get("company_id") for eval in evaluations]))
-            companies = {}
-            for company_id in company_ids:
-                company = await db.companies.find_one({"_id": company_id})
-                if company:
-                    companies[company_id] = company
+        artifact, cache_hit = await export_artifact_store.get_or_render(
+            print_artifact_key(evaluation_id, evaluation_data, template_options),
+            lambda: asyncio.to_thread(create_individual_evaluation_pdf, evaluation_data, template_options),
+            subjects=[evaluation_id],
+        )
+        filename = f"evaluation_{evaluation_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        file_path = str(await asyncio.to_thread(artifact.link_to, job_output_path(ctx.job_id, filename)))
+        result_fields = {"filename": filename, "cache_hit": cache_hit}
+        
+    elif request_data["print_type"] == "bulk":
+        # 전체 평가표 생성 (ZIP 파일) - 같은 평가/옵션의 ZIP 이 캐시에 있으면 재사용
+        evaluation_ids = request_data["evaluation_ids"]
+        template_options = request_data.get("template_options", {})
+        zip_filename = f"evaluations_bulk_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        cache_key = zip_archive_cache.request_key(await bulk_print_fingerprint(db, evaluation_ids, template_options))
+        cached = zip_archive_cache.lookup(cache_key)
+        
+        if cached is not None:
+            file_path = str(await asyncio.to_thread(cached.link_to, job_output_path(ctx.job_id, zip_filename)))
+            result_fields = {"filename": zip_filename, "cache_hit": True}
+        else:
+            total_evaluations = len(evaluation_ids)
+            metrics = RenderMetrics(workers=pdf_render_farm.workers)
+            failed: List[Dict[str, Any]] = []
+            last_progress = 20
             
-            project_data = {
-                "project": project,
-                "evaluations": evaluations,
-                "companies": companies
-            }
+            async def report_progress(processed: int):
+                nonlocal last_progress
+                # 진행률 업데이트 (값이 바뀔 때만 기록)
+                progress = 20 + int(processed / total_evaluations * 70)
+                if progress != last_progress:
+                    last_progress = progress
+                    await ctx.progress(progress)
             
-            print_jobs[job_id]["progress"] = 50
+            # 렌더링 팜이 완료한 문서부터 ZIP 으로 기록 (캐시 임시 파일에 바로 기록)
+            archive = zip_archive_cache.open_writer(cache_key)
+            try:
+                async for chunk in stream_zip(render_bulk_entries(
+                    db, evaluation_ids, template_options, metrics, failed, report_progress
+                )):
+                    archive.write(chunk)
+            except BaseException:
+                archive.abort()
+                raise
             
-            pdf_content = create_chairman_summary_pdf(
-                project_data,
-                request_data.get("template_options", {})
+            render_metrics = metrics.summary()
+            logger.info(
+                f"일괄 출력 렌더링: {render_metrics['rendered']}건, "
+                f"{render_metrics['documents_per_second']}건/초, 워커 {render_metrics['workers']}개, "
+                f"저장소 재사용 {render_metrics['cache_hits']}건",
+                extra={'job_id': ctx.job_id, 'failed': len(failed)}
             )
-            
-            # 파일 저장
-            filename = f"chairman_summary_{project_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            file_path = f"outputs/{filename}"
-            
-            os.makedirs("outputs", exist_ok=True)
-            with open(file_path, "wb") as f:
-                f.write(pdf_content)
-        
-        # 작업 완료
-        print_jobs[job_id]["status"] = "completed"
-        print_jobs[job_id]["progress"] = 100
-        print_jobs[job_id]["file_path"] = file_path
-        print_jobs[job_id]["completed_at"] = datetime.utcnow()
-        
-        logger.info(f"출력 작업 완료: {job_id}", extra={
-            'user_id': user.id,
-            'job_id': job_id,
-            'print_type': request_data["print_type"]
-        })
+            if failed and len(failed) == total_evaluations:
+                archive.abort()
+                raise ValueError(f"평가표를 생성하지 못했습니다: {failed[0]['error']}")
+            if failed:
+                # 일부가 빠진 ZIP 은 캐시하지 않음
+                ctx.completion_status = COMPLETED_WITH_ERRORS
+                file_path = str(archive.save_as(job_output_path(ctx.job_id, zip_filename)))
+            else:
+                committed = await asyncio.to_thread(archive.commit)
+                file_path = str(await asyncio.to_thread(committed.link_to, job_output_path(ctx.job_id, zip_filename)))
+            result_fields = {"filename": zip_filename, "render_metrics": render_metrics, "failed_evaluations": failed}
+    
+    elif request_data["print_type"] == "chairman":
+        # 위원장 종합 평가표 생성
+        project_id = request_data.get("project_id")
+        if not project_id:
+            raise ValueError("위원장 평가표 생성에는 프로젝트 ID가 필요합니다")
+        
+        # 프로젝트 데이터 조회
+        project = await db.projects.find_one({"id": project_id})
+        if not project:
+            raise ValueError(f"프로젝트를 찾을 수 없습니다: {project_id}")
+        evaluations = await db.evaluation_sheets.find({"project_id": project_id}, {"_id": 0}).to_list(length=None)
+        
+        # 기업 정보 조회 (기업 ID 목록을 한 번에 조회)
+        company_ids = list({evaluation.get("company_id") for evaluation in evaluations})
+        companies = {
+            company["id"]: company
+            for company in await db.companies.find({"id": {"$in": company_ids}}, {"_id": 0}).to_list(length=None)
+        }
         
-    except Exception as e:
-        print_jobs[job_id]["status"] = "failed"
-        print_jobs[job_id]["error_message"] = str(e)
-        logger.error(f"출력 작업 실패: {job_id}, 오류: {e}")
+        project_data = {
+            "project": project,
+            "evaluations": evaluations,
+            "companies": companies
+        }
+        template_options = request_data.get("template_options", {})
+        
+        await ctx.progress(50)
+        
+        # 프로젝트/평가/기업 입력이 같으면 저장소의 종합 평가표 사용 (평가 하나라도 수정되면 무효화)
+        artifact, cache_hit = await export_artifact_store.get_or_render(
+            export_artifact_store.fingerprint(
+                "chairman_summary", project_id, document_version(project), project_data, "pdf", template_options
+            ),
+            lambda: asyncio.to_thread(create_chairman_summary_pdf, project_data, template_options),
+            subjects=[project_id] + [evaluation["id"] for evaluation in evaluations],
+        )
+        filename = f"chairman_summary_{project_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        file_path = str(await asyncio.to_thread(artifact.link_to, job_output_path(ctx.job_id, filename)))
+        result_fields = {"filename": filename, "cache_hit": cache_hit}
+    
+    else:
+        raise ValueError(f"지원하지 않는 출력 타입입니다: {request_data['print_type']}")
+    
+    logger.info(f"출력 작업 완료: {ctx.job_id}", extra={
+        'user_id': ctx.job.get("created_by"),
+        'job_id': ctx.job_id,
+        'print_type': request_data["print_type"]
+    })
+    
+    return {"file_path": file_path, **result_fields}
 
 @evaluation_print_router.post("/print-request")
 async def create_print_job(
     request_data: EvaluationPrintRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """평가표 출력 작업 생성"""
@@ -621,23 +385,20 @@ async def create_print_job(
         if current_user.role not in ["admin", "secretary", "evaluator"]:
             raise HTTPException(status_code=403, detail="평가표 출력 권한이 없습니다")
         
-        # 작업 ID 생성
-        job_id = str(uuid.uuid4())
-        
-        # 작업 상태 초기화
-        print_jobs[job_id] = PrintJobStatus(
-            job_id=job_id,
-            status="pending",
-            created_at=datetime.utcnow()
-        ).dict()
+        # 평가위원은 자신의 평가지만 출력
+        from server import db
+        evaluation_ids = await accessible_evaluation_ids(db, request_data.evaluation_ids, current_user)
+        if len(evaluation_ids) != len(request_data.evaluation_ids):
+            raise HTTPException(status_code=403, detail="다른 평가위원의 평가표는 출력할 수 없습니다")
         
-        # 백그라운드 작업 시작
-        background_tasks.add_task(
-            process_print_job,
-            job_id,
+        # 작업 큐에 등록 (개별 출력은 대화형 요청이므로 우선 처리)
+        job = await job_queue.enqueue(
+            "print",
             request_data.dict(),
-            current_user
+            created_by=current_user.id,
+            priority=JobPriority.HIGH if request_data.print_type == "individual" else JobPriority.NORMAL
         )
+        job_id = job["job_id"]
         
         logger.info(f"출력 작업 생성: {job_id}", extra={
             'user_id': current_user.id,
@@ -651,10 +412,57 @@ async def create_print_job(
             "message": "출력 작업이 시작되었습니다"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"출력 작업 생성 오류: {e}")
         raise HTTPException(status_code=500, detail="출력 작업 생성 중 오류가 발생했습니다")
 
+@evaluation_print_router.post("/bulk-download")
+async def download_bulk_evaluations(
+    request_data: EvaluationPrintRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """전체 평가표 ZIP 즉시 다운로드 (작업 큐를 거치지 않고 렌더링되는 대로 스트리밍)
+    
+    같은 평가(수정 시각 포함)와 옵션의 ZIP 이 캐시에 있으면 디스크에서 전송합니다.
+    평가위원은 자신의 평가지만 포함됩니다.
+    """
+    if current_user.role not in ["admin", "secretary", "evaluator"]:
+        raise HTTPException(status_code=403, detail="평가표 출력 권한이 없습니다")
+    if not request_data.evaluation_ids:
+        raise HTTPException(status_code=400, detail="평가 ID 목록이 비어 있습니다")
+    
+    from server import db
+    
+    # 지문/렌더링 전에 출력할 수 있는 평가지로 제한
+    evaluation_ids = await accessible_evaluation_ids(db, request_data.evaluation_ids, current_user)
+    if not evaluation_ids:
+        raise HTTPException(status_code=403, detail="출력할 수 있는 평가표가 없습니다")
+    
+    template_options = request_data.template_options or {}
+    cache_key = zip_archive_cache.request_key(
+        await bulk_print_fingerprint(db, evaluation_ids, template_options)
+    )
+    failed: List[Dict[str, Any]] = []
+    zip_filename = f"evaluations_bulk_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    
+    logger.info("일괄 출력 스트리밍 다운로드", extra={
+        'user_id': current_user.id,
+        'evaluation_count': len(evaluation_ids)
+    })
+    
+    return zip_download_response(
+        request,
+        render_bulk_entries(db, evaluation_ids, template_options, failed=failed),
+        zip_filename,
+        zip_archive_cache,
+        cache_key,
+        # 일부가 빠진 ZIP 은 캐시하지 않음
+        store=lambda: not failed,
+    )
+
 @evaluation_print_router.get("/print-status/{job_id}")
 async def get_print_job_status(
     job_id: str,
@@ -662,14 +470,14 @@ async def get_print_job_status(
 ):
     """출력 작업 상태 조회"""
     try:
-        if job_id not in print_jobs:
+        job_status = await job_queue.get(job_id, PRINT_JOB_TYPES)
+        if not job_status:
             raise HTTPException(status_code=404, detail="출력 작업을 찾을 수 없습니다")
-        
-        job_status = print_jobs[job_id]
+        ensure_job_access(job_status, current_user, "조회")
         
         return {
             "success": True,
-            "job_status": job_status
+            "job_status": public_job(job_status)
         }
         
     except HTTPException:
@@ -685,20 +493,20 @@ async def download_print_result(
 ):
     """출력 결과 다운로드"""
     try:
-        if job_id not in print_jobs:
+        job_status = await job_queue.get(job_id, PRINT_JOB_TYPES)
+        if not job_status:
             raise HTTPException(status_code=404, detail="출력 작업을 찾을 수 없습니다")
+        ensure_job_access(job_status, current_user, "다운로드")
         
-        job_status = print_jobs[job_id]
-        
-        if job_status["status"] != "completed":
+        if job_status["status"] not in COMPLETED_STATUSES:
             raise HTTPException(status_code=400, detail="출력 작업이 완료되지 않았습니다")
         
-        file_path = job_status["file_path"]
+        file_path = job_status.get("file_path")
         if not file_path or not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="출력 파일을 찾을 수 없습니다")
         
-        # 파일 이름 추출
-        filename = os.path.basename(file_path)
+        # 파일 이름 (캐시에 저장된 ZIP 은 작업 결과의 파일명 사용)
+        filename = job_status.get("filename") or os.path.basename(file_path)
         
         # 파일 다운로드 응답
         return FileResponse(
@@ -716,7 +524,6 @@ async def download_print_result(
 @evaluation_print_router.post("/chairman-summary")
 async def create_chairman_summary(
     request_data: ChairmanSummaryRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """위원장 종합 평가표 생성"""
@@ -725,28 +532,14 @@ async def create_chairman_summary(
         if current_user.role not in ["admin", "secretary"]:
             raise HTTPException(status_code=403, detail="위원장 평가표 생성 권한이 없습니다")
         
-        # 작업 ID 생성
-        job_id = str(uuid.uuid4())
-        
-        # 작업 상태 초기화
-        print_jobs[job_id] = PrintJobStatus(
-            job_id=job_id,
-            status="pending",
-            created_at=datetime.utcnow()
-        ).dict()
-        
         # 요청 데이터에 프로젝트 ID 추가
         request_dict = request_data.dict()
         request_dict["print_type"] = "chairman"
         request_dict["evaluation_ids"] = request_data.evaluation_ids or []
         
-        # 백그라운드 작업 시작
-        background_tasks.add_task(
-            process_print_job,
-            job_id,
-            request_dict,
-            current_user
-        )
+        # 작업 큐에 등록
+        job = await job_queue.enqueue("print", request_dict, created_by=current_user.id)
+        job_id = job["job_id"]
         
         logger.info(f"위원장 평가표 생성 작업: {job_id}", extra={
             'user_id': current_user.id,
@@ -775,18 +568,8 @@ async def get_print_jobs(
         if current_user.role not in ["admin", "secretary"]:
             raise HTTPException(status_code=403, detail="출력 작업 목록 조회 권한이 없습니다")
         
-        # 작업 목록 필터링
-        jobs = []
-        for job_data in print_jobs.values():
-            if status and job_data["status"] != status:
-                continue
-            jobs.append(job_data)
-        
-        # 생성일 기준 내림차순 정렬
-        jobs.sort(key=lambda x: x["created_at"], reverse=True)
-        
-        # 제한된 수만 반환
-        jobs = jobs[:limit]
+        # 생성일 기준 내림차순으로 제한된 수만 조회
+        jobs = [public_job(job) for job in await job_queue.list(PRINT_JOB_TYPES, status=status, limit=limit)]
         
         return {
             "success": True,
@@ -798,4 +581,34 @@ async def get_print_jobs(
         raise
     except Exception as e:
         logger.error(f"출력 작업 목록 조회 오류: {e}")
-        raise HTTPException(status_code=500, detail="출력 작업 목록 조회 중 오류가 발생했습니다")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="출력 작업 목록 조회 중 오류가 발생했습니다")
+
+
+@evaluation_print_router.post("/jobs/{job_id}/cancel")
+async def cancel_print_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """출력 작업 취소 (처리 중인 작업은 워커가 다음 하트비트에서 중단)"""
+    try:
+        job_status = await job_queue.get(job_id, PRINT_JOB_TYPES)
+        if not job_status:
+            raise HTTPException(status_code=404, detail="출력 작업을 찾을 수 없습니다")
+        
+        ensure_job_access(job_status, current_user, "취소")
+        
+        job = await job_queue.cancel(job_id)
+        if not job:
+            raise HTTPException(status_code=400, detail="이미 완료된 작업은 취소할 수 없습니다")
+        
+        return {
+            "success": True,
+            "job_status": public_job(job),
+            "message": "출력 작업 취소가 요청되었습니다"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"출력 작업 취소 오류: {e}")
+        raise HTTPException(status_code=500, detail="출력 작업 취소 중 오류가 발생했습니다")
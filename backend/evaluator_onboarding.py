@@ -0,0 +1,374 @@
+"""
+Bulk Evaluator Onboarding
+CSV/XLSX 명단으로 평가위원을 일괄 등록하는 파이프라인
+
+- 생성될 login_id 전체를 $in 조회 한 번으로 중복 검사 (행마다 find_one 하지 않음)
+- 비밀번호 해시는 프로세스 풀에 묶음 단위로 분산해 이벤트 루프와 웹 요청 처리에 영향을 주지 않음
+- 순서 없는(unordered) insert_many 한 번으로 저장하고, 행별 중복 키 오류를 원래 행 번호로 매핑
+- 단계별 진행 상황을 이벤트로 내보내 NDJSON 스트림으로 전달
+"""
+
+import asyncio
+import csv
+import io
+import logging
+import math
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import BulkWriteError
+
+import security
+from dashboard_counters import dashboard_counters
+from models import EvaluatorCreate, User, UserResponse
+from security import _hash_password_sync, generate_evaluator_credentials
+
+logger = logging.getLogger(__name__)
+
+ONBOARDING_MAX_ROWS = int(os.getenv("ONBOARDING_MAX_ROWS", "5000"))
+ONBOARDING_MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+ONBOARDING_HASH_WORKERS = int(os.getenv("ONBOARDING_HASH_WORKERS", str(min(os.cpu_count() or 1, 8))))
+DUPLICATE_KEY_ERROR = 11000
+
+# 명단 헤더 별칭 (영문 필드명 또는 한글 컬럼명 허용)
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "user_name": ("user_name", "name", "이름", "성명", "평가위원명"),
+    "phone": ("phone", "전화번호", "연락처", "휴대폰", "휴대전화"),
+    "email": ("email", "이메일", "메일", "e-mail"),
+}
+
+
+@dataclass
+class RosterRow:
+    """명단의 한 행 (row_number 는 헤더를 1행으로 하는 원본 행 번호)"""
+    row_number: int
+    data: Dict[str, Any]
+
+
+@dataclass
+class _Candidate:
+    row_number: int
+    evaluator: EvaluatorCreate
+    login_id: str
+    password: str
+    password_hash: Optional[str] = None
+    document: Dict[str, Any] = field(default_factory=dict)
+
+
+def _cell_text(value: Any) -> str:
+    """셀 값을 문자열로 정규화 (엑셀이 숫자로 저장한 전화번호의 앞자리 0 복원)"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int):
+        digits = str(value)
+        if digits.startswith("1") and len(digits) in (9, 10):
+            return f"0{digits}"
+        return digits
+    return str(value).strip()
+
+
+def _header_mapping(header: List[Any]) -> Dict[int, str]:
+    mapping: Dict[int, str] = {}
+    for index, name in enumerate(header):
+        normalized = _cell_text(name).lower().replace(" ", "")
+        for field_name, aliases in FIELD_ALIASES.items():
+            if normalized in aliases and field_name not in mapping.values():
+                mapping[index] = field_name
+    missing = [f for f in FIELD_ALIASES if f not in mapping.values()]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"명단에 필수 컬럼이 없습니다: {', '.join(missing)}")
+    return mapping
+
+
+def _rows_from_table(table: List[List[Any]]) -> List[RosterRow]:
+    if not table:
+        raise HTTPException(status_code=400, detail="빈 명단 파일입니다.")
+
+    mapping = _header_mapping(table[0])
+    rows = []
+    for offset, values in enumerate(table[1:], start=2):
+        data = {
+            field_name: _cell_text(values[index]) if index < len(values) else ""
+            for index, field_name in mapping.items()
+        }
+        if not any(data.values()):
+            continue
+        rows.append(RosterRow(row_number=offset, data=data))
+
+    if len(rows) > ONBOARDING_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {ONBOARDING_MAX_ROWS}명까지 등록할 수 있습니다.")
+    return rows
+
+
+def _read_csv(content: bytes) -> List[List[Any]]:
+    # 엑셀에서 저장한 CSV 는 BOM 이 붙거나 CP949 로 인코딩된 경우가 많음
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            text = content.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise HTTPException(status_code=400, detail="CSV 파일 인코딩을 인식할 수 없습니다 (UTF-8/CP949).")
+    return [row for row in csv.reader(io.StringIO(text))]
+
+
+def _read_xlsx(content: bytes) -> List[List[Any]]:
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"엑셀 파일을 읽을 수 없습니다: {str(e)}")
+    try:
+        sheet = workbook.worksheets[0]
+        return [list(row) for row in sheet.iter_rows(values_only=True)]
+    finally:
+        workbook.close()
+
+
+def parse_roster(filename: str, content: bytes) -> List[RosterRow]:
+    """CSV/XLSX 명단을 행 목록으로 변환 (CPU 작업이므로 asyncio.to_thread 로 호출)"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".csv":
+        table = _read_csv(content)
+    elif extension == ".xlsx":
+        table = _read_xlsx(content)
+    else:
+        raise HTTPException(status_code=400, detail="CSV 또는 XLSX 파일만 업로드할 수 있습니다.")
+    return _rows_from_table(table)
+
+
+def roster_from_models(evaluators: List[EvaluatorCreate]) -> List[RosterRow]:
+    """JSON 요청 본문을 명단 행으로 변환 (행 번호는 1부터)"""
+    if len(evaluators) > ONBOARDING_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {ONBOARDING_MAX_ROWS}명까지 등록할 수 있습니다.")
+    return [RosterRow(row_number=i, data=e.model_dump()) for i, e in enumerate(evaluators, start=1)]
+
+
+def _hash_passwords(passwords: List[str], rounds: int) -> List[str]:
+    """프로세스 풀 작업 단위 - 묶음 단위로 전달해 프로세스 간 통신 비용을 줄임"""
+    return [_hash_password_sync(password, rounds) for password in passwords]
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first.get("loc", ()))
+    return f"{location}: {first.get('msg', '유효하지 않은 값')}"
+
+
+async def ensure_user_indexes(db) -> None:
+    """login_id/email 고유 인덱스 생성
+
+    일괄 등록은 insert_many 의 행별 중복 키 오류로 동시 등록 경합을 잡으므로 이 인덱스가 있어야 합니다.
+    기존 데이터의 이메일 중복이 login_id 인덱스 생성을 막지 않도록 하나씩 생성합니다.
+    """
+    indexes = [
+        IndexModel([("login_id", ASCENDING)], unique=True, name="uniq_login_id"),
+        IndexModel([("email", ASCENDING)], unique=True,
+                   partialFilterExpression={"email": {"$type": "string"}}, name="uniq_email"),
+    ]
+    for index in indexes:
+        try:
+            await db.users.create_indexes([index])
+        except Exception as e:
+            logger.error(f"Failed to create unique index {index.document['name']} for users: {e}")
+
+
+def _duplicate_key_message(write_error: Dict[str, Any]) -> str:
+    key_pattern = write_error.get("keyPattern") or {}
+    if "email" in key_pattern:
+        return "이미 사용 중인 이메일"
+    return "이미 존재하는 평가위원"
+
+
+class EvaluatorOnboarding:
+    """평가위원 일괄 등록 파이프라인
+
+    hash_workers=0 이면 프로세스 풀 대신 스레드로 해시합니다 (bcrypt 는 GIL 을 해제).
+    """
+
+    def __init__(self, db=None, hash_workers: int = ONBOARDING_HASH_WORKERS):
+        self.db = db
+        self.hash_workers = hash_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # 이벤트 루프 스레드와 DB 클라이언트를 가진 프로세스를 fork 하지 않도록 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.hash_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _hash_chunk(self, passwords: List[str], rounds: int) -> List[str]:
+        if self.hash_workers <= 0:
+            return await asyncio.to_thread(_hash_passwords, passwords, rounds)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), _hash_passwords, passwords, rounds)
+        except BrokenProcessPool:
+            logger.warning("Password hash process pool broke; recreating")
+            self.shutdown()
+            return await loop.run_in_executor(self._get_executor(), _hash_passwords, passwords, rounds)
+
+    def _validate(self, rows: List[RosterRow]) -> Tuple[List[_Candidate], List[Dict[str, Any]]]:
+        candidates: List[_Candidate] = []
+        errors: List[Dict[str, Any]] = []
+        seen: Dict[str, int] = {}
+
+        for row in rows:
+            user_name = row.data.get("user_name") or ""
+            try:
+                evaluator = EvaluatorCreate(**row.data)
+            except ValidationError as e:
+                errors.append(self._row_error(row.row_number, user_name, f"입력값 오류 ({_validation_message(e)})"))
+                continue
+
+            login_id, password = generate_evaluator_credentials(evaluator.user_name, evaluator.phone)
+            if not login_id:
+                errors.append(self._row_error(row.row_number, user_name, "이름이 비어 있습니다"))
+                continue
+            if login_id in seen:
+                errors.append(self._row_error(
+                    row.row_number, user_name, f"명단 내 중복 ({seen[login_id]}행과 동일한 아이디)", login_id
+                ))
+                continue
+
+            seen[login_id] = row.row_number
+            candidates.append(_Candidate(row.row_number, evaluator, login_id, password))
+
+        return candidates, errors
+
+    @staticmethod
+    def _row_error(row_number: int, user_name: str, message: str, login_id: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "row": row_number,
+            "user_name": user_name,
+            "login_id": login_id,
+            "error": f"{message}: {user_name}" if user_name else message,
+        }
+
+    @staticmethod
+    def _progress(stage: str, processed: int, total: int) -> Dict[str, Any]:
+        return {"event": "progress", "stage": stage, "processed": processed, "total": total}
+
+    async def run(self, rows: List[RosterRow]) -> AsyncIterator[Dict[str, Any]]:
+        """진행 이벤트를 순서대로 내보내고 마지막에 result 이벤트를 내보냄"""
+        total = len(rows)
+        candidates, errors = self._validate(rows)
+        yield self._progress("validated", total, total)
+
+        # 1) 기존 사용자 중복 검사 - $in 조회 한 번
+        if candidates:
+            login_ids = [c.login_id for c in candidates]
+            existing = {
+                doc["login_id"]
+                async for doc in self.db.users.find({"login_id": {"$in": login_ids}}, {"login_id": 1, "_id": 0})
+            }
+            if existing:
+                remaining = []
+                for candidate in candidates:
+                    if candidate.login_id in existing:
+                        errors.append(self._row_error(
+                            candidate.row_number, candidate.evaluator.user_name, "이미 존재하는 평가위원", candidate.login_id
+                        ))
+                    else:
+                        remaining.append(candidate)
+                candidates = remaining
+        yield self._progress("checked", len(candidates), total)
+
+        # 2) 비밀번호 해시 - 워커 수의 몇 배로 묶음을 나눠 완료되는 대로 진행률 보고
+        if candidates:
+            rounds = security.BCRYPT_ROUNDS
+            workers = max(self.hash_workers, 1)
+            chunk_size = max(1, math.ceil(len(candidates) / (workers * 4)))
+            chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+
+            async def hash_chunk(chunk: List[_Candidate]) -> List[_Candidate]:
+                hashes = await self._hash_chunk([c.password for c in chunk], rounds)
+                for candidate, password_hash in zip(chunk, hashes):
+                    candidate.password_hash = password_hash
+                return chunk
+
+            hashed = 0
+            for finished in asyncio.as_completed([hash_chunk(chunk) for chunk in chunks]):
+                hashed += len(await finished)
+                yield self._progress("hashing", hashed, len(candidates))
+
+        # 3) 순서 없는 insert_many 한 번 - 실패한 행만 오류로 매핑하고 나머지는 저장
+        created: List[Dict[str, Any]] = []
+        if candidates:
+            for candidate in candidates:
+                user = User(
+                    id=str(uuid.uuid4()),
+                    login_id=candidate.login_id,
+                    password_hash=candidate.password_hash,
+                    user_name=candidate.evaluator.user_name,
+                    email=candidate.evaluator.email,
+                    phone=candidate.evaluator.phone,
+                    role="evaluator",
+                )
+                candidate.document = user.model_dump()
+
+            failed_indexes: Dict[int, str] = {}
+            try:
+                await self.db.users.insert_many([c.document for c in candidates], ordered=False)
+            except BulkWriteError as e:
+                for write_error in e.details.get("writeErrors", []):
+                    if write_error.get("code") == DUPLICATE_KEY_ERROR:
+                        failed_indexes[write_error["index"]] = _duplicate_key_message(write_error)
+                    else:
+                        failed_indexes[write_error["index"]] = f"저장 실패 ({write_error.get('errmsg', '알 수 없는 오류')})"
+
+            for index, candidate in enumerate(candidates):
+                if index in failed_indexes:
+                    errors.append(self._row_error(
+                        candidate.row_number, candidate.evaluator.user_name, failed_indexes[index], candidate.login_id
+                    ))
+                    continue
+                created.append({
+                    "row": candidate.row_number,
+                    "user": UserResponse(**candidate.document).model_dump(),
+                    "credentials": {"login_id": candidate.login_id, "password": candidate.password},
+                })
+
+            await dashboard_counters.user_created("evaluator", True, count=len(created))
+        yield self._progress("inserted", len(created), total)
+
+        errors.sort(key=lambda error: error["row"])
+        yield {
+            "event": "result",
+            "total_rows": total,
+            "created_count": len(created),
+            "error_count": len(errors),
+            "created_evaluators": created,
+            "errors": errors,
+        }
+
+    async def onboard(self, rows: List[RosterRow]) -> Dict[str, Any]:
+        """진행 이벤트 없이 최종 결과만 반환"""
+        result: Dict[str, Any] = {}
+        async for event in self.run(rows):
+            if event["event"] == "result":
+                result = event
+        return result
+
+
+evaluator_onboarding = EvaluatorOnboarding()
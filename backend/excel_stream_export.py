@@ -0,0 +1,347 @@
+"""
+Streaming Excel Export
+평가 결과 Excel 을 pandas DataFrame 없이 xlsxwriter constant_memory 모드로 한 번에 기록하는 내보내기 엔진
+
+- 평가지는 Motor 커서에서 묶음 단위로 읽고, 관계(프로젝트/기업/평가위원/템플릿)와 점수는 묶음마다 $in 조회
+- constant_memory 모드는 행을 쓰는 즉시 임시 파일로 내보내므로 메모리에는 현재 행 하나만 남음
+  → 평가지 수와 관계없이 요약 시트의 메모리 사용량이 일정 (평가별 상세 시트는 시트 객체 크기만큼만 증가)
+- 셀 서식은 워크북을 열 때 한 번만 만들어 모든 행이 공유
+- 기업별 요약(피벗) 시트는 같은 순회에서 기업별 합계/최고/최저/항목 평균을 누적해 마지막에 기록
+- 요약 시트의 항목 열은 내보낼 평가지들의 템플릿에서 미리 정함 (constant_memory 는 머리행을 나중에 쓸 수 없음)
+- xlsxwriter 쓰기는 CPU 작업이므로 묶음 단위로 스레드에서 실행해 이벤트 루프를 막지 않음
+"""
+
+import asyncio
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterable, List, Optional, Sequence, Union
+
+import xlsxwriter
+
+from relation_loader import RelationLoader
+from scoring_engine import score_sheet, template_items
+
+logger = logging.getLogger(__name__)
+
+EXCEL_EXPORT_BATCH_SIZE = int(os.getenv("EXCEL_EXPORT_BATCH_SIZE", "200"))
+EXCEL_EXPORT_TMPDIR = os.getenv("EXCEL_EXPORT_TMPDIR") or None
+
+SUMMARY_COLUMNS = ['NO', '프로젝트명', '평가대상기업', '담당자', '연락처', '평가표', '평가위원', '제출일시', '총점', '상태']
+SUMMARY_WIDTHS = [6, 20, 20, 10, 15, 20, 12, 17, 8, 10]
+PIVOT_COLUMNS = ['순위', '평가대상기업', '평가 수', '평균 총점', '최고 총점', '최저 총점']
+DETAIL_COLUMNS = ['항목명', '설명', '배점', '획득점수', '가중치', '가중점수', '평가의견']
+DETAIL_WIDTHS = [15, 30, 8, 10, 8, 10, 40]
+OPINION_PREVIEW_LENGTH = 100
+
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+def item_columns(templates: Iterable[Optional[Dict[str, Any]]]) -> List[str]:
+    """템플릿들의 평가 항목 이름 (처음 나온 순서, 중복 제거)"""
+    names: Dict[str, None] = {}
+    for template in templates:
+        for item in template_items(template):
+            if item.get('name'):
+                names.setdefault(item['name'], None)
+    return list(names)
+
+
+def _submitted_text(sheet: Dict[str, Any]) -> str:
+    submitted_at = sheet.get('submitted_at')
+    return submitted_at.strftime('%Y-%m-%d %H:%M') if hasattr(submitted_at, 'strftime') else (submitted_at or '')
+
+
+def _opinion_preview(opinion: Optional[str]) -> str:
+    opinion = opinion or ''
+    return opinion[:OPINION_PREVIEW_LENGTH] + '...' if len(opinion) > OPINION_PREVIEW_LENGTH else opinion
+
+
+@dataclass
+class _CompanyTotals:
+    """기업별 요약 누적값"""
+    name: str
+    count: int = 0
+    total: float = 0.0
+    best: float = float('-inf')
+    worst: float = float('inf')
+    item_sums: Dict[str, List[float]] = field(default_factory=dict)  # 항목명 -> [합계, 개수]
+
+    def add(self, score: float, item_scores: Dict[str, float]) -> None:
+        self.count += 1
+        self.total += score
+        self.best = max(self.best, score)
+        self.worst = min(self.worst, score)
+        for name, value in item_scores.items():
+            sums = self.item_sums.setdefault(name, [0.0, 0])
+            sums[0] += value
+            sums[1] += 1
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def item_average(self, name: str) -> Optional[float]:
+        sums = self.item_sums.get(name)
+        return round(sums[0] / sums[1], 1) if sums and sums[1] else None
+
+
+class EvaluationWorkbookWriter:
+    """평가 결과 워크북 작성기 (constant_memory - 시트마다 행을 위에서 아래로 한 번만 기록)
+
+    시트 구성: 요약(평가지당 1행) → 기업별 요약(피벗) → [평가별 상세 시트]
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], item_names: Sequence[str] = (),
+                 detail_sheets: bool = False, summary_sheet_name: str = '평가결과요약',
+                 tmpdir: Optional[str] = EXCEL_EXPORT_TMPDIR):
+        self.workbook = xlsxwriter.Workbook(target, {"constant_memory": True, "tmpdir": tmpdir})
+        self.item_names = list(item_names)
+        self.detail_sheets = detail_sheets
+        self.count = 0
+        self.project_name: Optional[str] = None
+        self._companies: Dict[Any, _CompanyTotals] = {}
+        self._sheet_names: set = set()
+        self._closed = False
+        self.formats = self._create_formats()
+
+        self.summary = self.workbook.add_worksheet(summary_sheet_name)
+        self.pivot = self.workbook.add_worksheet('기업별요약')
+        self._sheet_names.update({summary_sheet_name.lower(), '기업별요약'})
+        self._write_summary_header()
+
+    def _create_formats(self) -> Dict[str, Any]:
+        add = self.workbook.add_format
+        return {
+            "header": add({"bold": True, "bg_color": "#CCCCCC", "border": 1, "align": "center", "valign": "vcenter"}),
+            "text": add({"border": 1}),
+            "wrap": add({"border": 1, "text_wrap": True, "valign": "top"}),
+            "center": add({"border": 1, "align": "center"}),
+            "score": add({"border": 1, "align": "center", "num_format": "0.0"}),
+            "total": add({"bold": True, "bg_color": "#E6F3FF", "border": 1, "align": "center", "num_format": "0.0"}),
+        }
+
+    def _write_summary_header(self) -> None:
+        header = self.formats["header"]
+        columns = SUMMARY_COLUMNS + [
+            column for name in self.item_names for column in (f"{name}_점수", f"{name}_의견")
+        ]
+        for col, width in enumerate(SUMMARY_WIDTHS):
+            self.summary.set_column(col, col, width)
+        if self.item_names:
+            self.summary.set_column(len(SUMMARY_COLUMNS), len(columns) - 1, 14)
+        self.summary.write_row(0, 0, columns, header)
+        self.summary.freeze_panes(1, 0)
+
+        self.pivot.set_column(0, 0, 6)
+        self.pivot.set_column(1, 1, 20)
+        self.pivot.set_column(2, len(PIVOT_COLUMNS) + len(self.item_names) - 1, 11)
+        self.pivot.write_row(0, 0, PIVOT_COLUMNS + [f"{name}_평균" for name in self.item_names], header)
+
+    def _unique_sheet_name(self, name: str) -> str:
+        name = _INVALID_SHEET_CHARS.sub('_', name).strip("'")[:31] or '평가'
+        candidate, number = name, 2
+        while candidate.lower() in self._sheet_names:
+            suffix = f"({number})"
+            candidate, number = name[:31 - len(suffix)] + suffix, number + 1
+        self._sheet_names.add(candidate.lower())
+        return candidate
+
+    def add(self, evaluation_data: Dict[str, Any]) -> None:
+        """평가지 1건 기록 (요약 행, 피벗 누적, 상세 시트)"""
+        sheet, company = evaluation_data['sheet'], evaluation_data['company']
+        template, evaluator = evaluation_data['template'], evaluation_data['evaluator']
+        project_name = evaluation_data['project']['name']
+        self.project_name = self.project_name or project_name
+        self.count += 1
+        row_number = self.count
+
+        answered = [row for row in score_sheet(template_items(template), evaluation_data['scores']).items
+                    if row['score'] is not None]
+        total = round(sheet.get('weighted_score', 0) or 0, 1)
+
+        # 요약 행
+        formats = self.formats
+        values = [
+            (row_number, formats["center"]),
+            (project_name, formats["text"]),
+            (company['name'], formats["text"]),
+            (company.get('contact_person', ''), formats["text"]),
+            (company.get('phone', ''), formats["text"]),
+            (template['name'], formats["text"]),
+            (evaluator['user_name'], formats["text"]),
+            (_submitted_text(sheet), formats["center"]),
+            (total, formats["score"]),
+            ('제출완료' if sheet.get('status') == 'submitted' else '평가중', formats["center"]),
+        ]
+        for col, (value, cell_format) in enumerate(values):
+            self.summary.write(row_number, col, value, cell_format)
+        by_name = {row['item']['name']: row for row in answered}
+        for index, name in enumerate(self.item_names):
+            scored = by_name.get(name)
+            if scored is None:
+                continue
+            col = len(SUMMARY_COLUMNS) + index * 2
+            self.summary.write(row_number, col, scored['score_doc']['score'], formats["center"])
+            self.summary.write(row_number, col + 1, _opinion_preview(scored['score_doc'].get('opinion')), formats["text"])
+
+        # 기업별 누적
+        key = company.get('id') or company['name']
+        totals = self._companies.get(key)
+        if totals is None:
+            totals = self._companies[key] = _CompanyTotals(company['name'])
+        totals.add(total, {name: row['score'] for name, row in by_name.items()})
+
+        if self.detail_sheets:
+            self._write_detail_sheet(evaluation_data, answered, row_number)
+
+    def add_many(self, batch: Iterable[Dict[str, Any]]) -> None:
+        for evaluation_data in batch:
+            self.add(evaluation_data)
+
+    def _write_detail_sheet(self, evaluation_data: Dict[str, Any], answered: List[Dict[str, Any]], number: int) -> None:
+        sheet, formats = evaluation_data['sheet'], self.formats
+        worksheet = self.workbook.add_worksheet(
+            self._unique_sheet_name(f"평가_{number}_{evaluation_data['company']['name'][:10]}")
+        )
+        for col, width in enumerate(DETAIL_WIDTHS):
+            worksheet.set_column(col, col, width)
+
+        worksheet.write_row(0, 0, ['항목', '내용'], formats["header"])
+        basic_info = [
+            ['프로젝트명', evaluation_data['project']['name']],
+            ['평가대상기업', evaluation_data['company']['name']],
+            ['평가표', evaluation_data['template']['name']],
+            ['평가위원', evaluation_data['evaluator']['user_name']],
+            ['제출일시', _submitted_text(sheet)],
+            ['총점', f"{sheet.get('weighted_score', 0) or 0:.1f}점"],
+        ]
+        for row, values in enumerate(basic_info, 1):
+            worksheet.write_row(row, 0, values, formats["text"])
+
+        row = len(basic_info) + 3
+        worksheet.write_row(row, 0, DETAIL_COLUMNS, formats["header"])
+        for scored in answered:
+            row += 1
+            item, score_info = scored['item'], scored['score_doc']
+            worksheet.write(row, 0, item['name'], formats["text"])
+            worksheet.write(row, 1, item.get('description', ''), formats["wrap"])
+            worksheet.write(row, 2, item.get('max_score'), formats["center"])
+            worksheet.write(row, 3, score_info['score'], formats["center"])
+            worksheet.write(row, 4, item.get('weight', 1), formats["center"])
+            worksheet.write(row, 5, round(scored['weighted_score'], 1), formats["score"])
+            worksheet.write(row, 6, score_info.get('opinion', ''), formats["wrap"])
+
+        # 다 쓴 상세 시트의 임시 파일 핸들은 닫아 둠 (저장 시 xlsxwriter 가 다시 열어 남은 행을 기록)
+        # 평가 수천 건의 상세 시트를 만들어도 열린 파일 수가 늘지 않음
+        close = getattr(worksheet, "_opt_close", None)
+        if close is not None:
+            close()
+
+    def _write_pivot(self) -> None:
+        formats = self.formats
+        ranked = sorted(self._companies.values(), key=lambda totals: totals.average, reverse=True)
+        for rank, totals in enumerate(ranked, 1):
+            self.pivot.write(rank, 0, rank, formats["center"])
+            self.pivot.write(rank, 1, totals.name, formats["text"])
+            self.pivot.write(rank, 2, totals.count, formats["center"])
+            self.pivot.write(rank, 3, round(totals.average, 1), formats["score"])
+            self.pivot.write(rank, 4, totals.best, formats["score"])
+            self.pivot.write(rank, 5, totals.worst, formats["score"])
+            for index, name in enumerate(self.item_names):
+                average = totals.item_average(name)
+                if average is not None:
+                    self.pivot.write(rank, len(PIVOT_COLUMNS) + index, average, formats["score"])
+
+        # 전체 행
+        if ranked:
+            row = len(ranked) + 1
+            count = sum(totals.count for totals in ranked)
+            self.pivot.write_row(row, 0, ['', '전체', count], formats["total"])
+            self.pivot.write(row, 3, round(sum(totals.total for totals in ranked) / count, 1), formats["total"])
+            self.pivot.write(row, 4, max(totals.best for totals in ranked), formats["total"])
+            self.pivot.write(row, 5, min(totals.worst for totals in ranked), formats["total"])
+
+    def close(self) -> None:
+        """피벗 시트를 기록하고 워크북 저장 (임시 행 파일 정리 포함)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_pivot()
+        self.workbook.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"evaluations": self.count, "companies": len(self._companies), "project_name": self.project_name}
+
+
+async def iter_evaluation_exports(db, query: Dict[str, Any],
+                                  batch_size: int = EXCEL_EXPORT_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+    """제출된 평가지를 커서에서 묶음 단위로 읽어 내보내기 데이터(sheet/company/project/template/evaluator/scores)로 조합
+
+    관련 문서가 없는 평가지는 건너뜁니다.
+    """
+    loader = RelationLoader(db)
+
+    async def hydrate(sheets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        sheet_ids = [sheet['id'] for sheet in sheets]
+        related_list, score_docs = await asyncio.gather(
+            loader.hydrate(sheets),
+            db.evaluation_scores.find(
+                {"sheet_id": {"$in": sheet_ids}},
+                {"_id": 0, "sheet_id": 1, "item_id": 1, "score": 1, "opinion": 1},
+            ).to_list(None),
+        )
+        scores: Dict[str, List[Dict[str, Any]]] = {}
+        for score in score_docs:
+            scores.setdefault(score['sheet_id'], []).append(
+                {"item_id": score['item_id'], "score": score['score'], "opinion": score.get('opinion', '')}
+            )
+        batch = []
+        for sheet, related in zip(sheets, related_list):
+            if not all(related.values()):
+                continue
+            batch.append({"sheet": sheet, "scores": scores.get(sheet['id'], []), **related})
+        return batch
+
+    pending: List[Dict[str, Any]] = []
+    cursor = db.evaluation_sheets.find(query, {"_id": 0}, sort=[("submitted_at", 1), ("id", 1)], batch_size=batch_size)
+    async for sheet in cursor:
+        pending.append(sheet)
+        if len(pending) >= batch_size:
+            yield await hydrate(pending)
+            pending = []
+    if pending:
+        yield await hydrate(pending)
+
+
+async def write_evaluations_excel(db, query: Dict[str, Any], target: Union[str, BinaryIO],
+                                  detail_sheets: bool = False, summary_sheet_name: str = '평가결과요약',
+                                  batch_size: int = EXCEL_EXPORT_BATCH_SIZE) -> Dict[str, Any]:
+    """조건에 맞는 평가지를 커서에서 바로 Excel 로 기록하고 통계 반환 (evaluations, companies, project_name)"""
+    template_ids = await db.evaluation_sheets.distinct("template_id", query)
+    templates = await db.evaluation_templates.find({"id": {"$in": template_ids}}).to_list(None) if template_ids else []
+
+    writer = EvaluationWorkbookWriter(target, item_columns(templates), detail_sheets, summary_sheet_name)
+    try:
+        async for batch in iter_evaluation_exports(db, query, batch_size):
+            await asyncio.to_thread(writer.add_many, batch)
+    finally:
+        # 오류가 나도 임시 행 파일을 정리하도록 워크북은 항상 닫음 (결과 파일은 호출자가 삭제)
+        await asyncio.to_thread(writer.close)
+    logger.info(f"Excel export written: {writer.stats()}")
+    return writer.stats()
+
+
+def write_evaluations_workbook(evaluations_data: Iterable[Dict[str, Any]], target: Union[str, BinaryIO],
+                               detail_sheets: bool = False, summary_sheet_name: str = '평가결과요약') -> Dict[str, Any]:
+    """이미 조합된 평가 데이터 목록을 워크북으로 기록 (EvaluationExporter 호환 경로)"""
+    evaluations_data = list(evaluations_data)
+    writer = EvaluationWorkbookWriter(
+        target, item_columns(data['template'] for data in evaluations_data), detail_sheets, summary_sheet_name
+    )
+    try:
+        writer.add_many(evaluations_data)
+    finally:
+        writer.close()
+    return writer.stats()
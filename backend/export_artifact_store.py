@@ -0,0 +1,141 @@
+"""
+Export Artifact Store
+렌더링한 내보내기 문서(PDF/Excel)를 입력 지문(fingerprint)으로 찾아 재사용하는 디스크 저장소
+
+- 지문: 대상 평가 ID 와 버전(version/updated_at/last_modified/submitted_at), 렌더링 입력 데이터 다이제스트,
+  형식, 출력 옵션(템플릿/페르소나/스타일), 렌더러 버전(RENDERER_VERSION)
+  → 평가가 바뀌지 않았으면 같은 지문이므로 다시 렌더링하지 않고 디스크에서 바로 전송 (ETag/Range 지원)
+- ZIP 캐시와 같은 콘텐츠 주소 저장소 (content_store: objects/ab/<sha256>.artifact, refs/<지문>) - 같은 바이트는 한 번만 저장
+- 전체 크기가 EXPORT_ARTIFACT_CACHE_MAX_MB 를 넘으면 오래 사용하지 않은 문서부터 삭제
+- 평가지가 수정되면 invalidate(평가지 ID) 로 그 평가지가 포함된 문서를 삭제 (subjects/<ID 해시>/<지문> 표식)
+- 일괄 ZIP 은 구성 문서를 이 저장소에서 가져오므로 평가 하나가 바뀌어도 나머지는 다시 렌더링하지 않음
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from content_store import ContentAddressedStore, StoredObject
+from ranged_file import ranged_file_response
+from zip_stream import content_disposition
+
+logger = logging.getLogger(__name__)
+
+EXPORT_ARTIFACT_CACHE_DIR = Path(os.getenv("EXPORT_ARTIFACT_CACHE_DIR", "outputs/artifact_cache"))
+EXPORT_ARTIFACT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_ARTIFACT_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# 출력 레이아웃(evaluation_pdf, export_utils, excel_stream_export, pdf_render_context)을 바꾸면 올림
+# → 이전 렌더러로 만든 문서는 지문이 달라져 더 이상 사용되지 않고 LRU 정리로 삭제됨
+RENDERER_VERSION = "1"
+
+# 문서 버전으로 쓰는 필드 (평가지 수정/자동저장/제출이 각각 갱신하는 필드가 다름)
+VERSION_FIELDS = ("version", "updated_at", "last_modified", "submitted_at")
+
+
+def document_version(doc: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+    """문서의 버전 필드 값 - 어느 하나라도 바뀌면 다른 값"""
+    doc = doc or {}
+    return tuple(doc.get(field) for field in VERSION_FIELDS)
+
+
+class ExportArtifactStore(ContentAddressedStore):
+    """콘텐츠 주소 내보내기 문서 저장소 (refs/<지문> → objects/ab/<sha256>.artifact)"""
+
+    suffix = ".artifact"
+
+    def __init__(self, cache_dir: Path = EXPORT_ARTIFACT_CACHE_DIR, max_bytes: int = EXPORT_ARTIFACT_CACHE_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    @classmethod
+    def fingerprint(cls, kind: str, subject_id: Any, version: Any, inputs: Any,
+                    export_format: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """렌더링 입력 지문 - 입력이 같으면 같은 키
+
+        inputs 는 렌더러에 넘기는 데이터(평가/기업/템플릿/점수 등)로, 관련 문서가 바뀌어도 지문이 달라짐
+        """
+        digest = hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return cls.request_key({
+            "kind": kind,
+            "subject": str(subject_id),
+            "version": version,
+            "inputs": digest,
+            "format": export_format,
+            "options": options or {},
+            "renderer": RENDERER_VERSION,
+        })
+
+    def _subject_dir(self, subject_id: Any) -> Path:
+        return self.cache_dir / "subjects" / hashlib.sha256(str(subject_id).encode("utf-8")).hexdigest()[:32]
+
+    def put(self, key: str, data: bytes, subjects: Iterable[Any] = ()) -> StoredObject:
+        """문서 저장 - subjects(평가 ID 등)가 수정되면 invalidate 로 함께 삭제"""
+        writer = self.open_writer(key)
+        try:
+            writer.write(data)
+        except BaseException:
+            writer.abort()
+            raise
+        artifact = writer.commit()
+        for subject_id in subjects:
+            marker = self._subject_dir(subject_id) / key
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        return artifact
+
+    def invalidate(self, subject_id: Any) -> int:
+        """subject_id 가 포함된 문서의 지문 삭제, 삭제한 지문 수 반환
+
+        같은 바이트를 다른 지문(다른 평가의 같은 결과 문서 등)이 가리키면 문서 파일은 남겨 둠 (owners/ 역참조)
+        """
+        subject_dir = self._subject_dir(subject_id)
+        if not subject_dir.is_dir():
+            return 0
+        removed = 0
+        for marker in list(subject_dir.iterdir()):
+            if self.release(marker.name):
+                removed += 1
+            marker.unlink(missing_ok=True)
+        try:
+            subject_dir.rmdir()
+        except OSError:
+            pass
+        return removed
+
+    async def get_or_render(self, key: str, render: Callable[[], Awaitable[bytes]],
+                            subjects: Iterable[Any] = ()) -> Tuple[StoredObject, bool]:
+        """저장된 문서가 있으면 그대로, 없으면 렌더링해 저장 - (문서, 캐시 적중 여부)"""
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached, True
+        data = await render()
+        return await asyncio.to_thread(self.put, key, data, list(subjects)), False
+
+    async def invalidate_async(self, subject_id: Any) -> int:
+        """이벤트 루프를 막지 않는 invalidate (평가지 수정 API 에서 사용)"""
+        try:
+            return await asyncio.to_thread(self.invalidate, subject_id)
+        except OSError as e:
+            # 저장소 정리 실패로 평가지 저장이 실패하지 않도록 - 지문이 달라 오래된 문서는 쓰이지 않음
+            logger.warning(f"Export artifact invalidation failed for {subject_id}: {e}")
+            return 0
+
+
+def artifact_response(request: Request, artifact: StoredObject, media_type: str,
+                      filename: str, cache_hit: bool) -> Response:
+    """저장된 문서 다운로드 응답 (콘텐츠 해시 ETag, If-None-Match 304, Range 지원)"""
+    headers = {
+        "Content-Disposition": content_disposition(filename),
+        "X-Export-Cache": "hit" if cache_hit else "miss",
+    }
+    return ranged_file_response(request, str(artifact.path), media_type, artifact.sha256, headers)
+
+
+# Global artifact store instance
+export_artifact_store = ExportArtifactStore()
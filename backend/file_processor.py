@@ -38,6 +38,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# PDF 페이지 구분 문자 (document_pipeline.PAGE_BREAK 와 동일)
+PAGE_BREAK = '\f'
+
 class FileProcessor:
     """고성능 파일 처리 클래스"""
     
@@ -235,36 +238,39 @@ class FileProcessor:
         return None
     
     async def _extract_pdf_text(self, file_path: Path) -> str:
-        """PDF 텍스트 추출"""
+        """PDF 텍스트 추출 (페이지 사이는 폼피드(\\f)로 구분 - AI 분석 청크 분할에 사용)"""
         def extract_sync():
             try:
                 with pdfplumber.open(file_path) as pdf:
                     text_parts = []
                     for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_parts.append(page_text)
-                    return '\n'.join(text_parts)
+                        text_parts.append(page.extract_text() or '')
+                    return PAGE_BREAK.join(text_parts)
             except:
                 # Fallback to PyPDF2
                 with open(file_path, 'rb') as file:
                     pdf_reader = PyPDF2.PdfReader(file)
                     text_parts = []
                     for page in pdf_reader.pages:
-                        text_parts.append(page.extract_text())
-                    return '\n'.join(text_parts)
+                        text_parts.append(page.extract_text() or '')
+                    return PAGE_BREAK.join(text_parts)
         
         # 별도 스레드에서 실행
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, extract_sync)
     
     async def _extract_docx_text(self, file_path: Path) -> str:
-        """DOCX 텍스트 추출"""
+        """DOCX 텍스트 추출 (제목 스타일 문단은 '#' 표시 - AI 분석 청크 분할에 사용)"""
         def extract_sync():
             doc = DocxDocument(file_path)
             text_parts = []
             for paragraph in doc.paragraphs:
-                text_parts.append(paragraph.text)
+                style = paragraph.style.name if paragraph.style is not None else ''
+                level = style[len('Heading'):].strip() if style.startswith('Heading') else ''
+                if level.isdigit() and paragraph.text.strip():
+                    text_parts.append('#' * min(int(level), 6) + ' ' + paragraph.text.strip())
+                else:
+                    text_parts.append(paragraph.text)
             return '\n'.join(text_parts)
         
         loop = asyncio.get_event_loop()
@@ -0,0 +1,451 @@
+"""
+Persistent Job Queue
+출력/내보내기/AI 평가 같은 장시간 작업을 MongoDB jobs 컬렉션에 저장하고 워커가 임대(lease)하여 처리하는 작업 큐
+
+- 우선순위 + 실행 예정 시각(run_at) 순으로 find_one_and_update 를 이용해 원자적으로 작업 획득
+- 처리 중에는 하트비트로 임대 기간을 연장, 임대가 만료된 작업은 다른 워커가 회수
+- 실패 시 지수 백오프(+지터)로 재시도, 최대 시도 횟수 초과 시 failed
+- 취소 요청은 대기 중이면 즉시, 처리 중이면 다음 하트비트에서 반영
+- 웹 프로세스 내장 워커(JOB_WORKER_EMBEDDED) 또는 별도 프로세스(job_worker.py)로 실행
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import uuid
+from datetime import datetime, timedelta
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_RETRY_BASE_SECONDS = int(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+JOB_RETRY_MAX_SECONDS = int(os.getenv("JOB_RETRY_MAX_SECONDS", "600"))
+JOB_DEFAULT_MAX_ATTEMPTS = int(os.getenv("JOB_DEFAULT_MAX_ATTEMPTS", "3"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+JOB_SHUTDOWN_GRACE_SECONDS = float(os.getenv("JOB_SHUTDOWN_GRACE_SECONDS", "20"))
+
+# 작업 상태 (기존 출력/AI 작업 API 와 동일한 값 사용)
+PENDING = "pending"
+PROCESSING = "processing"
+COMPLETED = "completed"
+COMPLETED_WITH_ERRORS = "completed_with_errors"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL_STATUSES = (COMPLETED, COMPLETED_WITH_ERRORS, FAILED, CANCELLED)
+# 결과 파일이 있는 완료 상태 (일부 항목이 실패한 작업도 결과를 내려받을 수 있음)
+COMPLETED_STATUSES = (COMPLETED, COMPLETED_WITH_ERRORS)
+
+# 다시 실행해도 같은 결과인 오류 (잘못된 요청/데이터) - 재시도하지 않고 바로 failed
+NON_RETRYABLE_ERRORS = (ValueError, TypeError, KeyError)
+
+# 조회 응답에서 제외하는 내부 필드
+_INTERNAL_FIELDS = ("_id", "payload", "lease_owner", "lease_expires_at", "heartbeat_at", "run_at", "cancel_requested")
+
+
+class JobPriority(IntEnum):
+    """작업 우선순위 (값이 클수록 먼저 처리)"""
+    LOW = 1
+    NORMAL = 2
+    HIGH = 3
+    CRITICAL = 4
+
+
+class JobCancelled(Exception):
+    """처리 중인 작업에 취소가 요청됨"""
+
+
+class JobLeaseLost(Exception):
+    """임대가 만료되어 다른 워커가 작업을 가져감"""
+
+
+JobHandler = Callable[[Dict[str, Any], "JobContext"], Awaitable[Optional[Dict[str, Any]]]]
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(job_type: str):
+    """작업 처리 함수 등록 데코레이터
+
+    처리 함수는 (payload, ctx) 를 받아 결과 dict 를 반환하며, 반환값은 작업 문서에 병합됩니다.
+    """
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[job_type] = func
+        return func
+    return decorator
+
+
+def get_job_handler(job_type: str) -> Optional[JobHandler]:
+    return _handlers.get(job_type)
+
+
+def registered_job_types() -> List[str]:
+    return list(_handlers)
+
+
+def retry_delay(attempts: int, base: int = JOB_RETRY_BASE_SECONDS, cap: int = JOB_RETRY_MAX_SECONDS) -> float:
+    """재시도 대기 시간 (지수 백오프 + 지터)"""
+    delay = min(cap, base * (2 ** max(attempts - 1, 0)))
+    return delay + random.uniform(0, base)
+
+
+def public_job(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """API 응답용 작업 정보 (내부 임대 필드 제외)"""
+    if doc is None:
+        return None
+    return {key: value for key, value in doc.items() if key not in _INTERNAL_FIELDS}
+
+
+class JobContext:
+    """처리 함수에 전달되는 작업 컨텍스트 (진행률 보고 및 취소 확인)"""
+
+    def __init__(self, queue: "JobQueue", job: Dict[str, Any], worker_id: str):
+        self.queue = queue
+        self.job = job
+        self.job_id = job["job_id"]
+        self.worker_id = worker_id
+        self.attempt = job.get("attempts", 1)
+        # 처리 함수가 completed_with_errors 등으로 변경 가능
+        self.completion_status = COMPLETED
+
+    async def progress(self, progress: Optional[int] = None, **fields) -> None:
+        """진행률/상태 필드를 기록하고 임대를 연장. 취소가 요청되었으면 JobCancelled 발생"""
+        if progress is not None:
+            fields["progress"] = progress
+        state = await self.queue.heartbeat(self.job_id, self.worker_id, **fields)
+        if state is None:
+            raise JobLeaseLost(self.job_id)
+        if state.get("cancel_requested"):
+            raise JobCancelled(self.job_id)
+
+
+class JobQueue:
+    """MongoDB 기반 영속 작업 큐"""
+
+    def __init__(self, lease_seconds: int = JOB_LEASE_SECONDS):
+        self.db = None
+        self.lease_seconds = lease_seconds
+
+    @property
+    def collection(self):
+        return self.db.jobs
+
+    async def ensure_indexes(self) -> None:
+        try:
+            await self.collection.create_indexes([
+                IndexModel([("job_id", ASCENDING)], unique=True),
+                IndexModel([("status", ASCENDING), ("priority", DESCENDING), ("run_at", ASCENDING)]),
+                IndexModel([("job_type", ASCENDING), ("created_at", DESCENDING)]),
+            ])
+        except Exception as e:
+            logger.warning(f"Failed to create job queue indexes: {e}")
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        created_by: Optional[str] = None,
+        priority: JobPriority = JobPriority.NORMAL,
+        max_attempts: int = JOB_DEFAULT_MAX_ATTEMPTS,
+        job_id: Optional[str] = None,
+        **fields,
+    ) -> Dict[str, Any]:
+        """작업 등록. fields 는 상태 조회 응답에 그대로 노출되는 부가 정보"""
+        now = datetime.utcnow()
+        doc = {
+            **fields,
+            "job_id": job_id or str(uuid.uuid4()),
+            "job_type": job_type,
+            "payload": payload,
+            "status": PENDING,
+            "priority": int(priority),
+            "progress": 0,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "created_by": created_by,
+            "created_at": now,
+            "run_at": now,
+            "started_at": None,
+            "completed_at": None,
+            "error_message": None,
+            "cancel_requested": False,
+            "lease_owner": None,
+            "lease_expires_at": None,
+        }
+        await self.collection.insert_one(doc)
+        doc.pop("_id", None)
+        return doc
+
+    async def get(self, job_id: str, job_types: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        query: Dict[str, Any] = {"job_id": job_id}
+        if job_types:
+            query["job_type"] = {"$in": list(job_types)}
+        return await self.collection.find_one(query, {"_id": 0})
+
+    async def list(
+        self,
+        job_types: Optional[Iterable[str]] = None,
+        status: Optional[str] = None,
+        created_by: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        query: Dict[str, Any] = {}
+        if job_types:
+            query["job_type"] = {"$in": list(job_types)}
+        if status:
+            query["status"] = status
+        if created_by:
+            query["created_by"] = created_by
+        cursor = self.collection.find(query, {"_id": 0}).sort("created_at", DESCENDING).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def claim(self, worker_id: str, job_types: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """실행 가능한 작업 하나를 임대. 대기 작업과 임대가 만료된 처리 중 작업이 대상"""
+        while True:
+            now = datetime.utcnow()
+            query: Dict[str, Any] = {"$or": [
+                {"status": PENDING, "run_at": {"$lte": now}},
+                {"status": PROCESSING, "lease_expires_at": {"$lt": now}},
+            ]}
+            if job_types:
+                query["job_type"] = {"$in": list(job_types)}
+
+            job = await self.collection.find_one_and_update(
+                query,
+                {
+                    "$set": {
+                        "status": PROCESSING,
+                        "lease_owner": worker_id,
+                        "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                        "heartbeat_at": now,
+                        "started_at": now,
+                    },
+                    "$inc": {"attempts": 1},
+                },
+                sort=[("priority", DESCENDING), ("run_at", ASCENDING)],
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER,
+            )
+            if job is None:
+                return None
+
+            # 임대 만료로 회수된 작업 중 취소 요청되었거나 시도 횟수를 모두 쓴 작업은 종료 처리
+            if job.get("cancel_requested"):
+                await self.mark_cancelled(job["job_id"], worker_id)
+                continue
+            if job["attempts"] > job["max_attempts"]:
+                await self._finish(job["job_id"], worker_id, {
+                    "status": FAILED,
+                    "error_message": job.get("error_message") or "작업 임대가 반복적으로 만료되었습니다",
+                })
+                continue
+            return job
+
+    async def heartbeat(self, job_id: str, worker_id: str, **fields) -> Optional[Dict[str, Any]]:
+        """임대 연장 및 진행 상태 기록. 임대를 잃었으면 None"""
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {"job_id": job_id, "lease_owner": worker_id, "status": PROCESSING},
+            {"$set": {
+                **fields,
+                "heartbeat_at": now,
+                "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+            }},
+            projection={"_id": 0, "cancel_requested": 1},
+        )
+
+    async def complete(
+        self, job_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None, status: str = COMPLETED
+    ) -> bool:
+        return await self._finish(job_id, worker_id, {**(result or {}), "status": status, "progress": 100})
+
+    async def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        """실패 처리 - 남은 시도가 있으면 백오프 후 재대기, 없거나 retry=False 이면 failed"""
+        job = await self.collection.find_one({"job_id": job_id, "lease_owner": worker_id}, {"attempts": 1, "max_attempts": 1})
+        if job is None:
+            return False
+        if retry and job["attempts"] < job["max_attempts"]:
+            run_at = datetime.utcnow() + timedelta(seconds=retry_delay(job["attempts"]))
+            result = await self.collection.update_one(
+                {"job_id": job_id, "lease_owner": worker_id},
+                {"$set": {
+                    "status": PENDING,
+                    "run_at": run_at,
+                    "error_message": error,
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                }},
+            )
+            logger.warning(f"Job {job_id} failed (attempt {job['attempts']}), retrying at {run_at.isoformat()}: {error}")
+            return result.modified_count > 0
+        return await self._finish(job_id, worker_id, {"status": FAILED, "error_message": error})
+
+    async def release(self, job_id: str, worker_id: str) -> bool:
+        """워커 종료 시 처리 중 작업을 시도 횟수 차감 없이 대기열로 반환"""
+        result = await self.collection.update_one(
+            {"job_id": job_id, "lease_owner": worker_id, "status": PROCESSING},
+            {
+                "$set": {"status": PENDING, "run_at": datetime.utcnow(), "lease_owner": None, "lease_expires_at": None},
+                "$inc": {"attempts": -1},
+            },
+        )
+        return result.modified_count > 0
+
+    async def mark_cancelled(self, job_id: str, worker_id: str) -> bool:
+        return await self._finish(job_id, worker_id, {"status": CANCELLED})
+
+    async def cancel(self, job_id: str, reason: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """취소 요청. 대기 중이면 즉시 cancelled, 처리 중이면 워커가 다음 하트비트에서 중단.
+        이미 종료된 작업이면 None"""
+        now = datetime.utcnow()
+        update: Dict[str, Any] = {"$set": {"cancel_requested": True}}
+        if reason:
+            update["$push"] = {"error_messages": reason}
+
+        job = await self.collection.find_one_and_update(
+            {"job_id": job_id, "status": PENDING},
+            {**update, "$set": {**update["$set"], "status": CANCELLED, "completed_at": now}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is None:
+            job = await self.collection.find_one_and_update(
+                {"job_id": job_id, "status": PROCESSING},
+                update,
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER,
+            )
+        return job
+
+    async def _finish(self, job_id: str, worker_id: str, fields: Dict[str, Any]) -> bool:
+        result = await self.collection.update_one(
+            {"job_id": job_id, "lease_owner": worker_id},
+            {"$set": {
+                **fields,
+                "completed_at": datetime.utcnow(),
+                "lease_owner": None,
+                "lease_expires_at": None,
+            }},
+        )
+        return result.modified_count > 0
+
+
+class JobWorker:
+    """작업 큐 소비 워커 - concurrency 개의 루프가 작업을 임대하여 처리"""
+
+    def __init__(
+        self,
+        queue: "JobQueue",
+        concurrency: int = 2,
+        job_types: Optional[Iterable[str]] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: float = JOB_POLL_INTERVAL_SECONDS,
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.job_types = list(job_types) if job_types else None
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = max(queue.lease_seconds / 3, 1)
+        self._stopping = asyncio.Event()
+        self._loops: List[asyncio.Task] = []
+        self.processed = 0
+
+    async def run(self) -> None:
+        """stop() 이 호출될 때까지 작업 처리"""
+        logger.info(f"Job worker {self.worker_id} started (concurrency={self.concurrency})")
+        self._loops = [asyncio.create_task(self._loop()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*self._loops)
+        finally:
+            logger.info(f"Job worker {self.worker_id} stopped after {self.processed} jobs")
+
+    def start(self) -> asyncio.Task:
+        return asyncio.create_task(self.run())
+
+    async def stop(self, grace_seconds: float = JOB_SHUTDOWN_GRACE_SECONDS) -> None:
+        """새 작업 획득 중단 후 진행 중 작업을 기다리고, 시간이 지나면 취소하여 대기열로 반환"""
+        self._stopping.set()
+        if not self._loops:
+            return
+        _, pending = await asyncio.wait(self._loops, timeout=grace_seconds)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = await self.queue.claim(self.worker_id, self.job_types)
+            except Exception as e:
+                logger.error(f"Job claim failed: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 상태 기록 실패 등 - 임대가 만료되면 다른 워커가 회수하므로 루프는 계속
+                logger.error(f"Job {job.get('job_id')} handling failed: {e}")
+            self.processed += 1
+
+    async def run_job(self, job: Dict[str, Any]) -> None:
+        job_id = job["job_id"]
+        handler = get_job_handler(job["job_type"])
+        if handler is None:
+            await self.queue.fail(job_id, self.worker_id, f"등록되지 않은 작업 유형: {job['job_type']}", retry=False)
+            return
+
+        ctx = JobContext(self.queue, job, self.worker_id)
+        task = asyncio.create_task(handler(job.get("payload") or {}, ctx))
+        try:
+            # 처리 함수가 진행률을 보고하지 않는 구간에도 임대가 유지되도록 주기적 하트비트
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=self.heartbeat_interval)
+                if done:
+                    break
+                state = await self.queue.heartbeat(job_id, self.worker_id)
+                if state is None or state.get("cancel_requested"):
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    if state is None:
+                        logger.warning(f"Job {job_id} lease lost; abandoning")
+                    else:
+                        await self.queue.mark_cancelled(job_id, self.worker_id)
+                    return
+
+            result = task.result()
+            await self.queue.complete(job_id, self.worker_id, result, status=ctx.completion_status)
+        except JobCancelled:
+            await self.queue.mark_cancelled(job_id, self.worker_id)
+        except JobLeaseLost:
+            logger.warning(f"Job {job_id} lease lost; abandoning")
+        except asyncio.CancelledError:
+            # 워커 종료 - 다른 워커가 이어받도록 반환
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await asyncio.shield(self.queue.release(job_id, self.worker_id))
+            raise
+        except Exception as e:
+            retry = not isinstance(e, NON_RETRYABLE_ERRORS)
+            logger.error(f"Job {job_id} ({job['job_type']}) failed{'' if retry else ' (not retried)'}: {e}")
+            try:
+                await self.queue.fail(job_id, self.worker_id, str(e) or type(e).__name__, retry=retry)
+            except Exception as fail_error:
+                logger.error(f"Recording failure of job {job_id} failed: {fail_error}")
+
+
+# 전역 작업 큐 (db 는 server.py / job_worker.py 에서 연결)
+job_queue = JobQueue()
@@ -0,0 +1,91 @@
+"""
+Job Worker Entry Point
+웹 프로세스와 분리된 작업 큐 워커 실행 스크립트
+
+사용 예:
+    python job_worker.py --processes 4 --concurrency 2
+    python job_worker.py --types print,bulk_enhanced_export
+
+웹 서버는 JOB_WORKER_EMBEDDED=false 로 실행하면 작업 등록만 하고 처리는 이 워커들이 담당합니다.
+SIGTERM/SIGINT 수신 시 새 작업 획득을 멈추고, 유예 시간 내 끝나지 않은 작업은 대기열로 반환합니다.
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+from typing import List, Optional
+
+from job_queue import JOB_SHUTDOWN_GRACE_SECONDS, JobWorker, job_queue, registered_job_types
+from pdf_render_farm import pdf_render_farm
+
+logger = logging.getLogger("job_worker")
+
+
+async def run_worker(concurrency: int, job_types: Optional[List[str]], grace_seconds: float) -> None:
+    # server 임포트 시 DB 클라이언트가 생성되고 작업 처리 함수가 등록됨
+    import server
+
+    job_queue.db = server.db
+    await job_queue.ensure_indexes()
+    # 웹 서버 lifespan 과 같은 초기화 (보안 모듈 DB, AI 공급자, Redis) - 작업 처리 함수가 사용
+    await server.start_shared_services()
+
+    worker = JobWorker(job_queue, concurrency=concurrency, job_types=job_types)
+    logger.info(f"Registered job types: {', '.join(registered_job_types())}")
+
+    loop = asyncio.get_running_loop()
+    stop_requested = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_requested.set)
+
+    run_task = worker.start()
+    await stop_requested.wait()
+    logger.info("Shutdown requested; draining in-flight jobs")
+    await worker.stop(grace_seconds)
+    await asyncio.gather(run_task, return_exceptions=True)
+    await server.stop_shared_services()
+    pdf_render_farm.shutdown()
+
+
+def _process_main(concurrency: int, job_types: Optional[List[str]], grace_seconds: float) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    asyncio.run(run_worker(concurrency, job_types, grace_seconds))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluation system job worker")
+    parser.add_argument("--processes", type=int, default=1, help="워커 프로세스 수 (CPU 코어 수 권장)")
+    parser.add_argument("--concurrency", type=int, default=2, help="프로세스당 동시 처리 작업 수")
+    parser.add_argument("--types", default="", help="처리할 작업 유형 (쉼표 구분, 기본: 전체)")
+    parser.add_argument("--grace-seconds", type=float, default=JOB_SHUTDOWN_GRACE_SECONDS)
+    args = parser.parse_args()
+
+    job_types = [t.strip() for t in args.types.split(",") if t.strip()] or None
+
+    if args.processes <= 1:
+        _process_main(args.concurrency, job_types, args.grace_seconds)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=_process_main, args=(args.concurrency, job_types, args.grace_seconds), daemon=False)
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -147,6 +147,7 @@ class FileMetadata(BaseModel):
     file_type: str = Field(..., description="File MIME type")
     uploaded_by: str = Field(..., description="User ID who uploaded the file")
     company_id: str = Field(..., description="Company ID this file belongs to")
+    file_hash: Optional[str] = Field(None, description="SHA-256 of the file content")
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
 
     model_config = ConfigDict(populate_by_name=True)
@@ -171,6 +172,9 @@ class EvaluationSheet(BaseModel):
     evaluator_id: str
     company_id: str
     status: str = Field("pending") # pending, in_progress, submitted, reviewed
+    template_id: Optional[str] = Field(None, description="Evaluation template ID")
+    deadline: Optional[datetime] = Field(None, description="Assignment deadline")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
     # ... other fields
 
 class EvaluationItem(BaseModel):
@@ -438,6 +442,7 @@ class EvaluationScore(BaseModel):
     item_id: str = Field(..., description="Evaluation item ID")
     score: int = Field(..., description="Score value")
     opinion: Optional[str] = Field(None, description="Evaluator's opinion/comment")
+    version: int = Field(0, description="Per-item version for optimistic concurrency on save")
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     model_config = ConfigDict(populate_by_name=True)
@@ -0,0 +1,189 @@
+"""
+Keyset Pagination & NDJSON Streaming
+(created_at, id) 기준 커서 페이지네이션과 Motor 커서 기반 NDJSON 스트리밍 응답 유틸리티
+
+- 페이지 조회: limit/after 파라미터, X-Total-Count / X-Next-Cursor 응답 헤더
+- 스트리밍 조회: 결과 전체를 메모리에 올리지 않고 배치 단위로 변환하여 한 줄씩 전송
+"""
+
+import asyncio
+import base64
+import inspect
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pymongo import ASCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# 컬렉션별 정렬 기준 필드 (파일 메타데이터는 uploaded_at 사용)
+PAGINATED_COLLECTIONS: Dict[str, str] = {
+    "projects": "created_at",
+    "companies": "created_at",
+    "evaluation_sheets": "created_at",
+    "file_metadata": "uploaded_at",
+}
+
+
+def encode_cursor(doc: Dict[str, Any], sort_field: str = "created_at") -> str:
+    """문서의 (정렬 필드, id) 값을 불투명한 커서 문자열로 인코딩"""
+    value = doc.get(sort_field)
+    payload = {
+        "t": value.isoformat() if isinstance(value, datetime) else value,
+        "id": doc.get("id"),
+    }
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    """커서 문자열을 (정렬 값, id) 로 디코딩"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = payload.get("t")
+        if value is not None:
+            value = datetime.fromisoformat(value)
+        return value, str(payload["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 페이지 커서입니다.")
+
+
+def keyset_filter(query: Dict[str, Any], after: Optional[str], sort_field: str = "created_at") -> Dict[str, Any]:
+    """기존 쿼리에 커서 이후 문서만 조회하는 조건을 추가
+
+    정렬 필드가 없는(null) 문서는 오름차순 정렬 시 가장 앞에 오므로 별도로 처리합니다.
+    """
+    if not after:
+        return query
+
+    value, last_id = decode_cursor(after)
+    if value is None:
+        condition = {"$or": [
+            {sort_field: None, "id": {"$gt": last_id}},
+            {sort_field: {"$ne": None}},
+        ]}
+    else:
+        condition = {"$or": [
+            {sort_field: {"$gt": value}},
+            {sort_field: value, "id": {"$gt": last_id}},
+        ]}
+
+    return {"$and": [query, condition]} if query else condition
+
+
+async def paginate(
+    collection,
+    query: Dict[str, Any],
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    sort_field: str = "created_at",
+    projection: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+    """한 페이지 조회 후 (문서 목록, 다음 커서, 전체 개수) 반환"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    cursor = (
+        collection.find(keyset_filter(query, after, sort_field), projection)
+        .sort([(sort_field, ASCENDING), ("id", ASCENDING)])
+        .limit(limit + 1)
+    )
+
+    docs, total = await asyncio.gather(
+        cursor.to_list(length=limit + 1),
+        collection.count_documents(query),
+    )
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1], sort_field)
+
+    return docs, next_cursor, total
+
+
+def set_pagination_headers(response: Response, total: int, next_cursor: Optional[str]) -> None:
+    """페이지네이션 응답 헤더 설정"""
+    response.headers["X-Total-Count"] = str(total)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+
+async def _apply(transform: Optional[Callable], batch: List[Dict[str, Any]]) -> List[Any]:
+    if transform is None:
+        return batch
+    result = transform(batch)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def _serialize(item: Any) -> str:
+    if hasattr(item, "model_dump"):
+        item = item.model_dump()
+    elif isinstance(item, dict) and "_id" in item:
+        item = {key: value for key, value in item.items() if key != "_id"}
+    return json.dumps(item, ensure_ascii=False, default=str) + "\n"
+
+
+async def iter_ndjson(
+    cursor,
+    transform: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> AsyncIterator[str]:
+    """Motor 커서를 배치 단위로 읽어 NDJSON 줄을 생성
+
+    transform 은 문서 배치를 받아 출력 항목 목록을 반환하는 동기/비동기 함수이며,
+    배치마다 관계 일괄 조회 등을 수행할 수 있습니다.
+    """
+    batch: List[Dict[str, Any]] = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            for item in await _apply(transform, batch):
+                yield _serialize(item)
+            batch = []
+
+    if batch:
+        for item in await _apply(transform, batch):
+            yield _serialize(item)
+
+
+def ndjson_response(
+    collection,
+    query: Dict[str, Any],
+    transform: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+    sort_field: str = "created_at",
+    projection: Optional[Dict[str, int]] = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> StreamingResponse:
+    """쿼리 결과 전체를 상수 메모리로 전송하는 NDJSON 스트리밍 응답 생성"""
+    cursor = (
+        collection.find(query, projection)
+        .sort([(sort_field, ASCENDING), ("id", ASCENDING)])
+        .batch_size(batch_size)
+    )
+    return StreamingResponse(
+        iter_ndjson(cursor, transform, batch_size),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+async def ensure_pagination_indexes(db) -> None:
+    """커서 페이지네이션용 (정렬 필드, id) 복합 인덱스 생성"""
+    for collection_name, sort_field in PAGINATED_COLLECTIONS.items():
+        try:
+            await db[collection_name].create_indexes([
+                IndexModel([(sort_field, ASCENDING), ("id", ASCENDING)])
+            ])
+        except Exception as e:
+            logger.warning(f"Failed to create pagination index for {collection_name}: {e}")
@@ -0,0 +1,408 @@
+"""
+PDF Render Context
+reportlab 출력에 쓰는 폰트/스타일/페이지 장식을 프로세스당 한 번만 준비해 재사용하는 렌더링 컨텍스트
+
+- 한글 폰트는 프로세스에서 처음 사용할 때 한 번만 등록 (문서/표마다 TTF 를 다시 읽지 않음)
+- 문단 스타일시트, TableStyle, 페이지 장식(헤더/푸터/워터마크/로고)은 레이아웃 프로파일
+  (출력 템플릿, 페르소나, 스타일 옵션)별로 컴파일해 캐시
+- 캐시된 객체는 렌더링 중 변경되지 않으므로 여러 문서와 스레드가 공유해도 안전
+- PDF 렌더링 팜의 워커 프로세스는 각자 컨텍스트를 가지며 첫 문서 이후에는 캐시를 사용
+
+한글 폰트 경로는 PDF_KOREAN_FONT_PATH 로 지정할 수 있고, 로고는 PDF_LOGO_PATH 파일이 있을 때만 그립니다.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.platypus import TableStyle
+    HAS_REPORTLAB = True
+except ImportError:
+    HAS_REPORTLAB = False
+
+logger = logging.getLogger(__name__)
+
+KOREAN_FONT_NAME = "Korean"
+KOREAN_FONT_PATHS = [
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",  # Ubuntu
+    "/System/Library/Fonts/AppleGothic.ttf",  # macOS
+    "C:/Windows/Fonts/malgun.ttf",  # Windows
+    "./fonts/NanumGothic.ttf",  # 로컬 폰트
+]
+PDF_LOGO_PATH = os.getenv("PDF_LOGO_PATH", "")
+PDF_LAYOUT_CACHE_SIZE = int(os.getenv("PDF_LAYOUT_CACHE_SIZE", "64"))
+
+# 출력 템플릿별 머리글 제목
+TEMPLATE_TITLES = {
+    "standard": "표준 평가서",
+    "government": "정부기관 양식",
+    "corporate": "기업 임원 보고서",
+    "academic": "학술 평가서",
+    "technical": "기술 평가서",
+    "minimal": "간단 평가서",
+    "detailed": "상세 평가서",
+}
+
+# 색상 구성별 표 머리행 배경색
+HEADER_COLORS = {
+    "professional": "#808080",
+    "government": "#1f3864",
+    "corporate": "#2f5597",
+    "academic": "#5b3a29",
+    "modern": "#0f766e",
+    "classic": "#404040",
+}
+
+
+@dataclass(frozen=True)
+class LayoutProfile:
+    """스타일/표/페이지 장식 캐시 키 (출력 템플릿, 페르소나, 스타일 옵션)
+
+    기본값(template=None)은 출력 API 의 기본 평가표 - 머리글/푸터/워터마크 없음
+    """
+    template: Optional[str] = None
+    persona: Optional[str] = None
+    font_size: int = 10
+    color_scheme: str = "professional"
+    watermark: Optional[str] = None
+    header_style: str = "modern"
+    include_logo: bool = False
+    confidentiality: Optional[str] = None
+
+    @classmethod
+    def from_options(cls, options: Optional[Dict[str, Any]]) -> "LayoutProfile":
+        """출력/고급 내보내기 옵션에서 프로파일 생성 (렌더링과 관계없는 옵션은 무시)"""
+        if not options:
+            return DEFAULT_PROFILE
+        styling = options.get("styling") or options.get("style_options") or {}
+        metadata = options.get("metadata") or {}
+        return cls(
+            template=options.get("template") or None,
+            persona=options.get("persona") or metadata.get("persona"),
+            font_size=int(styling.get("font_size") or 10),
+            color_scheme=styling.get("color_scheme") or "professional",
+            watermark=styling.get("watermark") or None,
+            header_style=styling.get("header_style") or "modern",
+            include_logo=bool(styling.get("include_logo", False)),
+            confidentiality=metadata.get("confidentiality"),
+        )
+
+
+DEFAULT_PROFILE = LayoutProfile()
+
+
+# 문단 스타일 정의: (이름, 상위 스타일, 굵은 글꼴 여부, 속성) - fontSize 는 프로파일 글자 크기(기본 10)에 비례
+STYLE_SHEETS: Dict[str, List[Tuple[str, Optional[str], bool, Dict[str, Any]]]] = {
+    # 출력 API 평가표 (evaluation_pdf)
+    "print": [
+        ("KoreanTitle", None, False, {"fontSize": 16, "spaceAfter": 12, "alignment": 1, "textColor": "black"}),
+        ("KoreanHeading", None, False, {"fontSize": 12, "spaceBefore": 6, "spaceAfter": 6, "textColor": "black"}),
+        ("KoreanNormal", None, False, {"fontSize": 10, "spaceAfter": 6, "textColor": "black"}),
+        ("KoreanSmall", None, False, {"fontSize": 8, "spaceAfter": 4, "textColor": "grey"}),
+    ],
+    # 종합평가서 (export_utils.EvaluationExporter)
+    "report": [
+        ("KoreanTitle", "Title", True, {"fontSize": 16, "alignment": "center", "spaceAfter": 20}),
+        ("KoreanNormal", "Normal", False, {"fontSize": 10, "alignment": "left"}),
+        ("KoreanHeading", "Heading2", True, {"fontSize": 12, "alignment": "left", "spaceAfter": 10}),
+    ],
+}
+
+# 표 스타일 정의 - "$font" 는 본문 글꼴, "$header" 는 색상 구성의 머리행 배경색으로 치환
+TABLE_STYLES: Dict[str, List[Tuple]] = {
+    "info": [
+        ('BACKGROUND', (0, 0), (-1, 0), "$header"),
+        ('TEXTCOLOR', (0, 0), (-1, 0), "whitesmoke"),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), "$font"),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), "beige"),
+        ('GRID', (0, 0), (-1, -1), 1, "black"),
+    ],
+    "criteria": [
+        ('BACKGROUND', (0, 0), (-1, 0), "$header"),
+        ('TEXTCOLOR', (0, 0), (-1, 0), "whitesmoke"),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), "$font"),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('BACKGROUND', (0, 1), (-1, -2), "beige"),
+        ('BACKGROUND', (0, -1), (-1, -1), "lightgrey"),
+        ('GRID', (0, 0), (-1, -1), 1, "black"),
+        ('FONTSIZE', (0, -1), (-1, -1), 10),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),  # 첫 번째 열은 왼쪽 정렬
+    ],
+    "summary": [
+        ('BACKGROUND', (0, 0), (-1, 0), "$header"),
+        ('TEXTCOLOR', (0, 0), (-1, 0), "whitesmoke"),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), "$font"),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), "beige"),
+        ('GRID', (0, 0), (-1, -1), 1, "black"),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),  # 기업명은 왼쪽 정렬
+    ],
+    "signature": [
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), "$font"),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('LINEBELOW', (1, 0), (1, 0), 1, "black"),  # 서명란 밑줄
+    ],
+    "chairman_signature": [
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), "$font"),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('LINEBELOW', (1, 0), (1, 2), 1, "black"),  # 서명란 밑줄
+    ],
+    "report_info": [
+        ('BACKGROUND', (0, 0), (0, -1), "lightgrey"),
+        ('TEXTCOLOR', (0, 0), (-1, -1), "black"),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), "$font"),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('BACKGROUND', (1, 0), (1, -1), "white"),
+        ('GRID', (0, 0), (-1, -1), 1, "black"),
+    ],
+    "report_scores": [
+        ('BACKGROUND', (0, 0), (-1, 0), "$header"),
+        ('TEXTCOLOR', (0, 0), (-1, 0), "whitesmoke"),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), "$font"),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('BACKGROUND', (0, -1), (-1, -1), "lightblue"),
+        ('GRID', (0, 0), (-1, -1), 1, "black"),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ],
+}
+
+_ALIGNMENTS = {"center": TA_CENTER, "left": TA_LEFT} if HAS_REPORTLAB else {}
+
+PageCallback = Callable[[Any, Any], None]
+
+
+class _LRUCache:
+    """프로파일별 컴파일 결과 캐시 (워터마크 문구 등 자유 입력이 있어 개수 제한)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, key: Any, factory: Callable[[], Any]) -> Any:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self._entries[key] = factory()
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class PDFRenderContext:
+    """프로세스 전역 reportlab 렌더링 컨텍스트"""
+
+    def __init__(self, font_paths: Optional[List[str]] = None, logo_path: str = PDF_LOGO_PATH,
+                 max_profiles: int = PDF_LAYOUT_CACHE_SIZE):
+        env_font = os.getenv("PDF_KOREAN_FONT_PATH")
+        self.font_paths = font_paths if font_paths is not None else ([env_font] if env_font else []) + KOREAN_FONT_PATHS
+        self.logo_path = logo_path
+        self._lock = threading.RLock()
+        self._font_name: Optional[str] = None
+        self._logo: Any = None
+        self._style_sheets = _LRUCache(max_profiles)
+        self._table_styles = _LRUCache(max_profiles * len(TABLE_STYLES))
+        self._page_callbacks = _LRUCache(max_profiles)
+
+    # 폰트
+
+    def _register_korean_font(self) -> Optional[str]:
+        if KOREAN_FONT_NAME in pdfmetrics.getRegisteredFontNames():
+            return KOREAN_FONT_NAME
+        try:
+            for font_path in self.font_paths:
+                if os.path.exists(font_path):
+                    pdfmetrics.registerFont(TTFont(KOREAN_FONT_NAME, font_path))
+                    return KOREAN_FONT_NAME
+            logger.warning("한글 폰트를 찾을 수 없어 기본 폰트를 사용합니다.")
+        except Exception as e:
+            logger.error(f"폰트 설정 오류: {e}")
+        return None
+
+    @property
+    def korean_font(self) -> Optional[str]:
+        """등록된 한글 폰트 이름 (없으면 None) - 처음 호출할 때 한 번만 등록"""
+        if self._font_name is None:
+            with self._lock:
+                if self._font_name is None:
+                    self._font_name = self._register_korean_font() or ""
+        return self._font_name or None
+
+    @property
+    def font_name(self) -> str:
+        return self.korean_font or "Helvetica"
+
+    @property
+    def bold_font_name(self) -> str:
+        return self.korean_font or "Helvetica-Bold"
+
+    # 스타일
+
+    def _compile_style_sheet(self, layout: str, profile: LayoutProfile) -> "StyleSheet1":
+        styles = getSampleStyleSheet()
+        scale = profile.font_size / 10
+        for name, parent, bold, attributes in STYLE_SHEETS[layout]:
+            attributes = dict(attributes)
+            attributes["fontSize"] = attributes["fontSize"] * scale
+            if "textColor" in attributes:
+                attributes["textColor"] = getattr(colors, attributes["textColor"])
+            if isinstance(attributes.get("alignment"), str):
+                attributes["alignment"] = _ALIGNMENTS[attributes["alignment"]]
+            if parent is not None:
+                attributes["parent"] = styles[parent]
+            styles.add(ParagraphStyle(
+                name=name,
+                fontName=self.bold_font_name if bold else self.font_name,
+                **attributes,
+            ))
+        return styles
+
+    def styles(self, layout: str = "print", profile: LayoutProfile = DEFAULT_PROFILE) -> "StyleSheet1":
+        """레이아웃/프로파일별 문단 스타일시트 (공유 객체이므로 변경하지 말 것)"""
+        with self._lock:
+            return self._style_sheets.get_or_create(
+                (layout, profile), lambda: self._compile_style_sheet(layout, profile)
+            )
+
+    def _compile_table_style(self, name: str, profile: LayoutProfile) -> "TableStyle":
+        header = colors.HexColor(HEADER_COLORS.get(profile.color_scheme, HEADER_COLORS["professional"]))
+        commands = []
+        for command in TABLE_STYLES[name]:
+            values = []
+            for value in command[3:]:
+                if value == "$font":
+                    value = self.font_name
+                elif value == "$header":
+                    value = header
+                elif isinstance(value, str) and command[0] not in ("ALIGN", "VALIGN"):
+                    value = getattr(colors, value)
+                values.append(value)
+            commands.append(tuple(command[:3]) + tuple(values))
+        return TableStyle(commands)
+
+    def table_style(self, name: str, profile: LayoutProfile = DEFAULT_PROFILE) -> "TableStyle":
+        """이름/프로파일별 TableStyle (Table.setStyle 은 명령만 복사하므로 여러 표가 공유 가능)"""
+        with self._lock:
+            return self._table_styles.get_or_create(
+                (name, profile), lambda: self._compile_table_style(name, profile)
+            )
+
+    # 페이지 장식
+
+    def _load_logo(self) -> Any:
+        if self._logo is None:
+            self._logo = False
+            if self.logo_path and os.path.exists(self.logo_path):
+                try:
+                    self._logo = ImageReader(self.logo_path)
+                except Exception as e:
+                    logger.warning(f"로고 이미지를 불러오지 못했습니다: {e}")
+        return self._logo or None
+
+    def _compile_page_callback(self, profile: LayoutProfile) -> Optional[PageCallback]:
+        logo = self._load_logo() if profile.include_logo else None
+        header_text = None
+        if profile.template is not None:
+            header_text = TEMPLATE_TITLES.get(profile.template, profile.template)
+            if profile.confidentiality:
+                header_text = f"{header_text} | {profile.confidentiality}"
+        if not (header_text or profile.watermark or logo):
+            return None
+
+        font_name = self.font_name
+        header_color = colors.HexColor(HEADER_COLORS.get(profile.color_scheme, HEADER_COLORS["professional"]))
+        watermark = profile.watermark
+        show_rule = profile.header_style != "minimal"
+
+        def draw_page(canvas, doc) -> None:
+            width, height = doc.pagesize
+            canvas.saveState()
+            if watermark:
+                canvas.setFont(font_name, 48)
+                canvas.setFillColor(colors.Color(0.85, 0.85, 0.85))
+                canvas.translate(width / 2, height / 2)
+                canvas.rotate(45)
+                canvas.drawCentredString(0, 0, watermark)
+                canvas.rotate(-45)
+                canvas.translate(-width / 2, -height / 2)
+            if logo is not None:
+                canvas.drawImage(logo, width - doc.rightMargin - 2.5 * cm, height - 0.9 * cm,
+                                 width=2.5 * cm, height=0.7 * cm, preserveAspectRatio=True, mask="auto")
+            if header_text:
+                canvas.setFont(font_name, 7)
+                canvas.setFillColor(header_color)
+                canvas.drawString(doc.leftMargin, height - 0.6 * cm, header_text)
+                if show_rule:
+                    canvas.setStrokeColor(header_color)
+                    canvas.line(doc.leftMargin, height - 0.7 * cm, width - doc.rightMargin, height - 0.7 * cm)
+                canvas.setFillColor(colors.grey)
+                canvas.drawCentredString(width / 2, 0.5 * cm, f"- {canvas.getPageNumber()} -")
+            canvas.restoreState()
+
+        return draw_page
+
+    def page_callbacks(self, profile: LayoutProfile = DEFAULT_PROFILE) -> Dict[str, PageCallback]:
+        """doc.build 에 넘길 onFirstPage/onLaterPages (장식이 없는 프로파일은 빈 dict)"""
+        with self._lock:
+            callback = self._page_callbacks.get_or_create(profile, lambda: self._compile_page_callback(profile))
+        return {"onFirstPage": callback, "onLaterPages": callback} if callback else {}
+
+    # 관리
+
+    def clear(self) -> None:
+        """컴파일된 스타일/장식 캐시 비우기 (등록된 폰트는 유지)"""
+        with self._lock:
+            self._style_sheets.clear()
+            self._table_styles.clear()
+            self._page_callbacks.clear()
+            self._logo = None
+
+    def cache_info(self) -> Dict[str, Any]:
+        return {
+            "font": self.font_name,
+            "style_sheets": self._style_sheets.info(),
+            "table_styles": self._table_styles.info(),
+            "page_callbacks": self._page_callbacks.info(),
+        }
+
+
+# Global render context (one per process; PDF render farm workers build their own on first use)
+pdf_render_context = PDFRenderContext()
@@ -0,0 +1,251 @@
+"""
+PDF Render Farm
+대량 평가표 출력을 위한 다중 프로세스 PDF 렌더링 팜
+
+- 평가 데이터는 $in 조회로 묶음 단위 미리 조회 (평가 1건마다 find_one 여러 번 하지 않음)
+  프로젝트/템플릿/기업/평가자 문서는 묶음 간에 재사용
+- 렌더링은 spawn 프로세스 풀에 묶음(batch) 단위로 분산 - reportlab 은 순수 파이썬이라 스레드로는 코어를 나눠 쓰지 못함
+- 다음 묶음을 조회하는 동안 이전 묶음이 렌더링되며, 완료된 문서는 순서와 관계없이 바로 호출자(ZIP 작성)에게 전달
+- 동시에 처리 중인 묶음 수를 워커 수의 2배로 제한해 메모리 사용량 유지
+- 문서별 렌더링 시간(워커 프로세스에서 측정)과 처리량 지표 제공
+
+워커 수는 PDF_RENDER_WORKERS (0 이면 프로세스 풀 대신 스레드에서 렌더링)
+job_worker.py 를 여러 프로세스로 실행하면 프로세스마다 렌더링 풀이 생기므로 합계가 코어 수를 넘지 않게 설정하세요.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from evaluation_pdf import create_individual_evaluation_pdf
+
+logger = logging.getLogger(__name__)
+
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", str(min(os.cpu_count() or 1, 4))))
+PDF_RENDER_BATCH_SIZE = int(os.getenv("PDF_RENDER_BATCH_SIZE", "8"))
+PDF_PREFETCH_BATCH_SIZE = int(os.getenv("PDF_PREFETCH_BATCH_SIZE", "100"))
+
+RenderItem = Tuple[str, Dict[str, Any]]
+Renderer = Callable[[Dict[str, Any], Optional[Dict[str, Any]]], bytes]
+
+
+@dataclass
+class RenderedDocument:
+    """렌더링 결과 (실패하면 content 는 None, error 에 사유)"""
+    key: str
+    content: Optional[bytes]
+    render_ms: float
+    error: Optional[str] = None
+    worker_pid: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.content is not None
+
+
+@dataclass
+class RenderMetrics:
+    """렌더링 작업 지표 (문서별 렌더링 시간과 전체 처리량)"""
+    workers: int
+    documents: List[Dict[str, Any]] = field(default_factory=list)
+    cache_hits: int = 0  # 렌더링하지 않고 저장소에서 가져온 문서 수
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def record(self, document: RenderedDocument) -> None:
+        entry = {"key": document.key, "render_ms": round(document.render_ms, 1), "worker_pid": document.worker_pid}
+        if document.ok:
+            entry["bytes"] = len(document.content)
+        else:
+            entry["error"] = document.error
+        self.documents.append(entry)
+
+    def summary(self, include_documents: bool = True) -> Dict[str, Any]:
+        wall_ms = (time.perf_counter() - self.started_at) * 1000
+        timings = sorted(d["render_ms"] for d in self.documents)
+        rendered = [d for d in self.documents if "error" not in d]
+
+        def percentile(ratio: float) -> float:
+            return timings[min(len(timings) - 1, int(round(ratio * (len(timings) - 1))))] if timings else 0.0
+
+        summary = {
+            "workers": self.workers,
+            "rendered": len(rendered),
+            "failed": len(self.documents) - len(rendered),
+            "cache_hits": self.cache_hits,
+            "bytes": sum(d["bytes"] for d in rendered),
+            "wall_ms": round(wall_ms, 1),
+            "render_ms_total": round(sum(timings), 1),
+            "render_ms_avg": round(sum(timings) / len(timings), 1) if timings else 0.0,
+            "render_ms_p50": percentile(0.5),
+            "render_ms_p95": percentile(0.95),
+            "render_ms_max": timings[-1] if timings else 0.0,
+            "documents_per_second": round(len(self.documents) / (wall_ms / 1000), 2) if wall_ms > 0 else 0.0,
+        }
+        if include_documents:
+            summary["documents"] = list(self.documents)
+        return summary
+
+
+def _render_batch(render: Renderer, items: Sequence[RenderItem],
+                  options: Optional[Dict[str, Any]]) -> List[Tuple[str, Optional[bytes], float, Optional[str], int]]:
+    """워커 프로세스에서 묶음 하나를 렌더링 (문서 하나가 실패해도 나머지는 계속)"""
+    results = []
+    for key, payload in items:
+        started = time.perf_counter()
+        try:
+            content, error = render(payload, options), None
+        except Exception as e:
+            content, error = None, str(e) or type(e).__name__
+        results.append((key, content, (time.perf_counter() - started) * 1000, error, os.getpid()))
+    return results
+
+
+async def _as_async(batches: Union[Iterable[List[RenderItem]], AsyncIterable[List[RenderItem]]]) -> AsyncIterator[List[RenderItem]]:
+    if hasattr(batches, "__aiter__"):
+        async for batch in batches:
+            yield batch
+    else:
+        for batch in batches:
+            yield batch
+
+
+async def fetch_evaluation_payloads(db, evaluation_ids: Sequence[str],
+                                    batch_size: int = PDF_PREFETCH_BATCH_SIZE) -> AsyncIterator[List[Tuple[str, Optional[Dict[str, Any]]]]]:
+    """평가 렌더링 데이터를 묶음 단위로 조회 (get_evaluation_data 와 같은 형식, 없는 평가는 None)
+
+    평가지는 evaluation_sheets, 관련 문서는 id 필드로 조회 (점수는 sheet_id)
+    묶음마다 평가/점수 조회 1회, 아직 조회하지 않은 평가자/기업/프로젝트/템플릿 컬렉션별 조회 1회
+    """
+    related = {
+        "evaluator": ("users", "evaluator_id", {}),
+        "company": ("companies", "company_id", {}),
+        "project": ("projects", "project_id", {}),
+        "template": ("evaluation_templates", "template_id", {}),
+    }
+
+    async def load_related(evaluations: List[Dict[str, Any]], collection: str, field_name: str, cache: Dict[Any, Any]):
+        missing = list({e.get(field_name) for e in evaluations if e.get(field_name) is not None} - cache.keys())
+        if missing:
+            for doc in await db[collection].find({"id": {"$in": missing}}, {"_id": 0}).to_list(None):
+                cache[doc["id"]] = doc
+
+    for start in range(0, len(evaluation_ids), batch_size):
+        chunk = list(evaluation_ids[start:start + batch_size])
+        evaluations, score_docs = await asyncio.gather(
+            db.evaluation_sheets.find({"id": {"$in": chunk}}, {"_id": 0}).to_list(None),
+            db.evaluation_scores.find({"sheet_id": {"$in": chunk}}, {"_id": 0}).to_list(None),
+        )
+        await asyncio.gather(*(
+            load_related(evaluations, collection, field_name, cache)
+            for collection, field_name, cache in related.values()
+        ))
+
+        scores: Dict[str, List[Dict[str, Any]]] = {}
+        for score in score_docs:
+            scores.setdefault(score["sheet_id"], []).append(score)
+        by_id = {evaluation["id"]: evaluation for evaluation in evaluations}
+
+        batch = []
+        for evaluation_id in chunk:
+            evaluation = by_id.get(evaluation_id)
+            if evaluation is None:
+                batch.append((evaluation_id, None))
+                continue
+            payload = {"evaluation": evaluation, "scores": scores.get(evaluation_id, [])}
+            for name, (_, field_name, cache) in related.items():
+                payload[name] = cache.get(evaluation.get(field_name))
+            batch.append((evaluation_id, payload))
+        yield batch
+
+
+class PDFRenderFarm:
+    """프로세스 풀 기반 PDF 렌더링 팜
+
+    workers=0 이면 프로세스 풀 대신 스레드에서 렌더링합니다 (테스트/단일 코어 환경).
+    """
+
+    def __init__(self, workers: int = PDF_RENDER_WORKERS, batch_size: int = PDF_RENDER_BATCH_SIZE):
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # 이벤트 루프 스레드와 DB 클라이언트를 가진 프로세스를 fork 하지 않도록 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run_batch(self, render: Renderer, items: List[RenderItem],
+                         options: Optional[Dict[str, Any]]) -> List[RenderedDocument]:
+        if self.workers <= 0:
+            results = await asyncio.to_thread(_render_batch, render, items, options)
+        else:
+            loop = asyncio.get_running_loop()
+            try:
+                results = await loop.run_in_executor(self._get_executor(), _render_batch, render, items, options)
+            except BrokenProcessPool:
+                logger.warning("PDF render process pool broke; recreating")
+                self.shutdown()
+                results = await loop.run_in_executor(self._get_executor(), _render_batch, render, items, options)
+        return [RenderedDocument(*result) for result in results]
+
+    async def render(self, batches: Union[Iterable[List[RenderItem]], AsyncIterable[List[RenderItem]]],
+                     options: Optional[Dict[str, Any]] = None,
+                     render: Renderer = create_individual_evaluation_pdf,
+                     metrics: Optional[RenderMetrics] = None) -> AsyncIterator[RenderedDocument]:
+        """(key, payload) 묶음들을 렌더링해 완료되는 순서대로 결과를 내보냄
+
+        batches 는 미리 조회한 묶음의 (비)동기 이터러블 - 다음 묶음을 조회하는 동안 앞 묶음이 렌더링됩니다.
+        """
+        max_in_flight = max(self.workers, 1) * 2
+        in_flight: set = set()
+
+        def finished(tasks) -> Iterable[RenderedDocument]:
+            for task in tasks:
+                for document in task.result():
+                    if metrics is not None:
+                        metrics.record(document)
+                    yield document
+
+        try:
+            async for batch in _as_async(batches):
+                for start in range(0, len(batch), self.batch_size):
+                    in_flight.add(asyncio.ensure_future(
+                        self._run_batch(render, list(batch[start:start + self.batch_size]), options)
+                    ))
+                    if len(in_flight) >= max_in_flight:
+                        done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                        for document in finished(done):
+                            yield document
+                # 조회를 기다리는 동안 끝난 묶음은 바로 전달
+                done = {task for task in in_flight if task.done()}
+                in_flight -= done
+                for document in finished(done):
+                    yield document
+
+            while in_flight:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for document in finished(done):
+                    yield document
+        finally:
+            # 작업 취소 등으로 중단되면 대기 중인 묶음은 버림
+            for task in in_flight:
+                task.cancel()
+
+
+# Global render farm instance (worker processes start on first use)
+pdf_render_farm = PDFRenderFarm()
@@ -11,7 +11,8 @@ import logging
 from pydantic import BaseModel, Field
 
 from models import User
-from security import get_current_user
+from dashboard_counters import dashboard_counters
+from security import get_current_user, invalidate_user_principal
 from enhanced_permissions import (
     Permission, Role, ProjectRole, PermissionChecker, 
     permission_checker, add_project_member, remove_project_member,
@@ -187,6 +188,10 @@ async def update_user_role(
                 }
             }
         )
+        await invalidate_user_principal(user_id)
+        await permission_checker.broadcast_invalidation(user_id)
+        is_active = user_doc.get("is_active", True)
+        await dashboard_counters.user_updated(user_doc.get("role"), is_active, request.new_role.value, is_active)
         
         logger.info(f"사용자 역할 변경: {user_id} -> {request.new_role.value}", extra={
             'admin_id': current_user.id,
@@ -472,13 +477,14 @@ async def get_users_with_permissions(
             filter_conditions["role"] = role
         
         users = await db.users.find(filter_conditions).to_list(length=None)
+        user_models = [User.from_mongo(user_doc) for user_doc in users]
+        
+        # 권한 일괄 조회
+        permissions_by_user = await permission_checker.get_permissions_for_users(user_models)
         
         user_list = []
-        for user_doc in users:
-            user = User.from_mongo(user_doc)
-            
-            # 권한 조회
-            permissions = await permission_checker.get_user_permissions(user)
+        for user in user_models:
+            permissions = permissions_by_user[user.id]
             
             # 특정 권한 필터링
             if has_permission and Permission(has_permission) not in permissions:
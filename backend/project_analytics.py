@@ -0,0 +1,314 @@
+"""
+Project Analytics Aggregation
+프로젝트 분석 통계를 MongoDB 집계 파이프라인으로 계산하고, project_stats 컬렉션에 사전 계산 문서로 유지합니다.
+
+- 라이브 조회: $facet/$group/$lookup 한 번으로 템플릿별 점수 통계와 기업별 진행률 계산
+- 사전 계산: 배정·제출·삭제 시 $inc/$min/$max 로 누적값을 증분 갱신, 되돌릴 수 없는 변경은 전체 재계산
+"""
+
+import asyncio
+import logging
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, IndexModel
+
+from scoring_engine import score_project, template_items
+
+logger = logging.getLogger(__name__)
+
+STATS_COLLECTION = "project_stats"
+
+
+def _empty_stats() -> Dict[str, Any]:
+    return {"templates": {}, "companies": {}}
+
+
+class ProjectStatsService:
+    """프로젝트 통계 집계 및 사전 계산 문서 관리 서비스"""
+
+    def __init__(self, db=None):
+        self.db = db
+
+    @staticmethod
+    def build_pipeline(project_id: str) -> List[Dict[str, Any]]:
+        """템플릿별 점수 누적값과 기업별 배정/제출 수를 계산하는 집계 파이프라인"""
+        return [
+            {"$match": {"project_id": project_id}},
+            {"$facet": {
+                "templates": [
+                    {"$match": {"status": "submitted", "total_score": {"$ne": None}}},
+                    {"$group": {
+                        "_id": "$template_id",
+                        "count": {"$sum": 1},
+                        "sum": {"$sum": "$total_score"},
+                        "sumsq": {"$sum": {"$multiply": ["$total_score", "$total_score"]}},
+                        "min": {"$min": "$total_score"},
+                        "max": {"$max": "$total_score"},
+                    }},
+                    {"$lookup": {
+                        "from": "evaluation_templates",
+                        "localField": "_id",
+                        "foreignField": "id",
+                        "as": "template",
+                    }},
+                    {"$project": {
+                        "count": 1, "sum": 1, "sumsq": 1, "min": 1, "max": 1,
+                        "name": {"$arrayElemAt": ["$template.name", 0]},
+                    }},
+                ],
+                "companies": [
+                    {"$group": {
+                        "_id": "$company_id",
+                        "assigned": {"$sum": 1},
+                        "submitted": {"$sum": {"$cond": [{"$eq": ["$status", "submitted"]}, 1, 0]}},
+                    }},
+                ],
+            }},
+        ]
+
+    async def aggregate(self, project_id: str, session=None) -> Dict[str, Any]:
+        """집계 파이프라인을 실행하여 누적 통계 반환"""
+        results = await self.db.evaluation_sheets.aggregate(
+            self.build_pipeline(project_id), session=session
+        ).to_list(1)
+        facets = results[0] if results else {"templates": [], "companies": []}
+
+        stats = _empty_stats()
+        for row in facets["templates"]:
+            template_id = row.pop("_id")
+            if template_id is not None:
+                stats["templates"][template_id] = row
+        for row in facets["companies"]:
+            company_id = row.pop("_id")
+            if company_id is not None:
+                stats["companies"][company_id] = row
+        return stats
+
+    async def refresh(self, project_id: str, session=None) -> Dict[str, Any]:
+        """전체 재계산 후 사전 계산 문서를 교체"""
+        stats = await self.aggregate(project_id, session=session)
+        stats["updated_at"] = datetime.utcnow()
+        await self.db[STATS_COLLECTION].replace_one(
+            {"project_id": project_id},
+            {"project_id": project_id, **stats},
+            upsert=True,
+            session=session,
+        )
+        return stats
+
+    async def record_submission(self, sheet_data: Dict[str, Any], total_score: Optional[float], session=None) -> None:
+        """평가 제출을 사전 계산 문서에 증분 반영
+
+        sheet_data 는 제출 처리 이전의 평가지 문서입니다. 이미 제출된 평가지의 재제출은
+        기존 점수를 되돌릴 수 없으므로(min/max) 전체 재계산으로 처리합니다.
+        session 이 있으면 평가지 상태 변경과 같은 트랜잭션에서 반영하고 오류는 전달합니다
+        (커밋과 증분 사이에 다른 요청의 전체 재계산이 끼어 제출이 두 번 반영되지 않도록).
+        """
+        project_id = sheet_data.get("project_id")
+        if not project_id or self.db is None:
+            return
+
+        try:
+            if sheet_data.get("status") == "submitted" or total_score is None:
+                await self.refresh(project_id, session=session)
+                return
+
+            template_key = f"templates.{sheet_data.get('template_id')}"
+            company_key = f"companies.{sheet_data.get('company_id')}"
+            result = await self.db[STATS_COLLECTION].update_one(
+                {"project_id": project_id},
+                {
+                    "$inc": {
+                        f"{template_key}.count": 1,
+                        f"{template_key}.sum": total_score,
+                        f"{template_key}.sumsq": total_score * total_score,
+                        f"{company_key}.submitted": 1,
+                    },
+                    "$min": {f"{template_key}.min": total_score},
+                    "$max": {f"{template_key}.max": total_score},
+                    "$set": {"updated_at": datetime.utcnow()},
+                },
+                session=session,
+            )
+
+            # 사전 계산 문서가 아직 없으면 현재 상태로 전체 계산
+            if result.matched_count == 0:
+                await self.refresh(project_id, session=session)
+        except Exception as e:
+            if session is not None:
+                raise
+            logger.error(f"Project stats update failed for {project_id}: {e}")
+
+    async def sheets_assigned(self, project_id: Optional[str], company_counts: Dict[str, int]) -> None:
+        """새 평가지 배정을 기업별 assigned 에 증분 반영
+
+        사전 계산 문서가 아직 없으면 처음 조회할 때 전체 계산되므로 갱신하지 않습니다.
+        """
+        changes = {f"companies.{company_id}.assigned": count for company_id, count in company_counts.items() if count}
+        if not project_id or not changes or self.db is None:
+            return
+
+        try:
+            await self.db[STATS_COLLECTION].update_one(
+                {"project_id": project_id},
+                {"$inc": changes, "$set": {"updated_at": datetime.utcnow()}},
+            )
+        except Exception as e:
+            logger.error(f"Project stats update failed for {project_id}: {e}")
+
+    async def sheet_deleted(self, sheet_data: Dict[str, Any]) -> None:
+        """평가지 삭제를 사전 계산 문서에 반영
+
+        제출된 평가지는 점수 누적값(min/max)을 되돌릴 수 없으므로 전체 재계산합니다.
+        """
+        project_id = sheet_data.get("project_id")
+        if not project_id or self.db is None:
+            return
+
+        if sheet_data.get("status") == "submitted":
+            try:
+                await self.refresh(project_id)
+            except Exception as e:
+                logger.error(f"Project stats update failed for {project_id}: {e}")
+            return
+        await self.sheets_assigned(project_id, {sheet_data.get("company_id"): -1})
+
+    async def _resolve_template_names(self, templates: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        names = {tid: row["name"] for tid, row in templates.items() if row.get("name")}
+        missing = [tid for tid in templates if tid not in names]
+        if missing:
+            async for template in self.db.evaluation_templates.find(
+                {"id": {"$in": missing}}, {"_id": 0, "id": 1, "name": 1}
+            ):
+                names[template["id"]] = template.get("name")
+        return names
+
+    async def format(self, project_id: str, stats: Dict[str, Any], total_companies: int) -> Dict[str, Any]:
+        """누적 통계를 API 응답 형태로 변환"""
+        names = await self._resolve_template_names(stats["templates"])
+
+        score_analytics = {}
+        for template_id, row in stats["templates"].items():
+            count = row.get("count", 0)
+            if not count:
+                continue
+            average = row["sum"] / count
+            variance = max(row["sumsq"] / count - average * average, 0.0)
+            score_analytics[names.get(template_id) or "Unknown"] = {
+                "average": average,
+                "min": row["min"],
+                "max": row["max"],
+                "count": count,
+                "stddev": math.sqrt(variance),
+            }
+
+        company_completion = []
+        for company_id, row in stats["companies"].items():
+            assigned = row.get("assigned", 0)
+            submitted = row.get("submitted", 0)
+            company_completion.append({
+                "company_id": company_id,
+                "assigned": assigned,
+                "submitted": submitted,
+                "completion_rate": round((submitted / assigned * 100) if assigned else 0, 1),
+            })
+
+        total_evaluations = sum(row.get("submitted", 0) for row in stats["companies"].values())
+        companies_evaluated = sum(1 for row in stats["companies"].values() if row.get("submitted"))
+
+        return {
+            "project_id": project_id,
+            "total_companies": total_companies,
+            "companies_evaluated": companies_evaluated,
+            "total_evaluations": total_evaluations,
+            "completion_rate": round((companies_evaluated / total_companies * 100) if total_companies else 0, 1),
+            "score_analytics": score_analytics,
+            "company_completion": company_completion,
+        }
+
+    async def get_analytics(self, project_id: str, precomputed: bool = False) -> Dict[str, Any]:
+        """프로젝트 분석 결과 조회 (precomputed=True 이면 사전 계산 문서 사용)"""
+        total_companies_task = self.db.companies.count_documents({"project_id": project_id})
+
+        if precomputed:
+            stats, total_companies = await asyncio.gather(
+                self.db[STATS_COLLECTION].find_one({"project_id": project_id}),
+                total_companies_task,
+            )
+            if stats is None:
+                stats = await self.refresh(project_id)
+            source = "materialized"
+        else:
+            stats, total_companies = await asyncio.gather(
+                self.aggregate(project_id), total_companies_task
+            )
+            source = "live"
+
+        analytics = await self.format(project_id, stats, total_companies)
+        analytics["source"] = source
+        if precomputed:
+            analytics["updated_at"] = stats.get("updated_at")
+        return analytics
+
+    async def get_criteria_analytics(self, project_id: str, template_id: Optional[str] = None) -> Dict[str, Any]:
+        """제출된 평가지의 항목별 점수 통계 (평가표마다 scoring_engine 행렬 연산 1회)"""
+        query: Dict[str, Any] = {"project_id": project_id, "status": "submitted"}
+        if template_id:
+            query["template_id"] = template_id
+        sheets = await self.db.evaluation_sheets.find(query, {"_id": 0, "id": 1, "template_id": 1}).to_list(None)
+
+        sheet_ids_by_template: Dict[str, List[str]] = {}
+        for sheet in sheets:
+            if sheet.get("template_id"):
+                sheet_ids_by_template.setdefault(sheet["template_id"], []).append(sheet["id"])
+        if not sheet_ids_by_template:
+            return {"project_id": project_id, "templates": []}
+
+        sheet_template = {sid: tid for tid, sids in sheet_ids_by_template.items() for sid in sids}
+        templates, scores = await asyncio.gather(
+            self.db.evaluation_templates.find(
+                {"id": {"$in": list(sheet_ids_by_template)}},
+                {"_id": 0, "id": 1, "name": 1, "items": 1, "criteria": 1},
+            ).to_list(None),
+            self.db.evaluation_scores.find(
+                {"sheet_id": {"$in": list(sheet_template)}},
+                {"_id": 0, "sheet_id": 1, "item_id": 1, "criterion_id": 1, "score": 1},
+            ).to_list(None),
+        )
+
+        scores_by_template: Dict[str, List[Dict[str, Any]]] = {}
+        for score in scores:
+            scores_by_template.setdefault(sheet_template[score["sheet_id"]], []).append(score)
+
+        results = []
+        for template in templates:
+            template_sheet_ids = sheet_ids_by_template[template["id"]]
+            computed = score_project(template_items(template), scores_by_template.get(template["id"], []), template_sheet_ids)
+            results.append({
+                "template_id": template["id"],
+                "name": template.get("name"),
+                "sheet_count": len(template_sheet_ids),
+                "totals": computed["totals"],
+                "criteria": [{"item_id": item_id, **stats} for item_id, stats in computed["criteria"].items()],
+            })
+        return {"project_id": project_id, "templates": results}
+
+
+async def ensure_analytics_indexes(db) -> None:
+    """분석 집계용 인덱스 생성"""
+    indexes = {
+        "evaluation_sheets": [IndexModel([("project_id", ASCENDING), ("status", ASCENDING)])],
+        "companies": [IndexModel([("project_id", ASCENDING)])],
+        STATS_COLLECTION: [IndexModel([("project_id", ASCENDING)], unique=True)],
+    }
+    for collection_name, collection_indexes in indexes.items():
+        try:
+            await db[collection_name].create_indexes(collection_indexes)
+        except Exception as e:
+            logger.warning(f"Failed to create analytics index for {collection_name}: {e}")
+
+
+# Global project statistics service instance (db is attached at server startup)
+project_stats_service = ProjectStatsService()
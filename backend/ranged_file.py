@@ -0,0 +1,137 @@
+"""
+Ranged File Streaming
+HTTP Range(206) 및 조건부 GET(ETag/If-None-Match) 을 지원하는 파일 스트리밍 유틸리티
+
+- 단일 바이트 범위 요청만 처리 (다중 범위는 무시하고 전체 응답 - RFC 9110 허용)
+- If-Range 가 현재 ETag 와 다르면 범위를 무시하고 전체 파일 전송
+- 전송 크기에 따라 읽기 청크 크기를 조정해 작은 범위는 적게, 큰 파일은 크게 읽음
+"""
+
+import os
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import aiofiles
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+MIN_CHUNK_SIZE = 64 * 1024  # 64KB
+MAX_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def adaptive_chunk_size(length: int) -> int:
+    """전송 길이에 맞춘 읽기 청크 크기 (64KB ~ 1MB, 대략 8회 읽기 기준)"""
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, length // 8))
+
+
+def make_etag(file_hash: Optional[str], stat_result: os.stat_result) -> str:
+    """콘텐츠 해시가 있으면 강한 ETag, 없으면 크기/수정시각 기반 약한 ETag"""
+    if file_hash:
+        return f'"{file_hash}"'
+    return f'W/"{stat_result.st_size:x}-{int(stat_result.st_mtime):x}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 비교 (약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def parse_range_header(range_header: Optional[str], file_size: int) -> Optional[Tuple[int, int]]:
+    """Range 헤더를 (start, end) 로 해석 (end 포함)
+
+    범위 요청이 아니거나 다중 범위이면 None, 만족할 수 없는 범위이면 ValueError.
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_str, sep, end_str = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if start_str == "":
+            # 접미사 범위: 마지막 N 바이트
+            suffix = int(end_str)
+            if suffix <= 0:
+                raise ValueError("empty suffix range")
+            start, end = max(file_size - suffix, 0), file_size - 1
+        else:
+            start = int(start_str)
+            end = int(end_str) if end_str else file_size - 1
+            end = min(end, file_size - 1)
+    except ValueError:
+        raise ValueError(f"invalid range: {range_header}")
+
+    if start < 0 or start >= file_size or end < start:
+        raise ValueError(f"unsatisfiable range: {range_header}")
+    return start, end
+
+
+async def iter_file_range(path: str, start: int, length: int, chunk_size: int) -> AsyncIterator[bytes]:
+    """파일의 [start, start + length) 구간을 청크 단위로 읽기"""
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = await f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def ranged_file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    file_hash: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Range/If-Range/If-None-Match 를 반영한 파일 응답 생성 (200/206/304/416)"""
+    stat_result = os.stat(path)
+    file_size = stat_result.st_size
+    etag = make_etag(file_hash, stat_result)
+
+    base_headers = dict(headers or {})
+    base_headers["ETag"] = etag
+    base_headers["Accept-Ranges"] = "bytes"
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=base_headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    # If-Range 는 강한 ETag 가 정확히 일치할 때만 범위를 적용
+    if not if_range or (if_range.strip() == etag and not etag.startswith("W/")):
+        try:
+            byte_range = parse_range_header(request.headers.get("range"), file_size)
+        except ValueError:
+            base_headers["Content-Range"] = f"bytes */{file_size}"
+            return Response(status_code=416, headers=base_headers)
+
+    if byte_range is None:
+        start, length, status_code = 0, file_size, 200
+    else:
+        start, end = byte_range
+        length, status_code = end - start + 1, 206
+        base_headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+
+    base_headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        iter_file_range(path, start, length, adaptive_chunk_size(length)),
+        status_code=status_code,
+        media_type=media_type,
+        headers=base_headers,
+    )
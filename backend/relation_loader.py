@@ -0,0 +1,116 @@
+"""
+Batched Relation Loader
+평가지/파일 목록에 연결된 프로젝트·회사·평가위원·템플릿을 컬렉션당 한 번의 $in 쿼리로 조회합니다.
+
+행마다 find_one 을 호출하던 N+1 패턴을 대체하여, 목록 크기와 무관하게
+관계 하나당 라운드트립 1회로 응답 지연을 일정하게 유지합니다.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pymongo import IndexModel
+
+logger = logging.getLogger(__name__)
+
+# 관계명 -> (문서 내 외래키 필드, 대상 컬렉션)
+RELATIONS: Dict[str, Tuple[str, str]] = {
+    "project": ("project_id", "projects"),
+    "company": ("company_id", "companies"),
+    "evaluator": ("evaluator_id", "users"),
+    "template": ("template_id", "evaluation_templates"),
+}
+
+DEFAULT_RELATIONS: Tuple[str, ...] = ("project", "company", "evaluator", "template")
+
+
+class RelationLoader:
+    """목록 문서의 관계를 일괄 조회하여 연결하는 로더"""
+
+    def __init__(self, db=None, key_field: str = "id"):
+        self.db = db
+        self.key_field = key_field
+
+    @staticmethod
+    def collect_ids(docs: Iterable[Dict[str, Any]], foreign_key: str) -> List[str]:
+        """문서 목록에서 중복 없는 외래키 값을 순서대로 수집"""
+        seen = {}
+        for doc in docs:
+            value = doc.get(foreign_key)
+            if value is not None and value not in seen:
+                seen[value] = None
+        return list(seen)
+
+    async def _fetch(
+        self,
+        collection_name: str,
+        ids: List[str],
+        projection: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """단일 $in 쿼리로 대상 문서를 조회하여 키 -> 문서 맵 반환"""
+        if not ids:
+            return {}
+
+        if projection is not None:
+            projection = {**projection, self.key_field: 1}
+
+        cursor = self.db[collection_name].find({self.key_field: {"$in": ids}}, projection)
+        documents = await cursor.to_list(length=len(ids))
+        return {doc[self.key_field]: doc for doc in documents if self.key_field in doc}
+
+    async def load(
+        self,
+        docs: Sequence[Dict[str, Any]],
+        relations: Sequence[str] = DEFAULT_RELATIONS,
+        projections: Optional[Dict[str, Dict[str, int]]] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """관계별 조회 결과 맵 반환 (관계명 -> {키: 문서})
+
+        관계별 쿼리는 동시에 실행되므로 전체 지연은 가장 느린 쿼리 하나에 수렴합니다.
+        """
+        projections = projections or {}
+        names = [name for name in relations if name in RELATIONS]
+        unknown = set(relations) - set(names)
+        if unknown:
+            raise ValueError(f"알 수 없는 관계: {', '.join(sorted(unknown))}")
+
+        tasks = []
+        for name in names:
+            foreign_key, collection_name = RELATIONS[name]
+            ids = self.collect_ids(docs, foreign_key)
+            tasks.append(self._fetch(collection_name, ids, projections.get(name)))
+
+        results = await asyncio.gather(*tasks)
+        return dict(zip(names, results))
+
+    async def hydrate(
+        self,
+        docs: Sequence[Dict[str, Any]],
+        relations: Sequence[str] = DEFAULT_RELATIONS,
+        projections: Optional[Dict[str, Dict[str, int]]] = None,
+    ) -> List[Dict[str, Optional[Dict[str, Any]]]]:
+        """문서 순서에 맞춘 관계 목록 반환
+
+        반환값의 i번째 항목은 docs[i] 에 대한 {관계명: 문서 또는 None} 입니다.
+        """
+        loaded = await self.load(docs, relations, projections)
+
+        hydrated = []
+        for doc in docs:
+            related = {}
+            for name, lookup in loaded.items():
+                foreign_key = RELATIONS[name][0]
+                related[name] = lookup.get(doc.get(foreign_key))
+            hydrated.append(related)
+        return hydrated
+
+
+async def ensure_relation_indexes(db) -> None:
+    """관계 조회 대상 컬렉션의 키 필드 인덱스 생성"""
+    collections = {collection_name for _, collection_name in RELATIONS.values()}
+    for collection_name in sorted(collections):
+        try:
+            await db[collection_name].create_indexes([IndexModel([("id", 1)])])
+        except Exception as e:
+            logger.warning(f"Failed to create relation index for {collection_name}: {e}")
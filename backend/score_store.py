@@ -0,0 +1,205 @@
+"""
+Evaluation Score Store
+평가 점수 저장소 - 임시저장/제출 시 전체 삭제 후 재삽입 대신 변경된 항목만 upsert
+
+- (sheet_id, item_id) 고유 인덱스를 기준으로 UpdateOne(upsert=True) 묶음을 bulk_write 한 번으로 실행
+- 항목마다 version 을 두어 낙관적 동시성 제어 (클라이언트가 받은 version 과 다르면 409)
+- 값이 바뀌지 않은 항목은 쓰지 않으므로 잦은 자동 저장에도 컬렉션/인덱스 변경이 최소화됨
+- 요청에서 빠진 기존 항목은 같은 bulk_write 의 DeleteMany 로 삭제 (전체 교체와 같은 결과)
+- 레플리카셋 환경에서는 점수 쓰기와 평가지 상태 변경(및 제출 통계 증분)을 하나의 트랜잭션으로 묶음
+"""
+
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo import ASCENDING, DeleteMany, IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from models import EvaluationScore
+
+logger = logging.getLogger(__name__)
+
+# auto: 트랜잭션을 시도하고 단독 서버 등 미지원 환경이면 트랜잭션 없이 실행 / true / false
+SCORE_WRITE_TRANSACTIONS = os.getenv("SCORE_WRITE_TRANSACTIONS", "auto").lower()
+ILLEGAL_OPERATION = 20
+
+# 점수/평가지 쓰기와 같은 트랜잭션에서 실행할 추가 쓰기 (session 을 받음, 트랜잭션이 없으면 None)
+RelatedWrites = Callable[[Any], Awaitable[None]]
+
+
+async def ensure_score_indexes(db) -> None:
+    """항목별 upsert 키인 (sheet_id, item_id) 고유 인덱스 생성"""
+    try:
+        await db.evaluation_scores.create_indexes([
+            IndexModel([("sheet_id", ASCENDING), ("item_id", ASCENDING)], unique=True, name="uniq_sheet_item")
+        ])
+    except Exception as e:
+        logger.warning(f"Failed to create score index for evaluation_scores: {e}")
+
+
+def _transactions_unsupported(error: OperationFailure) -> bool:
+    message = str(error)
+    return error.code == ILLEGAL_OPERATION or "replica set" in message or "Transaction numbers" in message
+
+
+def _conflict(conflicts: List[Dict[str, Any]]) -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail={
+            "message": "다른 곳에서 먼저 수정된 항목이 있습니다. 최신 점수를 다시 불러온 후 저장해주세요.",
+            "conflicts": conflicts,
+        },
+    )
+
+
+class ScoreStore:
+    """평가 점수 diff 저장"""
+
+    def __init__(self, db=None, transactions: str = SCORE_WRITE_TRANSACTIONS):
+        self.db = db
+        self.transactions = transactions
+
+    def _parse(self, sheet_id: str, scores: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        entries = []
+        for score_data in scores:
+            try:
+                score = EvaluationScore(
+                    sheet_id=sheet_id,
+                    item_id=score_data["item_id"],
+                    score=score_data["score"],
+                    opinion=score_data.get("opinion", ""),
+                )
+            except (KeyError, ValidationError) as e:
+                raise HTTPException(status_code=400, detail=f"점수 형식이 올바르지 않습니다: {str(e)}")
+            entries.append({
+                "item_id": score.item_id,
+                "score": score.score,
+                "opinion": score.opinion,
+                "version": score_data.get("version"),
+            })
+        return entries
+
+    async def _write(self, operations: List[Any], sheet_id: str, sheet_update: Optional[Dict[str, Any]],
+                     related_writes: Optional[RelatedWrites] = None, session=None) -> None:
+        if operations:
+            await self.db.evaluation_scores.bulk_write(operations, ordered=False, session=session)
+        if sheet_update:
+            await self.db.evaluation_sheets.update_one({"id": sheet_id}, sheet_update, session=session)
+        if related_writes is not None:
+            await related_writes(session)
+
+    async def _write_atomically(self, operations: List[Any], sheet_id: str, sheet_update: Optional[Dict[str, Any]],
+                                related_writes: Optional[RelatedWrites] = None) -> None:
+        if self.transactions in ("auto", "true"):
+            try:
+                async with await self.db.client.start_session() as session:
+                    async def callback(s):
+                        await self._write(operations, sheet_id, sheet_update, related_writes, session=s)
+
+                    await session.with_transaction(callback)
+                return
+            except OperationFailure as e:
+                if self.transactions == "true" or not _transactions_unsupported(e):
+                    raise
+                logger.info("MongoDB transactions unavailable; writing scores without a transaction")
+                self.transactions = "false"
+        await self._write(operations, sheet_id, sheet_update, related_writes)
+
+    async def save(
+        self,
+        sheet_id: str,
+        scores: List[Dict[str, Any]],
+        sheet_update: Optional[Dict[str, Any]] = None,
+        always_update_sheet: bool = False,
+        related_writes: Optional[RelatedWrites] = None,
+    ) -> Dict[str, Any]:
+        """변경된 점수만 upsert 하고 평가지 갱신(sheet_update)을 함께 적용
+
+        scores 는 평가지의 전체 점수 목록이며, 저장되어 있지만 scores 에 없는 항목은 삭제합니다.
+        scores 항목에 version 이 있으면 저장된 version 과 일치할 때만 덮어씁니다.
+        변경된 항목이 없고 always_update_sheet 가 아니면 아무것도 쓰지 않습니다.
+        related_writes(session) 는 평가지 갱신과 같은 트랜잭션에서 실행할 쓰기(통계 카운터 등)로,
+        트랜잭션을 쓸 수 없으면 평가지 갱신 직후 session=None 으로 실행됩니다.
+        반환값의 versions 는 항목별 최신 version (다음 저장 요청에 그대로 전달).
+        """
+        entries = self._parse(sheet_id, scores)
+        stored = {
+            doc["item_id"]: doc
+            async for doc in self.db.evaluation_scores.find(
+                {"sheet_id": sheet_id}, {"_id": 0, "item_id": 1, "score": 1, "opinion": 1, "version": 1}
+            )
+        }
+
+        now = datetime.utcnow()
+        operations: List[Any] = []
+        written: List[Dict[str, Any]] = []
+        versions: Dict[str, int] = {}
+        conflicts: List[Dict[str, Any]] = []
+
+        for entry in entries:
+            item_id = entry["item_id"]
+            current = stored.get(item_id)
+            current_version = current.get("version", 0) if current else 0
+
+            if entry["version"] is not None and current and entry["version"] != current_version:
+                conflicts.append({"item_id": item_id, "version": current_version,
+                                  "score": current.get("score"), "opinion": current.get("opinion")})
+                continue
+            if current and current.get("score") == entry["score"] and (current.get("opinion") or "") == (entry["opinion"] or ""):
+                versions[item_id] = current_version
+                continue
+
+            # 읽은 시점의 version 을 조건에 포함 - 그 사이 다른 요청이 바꿨다면 upsert 가 고유 인덱스에 걸려 실패
+            # (version 이 없던 항목은 $exists 조건 - 동등 조건은 upsert 시 문서에 복사되어 $inc 와 충돌)
+            stored_version = current.get("version") if current else None
+            query = {
+                "sheet_id": sheet_id,
+                "item_id": item_id,
+                "version": stored_version if stored_version is not None else {"$exists": False},
+            }
+            operations.append(UpdateOne(
+                query,
+                {
+                    "$set": {"score": entry["score"], "opinion": entry["opinion"], "updated_at": now},
+                    "$inc": {"version": 1},
+                    "$setOnInsert": {"id": str(uuid.uuid4()), "created_at": now},
+                },
+                upsert=True,
+            ))
+            written.append(entry)
+            versions[item_id] = current_version + 1
+
+        if conflicts:
+            raise _conflict(conflicts)
+
+        # 요청에서 빠진 항목 삭제 (upsert 뒤에 두어 writeErrors 의 index 가 written 과 일치)
+        removed = sorted(stored.keys() - {entry["item_id"] for entry in entries})
+        if removed:
+            operations.append(DeleteMany({"sheet_id": sheet_id, "item_id": {"$in": removed}}))
+
+        if not operations and not always_update_sheet:
+            return {"changed": 0, "unchanged": len(versions), "removed": 0, "versions": versions}
+
+        try:
+            await self._write_atomically(operations, sheet_id, sheet_update, related_writes)
+        except BulkWriteError as e:
+            raced = [written[error["index"]]["item_id"] for error in e.details.get("writeErrors", [])
+                     if error["index"] < len(written)]
+            logger.warning(f"Concurrent score update detected for sheet {sheet_id}: {raced}")
+            raise _conflict([{"item_id": item_id} for item_id in raced])
+
+        return {
+            "changed": len(written) + len(removed),
+            "unchanged": len(versions) - len(written),
+            "removed": len(removed),
+            "versions": versions,
+        }
+
+
+# Global score store instance (db is attached at server startup)
+score_store = ScoreStore()
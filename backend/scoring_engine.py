@@ -0,0 +1,260 @@
+"""
+Scoring Engine
+평가표 항목과 점수를 정렬된 NumPy 배열로 변환해 총점/가중점수/정규화 점수와 항목별 통계를 계산하는 모듈
+
+- 평가지 1건(score_sheet)과 프로젝트 전체(score_project)를 같은 (평가지 × 항목) 행렬 연산으로 처리
+- 제출, 분석, 내보내기(PDF/Excel/출력), AI 평가 총점 계산이 모두 이 모듈을 사용
+- 템플릿 항목은 items(평가표) 또는 criteria(출력/AI 평가) 어느 쪽이든 허용
+- 점수가 없는 항목은 NaN 으로 두어 합계에서는 0, 평균에서는 제외
+- 가점(bonus) 항목은 가중 총점/만점에서 제외하고 bonus_total 로 따로 집계
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+Scores = Union[Mapping[str, Any], Iterable[Dict[str, Any]]]
+
+
+def template_items(template: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """템플릿의 평가 항목 목록 (items 또는 criteria)"""
+    if not template:
+        return []
+    return template.get("items") or template.get("criteria") or []
+
+
+def _score_key(score: Dict[str, Any]) -> Optional[str]:
+    return score.get("item_id", score.get("criterion_id"))
+
+
+def _score_value(value: Any) -> float:
+    if isinstance(value, dict):
+        value = value.get("score")
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _iter_scores(scores: Scores) -> Iterable[Tuple[Optional[str], Optional[str], float, Optional[Dict[str, Any]]]]:
+    """(sheet_id, item_id, 점수, 원본 문서) 순회 - {항목: 점수} 매핑과 점수 문서 목록 모두 허용"""
+    if isinstance(scores, Mapping):
+        for item_id, value in scores.items():
+            yield None, item_id, _score_value(value), value if isinstance(value, dict) else None
+        return
+    for score in scores or []:
+        yield score.get("sheet_id"), _score_key(score), _score_value(score.get("score")), score
+
+
+@dataclass
+class ItemArrays:
+    """템플릿 항목 순서대로 정렬된 항목 배열"""
+    items: List[Dict[str, Any]]
+    ids: List[str]
+    weights: np.ndarray
+    max_scores: np.ndarray
+    bonus: np.ndarray
+    index: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_items(cls, items: List[Dict[str, Any]]) -> "ItemArrays":
+        ids = [item.get("id") for item in items]
+        return cls(
+            items=items,
+            ids=ids,
+            weights=np.array([float(item.get("weight", 1.0) or 0.0) for item in items], dtype=float),
+            max_scores=np.array([float(item.get("max_score", 0) or 0.0) for item in items], dtype=float),
+            bonus=np.array([bool(item.get("bonus", False)) for item in items], dtype=bool),
+            index={item_id: i for i, item_id in enumerate(ids)},
+        )
+
+
+def _items_from_scores(scores: Scores) -> List[Dict[str, Any]]:
+    """템플릿이 없을 때 점수에 나타난 항목을 가중치 1로 간주"""
+    seen: Dict[str, Dict[str, Any]] = {}
+    for _, item_id, _, _ in _iter_scores(scores):
+        if item_id is not None and item_id not in seen:
+            seen[item_id] = {"id": item_id, "name": item_id, "weight": 1.0, "max_score": 0}
+    return list(seen.values())
+
+
+def _totals(matrix: np.ndarray, arrays: ItemArrays) -> Dict[str, np.ndarray]:
+    """(평가지 × 항목) 행렬에서 평가지별 총점 배열 계산"""
+    answered = ~np.isnan(matrix)
+    filled = np.where(answered, matrix, 0.0)
+    weighted = filled * arrays.weights
+    base = ~arrays.bonus
+
+    weighted_total = weighted[:, base].sum(axis=1)
+    answered_weight = (answered[:, base] * arrays.weights[base]).sum(axis=1)
+    max_weighted = float((arrays.max_scores[base] * arrays.weights[base]).sum())
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weighted_average = np.where(answered_weight > 0, weighted_total / answered_weight, 0.0)
+        normalized = weighted_total / max_weighted * 100 if max_weighted > 0 else np.zeros(len(matrix))
+
+    return {
+        "raw_total": filled.sum(axis=1),
+        "weighted_total": weighted_total,
+        "bonus_total": weighted[:, arrays.bonus].sum(axis=1),
+        "weighted_average": weighted_average,
+        "normalized": normalized,
+        "answered": answered.sum(axis=1),
+        "answered_weight": answered_weight,
+        "max_weighted": np.full(len(matrix), max_weighted),
+    }
+
+
+def summarize(values: Iterable[float]) -> Dict[str, float]:
+    """값 목록의 개수/평균/최소/최대/표준편차 (NaN 제외)"""
+    array = np.asarray(list(values), dtype=float)
+    array = array[~np.isnan(array)]
+    if not array.size:
+        return {"count": 0, "average": 0.0, "min": 0.0, "max": 0.0, "stddev": 0.0}
+    return {
+        "count": int(array.size),
+        "average": float(array.mean()),
+        "min": float(array.min()),
+        "max": float(array.max()),
+        "stddev": float(array.std()),
+    }
+
+
+@dataclass
+class SheetScore:
+    """평가지 1건의 점수 계산 결과 (items 는 템플릿 항목 순서)"""
+    raw_total: float
+    weighted_total: float
+    bonus_total: float
+    weighted_average: float
+    normalized: float
+    max_weighted: float
+    answered: int
+    answered_weight: float
+    items: List[Dict[str, Any]]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "raw_total": self.raw_total,
+            "weighted_total": self.weighted_total,
+            "bonus_total": self.bonus_total,
+            "weighted_average": self.weighted_average,
+            "normalized": self.normalized,
+            "max_weighted": self.max_weighted,
+            "answered": self.answered,
+            "answered_weight": self.answered_weight,
+            "item_count": len(self.items),
+        }
+
+
+def score_sheet(items: Optional[List[Dict[str, Any]]], scores: Scores) -> SheetScore:
+    """평가지 1건의 점수 계산
+
+    items 가 비어 있으면 점수에 나타난 항목을 가중치 1로 계산합니다 (템플릿 없는 평가지).
+    반환값 items 의 각 행에는 score/weighted_score(미응답은 None)와 원본 점수 문서(score_doc)가 포함됩니다.
+    """
+    arrays = ItemArrays.from_items(items or _items_from_scores(scores))
+    row = np.full(len(arrays.ids), np.nan)
+    docs: List[Optional[Dict[str, Any]]] = [None] * len(arrays.ids)
+    for _, item_id, value, doc in _iter_scores(scores):
+        column = arrays.index.get(item_id)
+        if column is not None:
+            row[column] = value
+            docs[column] = doc
+
+    totals = _totals(row[np.newaxis, :], arrays)
+    weighted_row = row * arrays.weights
+
+    rows = []
+    for column, item in enumerate(arrays.items):
+        answered = not np.isnan(row[column])
+        rows.append({
+            "item": item,
+            "item_id": arrays.ids[column],
+            "score": float(row[column]) if answered else None,
+            "weight": float(arrays.weights[column]),
+            "max_score": float(arrays.max_scores[column]),
+            "weighted_score": float(weighted_row[column]) if answered else None,
+            "bonus": bool(arrays.bonus[column]),
+            "score_doc": docs[column],
+        })
+
+    return SheetScore(
+        raw_total=float(totals["raw_total"][0]),
+        weighted_total=float(totals["weighted_total"][0]),
+        bonus_total=float(totals["bonus_total"][0]),
+        weighted_average=float(totals["weighted_average"][0]),
+        normalized=float(totals["normalized"][0]),
+        max_weighted=float(totals["max_weighted"][0]),
+        answered=int(totals["answered"][0]),
+        answered_weight=float(totals["answered_weight"][0]),
+        items=rows,
+    )
+
+
+def score_project(items: List[Dict[str, Any]], scores: Iterable[Dict[str, Any]], sheet_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+    """같은 템플릿을 쓰는 여러 평가지의 점수를 한 번의 행렬 연산으로 계산
+
+    scores 는 sheet_id 를 가진 점수 문서 목록입니다. 반환값:
+    - sheets: 평가지별 총점 요약
+    - criteria: 항목별 응답 수/평균/최소/최대/표준편차/평균 득점률
+    - totals: 평가지 가중 평균 점수 분포 요약
+    """
+    arrays = ItemArrays.from_items(items)
+    score_list = list(scores)
+    if sheet_ids is None:
+        sheet_ids = list(dict.fromkeys(s.get("sheet_id") for s in score_list if s.get("sheet_id") is not None))
+    sheet_index = {sheet_id: i for i, sheet_id in enumerate(sheet_ids)}
+
+    rows, columns, values = [], [], []
+    for sheet_id, item_id, value, _ in _iter_scores(score_list):
+        row = sheet_index.get(sheet_id)
+        column = arrays.index.get(item_id)
+        if row is not None and column is not None:
+            rows.append(row)
+            columns.append(column)
+            values.append(value)
+
+    matrix = np.full((len(sheet_ids), len(arrays.ids)), np.nan)
+    if rows:
+        matrix[np.array(rows), np.array(columns)] = np.array(values)
+
+    totals = _totals(matrix, arrays)
+    sheets = {
+        sheet_id: {name: (float(column[i]) if name != "answered" else int(column[i])) for name, column in totals.items()}
+        for sheet_id, i in sheet_index.items()
+    }
+
+    answered = ~np.isnan(matrix)
+    counts = answered.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sums = np.where(answered, matrix, 0.0).sum(axis=0)
+        means = np.where(counts > 0, sums / counts, 0.0)
+        squares = np.where(answered, (matrix - means) ** 2, 0.0).sum(axis=0)
+        stddevs = np.where(counts > 0, np.sqrt(squares / counts), 0.0)
+        rates = np.where(arrays.max_scores > 0, means / arrays.max_scores * 100, 0.0)
+    minimums = np.where(counts > 0, np.where(answered, matrix, np.inf).min(axis=0, initial=np.inf), 0.0)
+    maximums = np.where(counts > 0, np.where(answered, matrix, -np.inf).max(axis=0, initial=-np.inf), 0.0)
+
+    criteria = {
+        item_id: {
+            "name": arrays.items[i].get("name", item_id),
+            "count": int(counts[i]),
+            "average": float(means[i]),
+            "min": float(minimums[i]),
+            "max": float(maximums[i]),
+            "stddev": float(stddevs[i]),
+            "achievement_rate": float(rates[i]),
+            "weight": float(arrays.weights[i]),
+            "max_score": float(arrays.max_scores[i]),
+        }
+        for i, item_id in enumerate(arrays.ids)
+    }
+
+    return {
+        "sheets": sheets,
+        "criteria": criteria,
+        "totals": summarize(totals["weighted_average"]),
+    }
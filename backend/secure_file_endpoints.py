@@ -4,12 +4,10 @@ PDF 뷰어를 위한 보안 파일 접근 제어
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.responses import StreamingResponse
 from typing import Optional, Any
 import logging
 from pydantic import BaseModel, Field
 import os
-import aiofiles
 import mimetypes
 import hashlib
 import time
@@ -21,6 +19,7 @@ import uuid # Added for log_file_access
 from models import User
 from security import get_current_user
 from enhanced_permissions import Permission, check_permission, permission_checker
+from ranged_file import ranged_file_response
 
 logger = logging.getLogger(__name__)
 
@@ -188,14 +187,20 @@ async def check_file_access_permission(db: Any, current_user: User, file_id: str
         logger.error(f"파일 권한 검사 오류: {e}")
         return False
 
-def add_security_headers(response, filename: str):
-    """보안 헤더 추가"""
+def add_security_headers(response, filename: str, revalidate: bool = False):
+    """보안 헤더 추가
+
+    revalidate=True 이면 브라우저 공유 캐시는 막되 ETag 재검증(304)은 허용
+    """
     response.headers["X-Content-Type-Options"] = "nosniff"
     response.headers["X-Frame-Options"] = "DENY"
     response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate, private"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
+    if revalidate:
+        response.headers["Cache-Control"] = "private, no-cache"
+    else:
+        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate, private"
+        response.headers["Pragma"] = "no-cache"
+        response.headers["Expires"] = "0"
     response.headers["Content-Security-Policy"] = "default-src 'none'; script-src 'none'; object-src 'none';"
     
     # 파일 이름을 안전하게 인코딩
@@ -203,6 +208,7 @@ def add_security_headers(response, filename: str):
     safe_filename = urllib.parse.quote(filename)
     response.headers["Content-Disposition"] = f"inline; filename*=UTF-8''{safe_filename}"
 
+@secure_file_router.get("/secure-pdf-view/{file_id}", operation_id="secure_pdf_view_get")
 @secure_file_router.post("/secure-pdf-view/{file_id}", operation_id="secure_pdf_view_post")
 async def secure_pdf_view(
     file_id: str,
@@ -210,15 +216,16 @@ async def secure_pdf_view(
     current_user: User = Depends(get_current_user),
     db: Any = Depends(get_db)
 ):
-    """보안 PDF 조회 (뷰어 전용)"""
+    """보안 PDF 조회 (뷰어 전용)
+
+    Range 요청(206)과 If-None-Match(304)를 지원하므로 PDF.js 가 필요한 페이지만 나누어 받을 수 있습니다.
+    """
     try:
-        start_time = time.time()
-        
         # 파일 메타데이터 조회
         file_metadata = await db.file_metadata.find_one({"id": file_id})
         if not file_metadata:
             await log_file_access(
-                db, # Pass db here
+                db,
                 user_id=current_user.id,
                 file_id=file_id,
                 action="preview_denied",
@@ -231,13 +238,14 @@ async def secure_pdf_view(
 
         # 권한 확인
         has_access = await check_file_access_permission(
+            db,
             current_user, 
             file_id
         )
         
         if not has_access:
             await log_file_access(
-                db, # Pass db here
+                db,
                 user_id=current_user.id,
                 file_id=file_id,
                 action="preview_denied",
@@ -251,11 +259,11 @@ async def secure_pdf_view(
                 detail="파일 접근 권한이 없습니다"
             )
         
-        # 파일 경로 정리
-        file_path_str = file_metadata["file_path"]
-        if ".." in file_path_str or file_path_str.startswith("/"):
+        # 파일 경로 정리 (file_path 는 uploads/ 를 포함한 저장 경로)
+        full_path = file_metadata["file_path"]
+        if ".." in full_path or full_path.startswith("/"):
             await log_file_access(
-                db, # Pass db here
+                db,
                 user_id=current_user.id,
                 file_id=file_id,
                 action="preview_blocked",
@@ -266,12 +274,11 @@ async def secure_pdf_view(
             )
             raise HTTPException(status_code=400, detail="잘못된 파일 경로입니다.")
         
-        full_path = os.path.join("uploads", file_path_str)
-        
         # 파일 존재 확인
         if not os.path.exists(full_path):
             logger.warning(f"파일을 찾을 수 없음: {full_path}")
             await log_file_access(
+                db,
                 user_id=current_user.id,
                 file_id=file_id,
                 action="preview_failed",
@@ -286,6 +293,7 @@ async def secure_pdf_view(
         mime_type, _ = mimetypes.guess_type(full_path)
         if mime_type != 'application/pdf':
             await log_file_access(
+                db,
                 user_id=current_user.id,
                 file_id=file_id,
                 action="preview_failed",
@@ -296,39 +304,28 @@ async def secure_pdf_view(
             )
             raise HTTPException(status_code=400, detail="PDF 파일만 조회할 수 있습니다")
         
-        # 파일 정보
-        file_size = os.path.getsize(full_path)
-        filename = file_metadata["original_filename"]
-        
-        # 파일 스트리밍 함수
-        async def stream_pdf():
-            async with aiofiles.open(full_path, 'rb') as file:
-                while chunk := await file.read(8192):
-                    yield chunk
-        
-        # 응답 생성
-        response = StreamingResponse(
-            stream_pdf(),
+        # 응답 생성 (200 전체 / 206 부분 / 304 변경 없음 / 416 범위 오류)
+        response = ranged_file_response(
+            request,
+            full_path,
             media_type="application/pdf",
-            headers={
-                "Content-Length": str(file_size),
-                "Accept-Ranges": "bytes"
-            }
+            file_hash=file_metadata.get("file_hash"),
         )
         
         # 보안 헤더 추가
-        add_security_headers(response, filename)
+        add_security_headers(response, file_metadata["original_filename"], revalidate=True)
         
-        # 접근 로그 기록
-        duration = int(time.time() - start_time)
-        await log_file_access(
-            user_id=current_user.id,
-            file_id=file_id,
-            action="preview_success",
-            ip_address=request.client.host,
-            user_agent=request.headers.get("user-agent"),
-            success=True
-        )
+        # 접근 로그 기록 - PDF.js 는 한 번의 조회에 여러 범위 요청을 보내므로 첫 요청만 기록
+        if response.status_code == 200 or response.headers.get("content-range", "").startswith("bytes 0-"):
+            await log_file_access(
+                db,
+                user_id=current_user.id,
+                file_id=file_id,
+                action="preview_success",
+                ip_address=request.client.host,
+                user_agent=request.headers.get("user-agent"),
+                success=True
+            )
         
         return response
         
@@ -337,11 +334,12 @@ async def secure_pdf_view(
     except Exception as e:
         logger.error(f"보안 PDF 조회 오류: {e}")
         await log_file_access(
-            user_id=current_user.id if 'current_user' in locals() else "unknown",
+            db,
+            user_id=current_user.id,
             file_id=file_id,
             action="preview_error",
-            ip_address=request.client.host if 'request' in locals() else "unknown",
-            user_agent=request.headers.get("user-agent") if 'request' in locals() else "unknown",
+            ip_address=request.client.host,
+            user_agent=request.headers.get("user-agent"),
             success=False,
             error_message=f"예상치 못한 오류: {str(e)}"
         )
@@ -350,46 +348,21 @@ async def secure_pdf_view(
             detail="파일 조회 중 오류가 발생했습니다"
         )
 
-@secure_file_router.get("/access-logs", operation_id="get_secure_file_access_logs")
-async def get_file_access_logs(
-    current_user: User = Depends(get_current_user),
-    limit: int = 100
-):
-    """파일 접근 로그 조회 (관리자 전용)"""
-    try:
-        # 관리자 권한 확인
-        if current_user.role != "admin":
-            raise HTTPException(status_code=403, detail="관리자만 접근 로그를 조회할 수 있습니다")
-        
-        # 최근 로그 반환
-        recent_logs = access_logs[-limit:] if len(access_logs) > limit else access_logs
-        
-        return {
-            "success": True,
-            "logs": [log.dict() for log in reversed(recent_logs)],
-            "total": len(access_logs)
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"접근 로그 조회 오류: {e}")
-        raise HTTPException(status_code=500, detail="접근 로그 조회 중 오류가 발생했습니다")
-
 @secure_file_router.post("/generate-access-token", operation_id="generate_secure_file_access_token")
 async def generate_file_access_token(
-    file_path: str,
-    current_user: User = Depends(get_current_user)
+    file_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Any = Depends(get_db)
 ):
     """임시 파일 접근 토큰 생성"""
     try:
         # 권한 확인
-        has_access = await check_file_access_permission(current_user, file_path)
+        has_access = await check_file_access_permission(db, current_user, file_id)
         if not has_access:
             raise HTTPException(status_code=403, detail="파일 접근 권한이 없습니다")
         
         # 토큰 생성
-        token = generate_access_token(current_user.id, file_path)
+        token = generate_access_token(current_user.id, file_id)
         
         return {
             "success": True,
@@ -3,17 +3,23 @@ Security configuration and utilities for Online Evaluation System
 Implements security best practices for FastAPI applications
 """
 
+import asyncio
+import math
 import os
 import secrets
 import hashlib
 from pathlib import Path
 from dotenv import dotenv_values, set_key
 import re
-from typing import List, Optional, Dict, Any
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta, timezone # Ensure timezone is imported
 from fastapi import HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from passlib.context import CryptContext
+import bcrypt
 from jose import JWTError, jwt
 import logging # Add logging import
 
@@ -140,36 +146,132 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """
     return get_jwt_manager().create_access_token(data, expires_delta)
 
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+def _password_bytes(password) -> bytes:
+    if isinstance(password, str):
+        password = password.encode("utf-8")
+    # bcrypt only uses the first 72 bytes; bcrypt>=5 raises instead of truncating
+    return password[:BCRYPT_MAX_PASSWORD_BYTES]
+
+def _hash_password_sync(password: str, rounds: Optional[int] = None) -> str:
+    return bcrypt.hashpw(_password_bytes(password), bcrypt.gensalt(rounds or BCRYPT_ROUNDS)).decode("utf-8")
+
+def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    if isinstance(hashed_password, str):
+        hashed_password = hashed_password.encode("utf-8")
+    try:
+        return bcrypt.checkpw(_password_bytes(plain_password), hashed_password)
+    except (ValueError, TypeError) as e:
+        logger.error(f"Password verification failed: {e}")
+        return False
+
+def password_needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+    """
+    True when a bcrypt hash was made with a cost factor other than the configured one.
+    """
+    try:
+        return int(hashed_password.split("$")[2]) != (rounds or BCRYPT_ROUNDS)
+    except (AttributeError, IndexError, ValueError):
+        return False
+
 def get_password_hash(password: str) -> str:
     """
-    Hashes a password using the configured context.
+    Hashes a password with bcrypt. Blocks for the full cost of the hash;
+    async code should use hash_password_async instead.
     """
-    return imported_pwd_context.hash(password)
+    return _hash_password_sync(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verifies a plain password against a hashed password.
-    Supports both new and legacy password formats.
+    Verifies a plain password against a bcrypt hash. Blocks for the full cost
+    of the check; async code should use verify_password_async instead.
     """
-    try:
-        # Try with the new passlib context first
-        return imported_pwd_context.verify(plain_password, hashed_password)
-    except Exception as e:
-        logger.debug(f"Failed to verify with passlib: {e}")
-        # Fallback for legacy bcrypt hashes
+    return _verify_password_sync(plain_password, hashed_password)
+
+class PasswordHashPool:
+    """
+    Bounded executor for bcrypt work.
+
+    bcrypt releases the GIL while hashing, so a small thread pool gives real
+    parallelism and keeps the event loop free. Once ``max_pending`` operations
+    are queued or running, further requests are rejected with 503 and a
+    Retry-After estimate instead of piling up behind a login burst.
+    """
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = workers or int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.max_pending = max_pending or int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._avg_seconds = 0.25  # EWMA of a single bcrypt operation
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self._pending / self.workers * self._avg_seconds))
+
+    async def run(self, func: Callable, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent authentication requests, please retry shortly",
+                headers={"Retry-After": str(self.retry_after_seconds())},
+            )
+        self._pending += 1
+        started = time.perf_counter()
         try:
-            import bcrypt
-            if isinstance(plain_password, str):
-                plain_password = plain_password.encode('utf-8')
-            if isinstance(hashed_password, str):
-                hashed_password = hashed_password.encode('utf-8')
-            return bcrypt.checkpw(plain_password, hashed_password)
-        except ImportError:
-            logger.error("bcrypt module not found. Please install it: pip install bcrypt")
-            return False
-        except Exception as e2:
-            logger.error(f"Password verification failed: {e2}")
-            return False
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * (time.perf_counter() - started)
+            self.completed += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_ms": round(self._avg_seconds * 1000, 1),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+password_hash_pool = PasswordHashPool()
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hashes a password on the bounded password pool.
+    """
+    return await password_hash_pool.run(_hash_password_sync, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password on the bounded password pool.
+
+    Returns ``(valid, new_hash)``; ``new_hash`` is set when the stored hash uses
+    an outdated cost factor so the caller can persist the upgraded hash.
+    """
+    valid = await password_hash_pool.run(_verify_password_sync, plain_password, hashed_password)
+    if not valid or not password_needs_rehash(hashed_password):
+        return valid, None
+    try:
+        return True, await password_hash_pool.run(_hash_password_sync, plain_password)
+    except HTTPException:
+        # Saturated: keep the login, upgrade on a later one
+        return True, None
+
 
 # Placeholder for get_db dependency - replace with your actual implementation
 def get_db():
@@ -189,6 +291,7 @@ def get_db():
 # MongoDB 연결을 위한 import
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from cache_service import cache_service
 
 # MongoDB database 인스턴스 (server.py에서 import)
 # 이는 server.py에서 설정한 db 인스턴스를 참조합니다
@@ -211,8 +314,8 @@ def test_function():
     return "test_function_works"
 
 # 실제 MongoDB CRUD 함수들
-async def get_user_by_id(user_id: str) -> Optional[models.User]:
-    """사용자 ID로 사용자를 조회합니다."""
+async def _find_user_document(user_id: str) -> Optional[dict]:
+    """사용자 ID로 사용자 문서를 조회합니다."""
     if db is None:
         logger.error("Database not initialized")
         return None
@@ -220,18 +323,125 @@ async def get_user_by_id(user_id: str) -> Optional[models.User]:
     try:
         # ObjectId로 변환 시도
         if ObjectId.is_valid(user_id):
-            user_data = await db.users.find_one({"_id": ObjectId(user_id)})
-        else:
-            # 문자열 ID로도 시도
-            user_data = await db.users.find_one({"_id": user_id})
-        
-        if user_data:
-            return models.User.from_mongo(user_data)
-        return None
+            return await db.users.find_one({"_id": ObjectId(user_id)})
+        # 문자열 ID로도 시도
+        return await db.users.find_one({"_id": user_id})
     except Exception as e:
         logger.error(f"Error fetching user by ID {user_id}: {e}")
         return None
 
+async def get_user_by_id(user_id: str) -> Optional[models.User]:
+    """사용자 ID로 사용자를 조회합니다."""
+    user_data = await _find_user_document(user_id)
+    if user_data:
+        return models.User.from_mongo(user_data)
+    return None
+
+# cache_service 메시지 주제 - 다른 워커의 인증 캐시 무효화
+USER_PRINCIPAL_INVALIDATION_TOPIC = "user_principals"
+
+class UserPrincipalCache:
+    """인증된 사용자 정보(principal) 캐시
+
+    (user_id, token_version) 를 키로 하는 크기 제한 LRU 캐시입니다. 짧은 TTL 동안
+    get_current_user 의 사용자 조회를 DB 왕복 없이 dict 조회로 처리합니다.
+    사용자 정보 변경, 비활성화, 비밀번호 변경 시 invalidate_user_principal() 로 모든 워커의
+    항목을 무효화합니다 (cache_service 의 Redis pub/sub). Redis 가 없거나 메시지가 유실되면
+    다른 워커는 최대 TTL 동안 이전 정보를 사용할 수 있습니다.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 30):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[models.User, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str, token_version: int) -> Optional[models.User]:
+        key = (user_id, token_version)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, user_id: str, token_version: int, user: models.User) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        key = (user_id, token_version)
+        self._entries[key] = (user, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """사용자의 모든 토큰 버전에 대한 캐시 항목 제거"""
+        user_id = str(user_id)
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def apply_invalidation_message(self, data: Optional[Dict[str, Any]]) -> None:
+        """다른 워커가 보낸 무효화 메시지 처리 (None 이면 메시지 유실 가능성 - 전체 삭제)"""
+        if data is None:
+            self.clear()
+        elif data.get("user_id"):
+            self.invalidate(data["user_id"])
+
+    def get_metrics(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / total * 100, 1) if total else 0.0,
+        }
+
+user_principal_cache = UserPrincipalCache(
+    max_entries=int(os.getenv("AUTH_USER_CACHE_SIZE", "1000")),
+    ttl_seconds=float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "30")),
+)
+
+cache_service.add_message_handler(USER_PRINCIPAL_INVALIDATION_TOPIC, user_principal_cache.apply_invalidation_message)
+
+async def invalidate_user_principal(user_id: str) -> None:
+    """사용자 정보 변경 시 이 워커와 다른 워커(cache_service pub/sub)의 인증 캐시 무효화"""
+    user_id = str(user_id)
+    user_principal_cache.invalidate(user_id)
+    await cache_service.publish_message(USER_PRINCIPAL_INVALIDATION_TOPIC, {"user_id": user_id})
+
+async def get_user_principal(user_id: str, token_version: int = 0) -> Optional[models.User]:
+    """토큰의 사용자 정보를 캐시 우선으로 조회합니다.
+
+    사용자 문서의 token_version 이 토큰의 버전과 다르면(비밀번호 변경 등으로
+    기존 토큰이 폐기된 경우) None 을 반환합니다.
+    """
+    user = user_principal_cache.get(user_id, token_version)
+    if user is not None:
+        return user
+
+    user_data = await _find_user_document(user_id)
+    if not user_data:
+        return None
+    if user_data.get("token_version", 0) != token_version:
+        logger.warning(f"Token version mismatch for user_id: {user_id}")
+        return None
+
+    user = models.User.from_mongo(user_data)
+    user_principal_cache.set(user_id, token_version, user)
+    return user
+
 async def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(oauth2_scheme), 
 ) -> models.User:
@@ -250,8 +460,8 @@ async def get_current_user(
         logger.error(f"JWTError in get_current_user: {e}")
         raise credentials_exception
     
-    # Use the real MongoDB user lookup function
-    user = await get_user_by_id(user_id)
+    # Cached user lookup keyed by user id and token version
+    user = await get_user_principal(user_id, payload.get("ver", 0))
     if user is None:
         logger.warning(f"User not found for user_id: {user_id} from token")
         raise credentials_exception
@@ -270,8 +480,8 @@ async def get_current_user_optional(
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
-        # Use the real MongoDB user lookup function
-        user = await get_user_by_id(user_id)
+        # Cached user lookup keyed by user id and token version
+        user = await get_user_principal(user_id, payload.get("ver", 0))
         if user is None or not user.is_active:
             return None
         return user
@@ -504,12 +714,12 @@ class SecurityUtils:
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash password using bcrypt"""
-        return imported_pwd_context.hash(password)
+        return get_password_hash(password)
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify password against hash"""
-        return imported_pwd_context.verify(plain_password, hashed_password)
+        return verify_password(plain_password, hashed_password)
     
     @staticmethod
     def generate_secure_token(length: int = 32) -> str:
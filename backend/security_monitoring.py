@@ -18,9 +18,9 @@ import time
 
 from fastapi import Request, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
-import redis
-import pymongo
-from pymongo import MongoClient
+import redis.asyncio as redis
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
 
 # Configure structured logging
 logging.basicConfig(
@@ -91,13 +91,53 @@ class SecurityEvent:
             'metadata': self.metadata or {}
         }
 
+@dataclass
+class SecurityPipelineStats:
+    """Counters for the buffered security event pipeline"""
+    enqueued: int = 0
+    coalesced: int = 0
+    sampled_out: int = 0
+    dropped_low: int = 0
+    dropped_medium: int = 0
+    dropped_high: int = 0
+    dropped_critical: int = 0
+    written: int = 0
+    coalesced_updates: int = 0
+    batches: int = 0
+    redis_errors: int = 0
+    mongo_errors: int = 0
+    max_queue_depth: int = 0
+
+
+@dataclass
+class _CoalesceWindow:
+    """Representative event for (IP, event type, severity) duplicates within one coalescing window"""
+    event: SecurityEvent
+    window_end: float
+    last_seen: datetime
+    pending: int = 0
+    flushed: bool = False
+
+
+def _coalesce_key(event: SecurityEvent) -> tuple:
+    # Severity is part of the key so a HIGH 403 after a MEDIUM 401 still alerts and keeps its overload priority
+    return (event.ip_address, event.event_type.value, event.severity.value)
+
+
 class SecurityMonitor:
-    """Comprehensive security monitoring system"""
+    """Comprehensive security monitoring system
+
+    log_security_event only updates in-memory threat intelligence and appends the event to a
+    bounded buffer; a background writer persists batches with one Redis pipeline and one
+    MongoDB insert_many, so event logging never waits on I/O in the request path.
+    Under overload, low severity events are sampled and then dropped (see get_pipeline_stats).
+    """
     
-    def __init__(self):
+    def __init__(self, connect: bool = True):
         self.logger = logging.getLogger(__name__)
         self.redis_client = None
         self.mongo_client = None
+        self.events_collection = None
         self.failed_login_attempts = defaultdict(deque)
         self.suspicious_ips = set()
         self.blocked_ips = set()
@@ -111,37 +151,87 @@ class SecurityMonitor:
         self.enable_ip_blocking = os.getenv("ENABLE_IP_BLOCKING", "true").lower() == "true"
         self.enable_real_time_alerts = os.getenv("ENABLE_REAL_TIME_ALERTS", "true").lower() == "true"
         
+        # Event pipeline configuration
+        self.queue_size = int(os.getenv("SECURITY_EVENT_QUEUE_SIZE", "10000"))
+        self.batch_size = int(os.getenv("SECURITY_EVENT_BATCH_SIZE", "500"))
+        self.flush_interval = float(os.getenv("SECURITY_EVENT_FLUSH_INTERVAL", "1.0"))
+        self.coalesce_seconds = float(os.getenv("SECURITY_EVENT_COALESCE_SECONDS", "60"))
+        self.sample_watermark = float(os.getenv("SECURITY_EVENT_SAMPLE_WATERMARK", "0.5"))
+        self.low_sample_rate = max(1, int(os.getenv("SECURITY_EVENT_LOW_SAMPLE_RATE", "10")))
+        
+        # Event pipeline state
+        self.pipeline_stats = SecurityPipelineStats()
+        self._buffer: deque = deque()
+        self._windows: Dict[tuple, _CoalesceWindow] = {}
+        self._queued_windows: Dict[str, _CoalesceWindow] = {}
+        self._dirty_windows: set = set()
+        self._low_seen = 0
+        self._writer_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        
         # Initialize connections
-        self._initialize_connections()
+        if connect:
+            self._initialize_connections()
         
     def _initialize_connections(self):
-        """Initialize Redis and MongoDB connections"""
+        """Create async Redis and MongoDB clients (no network I/O until first use)"""
         try:
             # Redis for real-time data
             redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
             self.redis_client = redis.from_url(redis_url)
-            self.redis_client.ping()
-            self.logger.info("Connected to Redis for security monitoring")
         except Exception as e:
-                        self.logger.error(f"Failed to connect to Redis: {e}")
+            self.logger.error(f"Failed to create Redis client: {e}")
             
         try:
             # MongoDB for persistent storage
             mongo_url = os.getenv("MONGO_URL", "mongodb://localhost:27017")
-            self.mongo_client = MongoClient(mongo_url)
+            self.mongo_client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=5000)
             self.security_db = self.mongo_client.security_monitoring
             self.events_collection = self.security_db.security_events
-            
-            # Create indexes for performance
-            self.events_collection.create_index([("timestamp", -1)])
-            self.events_collection.create_index([("event_type", 1)])
-            self.events_collection.create_index([("severity", 1)])
-            self.events_collection.create_index([("ip_address", 1)])
-            self.events_collection.create_index([("user_id", 1)])
-            
-            self.logger.info("Connected to MongoDB for security event storage")
         except Exception as e:
-            self.logger.error(f"Failed to connect to MongoDB: {e}")
+            self.logger.error(f"Failed to create MongoDB client: {e}")
+    
+    async def start(self):
+        """Verify connections, create indexes and start the background writer (application startup)"""
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.ping()
+                self.logger.info("Connected to Redis for security monitoring")
+            except Exception as e:
+                self.logger.error(f"Failed to connect to Redis: {e}")
+                self.redis_client = None
+        
+        if self.events_collection is not None:
+            try:
+                # Create indexes for performance
+                await self.events_collection.create_indexes([
+                    IndexModel([("timestamp", DESCENDING)]),
+                    IndexModel([("event_type", ASCENDING)]),
+                    IndexModel([("severity", ASCENDING)]),
+                    IndexModel([("ip_address", ASCENDING)]),
+                    IndexModel([("user_id", ASCENDING)]),
+                    IndexModel([("event_id", ASCENDING)]),
+                ])
+                self.logger.info("Connected to MongoDB for security event storage")
+            except Exception as e:
+                self.logger.error(f"Failed to connect to MongoDB: {e}")
+        
+        self._stopping = False
+        self._ensure_writer()
+    
+    async def stop(self):
+        """Stop the background writer and flush buffered events (application shutdown)"""
+        self._stopping = True
+        if self._writer_task is not None:
+            if self._wakeup is not None:
+                self._wakeup.set()
+            try:
+                await self._writer_task
+            except Exception as e:
+                self.logger.error(f"Security event writer failed: {e}")
+            self._writer_task = None
+        await self.flush()
     
     def generate_event_id(self) -> str:
         """Generate unique event ID"""
@@ -150,103 +240,227 @@ class SecurityMonitor:
         return hashlib.sha256(unique_string.encode()).hexdigest()[:16]
     
     async def log_security_event(self, event: SecurityEvent):
-        """Log security event to multiple destinations"""
+        """Record a security event without waiting on any I/O
+
+        Threat intelligence (brute force tracking, suspicious/blocked IPs) is updated immediately;
+        logging, Redis, MongoDB and real-time alerts are handled by the background writer.
+        """
         try:
-            # Structured logging
-            self.logger.info(
-                f"SECURITY_EVENT: {event.event_type.value} | "
-                f"Severity: {event.severity.value} | "
-                f"IP: {event.ip_address} | "
-                f"User: {event.user_id} | "
-                f"Endpoint: {event.endpoint} | "
-                f"Description: {event.description}"
-            )
-            
-            # Store in Redis for real-time monitoring
-            if self.redis_client:
-                event_data = event.to_dict()
-                await self._store_in_redis(event_data)
-            
-            # Store in MongoDB for persistence
-            if self.mongo_client:
-                await self._store_in_mongodb(event)
-            
-            # Real-time alerting for critical events
-            if event.severity in [SecuritySeverity.HIGH, SecuritySeverity.CRITICAL]:
-                await self._send_real_time_alert(event)
-                
             # Update threat intelligence
             await self._update_threat_intelligence(event)
-            
+            self._enqueue(event)
         except Exception as e:
             self.logger.error(f"Failed to log security event: {e}")
     
-    async def _store_in_redis(self, event_data: Dict[str, Any]):
-        """Store event in Redis for real-time access"""
+    def _enqueue(self, event: SecurityEvent):
+        """Coalesce, sample or buffer an event for the background writer"""
+        stats = self.pipeline_stats
+        now = time.monotonic()
+        key = _coalesce_key(event)
+        
+        # Duplicate (IP, event type, severity) within the window: count it on the representative event
+        window = self._windows.get(key)
+        if window is not None and now < window.window_end:
+            window.pending += 1
+            window.last_seen = event.timestamp
+            stats.coalesced += 1
+            if window.flushed:
+                self._dirty_windows.add(key)
+            return
+        
+        # Overload: sample low severity above the watermark, shed low/medium when full
+        depth = len(self._buffer)
+        if event.severity == SecuritySeverity.LOW and depth >= self.queue_size * self.sample_watermark:
+            self._low_seen += 1
+            if self._low_seen % self.low_sample_rate:
+                stats.sampled_out += 1
+                return
+        if depth >= self.queue_size:
+            if event.severity in (SecuritySeverity.LOW, SecuritySeverity.MEDIUM) or not self._evict_lower_severity():
+                self._count_dropped(event)
+                return
+        
+        window = _CoalesceWindow(event=event, window_end=now + self.coalesce_seconds, last_seen=event.timestamp)
+        self._windows[key] = window
+        self._queued_windows[event.event_id] = window
+        self._buffer.append(event)
+        stats.enqueued += 1
+        stats.max_queue_depth = max(stats.max_queue_depth, len(self._buffer))
+        
+        self._ensure_writer()
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+    
+    def _evict_lower_severity(self) -> bool:
+        """Make room for a high/critical event by dropping the oldest low/medium event"""
+        for index, queued in enumerate(self._buffer):
+            if queued.severity in (SecuritySeverity.LOW, SecuritySeverity.MEDIUM):
+                del self._buffer[index]
+                window = self._queued_windows.pop(queued.event_id, None)
+                if window is not None and self._windows.get(_coalesce_key(queued)) is window:
+                    del self._windows[_coalesce_key(queued)]
+                self._count_dropped(queued)
+                return True
+        return False
+    
+    def _count_dropped(self, event: SecurityEvent):
+        field_name = f"dropped_{event.severity.value}"
+        setattr(self.pipeline_stats, field_name, getattr(self.pipeline_stats, field_name) + 1)
+    
+    def _ensure_writer(self):
+        """Start the background writer on the running event loop if it is not running"""
+        if self._stopping or (self._writer_task is not None and not self._writer_task.done()):
+            return
         try:
-            # Store latest events (last 1000)
-            await asyncio.get_event_loop().run_in_executor(
-                None, 
-                lambda: self.redis_client.lpush("security_events", json.dumps(event_data))
-            )
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.redis_client.ltrim("security_events", 0, 999)
-            )
-            
-            # Store by event type for quick filtering
-            event_type_key = f"events:{event_data['event_type']}"
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.redis_client.lpush(event_type_key, json.dumps(event_data))
-            )
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.redis_client.ltrim(event_type_key, 0, 99)
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wakeup = asyncio.Event()
+        self._writer_task = loop.create_task(self._run_writer())
+    
+    async def _run_writer(self):
+        """Drain the buffer every flush_interval seconds (or as soon as a full batch is waiting)"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                self.logger.error(f"Security event writer error: {e}")
+    
+    async def flush(self):
+        """Persist all buffered events and pending coalesced counts"""
+        while self._buffer or self._dirty_windows:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            await self._write_batch(batch)
+        self._expire_windows()
+    
+    def _expire_windows(self):
+        now = time.monotonic()
+        for key, window in list(self._windows.items()):
+            if now >= window.window_end and window.flushed and not window.pending:
+                del self._windows[key]
+    
+    async def _write_batch(self, events: List[SecurityEvent]):
+        """Write one batch: a single Redis pipeline, insert_many and a bulk update for coalesced counts"""
+        docs = []
+        for event in events:
+            doc = event.to_dict()
+            window = self._queued_windows.pop(event.event_id, None)
+            occurrences, last_seen = 1, event.timestamp
+            if window is not None:
+                occurrences += window.pending
+                last_seen = window.last_seen
+                window.pending = 0
+                window.flushed = True
+            doc["occurrences"] = occurrences
+            doc["last_seen"] = last_seen.isoformat()
+            docs.append(doc)
+        
+        updates = []
+        for key in list(self._dirty_windows):
+            window = self._windows.get(key)
+            if window is not None and window.flushed and window.pending:
+                updates.append(UpdateOne(
+                    {"event_id": window.event.event_id},
+                    {"$inc": {"occurrences": window.pending}, "$set": {"last_seen": window.last_seen.isoformat()}}
+                ))
+                window.pending = 0
+        self._dirty_windows.clear()
+        
+        if not docs and not updates:
+            return
+        self.pipeline_stats.batches += 1
+        await asyncio.gather(
+            asyncio.to_thread(self._log_batch, docs),
+            self._store_in_redis(docs),
+            self._store_in_mongodb(docs, updates),
+        )
+    
+    def _log_batch(self, docs: List[Dict[str, Any]]):
+        """Structured logging (runs in a worker thread so file handlers never block the event loop)"""
+        for doc in docs:
+            self.logger.info(
+                f"SECURITY_EVENT: {doc['event_type']} | "
+                f"Severity: {doc['severity']} | "
+                f"IP: {doc['ip_address']} | "
+                f"User: {doc['user_id']} | "
+                f"Endpoint: {doc['endpoint']} | "
+                f"Description: {doc['description']} | "
+                f"Occurrences: {doc['occurrences']}"
             )
-            
-        except Exception as e:
-            self.logger.error(f"Failed to store event in Redis: {e}")
+            if self.enable_real_time_alerts and doc["severity"] in (SecuritySeverity.HIGH.value, SecuritySeverity.CRITICAL.value):
+                self.logger.critical(f"CRITICAL SECURITY ALERT: {doc['description']}")
     
-    async def _store_in_mongodb(self, event: SecurityEvent):
-        """Store event in MongoDB for persistence"""
+    async def _store_in_redis(self, docs: List[Dict[str, Any]]):
+        """Store events in Redis for real-time access (one pipelined round trip per batch)"""
+        if self.redis_client is None or not docs:
+            return
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.events_collection.insert_one(event.to_dict())
-            )
+            by_type = defaultdict(list)
+            payloads = []
+            for doc in docs:
+                payload = json.dumps(doc)
+                payloads.append(payload)
+                by_type[f"events:{doc['event_type']}"].append(payload)
+            
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                # Latest events (last 1000)
+                pipe.lpush("security_events", *payloads)
+                pipe.ltrim("security_events", 0, 999)
+                # By event type for quick filtering (last 100 each)
+                for key, values in by_type.items():
+                    pipe.lpush(key, *values)
+                    pipe.ltrim(key, 0, 99)
+                # Real-time alerts for high/critical events
+                if self.enable_real_time_alerts:
+                    for doc in docs:
+                        if doc["severity"] in (SecuritySeverity.HIGH.value, SecuritySeverity.CRITICAL.value):
+                            pipe.publish("security_alerts", json.dumps(self._alert_data(doc)))
+                await pipe.execute()
         except Exception as e:
-            self.logger.error(f"Failed to store event in MongoDB: {e}")
+            self.pipeline_stats.redis_errors += 1
+            self.logger.error(f"Failed to store events in Redis: {e}")
     
-    async def _send_real_time_alert(self, event: SecurityEvent):
-        """Send real-time alerts for critical security events"""
-        if not self.enable_real_time_alerts:
+    async def _store_in_mongodb(self, docs: List[Dict[str, Any]], updates: List[UpdateOne]):
+        """Store events in MongoDB for persistence"""
+        if self.events_collection is None:
             return
-            
         try:
-            alert_data = {
-                'alert_type': 'security_critical',
-                'event_id': event.event_id,
-                'severity': event.severity.value,
-                'event_type': event.event_type.value,
-                'timestamp': event.timestamp.isoformat(),
-                'ip_address': event.ip_address,
-                'description': event.description,
-                'requires_immediate_action': event.severity == SecuritySeverity.CRITICAL
-            }
-            
-            # Store alert in Redis for real-time consumption
-            if self.redis_client:
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.redis_client.publish("security_alerts", json.dumps(alert_data))
-                )
-            
-            # Log critical alert
-            self.logger.critical(f"CRITICAL SECURITY ALERT: {event.description}")
-            
+            if docs:
+                await self.events_collection.insert_many(docs, ordered=False)
+                self.pipeline_stats.written += len(docs)
+            if updates:
+                await self.events_collection.bulk_write(updates, ordered=False)
+                self.pipeline_stats.coalesced_updates += len(updates)
         except Exception as e:
-            self.logger.error(f"Failed to send real-time alert: {e}")
+            self.pipeline_stats.mongo_errors += 1
+            self.logger.error(f"Failed to store events in MongoDB: {e}")
+    
+    @staticmethod
+    def _alert_data(doc: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'alert_type': 'security_critical',
+            'event_id': doc['event_id'],
+            'severity': doc['severity'],
+            'event_type': doc['event_type'],
+            'timestamp': doc['timestamp'],
+            'ip_address': doc['ip_address'],
+            'description': doc['description'],
+            'occurrences': doc['occurrences'],
+            'requires_immediate_action': doc['severity'] == SecuritySeverity.CRITICAL.value
+        }
+    
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """Event pipeline counters (queue depth, coalesced, sampled/dropped, written)"""
+        stats = asdict(self.pipeline_stats)
+        stats["queue_depth"] = len(self._buffer)
+        stats["queue_size"] = self.queue_size
+        stats["writer_running"] = self._writer_task is not None and not self._writer_task.done()
+        return stats
     
     async def _update_threat_intelligence(self, event: SecurityEvent):
         """Update threat intelligence based on security events"""
@@ -327,7 +541,7 @@ class SecurityMonitor:
             end_time = datetime.utcnow()
             start_time = end_time - timedelta(hours=hours)
             
-            if not self.mongo_client:
+            if self.events_collection is None:
                 return {"error": "MongoDB not available"}
             
             # Query security events
@@ -338,14 +552,11 @@ class SecurityMonitor:
                         "event_type": "$event_type",
                         "severity": "$severity"
                     },
-                    "count": {"$sum": 1}
+                    "count": {"$sum": {"$ifNull": ["$occurrences", 1]}}
                 }}
             ]
             
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: list(self.events_collection.aggregate(pipeline))
-            )
+            results = await self.events_collection.aggregate(pipeline).to_list(None)
             
             # Process results
             metrics = {
@@ -354,7 +565,8 @@ class SecurityMonitor:
                 "events_by_type": defaultdict(int),
                 "events_by_severity": defaultdict(int),
                 "suspicious_ips": len(self.suspicious_ips),
-                "blocked_ips": len(self.blocked_ips)
+                "blocked_ips": len(self.blocked_ips),
+                "pipeline": self.get_pipeline_stats()
             }
             
             for result in results:
@@ -379,12 +591,9 @@ class SecurityMonitor:
             # Top suspicious IPs
             top_suspicious_ips = []
             for ip in list(self.suspicious_ips)[:10]:
-                if self.mongo_client:
+                if self.events_collection is not None:
                     # Get event count for this IP
-                    event_count = await asyncio.get_event_loop().run_in_executor(
-                        None,
-                        lambda: self.events_collection.count_documents({"ip_address": ip})
-                    )
+                    event_count = await self.events_collection.count_documents({"ip_address": ip})
                     top_suspicious_ips.append({"ip": ip, "events": event_count})
             
             # Rate limiting statistics
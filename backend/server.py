@@ -1,10 +1,12 @@
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks, Query, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks, Query, Response, WebSocket, WebSocketDisconnect
 from contextlib import asynccontextmanager
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request # 추가
+from starlette.background import BackgroundTask
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging  # Keep for compatibility with existing modules
@@ -15,16 +17,41 @@ import uuid
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from jose import JWTError, jwt
-import re
 import asyncio
-import aiofiles
-import io
-import base64
+import tempfile
 from concurrent.futures import ThreadPoolExecutor
 import json
 import time  # Added for enhanced logging middleware
+from urllib.parse import quote
 
 from cache_service import cache_service  # Import the instance directly
+from relation_loader import RelationLoader, ensure_relation_indexes
+from pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate, set_pagination_headers,
+    ndjson_response, ensure_pagination_indexes
+)
+from project_analytics import project_stats_service, ensure_analytics_indexes
+from dashboard_counters import dashboard_counters, sheet_status_count
+from job_queue import JobWorker, job_queue
+from similarity_index import similarity_index
+from evaluator_onboarding import (
+    ONBOARDING_MAX_FILE_SIZE, evaluator_onboarding, parse_roster, roster_from_models, ensure_user_indexes
+)
+from pdf_render_farm import pdf_render_farm
+from zip_stream import content_disposition, zip_archive_cache, zip_download_response
+from ranged_file import ranged_file_response
+from excel_stream_export import EXCEL_EXPORT_TMPDIR, write_evaluations_excel
+from export_utils import exporter
+from export_artifact_store import artifact_response, document_version, export_artifact_store
+from score_store import ensure_score_indexes, score_store
+from scoring_engine import score_sheet, template_items
+from assignment_engine import assignment_engine, ensure_assignment_indexes
+from ai_clients import ai_client_pool
+from ai_response_cache import ai_response_cache
+from document_pipeline import token_counter
+from upload_storage import MAX_UPLOAD_SIZE, store_upload, ensure_upload_indexes
+from stub_services import update_project_statistics
+from websocket_service import notification_service
 
 # Placeholder imports for missing models and functions
 # These should be adjusted based on actual project structure
@@ -42,13 +69,17 @@ import security
 from security import (
     create_access_token, 
     get_current_user, 
-    get_password_hash, 
     verify_password, 
+    hash_password_async,
+    verify_password_async,
+    password_hash_pool,
     check_admin_or_secretary, 
     get_current_user_optional,
     oauth2_scheme as security_oauth2_scheme, # Import with an alias if server.py defines its own
     imported_pwd_context, # Use the correctly named imported context
     generate_evaluator_credentials, # Add missing function import
+    user_principal_cache,
+    invalidate_user_principal,
 )
 from secure_file_endpoints import check_file_access_permission, log_file_access
 
@@ -67,7 +98,7 @@ except ImportError as e:
 
 # 향상된 권한 시스템 임포트
 try:
-    from enhanced_permissions import permission_checker
+    from enhanced_permissions import permission_checker, PermissionMemoMiddleware
     from permission_admin_endpoints import permission_admin_router
     ENHANCED_PERMISSIONS_ENABLED = True
 except ImportError as e:
@@ -223,6 +254,33 @@ client = AsyncIOMotorClient(
 )
 db = client[os.environ['DB_NAME']]
 
+# 목록 엔드포인트용 관계 일괄 로더 (N+1 조회 방지)
+relation_loader = RelationLoader(db)
+
+# 프로젝트 분석 집계 서비스 초기화 (project_stats 사전 계산 문서 포함)
+project_stats_service.db = db
+
+# 대시보드 증분 카운터 초기화
+dashboard_counters.db = db
+
+# 출력/내보내기/AI 평가 작업 큐 초기화
+job_queue.db = db
+
+# 표절 검사용 문서 유사도 인덱스 초기화
+similarity_index.db = db
+
+# 평가위원 일괄 등록 파이프라인 초기화
+evaluator_onboarding.db = db
+
+# 평가 배정 엔진 초기화
+assignment_engine.db = db
+
+# 평가 점수 저장소 초기화
+score_store.db = db
+
+# AI 응답 캐시 초기화
+ai_response_cache.db = db
+
 # AI 관련 컬렉션 설정
 ai_providers_collection = db.ai_providers
 ai_models_collection = db.ai_models
@@ -269,6 +327,50 @@ pwd_context = imported_pwd_context # Correctly assign the imported instance
 # API Router 정의
 api_router = APIRouter()
 
+async def start_shared_services() -> None:
+    """Initialize the services used by both the web app and standalone job workers (job_worker.py)"""
+    # Initialize the database connection in security module
+    from security import set_database
+    set_database(db)
+    logger.info("Database connection initialized in security module", extra={
+        'custom_service': 'security_db_init',
+        'custom_status': 'completed'
+    })
+    
+    # AI 공급자 클라이언트 로드 (공급자별 HTTP 연결 풀을 시작 시 한 번 생성해 재사용)
+    if AI_ENABLED:
+        try:
+            await enhanced_ai_service.load_ai_providers()
+        except Exception as e:
+            logger.error(f"AI 공급자 로드 오류: {e}")
+    
+    # Initialize Redis client for performance monitoring
+    try:
+        await cache_service.connect()
+        if cache_service.redis_client:
+            await cache_service.redis_client.ping()
+            logger.info("Redis connection verified", extra={
+                'custom_service': 'redis_init',
+                'custom_status': 'connected'
+            })
+        else:
+            logger.warning("Redis client not available", extra={
+                'custom_service': 'redis_init',
+                'custom_status': 'unavailable'
+            })
+    except Exception as e:
+        logger.error("Redis connection failed", extra={
+            'custom_service': 'redis_init',
+            'custom_status': 'failed',
+            'custom_error_type': type(e).__name__
+        })
+
+async def stop_shared_services() -> None:
+    """Release the connections opened by start_shared_services"""
+    await cache_service.disconnect()
+    await ai_client_pool.aclose()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan event handler"""
@@ -282,34 +384,33 @@ async def lifespan(app: FastAPI):
             'custom_services': ['mongodb', 'redis', 'prometheus']
         })
         
-        # Initialize the database connection in security module
-        from security import set_database
-        set_database(db)
-        logger.info("Database connection initialized in security module", extra={
-            'custom_service': 'security_db_init',
-            'custom_status': 'completed'
-        })
-        
-        # Initialize Redis client for performance monitoring
-        try:
-            await cache_service.connect()
-            if cache_service.redis_client:
-                await cache_service.redis_client.ping()
-                logger.info("Redis connection verified", extra={
-                    'custom_service': 'redis_init',
-                    'custom_status': 'connected'
-                })
-            else:
-                logger.warning("Redis client not available", extra={
-                    'custom_service': 'redis_init',
-                    'custom_status': 'unavailable'
-                })
-        except Exception as e:
-            logger.error("Redis connection failed", extra={
-                'custom_service': 'redis_init',
-                'custom_status': 'failed',
-                'custom_error_type': type(e).__name__
-            })
+        # Database handle, AI providers and Redis (shared with standalone job workers)
+        await start_shared_services()
+        
+        # Ensure key indexes used by the batched relation loader
+        await ensure_relation_indexes(db)
+        await ensure_pagination_indexes(db)
+        await ensure_analytics_indexes(db)
+        await ensure_upload_indexes(db)
+        await ensure_assignment_indexes(db)
+        await ensure_score_indexes(db)
+        await ensure_user_indexes(db)
+        await ai_response_cache.ensure_indexes()
+        await similarity_index.ensure_indexes()
+        
+        # 보안 이벤트 백그라운드 기록기 (요청 경로에서는 메모리 버퍼에만 추가)
+        if security_monitoring:
+            await security_monitor.start()
+        
+        # 대시보드 카운터 주기적 재집계 (증분 갱신 누락 보정)
+        counters_reconcile_task = asyncio.create_task(dashboard_counters.run_reconcile_loop())
+        
+        # 작업 큐 내장 워커 (별도 job_worker.py 프로세스로 분리 시 JOB_WORKER_EMBEDDED=false)
+        await job_queue.ensure_indexes()
+        embedded_job_worker = None
+        if os.getenv("JOB_WORKER_EMBEDDED", "true").lower() == "true":
+            embedded_job_worker = JobWorker(job_queue, concurrency=int(os.getenv("JOB_WORKER_CONCURRENCY", "2")))
+            embedded_job_worker.start()
         
         # Log enhanced security systems status
         logger.info("Security systems initialized", extra={
@@ -327,6 +428,15 @@ async def lifespan(app: FastAPI):
     yield  # Application runs here
     
     # Shutdown
+    counters_reconcile_task.cancel()
+    if embedded_job_worker:
+        await embedded_job_worker.stop()
+    if security_monitoring:
+        await security_monitor.stop()
+    await stop_shared_services()
+    password_hash_pool.shutdown()
+    evaluator_onboarding.shutdown()
+    pdf_render_farm.shutdown()
     logger.info("FastAPI application shutdown initiated", extra={
         'custom_event': 'application_shutdown'
     })
@@ -433,6 +543,9 @@ app.add_middleware(SecurityMiddleware, enable_rate_limiting=True, enable_securit
 app.add_middleware(RequestValidationMiddleware)
 app.add_middleware(FileUploadSecurityMiddleware)
 app.add_middleware(IPWhitelistMiddleware, admin_paths=["/api/admin", "/api/init"])
+if ENHANCED_PERMISSIONS_ENABLED:
+    # 요청 단위 권한 메모 (같은 요청 내 반복 권한 검사는 한 번만 해석)
+    app.add_middleware(PermissionMemoMiddleware)
 
 # Enhanced CORS configuration using security config
 app.add_middleware(
@@ -441,7 +554,7 @@ app.add_middleware(
     allow_credentials=config.CORS_ALLOW_CREDENTIALS,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["Authorization", "Content-Type", "X-Requested-With"],
-    expose_headers=["X-Total-Count"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
     max_age=3600,
 )
 
@@ -549,7 +662,8 @@ async def health_check():
             "services": {
                 "mongodb": "healthy",
                 "redis": redis_status,
-                "api": "healthy"
+                "api": "healthy",
+                "assignment_index": "healthy" if assignment_engine.index_ready else "unhealthy"
             },
             "version": "2.0.0"
         }
@@ -821,7 +935,7 @@ async def approve_secretary_request(
     # 사용자 계정 생성
     user_id = str(uuid.uuid4())
     login_id = request_data["name"]  # 이름을 로그인 ID로 사용
-    password_hash = get_password_hash(request_data["phone"].replace("-", ""))  # 전화번호를 비밀번호로 사용
+    password_hash = await hash_password_async(request_data["phone"].replace("-", ""))  # 전화번호를 비밀번호로 사용
     
     user_data = {
         "id": user_id,
@@ -901,7 +1015,7 @@ async def create_user(user_data: UserCreate, current_user: User = Depends(get_cu
     if existing_user:
         raise HTTPException(status_code=400, detail="이미 존재하는 아이디입니다")
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     user = User(
         login_id=user_data.login_id,
         password_hash=hashed_password,
@@ -912,6 +1026,7 @@ async def create_user(user_data: UserCreate, current_user: User = Depends(get_cu
     )
     
     await db.users.insert_one(user.dict())
+    await dashboard_counters.user_created(user.role, user.is_active)
     return UserResponse(**user.dict())
 
 # Get all users (for admin and verification)
@@ -967,7 +1082,7 @@ async def create_evaluator(evaluator_data: EvaluatorCreate, current_user: User =
     if existing_user:
         raise HTTPException(status_code=400, detail="이미 존재하는 평가위원입니다 (이름/전화번호 중복)")
     
-    hashed_password = get_password_hash(password)
+    hashed_password = await hash_password_async(password)
     user = User(
         login_id=login_id,
         password_hash=hashed_password,
@@ -978,6 +1093,7 @@ async def create_evaluator(evaluator_data: EvaluatorCreate, current_user: User =
     )
     
     await db.users.insert_one(user.dict())
+    await dashboard_counters.user_created(user.role, user.is_active)
     response = UserResponse(**user.dict())
     
     # Return with generated credentials for display
@@ -1003,56 +1119,58 @@ async def create_evaluators_batch(
 ):
     check_admin_or_secretary(current_user)
     
-    created_evaluators = []
-    errors = []
+    # $in 중복 조회 1회 + 프로세스 풀 해시 + unordered insert_many 1회
+    result = await evaluator_onboarding.onboard(roster_from_models(evaluators_data))
+    return {
+        "created_count": result["created_count"],
+        "error_count": result["error_count"],
+        "created_evaluators": result["created_evaluators"],
+        "errors": [error["error"] for error in result["errors"]]
+    }
+
+@api_router.post("/evaluators/batch/upload")
+async def upload_evaluators_batch(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user)
+):
+    """CSV/XLSX 명단으로 평가위원 일괄 등록 - 진행 상황과 결과를 NDJSON 으로 스트리밍"""
+    check_admin_or_secretary(current_user)
+    
+    content = await file.read(ONBOARDING_MAX_FILE_SIZE + 1)
+    if len(content) > ONBOARDING_MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=f"명단 파일은 {ONBOARDING_MAX_FILE_SIZE // (1024 * 1024)}MB를 초과할 수 없습니다.")
+    rows = await asyncio.to_thread(parse_roster, file.filename, content)
     
-    # Process in parallel using asyncio.gather
-    async def create_single_evaluator(evaluator_data):
+    async def event_stream():
         try:
-            login_id, password = generate_evaluator_credentials(evaluator_data.user_name, evaluator_data.phone)
-            
-            existing_user = await db.users.find_one({"login_id": login_id})
-            if existing_user:
-                return {"error": f"이미 존재하는 평가위원: {evaluator_data.user_name}"}
-            
-            hashed_password = get_password_hash(password)
-            user = User(
-                login_id=login_id,
-                password_hash=hashed_password,
-                user_name=evaluator_data.user_name,
-                email=evaluator_data.email,
-                phone=evaluator_data.phone,
-                role="evaluator"
-            )
-            
-            await db.users.insert_one(user.dict())
-            return {
-                "user": UserResponse(**user.dict()).dict(),
-                "credentials": {"login_id": login_id, "password": password}
-            }
+            async for event in evaluator_onboarding.run(rows):
+                yield json.dumps(jsonable_encoder(event), ensure_ascii=False) + "\n"
         except Exception as e:
-            return {"error": f"평가위원 생성 실패 ({evaluator_data.user_name}): {str(e)}"}
-    
-    # Execute all operations concurrently
-    results = await asyncio.gather(*[create_single_evaluator(evaluator) for evaluator in evaluators_data])
-    
-    for result in results:
-        if "error" in result:
-            errors.append(result["error"])
-        else:
-            created_evaluators.append(result)
-    
-    return {
-        "created_count": len(created_evaluators),
-        "error_count": len(errors),
-        "created_evaluators": created_evaluators,
-        "errors": errors
-    }
+            logger.error(f"Bulk evaluator onboarding failed: {e}")
+            yield json.dumps({"event": "error", "message": f"일괄 등록 중 오류가 발생했습니다: {str(e)}"}, ensure_ascii=False) + "\n"
+    
+    # 생성된 비밀번호가 포함되므로 캐시 금지
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store"}
+    )
 
 # Project routes
 @api_router.get("/projects", response_model=List[Project])
-async def get_projects(current_user: User = Depends(get_current_user)):
-    projects = await db.projects.find({"is_active": True}).to_list(1000)
+async def get_projects(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    after: Optional[str] = Query(None, description="이전 페이지의 X-Next-Cursor 값"),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 (전체 결과)"),
+    current_user: User = Depends(get_current_user)
+):
+    query = {"is_active": True}
+    if stream:
+        return ndjson_response(db.projects, query, lambda docs: [Project(**doc) for doc in docs])
+
+    projects, next_cursor, total = await paginate(db.projects, query, limit, after)
+    set_pagination_headers(response, total, next_cursor)
     return [Project(**project) for project in projects]
 
 @api_router.post("/projects", response_model=Project)
@@ -1073,7 +1191,9 @@ async def create_project(
         created_by=current_user.id
     )
     
-    await db.projects.insert_one(project.dict())
+    project_doc = project.dict()
+    await db.projects.insert_one(project_doc)
+    await dashboard_counters.project_created(is_active=project_doc.get("is_active", False))
     
     # Background task to initialize project statistics
     background_tasks.add_task(update_project_statistics, project.id)
@@ -1082,12 +1202,23 @@ async def create_project(
 
 # Company routes with enhanced file handling
 @api_router.get("/companies", response_model=List[Company])
-async def get_companies(project_id: Optional[str] = None, current_user: User = Depends(get_current_user)):
+async def get_companies(
+    response: Response,
+    project_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    after: Optional[str] = Query(None, description="이전 페이지의 X-Next-Cursor 값"),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 (전체 결과)"),
+    current_user: User = Depends(get_current_user)
+):
     query = {}
     if project_id:
         query["project_id"] = project_id
     
-    companies = await db.companies.find(query).to_list(1000)
+    if stream:
+        return ndjson_response(db.companies, query, lambda docs: [Company(**doc) for doc in docs])
+
+    companies, next_cursor, total = await paginate(db.companies, query, limit, after)
+    set_pagination_headers(response, total, next_cursor)
     return [Company(**company) for company in companies]
 
 @api_router.post("/companies", response_model=Company)
@@ -1102,6 +1233,7 @@ async def create_company(
     
     company = Company(**company_data.dict())
     await db.companies.insert_one(company.dict())
+    await dashboard_counters.company_created()
     
     # Update project statistics in background
     background_tasks.add_task(update_project_statistics, company.project_id)
@@ -1128,15 +1260,6 @@ async def upload_file(
         if not company_id or not company_id.strip():
             raise HTTPException(status_code=400, detail="회사 ID가 필요합니다.")
         
-        # File size validation (50MB limit)
-        MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
-        content = await file.read()
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=413, detail="파일 크기가 50MB를 초과합니다.")
-        
-        if len(content) == 0:
-            raise HTTPException(status_code=400, detail="빈 파일은 업로드할 수 없습니다.")
-        
         # File type validation
         ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx', '.xls', '.xlsx', '.txt', '.png', '.jpg', '.jpeg'}
         file_extension = Path(file.filename).suffix.lower()
@@ -1151,38 +1274,38 @@ async def upload_file(
         if not company:
             raise HTTPException(status_code=404, detail="존재하지 않는 회사입니다.")
         
-        # Create uploads directory if it doesn't exist
-        upload_dir = Path("uploads")
-        try:
-            upload_dir.mkdir(exist_ok=True)
-        except OSError as e:
-            logging.error(f"Failed to create uploads directory: {e}")
-            raise HTTPException(status_code=500, detail="파일 저장 공간을 준비할 수 없습니다.")
+        # Stream to disk in chunks: SHA-256, 50MB limit and magic bytes are checked
+        # mid-stream, then the file is renamed to its content-addressed path
+        stored = await store_upload(file, file_extension, max_size=MAX_UPLOAD_SIZE)
         
-        # Generate unique filename with proper encoding
-        file_id = str(uuid.uuid4())
-        # Sanitize filename to prevent directory traversal
-        safe_filename = re.sub(r'[^\w\s.-]', '', file.filename)
-        unique_filename = f"{company_id}_{file_id}_{safe_filename}"
-        file_path = upload_dir / unique_filename
+        # Same content already uploaded for this company: return the existing record
+        existing = await db.file_metadata.find_one(
+            {"company_id": company_id, "file_hash": stored.sha256}, {"_id": 0}
+        )
+        if existing:
+            return {
+                "message": "동일한 파일이 이미 업로드되어 있습니다",
+                "file_id": existing["id"],
+                "filename": existing["original_filename"],
+                "file_size": existing["file_size"],
+                "file_type": existing["file_type"],
+                "file_hash": stored.sha256,
+                "duplicate": True
+            }
         
-        # Save file asynchronously with error handling
-        try:
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(content)
-        except OSError as e:
-            logging.error(f"Failed to save file {file_path}: {e}")
-            raise HTTPException(status_code=500, detail="파일 저장에 실패했습니다.")
+        file_id = str(uuid.uuid4())
+        file_path = Path(stored.file_path)
         
         # Create file metadata
         try:
             file_metadata = FileMetadata(
                 id=file_id,
-                filename=unique_filename,
+                filename=file_path.name,
                 original_filename=file.filename,
-                file_path=str(file_path),
-                file_size=len(content),
+                file_path=stored.file_path,
+                file_size=stored.size,
                 file_type=file.content_type,
+                file_hash=stored.sha256,
                 uploaded_by=current_user.id,
                 company_id=company_id
             )
@@ -1197,20 +1320,16 @@ async def upload_file(
             )
             
         except Exception as e:
-            # If database operation fails, clean up the uploaded file
-            try:
-                if file_path.exists():
-                    file_path.unlink()
-            except OSError:
-                pass  # File cleanup failed, but don't raise another exception
-            
+            # The content-addressed file may be shared with other uploads, so it is kept;
+            # a retried upload of the same content reuses it
             logging.error(f"Database operation failed for file upload: {e}")
             raise HTTPException(status_code=500, detail="파일 메타데이터 저장에 실패했습니다.")
         
         # Add background task for file processing
         try:
             # background_tasks.add_task(background_file_processing, str(file_path), file_id)
-            pass
+            # 표절 검사용 유사도 색인 (텍스트 추출 포함)
+            background_tasks.add_task(similarity_index.index_file, file_metadata.dict(), company.get("project_id"))
         except Exception as e:
             logging.warning(f"Failed to add background task for file processing: {e}")
             # Don't fail the upload just because background task failed
@@ -1219,8 +1338,10 @@ async def upload_file(
             "message": "파일이 성공적으로 업로드되었습니다",
             "file_id": file_id,
             "filename": file.filename,
-            "file_size": len(content),
-            "file_type": file.content_type
+            "file_size": stored.size,
+            "file_type": file.content_type,
+            "file_hash": stored.sha256,
+            "duplicate": False
         }
         
     except HTTPException:
@@ -1231,10 +1352,37 @@ async def upload_file(
         raise HTTPException(status_code=500, detail="파일 업로드 중 예상치 못한 오류가 발생했습니다.")
 
 # File management endpoints
+async def _build_file_rows(files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """파일 메타데이터 배치에 회사 정보를 단일 $in 쿼리로 조합"""
+    related_list = await relation_loader.hydrate(
+        files, relations=("company",), projections={"company": {"name": 1}}
+    )
+
+    result = []
+    for file_doc, related in zip(files, related_list):
+        company = related["company"]
+        file_info = {
+            "id": file_doc["id"],
+            "filename": file_doc["original_filename"],
+            "file_size": file_doc["file_size"],
+            "file_type": file_doc["file_type"],
+            "uploaded_at": file_doc["uploaded_at"],
+            "uploaded_by": file_doc["uploaded_by"],
+            "company_id": file_doc["company_id"],
+            "company_name": company["name"] if company else "알 수 없음"
+        }
+        result.append(file_info)
+    
+    return result
+
 @api_router.get("/files", response_model=List[Dict[str, Any]])
 async def get_files(
+    response: Response,
     company_id: Optional[str] = Query(None, description="회사 ID로 필터링"),
     project_id: Optional[str] = Query(None, description="프로젝트 ID로 필터링"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    after: Optional[str] = Query(None, description="이전 페이지의 X-Next-Cursor 값"),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 (전체 결과)"),
     current_user: User = Depends(get_current_user)
 ):
     """파일 목록 조회"""
@@ -1245,146 +1393,21 @@ async def get_files(
     
     # 프로젝트별 필터링을 위해 회사를 통해 간접 조회
     if project_id:
-        companies = await db.companies.find({"project_id": project_id}).to_list(1000)
-        company_ids = [str(company["_id"]) for company in companies]
+        company_ids = await db.companies.distinct("id", {"project_id": project_id})
         if company_ids:
             filter_criteria["company_id"] = {"$in": company_ids}
         else:
+            set_pagination_headers(response, 0, None)
             return []  # 프로젝트에 회사가 없으면 빈 결과 반환
-    
-    files = await db.file_metadata.find(filter_criteria).to_list(1000)
-    
-    # 파일 정보와 회사 정보를 조합하여 반환
-    result = []
-    for file_doc in files:
-        company = await db.companies.find_one({"_id": file_doc["company_id"]})
-        file_info = {
-            "id": file_doc["id"],
-            "filename": file_doc["original_filename"],
-            "file_size": file_doc["file_size"],
-            "file_type": file_doc["file_type"],
-            "uploaded_at": file_doc["uploaded_at"],
-            "uploaded_by": file_doc["uploaded_by"],
-            "company_id": file_doc["company_id"],
-            "company_name": company["name"] if company else "알 수 없음"
-        }
-        result.append(file_info)
-    
-    return result
 
-@api_router.get("/files/{file_id}")
-async def get_file(
-    file_id: str, 
-    request: Request,
-    current_user: User = Depends(get_current_user)
-):
-    """보안 강화된 파일 다운로드 - 권한 검사 및 접근 로그 포함"""
-    try:
-        # 입력 검증
-        if not file_id or not file_id.strip():
-            raise HTTPException(status_code=400, detail="파일 ID가 필요합니다.")
-        
-        # 권한 검사
-        if not await check_file_access_permission(current_user, file_id):
-            # 권한 없는 접근 시도 로그 기록
-            await log_file_access(
-                user_id=current_user.id,
-                file_id=file_id,
-                action="download_denied",
-                ip_address=request.client.host,
-                user_agent=request.headers.get("user-agent"),
-                success=False,
-                error_message="접근 권한 없음"
-            )
-            raise HTTPException(status_code=403, detail="이 파일을 다운로드할 권한이 없습니다.")
-        
-        # 파일 메타데이터 조회
-        file_metadata = await db.file_metadata.find_one({"id": file_id})
-        if not file_metadata:
-            await log_file_access(
-                user_id=current_user.id,
-                file_id=file_id,
-                action="download_failed",
-                ip_address=request.client.host,
-                user_agent=request.headers.get("user-agent"),
-                success=False,
-                error_message="파일을 찾을 수 없음"
-            )
-            raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
-        
-        # 파일 경로 보안 검증
-        file_path_str = file_metadata["file_path"]
-        if ".." in file_path_str or file_path_str.startswith("/"):
-            await log_file_access(
-                user_id=current_user.id,
-                file_id=file_id,
-                action="download_blocked",
-                ip_address=request.client.host,
-                user_agent=request.headers.get("user-agent"),
-                success=False,
-                error_message="잘못된 파일 경로"
-            )
-            raise HTTPException(status_code=400, detail="잘못된 파일 경로입니다.")
-        
-        file_path = Path(file_path_str)
-        if not file_path.exists():
-            await log_file_access(
-                user_id=current_user.id,
-                file_id=file_id,
-                action="download_failed",
-                ip_address=request.client.host,
-                user_agent=request.headers.get("user-agent"),
-                success=False,
-                error_message="파일이 존재하지 않음"
-            )
-            raise HTTPException(status_code=404, detail="파일이 존재하지 않습니다.")
-        
-        # 성공적인 다운로드 로그 기록
-        await log_file_access(
-            user_id=current_user.id,
-            file_id=file_id,
-            action="download_success",
-            ip_address=request.client.host,
-            user_agent=request.headers.get("user-agent"),
-            success=True
-        )
-        
-        # 안전한 파일명 생성 (한글 파일명 처리)
-        safe_filename = file_metadata["original_filename"]
-        try:
-            # UTF-8로 인코딩 가능한지 확인
-            safe_filename.encode('utf-8')
-        except UnicodeEncodeError:
-            # 인코딩 실패 시 파일 ID로 대체
-            extension = Path(safe_filename).suffix
-            safe_filename = f"file_{file_id}{extension}"
-        
-        return FileResponse(
-            path=file_path,
-            filename=safe_filename,
-            media_type=file_metadata.get("file_type", "application/octet-stream"),
-            headers={
-                "X-User": current_user.user_name,
-                "X-Download-Time": datetime.utcnow().isoformat(),
-                "X-File-ID": file_id
-            }
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        # 예상치 못한 오류 로그 기록
-        await log_file_access(
-            user_id=current_user.id if 'current_user' in locals() else "unknown",
-            file_id=file_id,
-            action="download_error",
-            ip_address=request.client.host if 'request' in locals() else "unknown",
-            user_agent=request.headers.get("user-agent") if 'request' in locals() else "unknown",
-            success=False,
-            error_message=f"예상치 못한 오류: {str(e)}"
-        )
-        logging.error(f"파일 다운로드 예상치 못한 오류: {e}")
-        raise HTTPException(status_code=500, detail="파일 다운로드 중 오류가 발생했습니다.")
+    if stream:
+        return ndjson_response(db.file_metadata, filter_criteria, _build_file_rows, sort_field="uploaded_at")
+
+    files, next_cursor, total = await paginate(
+        db.file_metadata, filter_criteria, limit, after, sort_field="uploaded_at"
+    )
+    set_pagination_headers(response, total, next_cursor)
+    return await _build_file_rows(files)
 
 # 파일 접근 로그 관리 엔드포인트
 @api_router.get("/files/access-logs")
@@ -1558,7 +1581,132 @@ async def get_file_security_analytics(
         logging.error(f"파일 보안 분석 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="파일 보안 분석 조회 중 오류가 발생했습니다.")
 
+@api_router.get("/files/{file_id}")
+async def get_file(
+    file_id: str, 
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """보안 강화된 파일 다운로드 - 권한 검사 및 접근 로그 포함"""
+    try:
+        # 입력 검증
+        if not file_id or not file_id.strip():
+            raise HTTPException(status_code=400, detail="파일 ID가 필요합니다.")
+        
+        # 권한 검사
+        if not await check_file_access_permission(db, current_user, file_id):
+            # 권한 없는 접근 시도 로그 기록
+            await log_file_access(
+                db,
+                user_id=current_user.id,
+                file_id=file_id,
+                action="download_denied",
+                ip_address=request.client.host,
+                user_agent=request.headers.get("user-agent"),
+                success=False,
+                error_message="접근 권한 없음"
+            )
+            raise HTTPException(status_code=403, detail="이 파일을 다운로드할 권한이 없습니다.")
+        
+        # 파일 메타데이터 조회
+        file_metadata = await db.file_metadata.find_one({"id": file_id})
+        if not file_metadata:
+            await log_file_access(
+                db,
+                user_id=current_user.id,
+                file_id=file_id,
+                action="download_failed",
+                ip_address=request.client.host,
+                user_agent=request.headers.get("user-agent"),
+                success=False,
+                error_message="파일을 찾을 수 없음"
+            )
+            raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+        
+        # 파일 경로 보안 검증
+        file_path_str = file_metadata["file_path"]
+        if ".." in file_path_str or file_path_str.startswith("/"):
+            await log_file_access(
+                db,
+                user_id=current_user.id,
+                file_id=file_id,
+                action="download_blocked",
+                ip_address=request.client.host,
+                user_agent=request.headers.get("user-agent"),
+                success=False,
+                error_message="잘못된 파일 경로"
+            )
+            raise HTTPException(status_code=400, detail="잘못된 파일 경로입니다.")
+        
+        file_path = Path(file_path_str)
+        if not file_path.exists():
+            await log_file_access(
+                db,
+                user_id=current_user.id,
+                file_id=file_id,
+                action="download_failed",
+                ip_address=request.client.host,
+                user_agent=request.headers.get("user-agent"),
+                success=False,
+                error_message="파일이 존재하지 않음"
+            )
+            raise HTTPException(status_code=404, detail="파일이 존재하지 않습니다.")
+        
+        # 안전한 파일명 생성 (한글 파일명 처리)
+        safe_filename = file_metadata["original_filename"]
+        try:
+            # UTF-8로 인코딩 가능한지 확인
+            safe_filename.encode('utf-8')
+        except UnicodeEncodeError:
+            # 인코딩 실패 시 파일 ID로 대체
+            extension = Path(safe_filename).suffix
+            safe_filename = f"file_{file_id}{extension}"
+        
+        # 응답 생성 (200 전체 / 206 부분 / 304 변경 없음 / 416 범위 오류) - 끊긴 다운로드는 Range 로 이어받기
+        response = ranged_file_response(
+            request,
+            str(file_path),
+            media_type=file_metadata.get("file_type", "application/octet-stream"),
+            file_hash=file_metadata.get("file_hash"),
+            headers={
+                "Content-Disposition": content_disposition(safe_filename),
+                # 헤더는 latin-1 만 허용하므로 한글 이름은 퍼센트 인코딩
+                "X-User": quote(current_user.user_name),
+                "X-Download-Time": datetime.utcnow().isoformat(),
+                "X-File-ID": file_id
+            }
+        )
+
+        # 성공적인 다운로드 로그 기록 - 이어받기 요청은 첫 요청만 기록
+        if response.status_code == 200 or response.headers.get("content-range", "").startswith("bytes 0-"):
+            await log_file_access(
+                db,
+                user_id=current_user.id,
+                file_id=file_id,
+                action="download_success",
+                ip_address=request.client.host,
+                user_agent=request.headers.get("user-agent"),
+                success=True
+            )
 
+        return response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        # 예상치 못한 오류 로그 기록
+        await log_file_access(
+            db,
+            user_id=current_user.id if 'current_user' in locals() else "unknown",
+            file_id=file_id,
+            action="download_error",
+            ip_address=request.client.host if 'request' in locals() else "unknown",
+            user_agent=request.headers.get("user-agent") if 'request' in locals() else "unknown",
+            success=False,
+            error_message=f"예상치 못한 오류: {str(e)}"
+        )
+        logging.error(f"파일 다운로드 예상치 못한 오류: {e}")
+        raise HTTPException(status_code=500, detail="파일 다운로드 중 오류가 발생했습니다.")
 
 @api_router.get("/files/{file_id}/preview")
 async def preview_file(
@@ -1573,9 +1721,10 @@ async def preview_file(
             raise HTTPException(status_code=400, detail="파일 ID가 필요합니다.")
         
         # 권한 검사
-        if not await check_file_access_permission(current_user, file_id):
+        if not await check_file_access_permission(db, current_user, file_id):
             # 권한 없는 접근 시도 로그 기록
             await log_file_access(
+                db,
                 user_id=current_user.id,
                 file_id=file_id,
                 action="preview_denied",
@@ -1590,6 +1739,7 @@ async def preview_file(
         file_metadata = await db.file_metadata.find_one({"id": file_id})
         if not file_metadata:
             await log_file_access(
+                db,
                 user_id=current_user.id,
                 file_id=file_id,
                 action="preview_failed",
@@ -1604,6 +1754,7 @@ async def preview_file(
         file_path_str = file_metadata["file_path"]
         if ".." in file_path_str or file_path_str.startswith("/"):
             await log_file_access(
+                db,
                 user_id=current_user.id,
                 file_id=file_id,
                 action="preview_blocked",
@@ -1617,6 +1768,7 @@ async def preview_file(
         file_path = Path(file_path_str)
         if not file_path.exists():
             await log_file_access(
+                db,
                 user_id=current_user.id,
                 file_id=file_id,
                 action="preview_failed",
@@ -1631,6 +1783,7 @@ async def preview_file(
         MAX_PREVIEW_SIZE = 100 * 1024 * 1024  # 100MB
         if file_metadata.get("file_size", 0) > MAX_PREVIEW_SIZE:
             await log_file_access(
+                db,
                 user_id=current_user.id,
                 file_id=file_id,
                 action="preview_blocked",
@@ -1641,47 +1794,36 @@ async def preview_file(
             )
             raise HTTPException(status_code=413, detail="파일이 너무 커서 미리보기할 수 없습니다.")
         
-        # PDF 파일 처리
+        # PDF 파일 처리 - 본문을 인라인으로 싣지 않고 Range 지원 스트리밍 URL 반환
         if file_metadata["file_type"] == "application/pdf":
-            try:
-                async with aiofiles.open(file_path, 'rb') as f:
-                    content = await f.read()
-                    base64_content = base64.b64encode(content).decode('utf-8')
-                    
-                    # 성공적인 접근 로그 기록
-                    await log_file_access(
-                        user_id=current_user.id,
-                        file_id=file_id,
-                        action="preview_success",
-                        ip_address=request.client.host,
-                        user_agent=request.headers.get("user-agent"),
-                        success=True
-                    )
-                    
-                    return {
-                        "content": base64_content,
-                        "type": "pdf",
-                        "filename": file_metadata["original_filename"],
-                        "watermark": {
-                            "user": current_user.user_name,
-                            "date": datetime.utcnow().strftime("%Y-%m-%d %H:%M"),
-                            "ip": request.client.host
-                        }
-                    }
-            except Exception as e:
-                await log_file_access(
-                    user_id=current_user.id,
-                    file_id=file_id,
-                    action="preview_error",
-                    ip_address=request.client.host,
-                    user_agent=request.headers.get("user-agent"),
-                    success=False,
-                    error_message=f"파일 읽기 오류: {str(e)}"
-                )
-                raise HTTPException(status_code=500, detail="파일을 읽을 수 없습니다.")
-        
+            await log_file_access(
+                db,
+                user_id=current_user.id,
+                file_id=file_id,
+                action="preview_success",
+                ip_address=request.client.host,
+                user_agent=request.headers.get("user-agent"),
+                success=True
+            )
+
+            file_hash = file_metadata.get("file_hash")
+            return {
+                "type": "pdf",
+                "url": f"/api/files/secure-pdf-view/{file_id}",
+                "filename": file_metadata["original_filename"],
+                "size": file_metadata.get("file_size"),
+                "etag": f'"{file_hash}"' if file_hash else None,
+                "accept_ranges": "bytes",
+                "watermark": {
+                    "user": current_user.user_name,
+                    "date": datetime.utcnow().strftime("%Y-%m-%d %H:%M"),
+                    "ip": request.client.host
+                }
+            }
+
         # 기타 파일 처리
         await log_file_access(
+            db,
             user_id=current_user.id,
             file_id=file_id,
             action="metadata_access",
@@ -1708,6 +1850,7 @@ async def preview_file(
     except Exception as e:
         # 예상치 못한 오류 로그 기록
         await log_file_access(
+            db,
             user_id=current_user.id if 'current_user' in locals() else "unknown",
             file_id=file_id,
             action="preview_error",
@@ -1723,105 +1866,34 @@ async def preview_file(
 @api_router.post("/assignments")
 async def create_assignments(
     assignment_data: AssignmentCreate, 
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     check_admin_or_secretary(current_user)
     
-    deadline = None
-    if assignment_data.deadline:
-        deadline = datetime.fromisoformat(assignment_data.deadline.replace('Z', '+00:00'))
-    
-    created_sheets = []
-    
-    # Create evaluation sheets for each evaluator-company combination
-    tasks = []
-    for evaluator_id in assignment_data.evaluator_ids:
-        for company_id in assignment_data.company_ids:
-            tasks.append(create_single_assignment(evaluator_id, company_id, assignment_data.template_id, deadline))
-      # Execute assignments concurrently
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    for result in results:
-        if isinstance(result, Exception):
-            logger.error(f"Assignment creation failed: {result}", extra={
-                'custom_operation': 'assignment_creation',
-                'custom_error_type': type(result).__name__
-            })
-        elif result:
-            created_sheets.append(result)
+    # 기업 조회 1회 + 기존 배정 조회 1회 + insert_many 1회 (프로젝트 통계는 엔진에서 증분 반영)
+    summary = await assignment_engine.assign([assignment_data])
     
-    # Update project statistics in background
-    if created_sheets:
-        company_data = await db.companies.find_one({"id": assignment_data.company_ids[0]})
-        if company_data:
-            background_tasks.add_task(update_project_statistics, company_data["project_id"])
-    
-    return {"message": f"{len(created_sheets)}개의 평가가 할당되었습니다", "count": len(created_sheets)}
-
-async def create_single_assignment(evaluator_id: str, company_id: str, template_id: str, deadline: datetime):
-    """Helper function to create a single assignment"""
-    try:
-        # Get company to find project_id
-        company_data = await db.companies.find_one({"id": company_id})
-        if not company_data:
-            return None
-            
-        # Check if assignment already exists
-        existing_sheet = await db.evaluation_sheets.find_one({
-            "evaluator_id": evaluator_id,
-            "company_id": company_id,
-            "template_id": template_id
-        })
-        
-        if not existing_sheet:
-            sheet = EvaluationSheet(
-                evaluator_id=evaluator_id,
-                company_id=company_id,
-                project_id=company_data["project_id"],
-                template_id=template_id,
-                status="draft",
-                deadline=deadline            )
-            
-            await db.evaluation_sheets.insert_one(sheet.dict())
-            return sheet
-    except Exception as e:
-        logger.error(f"Failed to create assignment: {e}", extra={
-            'custom_operation': 'create_single_assignment',
-            'custom_evaluator_id': evaluator_id,
-            'custom_company_id': company_id,
-            'custom_template_id': template_id,
-            'custom_error_type': type(e).__name__
-        })
-        return None
+    return {
+        "message": f"{summary['created']}개의 평가가 할당되었습니다",
+        "count": summary["created"],
+        **summary
+    }
 
 @api_router.post("/assignments/batch")
 async def create_batch_assignments(
     batch_data: BatchAssignmentCreate,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     check_admin_or_secretary(current_user)
     
-    total_created = 0
-    
-    # Process all assignments concurrently
-    tasks = []
-    for assignment in batch_data.assignments:
-        tasks.append(create_assignments(assignment, background_tasks, current_user))
-    
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # 모든 배정 요청을 한 번에 계산하므로 프로젝트별 통계도 프로젝트마다 한 번씩만 갱신
+    summary = await assignment_engine.assign(batch_data.assignments)
     
-    for result in results:
-        if isinstance(result, Exception):
-            logger.error(f"Batch assignment failed: {result}", extra={
-                'custom_operation': 'batch_assignment',
-                'custom_error_type': type(result).__name__
-            })
-        else:
-            total_created += result.get("count", 0)
-    
-    return {"message": f"총 {total_created}개의 평가가 일괄 할당되었습니다", "total_count": total_created}
+    return {
+        "message": f"총 {summary['created']}개의 평가가 일괄 할당되었습니다",
+        "total_count": summary["created"],
+        **summary
+    }
 
 # Enhanced evaluation system
 @api_router.get("/evaluation/{sheet_id}")
@@ -1859,7 +1931,6 @@ async def get_evaluation_sheet(sheet_id: str, current_user: User = Depends(get_c
 @log_database_operation("evaluation_sheets")
 async def submit_evaluation(
     submission: EvaluationSubmission, 
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     sheet_data = await db.evaluation_sheets.find_one({"id": submission.sheet_id})
@@ -1872,37 +1943,35 @@ async def submit_evaluation(
     if current_user.role == "evaluator" and sheet.evaluator_id != current_user.id:
         raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
     
-    # Calculate scores
-    total_score, weighted_score = await calculate_evaluation_scores(submission.sheet_id, submission.scores)
-    
-    # Delete existing scores and save new ones concurrently
-    delete_task = db.evaluation_scores.delete_many({"sheet_id": submission.sheet_id})
+    # Calculate raw/weighted/normalized totals against the template items in one vectorized pass
+    template_data = await db.evaluation_templates.find_one({"id": sheet.template_id}) if sheet.template_id else None
+    sheet_score = score_sheet(template_items(template_data), submission.scores)
+    total_score, weighted_score = sheet_score.raw_total, sheet_score.weighted_average
     
-    # Prepare new scores
-    new_scores = []
-    for score_data in submission.scores:
-        score = EvaluationScore(
-            sheet_id=submission.sheet_id,
-            item_id=score_data["item_id"],
-            score=score_data["score"],
-            opinion=score_data.get("opinion", "")
+    async def apply_submission_counts(session):
+        # Counted in the same transaction as the status change - a reconcile/refresh in between cannot count it twice
+        await dashboard_counters.sheet_status_changed(
+            sheet_data.get("project_id"), sheet_data.get("status"), "submitted", session=session
         )
-        new_scores.append(score.dict())
-    
-    # Execute operations
-    await delete_task
-    if new_scores:
-        await db.evaluation_scores.insert_many(new_scores)    # Update sheet status
-    await db.evaluation_sheets.update_one(
-        {"id": submission.sheet_id},
-        {"$set": {
+        await project_stats_service.record_submission(sheet_data, total_score, session=session)
+    
+    # Upsert only changed scores and update the sheet status and counters together (one transaction when available)
+    now = datetime.utcnow()
+    saved = await score_store.save(
+        submission.sheet_id,
+        submission.scores,
+        sheet_update={"$set": {
             "status": "submitted",
-            "submitted_at": datetime.utcnow(),
-            "last_modified": datetime.utcnow(),
+            "submitted_at": now,
+            "last_modified": now,
             "total_score": total_score,
-            "weighted_score": weighted_score
-        }}
+            "weighted_score": weighted_score,
+            "normalized_score": sheet_score.normalized
+        }},
+        always_update_sheet=True,
+        related_writes=apply_submission_counts
     )
+    await export_artifact_store.invalidate_async(submission.sheet_id)
     
     # Invalidate cache for the evaluator
     await cache_service.invalidate_user_cache(current_user.id)
@@ -1916,27 +1985,33 @@ async def submit_evaluation(
         "evaluator_name": current_user.user_name
     }
     
-    # Notify the evaluator
-    await notification_service.send_evaluation_complete_notification(
-        current_user.id, 
-        evaluation_data
-    )
-    
-    # Notify project room members (admins, secretaries)
-    await notification_service.send_project_update_notification(
-        sheet.project_id,
-        {
-            "title": "평가 완료",
-            "message": f"{current_user.user_name}님이 평가를 완료했습니다",
-            "type": "evaluation_submitted",
-            "data": evaluation_data
-        }
-    )
-    
-    # Update project statistics in background
-    background_tasks.add_task(update_project_statistics, sheet.project_id)
+    # The submission is already committed; notifications are best effort and must not fail the request
+    try:
+        # Notify the evaluator
+        await notification_service.send_evaluation_complete_notification(
+            current_user.id, 
+            evaluation_data
+        )
+        
+        # Notify project room members (admins, secretaries)
+        await notification_service.send_project_update_notification(
+            sheet.project_id,
+            {
+                "title": "평가 완료",
+                "message": f"{current_user.user_name}님이 평가를 완료했습니다",
+                "type": "evaluation_submitted",
+                "data": evaluation_data
+            }
+        )
+    except Exception as e:
+        logger.warning(f"Submission notification failed for sheet {submission.sheet_id}: {e}")
     
-    return {"message": "평가가 성공적으로 제출되었습니다", "total_score": total_score, "weighted_score": weighted_score}
+    return {
+        "message": "평가가 성공적으로 제출되었습니다",
+        "total_score": total_score,
+        "weighted_score": weighted_score,
+        "versions": saved["versions"]
+    }
 
 @api_router.post("/evaluation/save")
 async def save_evaluation(submission: EvaluationSubmission, current_user: User = Depends(get_current_user)):
@@ -1950,30 +2025,20 @@ async def save_evaluation(submission: EvaluationSubmission, current_user: User =
     if current_user.role == "evaluator" and sheet.evaluator_id != current_user.id:
         raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
     
-    # Delete existing scores and save new ones
-    await db.evaluation_scores.delete_many({"sheet_id": submission.sheet_id})
-    
-    # Save new scores
-    new_scores = []
-    for score_data in submission.scores:
-        score = EvaluationScore(
-            sheet_id=submission.sheet_id,
-            item_id=score_data["item_id"],
-            score=score_data["score"],
-            opinion=score_data.get("opinion", "")
-        )
-        new_scores.append(score.dict())
-    
-    if new_scores:
-        await db.evaluation_scores.insert_many(new_scores)
-    
-    # Update last modified time
-    await db.evaluation_sheets.update_one(
-        {"id": submission.sheet_id},
-        {"$set": {"last_modified": datetime.utcnow()}}
+    # Autosave: upsert only changed items (nothing is written when no score changed)
+    saved = await score_store.save(
+        submission.sheet_id,
+        submission.scores,
+        sheet_update={"$set": {"last_modified": datetime.utcnow()}}
     )
+    if saved["changed"]:
+        await export_artifact_store.invalidate_async(submission.sheet_id)
     
-    return {"message": "평가가 임시저장되었습니다"}
+    return {
+        "message": "평가가 임시저장되었습니다",
+        "changed": saved["changed"],
+        "versions": saved["versions"]
+    }
 
 # Enhanced dashboard routes
 @api_router.get("/dashboard/evaluator")
@@ -1981,37 +2046,20 @@ async def get_evaluator_dashboard(current_user: User = Depends(get_current_user)
     if current_user.role != "evaluator":
         raise HTTPException(status_code=403, detail="평가위원만 접근할 수 있습니다")
     
-    # Try to get cached dashboard data
-    cached_data = await cache_service.get_cached_dashboard_data(current_user.id)
-    if cached_data:
-        logger.info(f"🚀 Returning cached dashboard data for user {current_user.id}")
-        return cached_data
-    
-    # Get assigned evaluation sheets
-    sheets = await db.evaluation_sheets.find({"evaluator_id": current_user.id}).to_list(1000)
-    
-    # Get related data for all sheets concurrently
-    tasks = []
-    for sheet_data in sheets:
-        sheet = EvaluationSheet(**sheet_data)
-        company_task = db.companies.find_one({"id": sheet.company_id})
-        project_task = db.projects.find_one({"id": sheet.project_id})
-        template_task = db.evaluation_templates.find_one({"id": sheet.template_id})
-        tasks.extend([company_task, project_task, template_task])
-    
-    if tasks:
-        results = await asyncio.gather(*tasks)
-        # Reorganize results into groups of 3 (company, project, template)
-        result_groups = [results[i:i+3] for i in range(0, len(results), 3)]
-    else:
-        result_groups = []
-    
-    # Build response
-    response = []
-    for i, sheet_data in enumerate(sheets):
-        sheet = EvaluationSheet(**sheet_data)
-        if i < len(result_groups):
-            company_data, project_data, template_data = result_groups[i]
+    async def build_dashboard():
+        # Get assigned evaluation sheets
+        sheets = await db.evaluation_sheets.find({"evaluator_id": current_user.id}).to_list(1000)
+        
+        # Get related data for all sheets with one $in query per relation
+        related_list = await relation_loader.hydrate(sheets, relations=("company", "project", "template"))
+
+        # Build response
+        response = []
+        for sheet_data, related in zip(sheets, related_list):
+            sheet = EvaluationSheet(**sheet_data)
+            company_data = related["company"]
+            project_data = related["project"]
+            template_data = related["template"]
             if company_data and project_data and template_data:
                 response.append({
                     "sheet": sheet,
@@ -2019,34 +2067,35 @@ async def get_evaluator_dashboard(current_user: User = Depends(get_current_user)
                     "project": Project(**project_data),
                     "template": EvaluationTemplate(**template_data)
                 })
-    
-    # Cache the dashboard data for 5 minutes
-    await cache_service.cache_dashboard_data(current_user.id, response, ttl=300)
-    
-    return response
+        # Encode models up front so cached hits have the same shape as fresh responses
+        return jsonable_encoder(response)
+    
+    # Cached for 5 minutes under the user's tag (invalidated on submission); concurrent
+    # misses share one build and an expired entry is served for 60s while it is rebuilt
+    cache_key = await cache_service.get_user_cache_key(current_user.id, "dashboard")
+    return await cache_service.get_or_set(
+        cache_key, build_dashboard, ttl=300,
+        tags=[cache_service.user_tag(current_user.id)], stale_ttl=60
+    )
 
 @api_router.get("/dashboard/admin")
 async def get_admin_dashboard(current_user: User = Depends(get_current_user)):
     if current_user.role not in ["admin", "secretary"]:
         raise HTTPException(status_code=403, detail="관리자 또는 간사만 접근할 수 있습니다")
     
-    # Get all statistics concurrently
-    stats_tasks = [
-        db.projects.count_documents({"is_active": True}),
-        db.companies.count_documents({}),
-        db.users.count_documents({"role": "evaluator", "is_active": True}),
-        db.evaluation_sheets.count_documents({}),
-        db.evaluation_sheets.count_documents({"status": "submitted"}),
+    # Counts come from the incrementally maintained counter document
+    counters, recent_projects = await asyncio.gather(
+        dashboard_counters.get(),
         db.projects.find({"is_active": True}).sort("created_at", -1).limit(5).to_list(5)
-    ]
-    
-    projects_count, companies_count, evaluators_count, total_sheets, completed_sheets, recent_projects = await asyncio.gather(*stats_tasks)
+    )
+    total_sheets = counters.get("sheets_total", 0)
+    completed_sheets = sheet_status_count(counters, "submitted")
     
     return {
         "stats": {
-            "projects": projects_count,
-            "companies": companies_count,
-            "evaluators": evaluators_count,
+            "projects": counters.get("projects_active", 0),
+            "companies": counters.get("companies_total", 0),
+            "evaluators": counters.get("evaluators_active", 0),
             "total_evaluations": total_sheets,
             "completed_evaluations": completed_sheets,
             "completion_rate": round((completed_sheets / total_sheets * 100) if total_sheets > 0 else 0, 1)
@@ -2056,58 +2105,61 @@ async def get_admin_dashboard(current_user: User = Depends(get_current_user)):
 
 # Analytics and reporting
 @api_router.get("/analytics/project/{project_id}")
-async def get_project_analytics(project_id: str, current_user: User = Depends(get_current_user)):
+async def get_project_analytics(
+    project_id: str,
+    precomputed: bool = Query(False, description="사전 계산된 project_stats 문서 사용"),
+    current_user: User = Depends(get_current_user)
+):
     check_admin_or_secretary(current_user)
     
-    # Get project analytics concurrently
-    tasks = [
-        db.evaluation_sheets.find({"project_id": project_id, "status": "submitted"}).to_list(1000),
-        db.companies.find({"project_id": project_id}).to_list(1000),
-        db.evaluation_templates.find({"project_id": project_id}).to_list(1000)
-    ]
-    
-    sheets, companies, templates = await asyncio.gather(*tasks)
-    
-    # Calculate analytics
-    total_evaluations = len(sheets)
-    companies_evaluated = len(set(sheet["company_id"] for sheet in sheets))
-    
-    # Score analytics
-    avg_scores = {}
-    if sheets:
-        for sheet in sheets:
-            if sheet.get("total_score"):
-                template_name = next((t["name"] for t in templates if t["id"] == sheet["template_id"]), "Unknown")
-                if template_name not in avg_scores:
-                    avg_scores[template_name] = []
-                avg_scores[template_name].append(sheet["total_score"])
-    
-    for template_name in avg_scores:
-        scores = avg_scores[template_name]
-        avg_scores[template_name] = {
-            "average": sum(scores) / len(scores),
-            "min": min(scores),
-            "max": max(scores),
-            "count": len(scores)
-        }
+    # Template score statistics and company completion are computed by the database
+    return await project_stats_service.get_analytics(project_id, precomputed=precomputed)
+
+@api_router.get("/analytics/project/{project_id}/criteria")
+async def get_project_criteria_analytics(
+    project_id: str,
+    template_id: Optional[str] = Query(None, description="특정 평가표만 조회"),
+    current_user: User = Depends(get_current_user)
+):
+    check_admin_or_secretary(current_user)
     
-    return {
-        "project_id": project_id,
-        "total_companies": len(companies),
-        "companies_evaluated": companies_evaluated,
-        "total_evaluations": total_evaluations,
-        "completion_rate": round((companies_evaluated / len(companies) * 100) if companies else 0, 1),
-        "score_analytics": avg_scores
-    }
+    # Per-criterion statistics for every submitted sheet, one matrix pass per template
+    return await project_stats_service.get_criteria_analytics(project_id, template_id=template_id)
+
+EXPORT_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+def evaluation_report_key(sheet_data: dict, evaluation_data: dict, format_type: str) -> str:
+    """종합평가서 지문 - 평가지 버전과 렌더링 입력(기업/프로젝트/템플릿/점수/평가위원) 포함"""
+    return export_artifact_store.fingerprint(
+        "evaluation_report", sheet_data.get("id"), document_version(sheet_data), evaluation_data, format_type
+    )
+
+async def render_evaluation_report(sheet_data: dict, evaluation_data: dict, format_type: str):
+    """종합평가서(PDF/Excel) - 평가지 버전과 입력이 같으면 저장된 문서를 재사용, (문서, 캐시 적중 여부) 반환"""
+    sheet_id = sheet_data.get("id")
+    key = evaluation_report_key(sheet_data, evaluation_data, format_type)
+    
+    async def render() -> bytes:
+        if format_type == "pdf":
+            buffer = await exporter.export_single_evaluation_pdf(evaluation_data)
+        else:
+            buffer = await exporter.export_single_evaluation_excel(evaluation_data)
+        return buffer.getvalue()
+    
+    return await export_artifact_store.get_or_render(key, render, subjects=[sheet_id])
 
 # Export routes for comprehensive evaluation reports
 @api_router.get("/evaluations/{evaluation_id}/export")
 async def export_single_evaluation(
     evaluation_id: str,
+    request: Request,
     format: str = Query(..., pattern="^(pdf|excel)$", description="Export format: pdf or excel"),
     current_user: User = Depends(get_current_user)
 ):
-    """단일 평가 데이터를 PDF 또는 Excel로 추출"""
+    """단일 평가 데이터를 PDF 또는 Excel로 추출 (평가지가 바뀌지 않았으면 저장된 문서를 ETag 와 함께 전송)"""
     check_admin_or_secretary(current_user)
     
     try:
@@ -2155,19 +2207,9 @@ async def export_single_evaluation(
             format
         )
         
-        # Export based on format
-        if format == "pdf":
-            buffer = await exporter.export_single_evaluation_pdf(evaluation_data)
-            media_type = "application/pdf"
-        else:  # excel
-            buffer = await exporter.export_single_evaluation_excel(evaluation_data)
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        
-        return StreamingResponse(
-            io.BytesIO(buffer.read()),
-            media_type=media_type,
-            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{filename}"}
-        )
+        # Export based on format (reuses the stored document when the sheet is unchanged)
+        artifact, cache_hit = await render_evaluation_report(sheet_data, evaluation_data, format)
+        return artifact_response(request, artifact, EXPORT_MEDIA_TYPES[format], filename, cache_hit)
         
     except HTTPException:
         raise
@@ -2181,16 +2223,17 @@ async def export_single_evaluation(
 @api_router.post("/evaluations/bulk-export")
 async def export_bulk_evaluations(
     export_request: dict,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
-    """여러 평가 데이터를 일괄 추출"""
+    """여러 평가 데이터를 일괄 추출 (개별 파일 ZIP 은 생성되는 대로 스트리밍)"""
     check_admin_or_secretary(current_user)
     
     try:
         project_id = export_request.get("project_id")
         template_id = export_request.get("template_id")
         format_type = export_request.get("format", "excel")
-        export_type = export_request.get("export_type", "separate")  # separate, combined
+        export_type = export_request.get("export_type", "separate")  # separate, combined, summary
         
         if not project_id:
             raise HTTPException(status_code=400, detail="프로젝트 ID가 필요합니다")
@@ -2204,15 +2247,10 @@ async def export_bulk_evaluations(
         if template_id:
             query["template_id"] = template_id
         
-        # Get evaluation sheets
-        sheets = await db.evaluation_sheets.find(query).to_list(1000)
-        
-        if not sheets:
+        if not await db.evaluation_sheets.find_one(query, {"_id": 1}):
             raise HTTPException(status_code=404, detail="추출할 평가 데이터가 없습니다")
         
-        # Get all related data
-        evaluation_data_list = []
-        for sheet_data in sheets:
+        async def load_evaluation_data(sheet_data: dict) -> Optional[dict]:
             sheet = EvaluationSheet(**sheet_data)
             
             # Get related data concurrently
@@ -2226,43 +2264,62 @@ async def export_bulk_evaluations(
                 company_task, project_task, template_task, scores_task, evaluator_task
             )
             
-            if all([company_data, project_data, template_data, evaluator_data]):
-                evaluation_data = {
-                    "sheet": sheet.dict(),
-                    "company": company_data,
-                    "project": project_data,
-                    "template": template_data,
-                    "scores": [{"item_id": s["item_id"], "score": s["score"], "opinion": s["opinion"]} for s in scores],
-                    "evaluator": evaluator_data
-                }
-                evaluation_data_list.append(evaluation_data)
+            if not all([company_data, project_data, template_data, evaluator_data]):
+                return None
+            return {
+                "sheet": sheet.dict(),
+                "company": company_data,
+                "project": project_data,
+                "template": template_data,
+                "scores": [{"item_id": s["item_id"], "score": s["score"], "opinion": s["opinion"]} for s in scores],
+                "evaluator": evaluator_data
+            }
         
-        if not evaluation_data_list:
-            raise HTTPException(status_code=404, detail="유효한 평가 데이터가 없습니다")
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        if export_type == "combined":
-            # 하나의 Excel 파일로 결합
+        if export_type in ("combined", "summary"):
+            # 하나의 Excel 파일로 결합 - 커서에서 바로 constant_memory 워크북으로 기록 (평가지 수와 무관한 메모리)
+            # summary 는 평가결과요약 + 기업별요약만, combined 는 평가별 상세 시트 포함
             if format_type == "pdf":
                 raise HTTPException(status_code=400, detail="PDF는 개별 파일로만 추출 가능합니다")
             
-            buffer = await exporter.export_bulk_evaluations_excel(evaluation_data_list)
-            project_name = evaluation_data_list[0]["project"]["name"]
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"{project_name}_종합평가서_{timestamp}.xlsx"
+            fd, excel_path = tempfile.mkstemp(suffix=".xlsx", dir=EXCEL_EXPORT_TMPDIR)
+            os.close(fd)
+            combined = export_type == "combined"
+            try:
+                stats = await write_evaluations_excel(
+                    db, query, excel_path, detail_sheets=combined,
+                    summary_sheet_name='전체요약' if combined else '평가결과요약'
+                )
+            except BaseException:
+                os.unlink(excel_path)
+                raise
+            if not stats["evaluations"]:
+                os.unlink(excel_path)
+                raise HTTPException(status_code=404, detail="유효한 평가 데이터가 없습니다")
             
-            return StreamingResponse(
-                io.BytesIO(buffer.read()),
+            label = "종합평가서" if combined else "평가결과요약"
+            filename = f"{stats['project_name']}_{label}_{timestamp}.xlsx"
+            return FileResponse(
+                excel_path,
                 media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                headers={"Content-Disposition": f"attachment; filename*=UTF-8''{filename}"}
+                headers={"Content-Disposition": content_disposition(filename)},
+                background=BackgroundTask(os.unlink, excel_path),
             )
         else:
-            # 개별 파일들을 ZIP으로 압축
-            import zipfile
+            # 개별 파일들을 ZIP 으로 - 파일 하나가 생성될 때마다 바로 전송 (전체 ZIP 을 메모리에 두지 않음)
+            sheets = await db.evaluation_sheets.find(query).to_list(1000)
+            project = await db.projects.find_one({"id": project_id})
+            project_name = (project or {}).get("name", project_id)
             
-            zip_buffer = io.BytesIO()
+            # 관련 데이터는 미리 조회 (문서 렌더링은 ZIP 전송 중에) - 유효한 평가지가 없으면 빈 ZIP 대신 404
+            loaded = await asyncio.gather(*(load_evaluation_data(sheet_data) for sheet_data in sheets))
+            reports = [(sheet_data, eval_data) for sheet_data, eval_data in zip(sheets, loaded) if eval_data is not None]
+            if not reports:
+                raise HTTPException(status_code=404, detail="유효한 평가 데이터가 없습니다")
             
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for eval_data in evaluation_data_list:
+            async def entries():
+                for sheet_data, eval_data in reports:
                     # Generate individual file
                     submitted_date = eval_data["sheet"]["submitted_at"] or datetime.utcnow()
                     filename = exporter.generate_filename(
@@ -2272,23 +2329,21 @@ async def export_bulk_evaluations(
                         format_type
                     )
                     
-                    if format_type == "pdf":
-                        file_buffer = await exporter.export_single_evaluation_pdf(eval_data)
-                    else:
-                        file_buffer = await exporter.export_single_evaluation_excel(eval_data)
-                    
-                    zip_file.writestr(filename, file_buffer.read())
+                    # 평가지별 문서는 단일 추출과 같은 저장소를 사용 (바뀐 평가지만 다시 렌더링)
+                    artifact, _ = await render_evaluation_report(sheet_data, eval_data, format_type)
+                    yield filename, await asyncio.to_thread(artifact.path.read_bytes)
             
-            zip_buffer.seek(0)
-            project_name = evaluation_data_list[0]["project"]["name"]
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            # 구성 문서의 지문(평가지 버전 + 기업/프로젝트/템플릿/점수 입력)이 모두 같으면 디스크 캐시의 ZIP 을 그대로 전송
+            cache_key = zip_archive_cache.request_key({
+                "kind": "bulk-export",
+                "format": format_type,
+                "reports": sorted(
+                    evaluation_report_key(sheet_data, eval_data, format_type) for sheet_data, eval_data in reports
+                ),
+            })
             zip_filename = f"{project_name}_종합평가서_일괄추출_{timestamp}.zip"
             
-            return StreamingResponse(
-                zip_buffer,
-                media_type="application/zip",
-                headers={"Content-Disposition": f"attachment; filename*=UTF-8''{zip_filename}"}
-            )
+            return zip_download_response(request, entries(), zip_filename, zip_archive_cache, cache_key)
             
     except HTTPException:
         raise
@@ -2299,11 +2354,51 @@ async def export_bulk_evaluations(
             })
         raise HTTPException(status_code=500, detail="일괄 추출 중 오류가 발생했습니다")
 
+async def _build_evaluation_rows(evaluations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """평가 시트 배치에 프로젝트/회사/평가자 정보를 관계별 단일 $in 쿼리로 조합"""
+    related_list = await relation_loader.hydrate(
+        evaluations,
+        relations=("project", "company", "evaluator"),
+        projections={
+            "project": {"name": 1},
+            "company": {"name": 1},
+            "evaluator": {"user_name": 1},
+        },
+    )
+
+    result = []
+    for eval_data, related in zip(evaluations, related_list):
+        project = related["project"]
+        company = related["company"]
+        evaluator = related["evaluator"]
+
+        result.append({
+            "id": eval_data.get("id", eval_data.get("_id")),
+            "project_id": eval_data.get("project_id"),
+            "project_name": project.get("name") if project else "알 수 없음",
+            "company_id": eval_data.get("company_id"),
+            "company_name": company.get("name") if company else "알 수 없음",
+            "evaluator_id": eval_data.get("evaluator_id"),
+            "evaluator_name": evaluator.get("user_name") if evaluator else "알 수 없음",
+            "evaluatee_id": eval_data.get("company_id"),  # 피평가자는 회사
+            "status": eval_data.get("status", "pending"),
+            "created_at": eval_data.get("created_at"),
+            "evaluation_date": eval_data.get("submitted_at"),
+            "scores": eval_data.get("scores", {}),
+            "comments": eval_data.get("comments", "")
+        })
+    
+    return result
+
 @api_router.get("/evaluations")
 async def get_evaluations_list(
+    response: Response,
     project_id: Optional[str] = Query(None, description="프로젝트 ID 필터"),
     status: Optional[str] = Query(None, description="상태 필터"),
     evaluator_id: Optional[str] = Query(None, description="평가자 ID 필터"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    after: Optional[str] = Query(None, description="이전 페이지의 X-Next-Cursor 값"),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 (전체 결과)"),
     current_user: User = Depends(get_current_user)
 ):
     """평가 목록 조회 - 향상된 필터링 지원"""
@@ -2316,44 +2411,61 @@ async def get_evaluations_list(
         if evaluator_id:
             query["evaluator_id"] = evaluator_id
             
-        # 평가 시트 조회
-        evaluations = await db.evaluation_sheets.find(query).to_list(1000)
-        
-        # 관련 데이터 조회하여 완전한 정보 제공
-        result = []
-        for eval_data in evaluations:
-            # 프로젝트 정보 조회
-            project = await db.projects.find_one({"id": eval_data.get("project_id")})
-            # 회사 정보 조회
-            company = await db.companies.find_one({"id": eval_data.get("company_id")})
-            # 평가자 정보 조회
-            evaluator = await db.users.find_one({"id": eval_data.get("evaluator_id")})
-            
-            result.append({
-                "id": eval_data.get("id", eval_data.get("_id")),
-                "project_id": eval_data.get("project_id"),
-                "project_name": project.get("name") if project else "알 수 없음",
-                "company_id": eval_data.get("company_id"),
-                "company_name": company.get("name") if company else "알 수 없음",
-                "evaluator_id": eval_data.get("evaluator_id"),
-                "evaluator_name": evaluator.get("user_name") if evaluator else "알 수 없음",
-                "evaluatee_id": eval_data.get("company_id"),  # 피평가자는 회사
-                "status": eval_data.get("status", "pending"),
-                "created_at": eval_data.get("created_at"),
-                "evaluation_date": eval_data.get("submitted_at"),
-                "scores": eval_data.get("scores", {}),
-                "comments": eval_data.get("comments", "")
-            })
+        if stream:
+            return ndjson_response(db.evaluation_sheets, query, _build_evaluation_rows)
+
+        # 평가 시트 페이지 조회
+        evaluations, next_cursor, total = await paginate(db.evaluation_sheets, query, limit, after)
+        set_pagination_headers(response, total, next_cursor)
         
-        return result
+        return await _build_evaluation_rows(evaluations)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"평가 목록 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"평가 목록 조회 실패: {str(e)}")
 
+async def _build_exportable_rows(sheets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """제출된 평가 시트 배치에 표시용 관계 정보를 관계별 단일 $in 쿼리로 조합"""
+    related_list = await relation_loader.hydrate(
+        sheets,
+        projections={
+            "project": {"name": 1},
+            "company": {"name": 1},
+            "evaluator": {"user_name": 1},
+            "template": {"name": 1},
+        },
+    )
+
+    result = []
+    for sheet_data, related in zip(sheets, related_list):
+        company_data = related["company"]
+        project_data = related["project"]
+        template_data = related["template"]
+        evaluator_data = related["evaluator"]
+
+        if all([company_data, project_data, template_data, evaluator_data]):
+            result.append({
+                "evaluation_id": sheet_data.get("id"),
+                "project_name": project_data["name"],
+                "company_name": company_data["name"],
+                "template_name": template_data["name"],
+                "evaluator_name": evaluator_data["user_name"],
+                "submitted_at": sheet_data.get("submitted_at"),
+                "total_score": sheet_data.get("total_score"),
+                "weighted_score": sheet_data.get("weighted_score")
+            })
+    
+    return result
+
 @api_router.get("/evaluations/export-list")
 async def get_exportable_evaluations(
+    response: Response,
     project_id: Optional[str] = None,
     template_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    after: Optional[str] = Query(None, description="이전 페이지의 X-Next-Cursor 값"),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 (전체 결과)"),
     current_user: User = Depends(get_current_user)
 ):
     """추출 가능한 평가 목록 조회 (제출된 평가만)"""
@@ -2368,38 +2480,17 @@ async def get_exportable_evaluations(
         if template_id:
             query["template_id"] = template_id
         
-        # Get evaluation sheets
-        sheets = await db.evaluation_sheets.find(query).to_list(1000)
-        
-        # Get related data for display
-        result = []
-        for sheet_data in sheets:
-            sheet = EvaluationSheet(**sheet_data)
-            
-            # Get related data concurrently
-            company_task = db.companies.find_one({"id": sheet.company_id})
-            project_task = db.projects.find_one({"id": sheet.project_id})
-            template_task = db.evaluation_templates.find_one({"id": sheet.template_id})
-            evaluator_task = db.users.find_one({"id": sheet.evaluator_id})
-            
-            company_data, project_data, template_data, evaluator_data = await asyncio.gather(
-                company_task, project_task, template_task, evaluator_task
-            )
-            
-            if all([company_data, project_data, template_data, evaluator_data]):
-                result.append({
-                    "evaluation_id": sheet.id,
-                    "project_name": project_data["name"],
-                    "company_name": company_data["name"],
-                    "template_name": template_data["name"],
-                    "evaluator_name": evaluator_data["user_name"],
-                    "submitted_at": sheet.submitted_at,
-                    "total_score": sheet.total_score,
-                    "weighted_score": sheet.weighted_score
-                })
+        if stream:
+            return ndjson_response(db.evaluation_sheets, query, _build_exportable_rows)
+
+        # Get one page of evaluation sheets
+        sheets, next_cursor, total = await paginate(db.evaluation_sheets, query, limit, after)
+        set_pagination_headers(response, total, next_cursor)
         
-        return result
+        return await _build_exportable_rows(sheets)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get exportable evaluations error: {str(e)}", extra={
                 'custom_operation': 'get_exportable_evaluations',
@@ -2420,7 +2511,7 @@ async def security_health_check():
         redis_status = "healthy"
         try:
             if security_monitor.redis_client:
-                security_monitor.redis_client.ping()
+                await security_monitor.redis_client.ping()
         except:
             redis_status = "unavailable"
         
@@ -2428,7 +2519,7 @@ async def security_health_check():
         mongo_status = "healthy"
         try:
             if security_monitor.mongo_client:
-                security_monitor.mongo_client.admin.command('ping')
+                await security_monitor.mongo_client.admin.command('ping')
         except:
             mongo_status = "unavailable"
         
@@ -2464,7 +2555,12 @@ async def get_security_metrics(
         )
     
     metrics = await security_monitor.get_security_metrics(hours)
-    return {"metrics": metrics, "generated_at": datetime.utcnow()}
+    return {
+        "metrics": metrics,
+        "auth_cache": user_principal_cache.get_metrics(),
+        "password_hash_pool": password_hash_pool.get_metrics(),
+        "generated_at": datetime.utcnow()
+    }
 
 @api_router.get("/security/threat-intelligence")
 async def get_threat_intelligence_report(current_user: User = Depends(get_current_user)):
@@ -2571,19 +2667,22 @@ async def estimate_ai_analysis_cost(
         
         # 최적 모델 선택
         optimal_model = enhanced_ai_service._select_optimal_groq_model(
-            document_length=len(document_text),
+            document_tokens=token_counter.count(document_text),
             analysis_type=analysis_type,
             budget_priority=budget_priority
         )
         
-        # 비용 계산
+        # 비용 계산 (문서 분석과 같은 토큰 계산기/청크 분할 기준)
         cost_info = enhanced_ai_service._calculate_token_cost(document_text, optimal_model)
+        chunks = enhanced_ai_service.plan_document_chunks(document_text, optimal_model)
         
         return {
             "success": True,
             "data": {
                 "recommended_model": optimal_model,
                 "document_length": len(document_text),
+                "document_tokens": cost_info["estimated_tokens"],
+                "estimated_chunks": len(chunks),
                 "analysis_type": analysis_type,
                 "budget_priority": budget_priority,
                 "cost_estimate": cost_info,
@@ -2677,8 +2776,6 @@ async def test_direct_endpoint():
 async def simple_login_test(form_data: OAuth2PasswordRequestForm = Depends()):
     """Simple login test without complex error handling"""
     try:
-        import bcrypt
-        
         username = form_data.username.strip().lower()
         password = form_data.password
         
@@ -2692,12 +2789,12 @@ async def simple_login_test(form_data: OAuth2PasswordRequestForm = Depends()):
         if not stored_hash:
             return {"error": "no_password_hash", "fields": list(user_data.keys())}
         
-        # bcrypt 직접 검증
-        password_valid = bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8'))
+        # bcrypt 검증 (전용 스레드 풀)
+        password_valid, _ = await verify_password_async(password, stored_hash)
         
         if password_valid:
             # 토큰 생성
-            access_token = create_access_token(data={"sub": str(user_data["_id"])})
+            access_token = create_access_token(data={"sub": str(user_data["_id"]), "ver": user_data.get("token_version", 0)})
             return {"access_token": access_token, "token_type": "bearer", "status": "success"}
         else:
             return {"error": "invalid_password", "hash_length": len(stored_hash)}
@@ -2746,17 +2843,18 @@ async def clean_login_endpoint(form_data: OAuth2PasswordRequestForm = Depends())
             logging.warning(f"Login failed - inactive account: {username}")
             raise HTTPException(status_code=401, detail="계정이 비활성화되었습니다. 관리자에게 문의하세요.")
         
-        # Verify password using bcrypt directly
+        # Verify password on the bounded bcrypt pool (503 + Retry-After when saturated)
         try:
-            import bcrypt
             logging.warning(f"DEBUG: Attempting password verification for user: {username}")
             logging.warning(f"DEBUG: Password hash exists: {'password_hash' in user_data}")
             logging.warning(f"DEBUG: Password hash length: {len(user_data.get('password_hash', ''))}")
             
             stored_hash = user_data["password_hash"]
-            password_valid = bcrypt.checkpw(form_data.password.encode('utf-8'), stored_hash.encode('utf-8'))
+            password_valid, upgraded_hash = await verify_password_async(form_data.password, stored_hash)
             
             logging.warning(f"DEBUG: Password verification result: {password_valid}")
+        except HTTPException:
+            raise
         except Exception as e:
             logging.error(f"Password verification error for user {username}: {e}")
             raise HTTPException(status_code=500, detail="비밀번호 검증 중 오류가 발생했습니다.")
@@ -2768,17 +2866,22 @@ async def clean_login_endpoint(form_data: OAuth2PasswordRequestForm = Depends())
         
         # Create token with error handling
         try:
-            access_token = create_access_token(data={"sub": str(user_data["_id"])})
+            access_token = create_access_token(data={"sub": str(user_data["_id"]), "ver": user_data.get("token_version", 0)})
         except Exception as e:
             logging.error(f"Token creation error for user {username}: {e}")
             raise HTTPException(status_code=500, detail="인증 토큰 생성 중 오류가 발생했습니다.")
         
-        # Update last login timestamp
+        # Update last login timestamp (and transparently upgrade the hash if the cost factor changed)
         try:
+            login_update = {"last_login": datetime.utcnow()}
+            if upgraded_hash:
+                login_update["password_hash"] = upgraded_hash
             await db.users.update_one(
                 {"_id": user_data["_id"]},
-                {"$set": {"last_login": datetime.utcnow()}}
+                {"$set": login_update}
             )
+            if upgraded_hash:
+                await invalidate_user_principal(user_data["_id"])
         except Exception as e:
             logging.warning(f"Failed to update last login for user {username}: {e}")
             # Don't fail the login just because we can't update last login
@@ -2814,6 +2917,10 @@ async def clean_login_endpoint(form_data: OAuth2PasswordRequestForm = Depends())
 
 # Router registrations moved to centralized location below to avoid duplicates
 
+# AI 기능 라우터 추가 (문서 분석, 점수 제안, 표절 검사)
+if AI_ENABLED:
+    app.include_router(ai_router)
+
 # AI 모델 설정 라우터 추가
 if AI_MODEL_SETTINGS_ENABLED:
     app.include_router(ai_model_settings_router)
@@ -2857,6 +2964,8 @@ async def create_evaluation_assignment(
         }
         
         await db.evaluation_sheets.insert_one(evaluation_sheet)
+        await dashboard_counters.sheets_created(evaluation_sheet["project_id"], evaluation_sheet["status"])
+        await project_stats_service.sheets_assigned(evaluation_sheet["project_id"], {evaluation_sheet["company_id"]: 1})
         return {"message": "평가가 성공적으로 배정되었습니다", "evaluation_id": evaluation_sheet["id"]}
     
     except Exception as e:
@@ -2931,6 +3040,10 @@ async def update_evaluation(
             {"id": evaluation_id},
             {"$set": update_fields}
         )
+        await dashboard_counters.sheet_status_changed(
+            evaluation.get("project_id"), evaluation.get("status"), update_fields["status"]
+        )
+        await export_artifact_store.invalidate_async(evaluation_id)
         
         return {"message": "평가가 성공적으로 업데이트되었습니다"}
     
@@ -2949,9 +3062,14 @@ async def delete_evaluation(
     check_admin_or_secretary(current_user)
     
     try:
-        result = await db.evaluation_sheets.delete_one({"id": evaluation_id})
-        if result.deleted_count == 0:
+        # 삭제된 평가지의 상태를 카운터와 프로젝트 통계에 반영하기 위해 삭제와 함께 조회
+        deleted = await db.evaluation_sheets.find_one_and_delete(
+            {"id": evaluation_id}, projection={"_id": 0, "project_id": 1, "company_id": 1, "status": 1}
+        )
+        if deleted is None:
             raise HTTPException(status_code=404, detail="평가를 찾을 수 없습니다")
+        await dashboard_counters.sheet_deleted(deleted.get("project_id"), deleted.get("status"))
+        await project_stats_service.sheet_deleted(deleted)
         
         # 관련 점수 데이터도 삭제
         await db.evaluation_scores.delete_many({"sheet_id": evaluation_id})
@@ -2970,16 +3088,16 @@ async def get_dashboard_statistics(
 ):
     """대시보드 통계 데이터 조회"""
     try:
-        # 기본 통계 데이터 조회
-        total_projects = await db.projects.count_documents({})
-        total_companies = await db.companies.count_documents({})
-        total_evaluators = await db.users.count_documents({"role": "evaluator"})
-        total_evaluations = await db.evaluation_sheets.count_documents({})
+        # 기본 통계 및 상태별 평가 집계 (증분 카운터 문서 조회)
+        counters = await dashboard_counters.get()
+        total_projects = counters.get("projects_total", 0)
+        total_companies = counters.get("companies_total", 0)
+        total_evaluators = counters.get("evaluators_total", 0)
+        total_evaluations = counters.get("sheets_total", 0)
         
-        # 상태별 평가 집계
-        pending_evaluations = await db.evaluation_sheets.count_documents({"status": "assigned"})
-        in_progress_evaluations = await db.evaluation_sheets.count_documents({"status": "in_progress"})
-        completed_evaluations = await db.evaluation_sheets.count_documents({"status": "submitted"})
+        pending_evaluations = sheet_status_count(counters, "assigned")
+        in_progress_evaluations = sheet_status_count(counters, "in_progress")
+        completed_evaluations = sheet_status_count(counters, "submitted")
         
         # 최근 활동
         recent_evaluations = await db.evaluation_sheets.find(
@@ -3094,6 +3212,18 @@ try:
 except ImportError as e:
     print(f"⚠️ WebSocket 서비스를 가져올 수 없습니다: {e}")
 
+# 보안 파일 라우터 추가 (Range 지원 PDF 스트리밍 - /api/files/{file_id} 보다 먼저 매칭되도록 선등록)
+app.include_router(secure_file_router)
+print("✅ 보안 파일 라우터가 등록되었습니다.")
+
+# 작업 큐 기반 출력/내보내기/AI 평가 라우터 추가
+if EVALUATION_PRINT_ENABLED:
+    app.include_router(evaluation_print_router)
+if ENHANCED_EXPORT_ENABLED:
+    app.include_router(enhanced_export_router)
+if AI_EVALUATION_CONTROL_ENABLED:
+    app.include_router(ai_evaluation_control_router)
+
 # 기본 API 라우터 추가 (중요한 엔드포인트들)
 try:
     app.include_router(api_router, prefix="/api", tags=["Main API"])
@@ -7,7 +7,7 @@ async def security_health_check():
         redis_status = "healthy"
         try:
             if security_monitor.redis_client:
-                security_monitor.redis_client.ping()
+                await security_monitor.redis_client.ping()
         except:
             redis_status = "unavailable"
         
@@ -15,7 +15,7 @@ async def security_health_check():
         mongo_status = "healthy"
         try:
             if security_monitor.mongo_client:
-                security_monitor.mongo_client.admin.command('ping')
+                await security_monitor.mongo_client.admin.command('ping')
         except:
             mongo_status = "unavailable"
         
@@ -0,0 +1,340 @@
+"""
+Similarity Index
+표절/유사도 검사를 위한 프로젝트별 근사 중복 탐지 인덱스 (MinHash + LSH)
+
+- 문서 텍스트를 공백/문장부호를 제거한 문자 n-gram(shingle)으로 분해 - 띄어쓰기가 일정하지 않은 한글 문서에 적합
+- n-gram 해시 집합을 NumPy 로 MinHash 서명(기본 120개 해시)으로 요약해 MongoDB document_similarity_index 컬렉션에 저장
+- 서명을 밴드(기본 40개 × 3행)로 나눈 LSH 버킷 키를 multikey 인덱스로 저장
+  → 검사 시 버킷 키가 하나라도 겹치는 후보만 조회(candidate)한 뒤 전체 서명으로 유사도 추정(verify)
+  밴드 설정 기준 유사도 0.3 에서 후보 포함 확률 약 67%, 0.5 이상 99% 이상
+- 업로드 시 백그라운드로 증분 색인, 프로젝트 단위 재색인과 전체 쌍 비교(batch all-pairs) 지원
+"""
+
+import asyncio
+import logging
+import os
+import re
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pymongo import ASCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_SHINGLE_SIZE = int(os.getenv("SIMILARITY_SHINGLE_SIZE", "5"))
+SIMILARITY_NUM_PERM = int(os.getenv("SIMILARITY_NUM_PERM", "120"))
+SIMILARITY_BANDS = int(os.getenv("SIMILARITY_BANDS", "40"))
+SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.3"))
+SIMILARITY_SEED = 20240621
+
+# 위험도 구간 (기존 detect_plagiarism_similarity 와 동일)
+HIGH_RISK_SIMILARITY = 0.7
+MEDIUM_RISK_SIMILARITY = 0.5
+
+_MIX_PRIME = np.uint64(0x100000001B3)
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+_HASH_BLOCK = 4096
+
+
+def normalize_for_shingles(text: str) -> str:
+    """유니코드 정규화(NFC), 소문자화, 공백/문장부호 제거"""
+    return _NON_WORD.sub("", unicodedata.normalize("NFC", text or "").lower())
+
+
+def _finalize(values: np.ndarray) -> np.ndarray:
+    """64비트 해시 값 섞기 (splitmix64 마무리 단계)"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def shingle_hashes(text: str, size: int = SIMILARITY_SHINGLE_SIZE) -> np.ndarray:
+    """문자 n-gram 해시 집합 (중복 제거된 uint64 배열)"""
+    normalized = normalize_for_shingles(text)
+    if not normalized:
+        return np.empty(0, dtype=np.uint64)
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    width = max(1, len(codes) - size + 1)
+    hashes = np.zeros(width, dtype=np.uint64)
+    for offset in range(min(size, len(codes))):
+        hashes = hashes * _MIX_PRIME + codes[offset:offset + width]
+    return np.unique(_finalize(hashes))
+
+
+class MinHasher:
+    """MinHash 서명과 LSH 밴드 키 계산기
+
+    해시 함수는 (a·x + b) mod 2^64 의 상위 32비트 (multiply-shift) - seed 가 같으면 프로세스 간에 같은 서명을 만듭니다.
+    """
+
+    def __init__(self, num_perm: int = SIMILARITY_NUM_PERM, bands: int = SIMILARITY_BANDS,
+                 shingle_size: int = SIMILARITY_SHINGLE_SIZE, seed: int = SIMILARITY_SEED):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    @property
+    def version(self) -> str:
+        """서명 호환 버전 - 설정이 다른 서명끼리는 비교하지 않음"""
+        return f"k{self.shingle_size}-p{self.num_perm}-b{self.bands}-s{self.seed}"
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash 서명 (uint32, 길이 num_perm) - 비교할 내용이 없으면 None"""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if hashes.size == 0:
+            return None
+        signature = np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint64)
+        for start in range(0, hashes.size, _HASH_BLOCK):
+            block = hashes[start:start + _HASH_BLOCK, None]
+            permuted = (block * self._a + self._b) >> np.uint64(32)
+            np.minimum(signature, permuted.min(axis=0), out=signature)
+        return signature.astype(np.uint32)
+
+    def band_hashes(self, signatures: np.ndarray) -> np.ndarray:
+        """(문서 수 × num_perm) 서명 → (문서 수 × bands) 밴드 해시"""
+        grouped = np.atleast_2d(signatures).astype(np.uint64).reshape(-1, self.bands, self.rows)
+        hashes = np.zeros(grouped.shape[:2], dtype=np.uint64)
+        for row in range(self.rows):
+            hashes = hashes * _MIX_PRIME + grouped[:, :, row]
+        return _finalize(hashes)
+
+    def band_keys(self, signature: np.ndarray) -> List[str]:
+        """MongoDB 에 저장하는 LSH 버킷 키 ("밴드번호:해시")"""
+        return [f"{band}:{value:016x}" for band, value in enumerate(self.band_hashes(signature)[0].tolist())]
+
+
+def estimate_similarity(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """서명 일치 비율 = Jaccard 유사도 추정치 (others 는 1개 또는 여러 개의 서명)"""
+    return (np.atleast_2d(others) == signature).mean(axis=1)
+
+
+def risk_level(similarity: float) -> str:
+    return "high" if similarity > HIGH_RISK_SIMILARITY else "medium" if similarity > MEDIUM_RISK_SIMILARITY else "low"
+
+
+def _signatures(docs: List[Dict[str, Any]], num_perm: int) -> np.ndarray:
+    if not docs:
+        return np.empty((0, num_perm), dtype=np.uint32)
+    return np.frombuffer(b"".join(bytes(doc["signature"]) for doc in docs), dtype=np.uint32).reshape(-1, num_perm)
+
+
+class SimilarityIndex:
+    """프로젝트별 문서 유사도 인덱스 (MongoDB document_similarity_index 컬렉션)"""
+
+    def __init__(self, db=None, hasher: Optional[MinHasher] = None):
+        self.db = db
+        self.hasher = hasher or MinHasher()
+
+    @property
+    def collection(self):
+        return self.db.document_similarity_index if self.db is not None else None
+
+    async def ensure_indexes(self) -> None:
+        """파일당 1건 고유 인덱스, LSH 버킷 multikey 인덱스, 프로젝트 인덱스 생성"""
+        if self.collection is None:
+            return
+        try:
+            await self.collection.create_indexes([
+                IndexModel([("file_id", ASCENDING)], unique=True, name="uniq_file_id"),
+                IndexModel([("bands", ASCENDING), ("project_id", ASCENDING)], name="lsh_bands"),
+                IndexModel([("project_id", ASCENDING), ("version", ASCENDING)], name="project_version"),
+            ])
+        except Exception as e:
+            logger.warning(f"Failed to create indexes for document_similarity_index: {e}")
+
+    def _project_filter(self, project_id: Optional[str]) -> Dict[str, Any]:
+        query: Dict[str, Any] = {"version": self.hasher.version}
+        if project_id:
+            query["project_id"] = project_id
+        return query
+
+    async def add_document(self, file_id: str, text: str, project_id: Optional[str] = None,
+                           company_id: Optional[str] = None, filename: Optional[str] = None,
+                           file_hash: Optional[str] = None) -> bool:
+        """문서 색인 (같은 file_id 는 갱신) - 비교할 내용이 없으면 False"""
+        signature = await asyncio.to_thread(self.hasher.signature, text)
+        if signature is None or self.collection is None:
+            return False
+        await self.collection.update_one(
+            {"file_id": file_id},
+            {"$set": {
+                "file_id": file_id,
+                "project_id": project_id,
+                "company_id": company_id,
+                "filename": filename,
+                "file_hash": file_hash,
+                "version": self.hasher.version,
+                "signature": signature.tobytes(),
+                "bands": self.hasher.band_keys(signature),
+                "text_length": len(text),
+                "indexed_at": datetime.utcnow(),
+            }},
+            upsert=True,
+        )
+        return True
+
+    async def remove_document(self, file_id: str) -> None:
+        if self.collection is not None:
+            await self.collection.delete_one({"file_id": file_id})
+
+    async def index_file(self, file_metadata: Dict[str, Any], project_id: Optional[str]) -> bool:
+        """업로드된 파일의 텍스트를 추출해 색인 (업로드 백그라운드 작업)"""
+        # 파일 처리 라이브러리는 색인할 때만 로드
+        from file_processor import file_processor
+
+        try:
+            extension = Path(file_metadata.get("original_filename") or file_metadata["file_path"]).suffix.lower()
+            text = file_metadata.get("extracted_text")
+            if text is None:
+                text = await file_processor._extract_text_async(Path(file_metadata["file_path"]), {"extension": extension})
+            if not text:
+                return False
+            return await self.add_document(
+                file_metadata["id"], text, project_id=project_id, company_id=file_metadata.get("company_id"),
+                filename=file_metadata.get("original_filename"), file_hash=file_metadata.get("file_hash"),
+            )
+        except Exception as e:
+            logger.error(f"유사도 색인 오류: {e}", extra={"file_id": file_metadata.get("id")})
+            return False
+
+    async def index_project(self, project_id: str) -> Dict[str, int]:
+        """프로젝트의 업로드 파일 중 색인되지 않았거나 서명 버전이 다른 파일을 색인 (초기 구축/재색인)"""
+        stats = {"files": 0, "indexed": 0, "skipped": 0}
+        if self.collection is None:
+            return stats
+        companies = await self.db.companies.find({"project_id": project_id}, {"_id": 0, "id": 1}).to_list(None)
+        company_ids = [company["id"] for company in companies]
+        indexed = {
+            doc["file_id"] for doc in await self.collection.find(
+                self._project_filter(project_id), {"_id": 0, "file_id": 1}
+            ).to_list(None)
+        }
+        async for file_metadata in self.db.file_metadata.find({"company_id": {"$in": company_ids}}, {"_id": 0}):
+            stats["files"] += 1
+            if file_metadata["id"] in indexed:
+                stats["skipped"] += 1
+            elif await self.index_file(file_metadata, project_id):
+                stats["indexed"] += 1
+        return stats
+
+    async def query(self, text: str, project_id: Optional[str] = None, threshold: float = SIMILARITY_THRESHOLD,
+                    exclude_company_id: Optional[str] = None, exclude_file_id: Optional[str] = None,
+                    limit: int = 20) -> Dict[str, Any]:
+        """문서와 유사한 색인 문서 검색 (LSH 후보 조회 → 전체 서명으로 유사도 확인)
+
+        결과 형식은 detect_plagiarism_similarity 와 같습니다.
+        """
+        signature = await asyncio.to_thread(self.hasher.signature, text)
+        query = self._project_filter(project_id)
+        total = await self.collection.count_documents(query) if self.collection is not None else 0
+
+        candidates: List[Dict[str, Any]] = []
+        if signature is not None and self.collection is not None:
+            query["bands"] = {"$in": self.hasher.band_keys(signature)}
+            if exclude_company_id:
+                query["company_id"] = {"$ne": exclude_company_id}
+            if exclude_file_id:
+                query["file_id"] = {"$ne": exclude_file_id}
+            candidates = await self.collection.find(
+                query, {"_id": 0, "file_id": 1, "company_id": 1, "filename": 1, "project_id": 1, "signature": 1}
+            ).to_list(None)
+
+        scores = estimate_similarity(signature, _signatures(candidates, self.hasher.num_perm)) if candidates else []
+        similarities = sorted(
+            (
+                {
+                    "file_id": doc["file_id"],
+                    "company_id": doc.get("company_id"),
+                    "filename": doc.get("filename"),
+                    "similarity_score": round(float(score), 4),
+                    "risk_level": risk_level(float(score)),
+                }
+                for doc, score in zip(candidates, scores) if score >= threshold
+            ),
+            key=lambda item: -item["similarity_score"],
+        )[:limit]
+
+        return {
+            "total_documents_checked": total,
+            "candidates_checked": len(candidates),
+            "similar_documents_found": len(similarities),
+            "max_similarity": similarities[0]["similarity_score"] if similarities else 0,
+            "similarities": similarities,
+            "overall_risk": "high" if any(s["risk_level"] == "high" for s in similarities) else "low",
+            "method": "minhash_lsh",
+            "checked_at": datetime.utcnow().isoformat(),
+        }
+
+    def similar_pairs(self, signatures: np.ndarray, threshold: float = SIMILARITY_THRESHOLD) -> List[tuple]:
+        """서명 행렬에서 같은 LSH 버킷에 들어간 쌍만 비교해 (i, j, 유사도) 목록 반환 (i < j)"""
+        count = len(signatures)
+        if count < 2:
+            return []
+        band_hashes = self.hasher.band_hashes(signatures)
+        pair_codes = []
+        for band in range(self.hasher.bands):
+            order = np.argsort(band_hashes[:, band], kind="stable")
+            keys = band_hashes[order, band]
+            # 정렬 후 이웃과 키가 같은 위치만 - 문서가 2개 이상인 버킷
+            same = np.flatnonzero(keys[1:] == keys[:-1])
+            if same.size == 0:
+                continue
+            for run in np.split(same, np.flatnonzero(np.diff(same) != 1) + 1):
+                bucket = np.sort(order[run[0]:run[-1] + 2])
+                first, second = np.triu_indices(len(bucket), k=1)
+                pair_codes.append(bucket[first].astype(np.int64) * count + bucket[second])
+        if not pair_codes:
+            return []
+        codes = np.unique(np.concatenate(pair_codes))
+        left, right = codes // count, codes % count
+        scores = (signatures[left] == signatures[right]).mean(axis=1)
+        keep = scores >= threshold
+        return list(zip(left[keep].tolist(), right[keep].tolist(), scores[keep].tolist()))
+
+    async def find_similar_pairs(self, project_id: str, threshold: float = SIMILARITY_THRESHOLD,
+                                 exclude_same_company: bool = True, limit: int = 500) -> Dict[str, Any]:
+        """프로젝트 전체 문서 쌍 중 유사한 쌍 (batch all-pairs)"""
+        docs = await self.collection.find(
+            self._project_filter(project_id), {"_id": 0, "file_id": 1, "company_id": 1, "filename": 1, "signature": 1}
+        ).to_list(None)
+        signatures = _signatures(docs, self.hasher.num_perm)
+        pairs = await asyncio.to_thread(self.similar_pairs, signatures, threshold)
+
+        results = []
+        for i, j, score in sorted(pairs, key=lambda pair: -pair[2]):
+            first, second = docs[i], docs[j]
+            if exclude_same_company and first.get("company_id") and first.get("company_id") == second.get("company_id"):
+                continue
+            results.append({
+                "file_ids": [first["file_id"], second["file_id"]],
+                "company_ids": [first.get("company_id"), second.get("company_id")],
+                "filenames": [first.get("filename"), second.get("filename")],
+                "similarity_score": round(score, 4),
+                "risk_level": risk_level(score),
+            })
+
+        return {
+            "project_id": project_id,
+            "documents_indexed": len(docs),
+            "similar_pairs_found": len(results),
+            "pairs": results[:limit],
+            "threshold": threshold,
+            "method": "minhash_lsh",
+            "checked_at": datetime.utcnow().isoformat(),
+        }
+
+
+# Global similarity index instance (db is attached at server startup)
+similarity_index = SimilarityIndex()
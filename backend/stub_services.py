@@ -4,38 +4,22 @@
 
 import io
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 import uuid
 
 # Calculate evaluation scores function
-async def calculate_evaluation_scores(sheet_id: str, scores: Dict[str, Any]) -> tuple[float, float]:
+async def calculate_evaluation_scores(sheet_id: str, scores: Any, items: Optional[List[Dict[str, Any]]] = None) -> tuple[float, float]:
     """
-    Temporary stub for calculate_evaluation_scores function
-    TODO: Implement proper evaluation scoring logic
+    Calculate (total_score, weighted_score) for a sheet via the scoring engine.
+    Without template items every scored item counts with weight 1 (plain average).
     """
-    try:
-        # Simple scoring logic - calculate average
-        if not scores:
-            return 0.0, 0.0
-        
-        score_values = []
-        for key, value in scores.items():
-            if isinstance(value, (int, float)):
-                score_values.append(float(value))
-            elif isinstance(value, dict) and 'score' in value:
-                score_values.append(float(value['score']))
-        
-        if not score_values:
-            return 0.0, 0.0
-            
-        total_score = sum(score_values)
-        weighted_score = total_score / len(score_values)  # Simple average for now
-        
-        return total_score, weighted_score
-    except Exception as e:
-        print(f"Error in calculate_evaluation_scores: {e}")
+    from scoring_engine import score_sheet
+
+    if not scores:
         return 0.0, 0.0
+    result = score_sheet(items, scores)
+    return result.raw_total, result.weighted_average
 
 # Notification service
 class NotificationServiceStub:
@@ -125,12 +109,18 @@ __all__ = [
 # Additional stub functions found in server.py
 async def update_project_statistics(project_id: str):
     """
-    Temporary stub for update_project_statistics function
-    TODO: Implement proper project statistics update logic
+    Refresh the precomputed project_stats document for a project
+    (server-side aggregation via project_analytics)
     """
-    print(f"[STATS] Updating project statistics for project {project_id}")
-    # TODO: Implement actual statistics calculation and update
-    pass
+    from project_analytics import project_stats_service
+
+    if not project_id or project_stats_service.db is None:
+        return
+
+    try:
+        await project_stats_service.refresh(project_id)
+    except Exception as e:
+        print(f"[STATS] Failed to refresh project statistics for project {project_id}: {e}")
 
 async def background_file_processing(file_path: str, file_id: str):
     """
@@ -0,0 +1,440 @@
+"""
+Shared test fixtures - in-memory Motor collections
+
+fake_db / fake_collection fixtures provide collections implementing the part of the Motor API the tests use:
+- filters: equality, $in/$nin/$ne/$exists/$gt/$gte/$lt/$lte, $or, dotted paths
+- updates: $set/$inc/$min/$max/$push/$setOnInsert, upserts
+- unique indexes (DuplicateKeyError / BulkWriteError code 11000), bulk_write of updates and deletes
+- aggregate with a single $group($sum) stage
+Every call is recorded (calls, queries, updates, inserts, bulk_writes, sessions) so tests can
+assert on database round trips. FakeDB creates collections on first access.
+"""
+import asyncio
+import operator
+import os
+import sys
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+from pymongo import DeleteMany, DeleteOne, UpdateMany
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+# 테스트 대상 backend 모듈 import 경로와 security 모듈이 요구하는 SECRET_KEY
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-backend-tests-0123456789")
+
+_MISSING = object()
+_COMPARISONS = {"$gt": operator.gt, "$gte": operator.ge, "$lt": operator.lt, "$lte": operator.le}
+
+
+def _copy(value):
+    """dict/list 만 복사 (저장된 문서가 호출한 쪽에서 바뀌지 않도록, deepcopy 보다 빠름)"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _get(doc, path):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set(doc, path, value):
+    *parents, last = path.split(".")
+    for part in parents:
+        doc = doc.setdefault(part, {})
+    doc[last] = value
+
+
+def _condition(value, op, operand):
+    if op == "$ne":
+        return (None if value is _MISSING else value) != operand
+    if op in ("$in", "$nin"):
+        values = value if isinstance(value, list) else [None if value is _MISSING else value]
+        found = any(candidate in operand for candidate in values)
+        return found if op == "$in" else not found
+    if op == "$exists":
+        return (value is not _MISSING) == bool(operand)
+    # $gt/$gte/$lt/$lte - 없는 값/None 은 비교 대상이 아님
+    return value is not _MISSING and value is not None and _COMPARISONS[op](value, operand)
+
+
+def compile_query(query):
+    """$in/$nin 목록을 집합으로 (큰 묶음 조회를 빠르게)"""
+    if isinstance(query, list):
+        return [compile_query(sub) for sub in query]
+    if not isinstance(query, dict):
+        return query
+    compiled = {}
+    for key, value in query.items():
+        compiled[key] = frozenset(value) if key in ("$in", "$nin") else compile_query(value)
+    return compiled
+
+
+def matches(doc, query):
+    """MongoDB 필터와 일치하는지"""
+    for field, expected in (query or {}).items():
+        if field == "$or":
+            if not any(matches(doc, sub) for sub in expected):
+                return False
+            continue
+        value = _get(doc, field)
+        if isinstance(expected, dict) and expected and next(iter(expected)).startswith("$"):
+            for op, operand in expected.items():
+                if not _condition(value, op, operand):
+                    return False
+        elif (None if value is _MISSING else value) != expected:
+            return False
+    return True
+
+
+def apply_update(doc, update, inserting=False):
+    """업데이트 연산자 적용 ($setOnInsert 는 upsert 로 새 문서를 만들 때만)"""
+    for field, value in update.get("$set", {}).items():
+        _set(doc, field, _copy(value))
+    if inserting:
+        for field, value in update.get("$setOnInsert", {}).items():
+            _set(doc, field, _copy(value))
+    for field, amount in update.get("$inc", {}).items():
+        current = _get(doc, field)
+        _set(doc, field, (0 if current is _MISSING else current) + amount)
+    for op, keep in (("$min", min), ("$max", max)):
+        for field, value in update.get(op, {}).items():
+            current = _get(doc, field)
+            _set(doc, field, value if current is _MISSING or current is None else keep(current, value))
+    for field, value in update.get("$push", {}).items():
+        current = _get(doc, field)
+        items = [] if current is _MISSING else current
+        items.extend(value["$each"] if isinstance(value, dict) and "$each" in value else [value])
+        _set(doc, field, items)
+
+
+def project(doc, projection):
+    """find 의 projection 적용 (포함 또는 제외 방식)"""
+    if not projection:
+        return _copy(doc)
+    included = {field for field, flag in projection.items() if flag and field != "_id"}
+    if included:
+        result = {field: _copy(doc[field]) for field in included if field in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+    return {field: _copy(value) for field, value in doc.items() if projection.get(field, 1)}
+
+
+def _sort_key(field):
+    def key(doc):
+        value = _get(doc, field)
+        # MongoDB 처럼 없는 값/None 이 먼저
+        return (value is not _MISSING and value is not None, None if value is _MISSING else value)
+    return key
+
+
+def sort_docs(docs, keys):
+    for field, direction in reversed(list(keys)):
+        docs.sort(key=_sort_key(field), reverse=direction < 0)
+    return docs
+
+
+class FakeCursor:
+    """find/aggregate 결과 커서 (sort/limit, to_list, async for)
+
+    find 결과는 꺼낼 때 복사(projection)하므로 정렬하지 않으면 스트리밍처럼 메모리를 쓰지 않음
+    (projection=False 이면 문서를 그대로 돌려줌)
+    """
+
+    def __init__(self, docs, projection=False):
+        self._docs = docs
+        self._projection = projection
+        self._limit = 0
+
+    def sort(self, key_or_list, direction=None):
+        keys = [(key_or_list, direction or 1)] if isinstance(key_or_list, str) else key_or_list
+        self._docs = sort_docs(list(self._docs), keys)
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    def _window(self):
+        for index, doc in enumerate(self._docs):
+            if self._limit and index >= self._limit:
+                break
+            yield doc if self._projection is False else project(doc, self._projection)
+
+    async def to_list(self, length=None):
+        return list(self._window())
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._window():
+            yield doc
+
+
+def _group_id(doc, spec):
+    if isinstance(spec, dict):
+        return {name: _group_id(doc, value) for name, value in spec.items()}
+    if isinstance(spec, str) and spec.startswith("$"):
+        value = _get(doc, spec[1:])
+        return None if value is _MISSING else value
+    return spec
+
+
+def aggregate_docs(docs, pipeline):
+    """$group($sum) 단계 하나로 된 집계"""
+    (stage,) = pipeline
+    spec = stage["$group"]
+    groups = {}
+    for doc in docs:
+        group_id = _group_id(doc, spec["_id"])
+        row = groups.setdefault(repr(group_id), {"_id": group_id})
+        for field, accumulator in spec.items():
+            if field != "_id":
+                value = _group_id(doc, accumulator["$sum"])
+                row[field] = row.get(field, 0) + (value if isinstance(value, (int, float)) else 0)
+    return list(groups.values())
+
+
+class FakeCollection:
+    """메모리 Motor 컬렉션
+
+    unique: 고유 인덱스 필드 튜플 목록 (예: [("login_id",), ("email",)])
+    latency: 데이터베이스 왕복마다 기다리는 시간(초)
+    """
+
+    def __init__(self, docs=(), unique=(), latency=0.0):
+        self.docs = [dict(doc) for doc in docs]
+        self.unique = [tuple(fields) for fields in unique]
+        self.latency = latency
+        self.calls = Counter()
+        self.queries = []       # (filter, projection) - find/find_one/count_documents/distinct
+        self.updates = []       # (filter, update) - update_one/find_one_and_update
+        self.inserts = []       # insert_one/insert_many 문서 묶음
+        self.bulk_writes = []   # bulk_write 연산 목록
+        self.sessions = []      # 쓰기 연산에 전달된 session
+        self.indexes = []
+
+    def doc(self, **fields):
+        """저장된 문서 (필드가 모두 같은 첫 문서, 없으면 None)"""
+        return next((doc for doc in self.docs if matches(doc, fields)), None)
+
+    async def _round_trip(self, name, session=None, write=False):
+        self.calls[name] += 1
+        if write:
+            self.sessions.append(session)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _duplicate_index(self, doc, ignore=None):
+        for fields in self.unique:
+            key = tuple(_get(doc, field) for field in fields)
+            if any(existing is not ignore and tuple(_get(existing, field) for field in fields) == key
+                   for existing in self.docs):
+                return fields
+        return None
+
+    def _duplicate_error(self, fields, index=0):
+        return {"index": index, "code": 11000, "keyPattern": {field: 1 for field in fields},
+                "errmsg": f"E11000 duplicate key error ({', '.join(fields)})"}
+
+    def _insert(self, doc):
+        fields = self._duplicate_index(doc)
+        if fields:
+            return fields
+        doc.setdefault("_id", f"oid{len(self.docs) + 1}")
+        self.docs.append(_copy(doc))
+        return None
+
+    def _upsert(self, query, update):
+        doc = {field: value for field, value in query.items()
+               if not field.startswith("$") and not (isinstance(value, dict) and any(k.startswith("$") for k in value))}
+        if any(key.startswith("$") for key in update):
+            apply_update(doc, update, inserting=True)
+        else:
+            doc.update(_copy(update))
+        return doc
+
+    def _update(self, query, update, upsert=False, many=False):
+        targets = [doc for doc in self.docs if matches(doc, query)]
+        if not many:
+            targets = targets[:1]
+        for doc in targets:
+            apply_update(doc, update)
+        upserted_id = None
+        if not targets and upsert:
+            doc = self._upsert(query, update)
+            fields = self._insert(doc)
+            if fields:
+                raise DuplicateKeyError("E11000 duplicate key error", 11000, {"keyPattern": {f: 1 for f in fields}})
+            upserted_id = doc["_id"]
+        return SimpleNamespace(matched_count=len(targets), modified_count=len(targets),
+                               upserted_id=upserted_id, acknowledged=True)
+
+    # 조회 ------------------------------------------------------------
+
+    def find(self, query=None, projection=None, sort=None, limit=0, batch_size=None, session=None):
+        self.calls["find"] += 1
+        self.queries.append((query or {}, projection))
+        query = compile_query(query)
+        cursor = FakeCursor((doc for doc in self.docs if matches(doc, query)), projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.limit(limit)
+
+    async def find_one(self, query=None, projection=None, session=None):
+        await self._round_trip("find_one")
+        self.queries.append((query or {}, projection))
+        doc = next((doc for doc in self.docs if matches(doc, query)), None)
+        return None if doc is None else project(doc, projection)
+
+    async def count_documents(self, query=None, session=None, **kwargs):
+        await self._round_trip("count_documents")
+        self.queries.append((query or {}, None))
+        return sum(1 for doc in self.docs if matches(doc, query))
+
+    async def distinct(self, key, query=None, session=None):
+        await self._round_trip("distinct")
+        self.queries.append((query or {}, None))
+        values = []
+        for doc in self.docs:
+            value = _get(doc, key)
+            if value is not _MISSING and matches(doc, query) and value not in values:
+                values.append(value)
+        return values
+
+    def aggregate(self, pipeline, session=None, **kwargs):
+        self.calls["aggregate"] += 1
+        return FakeCursor(aggregate_docs([_copy(doc) for doc in self.docs], pipeline))
+
+    # 쓰기 ------------------------------------------------------------
+
+    async def insert_one(self, doc, session=None):
+        await self._round_trip("insert_one", session, write=True)
+        self.inserts.append([doc])
+        fields = self._insert(doc)
+        if fields:
+            raise DuplicateKeyError("E11000 duplicate key error", 11000, {"keyPattern": {f: 1 for f in fields}})
+        return SimpleNamespace(inserted_id=doc["_id"], acknowledged=True)
+
+    async def insert_many(self, docs, ordered=True, session=None):
+        await self._round_trip("insert_many", session, write=True)
+        docs = list(docs)
+        self.inserts.append(docs)
+        write_errors = []
+        for index, doc in enumerate(docs):
+            fields = self._insert(doc)
+            if fields:
+                write_errors.append(self._duplicate_error(fields, index))
+                if ordered:
+                    break
+        if write_errors:
+            inserted = index + 1 - len(write_errors) if ordered else len(docs) - len(write_errors)
+            raise BulkWriteError({"writeErrors": write_errors, "nInserted": inserted})
+        return SimpleNamespace(inserted_ids=[doc["_id"] for doc in docs], acknowledged=True)
+
+    async def update_one(self, query, update, upsert=False, session=None, **kwargs):
+        await self._round_trip("update_one", session, write=True)
+        self.updates.append((query, update))
+        return self._update(query, update, upsert)
+
+    async def replace_one(self, query, replacement, upsert=False, session=None):
+        await self._round_trip("replace_one", session, write=True)
+        target = next((doc for doc in self.docs if matches(doc, query)), None)
+        if target is not None:
+            preserved_id = target.get("_id")
+            target.clear()
+            target.update(_copy(replacement))
+            if preserved_id is not None:
+                target.setdefault("_id", preserved_id)
+        elif upsert:
+            self._insert(self._upsert(query, replacement))
+        return SimpleNamespace(matched_count=int(target is not None), modified_count=int(target is not None))
+
+    async def find_one_and_update(self, query, update, projection=None, sort=None, return_document=False,
+                                  session=None):
+        await self._round_trip("find_one_and_update", session, write=True)
+        self.updates.append((query, update))
+        candidates = [doc for doc in self.docs if matches(doc, query)]
+        if sort:
+            sort_docs(candidates, sort)
+        if not candidates:
+            return None
+        doc = candidates[0]
+        before = _copy(doc)
+        apply_update(doc, update)
+        # pymongo ReturnDocument.AFTER 는 True
+        return project(doc if return_document else before, projection)
+
+    async def delete_many(self, query, session=None):
+        await self._round_trip("delete_many", session, write=True)
+        remaining = [doc for doc in self.docs if not matches(doc, query)]
+        deleted = len(self.docs) - len(remaining)
+        self.docs[:] = remaining
+        return SimpleNamespace(deleted_count=deleted)
+
+    async def bulk_write(self, requests, ordered=True, session=None, **kwargs):
+        """UpdateOne/UpdateMany/DeleteOne/DeleteMany 묶음 (upsert 중복 키는 BulkWriteError)"""
+        await self._round_trip("bulk_write", session, write=True)
+        requests = list(requests)
+        self.bulk_writes.append(requests)
+        write_errors = []
+        for index, request in enumerate(requests):
+            if isinstance(request, (DeleteOne, DeleteMany)):
+                matching = [doc for doc in self.docs if matches(doc, request._filter)]
+                for doc in matching if isinstance(request, DeleteMany) else matching[:1]:
+                    self.docs.remove(doc)
+                continue
+            try:
+                self._update(request._filter, request._doc, request._upsert, many=isinstance(request, UpdateMany))
+            except DuplicateKeyError as e:
+                write_errors.append({"index": index, "code": 11000, "keyPattern": e.details["keyPattern"],
+                                     "errmsg": "E11000 duplicate key error"})
+                if ordered:
+                    break
+        if write_errors:
+            raise BulkWriteError({"writeErrors": write_errors})
+        return SimpleNamespace(acknowledged=True)
+
+    async def create_indexes(self, indexes, **kwargs):
+        await self._round_trip("create_indexes")
+        self.indexes.extend(indexes)
+        return [getattr(index, "document", {}).get("name", str(index)) for index in indexes]
+
+
+class FakeDB:
+    """컬렉션을 처음 접근할 때 만드는 메모리 데이터베이스 (db.name, db["name"] 모두 지원)"""
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        collection = FakeCollection()
+        setattr(self, name, collection)
+        return collection
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+
+@pytest.fixture
+def fake_db():
+    """빈 메모리 데이터베이스 (컬렉션은 접근 시 생성, 고유 인덱스 등이 필요하면 fake_collection 으로 교체)"""
+    return FakeDB()
+
+
+@pytest.fixture
+def fake_collection():
+    """메모리 컬렉션 생성 함수 - fake_collection(docs, unique=[("login_id",)], latency=0.01)"""
+    return FakeCollection
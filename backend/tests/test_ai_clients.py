@@ -0,0 +1,109 @@
+"""
+Async AI client pool tests (local stub provider, concurrent calls, event-loop responsiveness)
+"""
+import asyncio
+import time
+
+import pytest
+import uvicorn
+
+import ai_model_settings_endpoints
+from ai_clients import AIClientPool, AIHttpSettings, ai_client_pool
+from ai_model_management import AIModelConfig, ModelProvider
+from ai_service_enhanced import EnhancedAIService
+from ai_stub_provider import create_stub_app
+
+
+async def start_stub(latency):
+    app = create_stub_app(latency)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="off"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return app, server, task, f"http://127.0.0.1:{port}"
+
+
+async def stop_stub(server, task):
+    server.should_exit = True
+    await task
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_pool_without_blocking_loop(monkeypatch):
+    app, server, task, url = await start_stub(latency=0.2)
+    pool = AIClientPool(AIHttpSettings(max_connections=5, max_keepalive=5, max_retries=0))
+    monkeypatch.setattr(ai_model_settings_endpoints, "ai_client_pool", pool)
+    monkeypatch.setenv("NOVITA_API_KEY", "stub-key")
+    monkeypatch.setenv("AI_PROVIDER_BASE_URL_NOVITA", f"{url}/v1")
+    config = AIModelConfig(model_id="m1", provider=ModelProvider.NOVITA, model_name="deepseek/deepseek-r1",
+                           display_name="Stub", cost_per_token=0.001)
+
+    # 첫 호출은 SDK 지연 import 와 연결 수립을 포함하므로 측정에서 제외
+    await ai_model_settings_endpoints.call_ai_model(config, "준비")
+
+    # 호출 중에도 이벤트 루프가 다른 작업을 처리하는지 측정
+    lags = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        while not stop.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - before - 0.01)
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        started = time.perf_counter()
+        results = await asyncio.gather(*[
+            ai_model_settings_endpoints.call_ai_model(config, f"평가 요청 {i}") for i in range(20)
+        ])
+        elapsed = time.perf_counter() - started
+        streamed = await ai_model_settings_endpoints.call_ai_model(config, "스트리밍 요청", stream=True)
+    finally:
+        stop.set()
+        await ticking
+        await pool.aclose()
+        await stop_stub(server, task)
+
+    assert all(result["error"] is None for result in results)
+    assert results[3]["response"].startswith("[Stub] deepseek/deepseek-r1 response to:")
+    assert results[3]["token_count"] > 0 and results[3]["cost"] > 0
+    assert streamed["error"] is None and streamed["response"].startswith("[Stub]")
+
+    # 20건 × 0.2초를 최대 5개 연결로 나눠 처리 - 직렬 실행(4초)보다 훨씬 빠르고 연결은 재사용됨
+    assert elapsed < 2.0
+    assert len(app.state.client_ports) <= 5
+    assert max(lags) < 0.1
+    assert pool.get_metrics()["providers"] == []
+
+
+@pytest.mark.asyncio
+async def test_enhanced_service_reuses_pooled_clients(monkeypatch):
+    app, server, task, url = await start_stub(latency=0)
+    monkeypatch.setenv("AI_PROVIDER_BASE_URL_GROQ", f"{url}/v1")
+    monkeypatch.setenv("AI_PROVIDER_BASE_URL_ANTHROPIC", url)
+    service = EnhancedAIService()
+    try:
+        groq = await service._create_ai_client("groq", "key-1")
+        again = await service._create_ai_client("groq", "key-1")
+        other_key = await service._create_ai_client("groq", "key-2")
+        anthropic = await service._create_ai_client("anthropic", "key-1")
+
+        chat = await groq.chat.completions.create(
+            model="llama3-8b-8192", messages=[{"role": "user", "content": "안녕"}]
+        )
+        message = await anthropic.messages.create(
+            model="claude-3-haiku-20240307", max_tokens=10, messages=[{"role": "user", "content": "안녕"}]
+        )
+        metrics = ai_client_pool.get_metrics()
+    finally:
+        await ai_client_pool.aclose()
+        await stop_stub(server, task)
+
+    assert groq is again and groq is not other_key
+    # 같은 공급자는 API 키가 달라도 하나의 HTTP 연결 풀을 공유
+    assert groq._client is other_key._client and groq._client is not anthropic._client
+    assert chat.choices[0].message.content.startswith("[Stub] llama3-8b-8192")
+    assert message.content[0].text.startswith("[Stub] claude-3-haiku-20240307")
+    assert metrics["providers"] == ["anthropic", "groq"]
@@ -0,0 +1,98 @@
+"""
+AI response cache tests (content-addressed keys, L1/Mongo hits, savings counters, size-based eviction)
+"""
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import ai_service_enhanced
+from ai_response_cache import AIResponseCache, make_cache_key
+from ai_service_enhanced import EnhancedAIService
+from cache_service import CacheService
+
+
+class FakeOpenAI:
+    """chat.completions.create 호출 수를 세는 OpenAI 클라이언트"""
+
+    def __init__(self, content):
+        self.calls = 0
+
+        async def create(**kwargs):
+            self.calls += 1
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+def make_service(monkeypatch, response_cache, content):
+    monkeypatch.setattr(ai_service_enhanced, "ai_response_cache", response_cache)
+    service = EnhancedAIService()
+    client = FakeOpenAI(content)
+    service.active_clients = {"openai": client}
+    service.provider_configs = {"openai": {"display_name": "OpenAI", "max_tokens": 4096, "temperature": 0.3, "priority": 1}}
+    return service, client
+
+
+def test_cache_key_ignores_whitespace_but_not_prompt_or_model():
+    base = make_cache_key("document_analysis", "사업 계획서\n\n목표:  AI 도입", "1", "openai", "gpt-4o-mini", {"t": 0.3})
+    assert base == make_cache_key("document_analysis", "  사업 계획서\r\n목표:\tAI 도입 \n", "1", "openai", "gpt-4o-mini", {"t": 0.3})
+    assert base != make_cache_key("document_analysis", "사업 계획서\n목표: AI 도입", "2", "openai", "gpt-4o-mini", {"t": 0.3})
+    assert base != make_cache_key("document_analysis", "사업 계획서\n목표: AI 도입", "1", "openai", "gpt-4o", {"t": 0.3})
+    assert base != make_cache_key("document_analysis", "사업 계획서\n목표: AI 도입", "1", "openai", "gpt-4o-mini", {"t": 0.5})
+
+
+@pytest.mark.asyncio
+async def test_repeat_analysis_is_served_from_cache(monkeypatch, fake_db):
+    response_cache = AIResponseCache(db=fake_db, cache=CacheService())
+    analysis = {"structure_score": 8, "innovation_score": 9, "summary": "우수한 계획"}
+    service, client = make_service(monkeypatch, response_cache, json.dumps(analysis, ensure_ascii=False))
+    document = "스마트 공장 구축 사업계획서 " * 200
+
+    first = await service.analyze_document_content(document)
+    second = await service.analyze_document_content(document + "\n\n")
+
+    assert client.calls == 1
+    assert "cache" not in first and second["cache"]["hit"] is True
+    assert second["structure_score"] == 8 and second["analyzed_at"] == first["analyzed_at"]
+
+    stats = service.get_cost_optimization_stats()["response_cache"]
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+    assert stats["tokens_saved"] > 0 and stats["cost_saved_usd"] > 0
+
+    # 다른 워커(빈 L1)에서도 MongoDB 에 저장된 결과를 사용
+    other_worker = AIResponseCache(db=fake_db, cache=CacheService())
+    service, client = make_service(monkeypatch, other_worker, "{}")
+    third = await service.analyze_document_content(document)
+    assert client.calls == 0 and third["cache"]["hit"] is True
+    assert fake_db.ai_response_cache.doc(key=third["cache"]["key"])["hits"] == 2
+
+    # 점수 제안은 분석 시각이 달라도 같은 분석 결과면 캐시 적중
+    suggestion = {"criteria_scores": [], "overall_opinion": "적정"}
+    service, client = make_service(monkeypatch, other_worker, json.dumps(suggestion, ensure_ascii=False))
+    await service.suggest_evaluation_scores(first)
+    again = await service.suggest_evaluation_scores({**first, "analyzed_at": "later"})
+    assert client.calls == 1 and again["cache"]["hit"] is True
+
+
+@pytest.mark.asyncio
+async def test_eviction_drops_least_recently_used_entries(fake_db):
+    response_cache = AIResponseCache(db=fake_db, cache=CacheService(), max_entries=3, evict_every=1)
+    start = datetime.utcnow()
+
+    for i in range(5):
+        await response_cache.set(f"k{i}", {"value": i}, "document_analysis", "openai", "gpt-4o-mini", tokens=10)
+        fake_db.ai_response_cache.doc(key=f"k{i}")["last_used_at"] = start - timedelta(seconds=10 - i)
+    results = [await response_cache.get(f"k{i}") for i in range(5)]
+
+    assert sorted(doc["key"] for doc in fake_db.ai_response_cache.docs) == ["k2", "k3", "k4"]
+    assert results[0] is None and results[1] is None
+    assert results[4]["value"] == 4
+    assert response_cache.get_stats()["evictions"] == 2
+
+    # 용량 제한도 같은 순서로 적용
+    response_cache.max_entries = 100
+    response_cache.max_bytes = 2 * fake_db.ai_response_cache.doc(key="k4")["size"]
+    assert await response_cache.evict() == 1
+    assert sorted(doc["key"] for doc in fake_db.ai_response_cache.docs) == ["k3", "k4"]
@@ -0,0 +1,94 @@
+"""
+Assignment engine tests (set-difference planning, single insert_many, idempotency)
+"""
+from unittest.mock import AsyncMock
+
+import pytest
+
+import assignment_engine
+from assignment_engine import AssignmentEngine, ensure_assignment_indexes
+from models import AssignmentCreate
+
+
+@pytest.fixture
+def db(fake_db, fake_collection):
+    fake_db.companies.docs.extend({"id": f"c{i}", "project_id": "p1" if i < 3 else "p2"} for i in range(5))
+    fake_db.evaluation_sheets = fake_collection(
+        [{"evaluator_id": "e0", "company_id": "c0", "template_id": "t1"}],
+        unique=[("evaluator_id", "company_id", "template_id")],
+    )
+    return fake_db
+
+
+@pytest.mark.asyncio
+async def test_assign_creates_only_missing_pairs_with_constant_round_trips(db):
+    engine = AssignmentEngine(db)
+    assignments = [
+        AssignmentCreate(evaluator_ids=["e0", "e1"], company_ids=["c0", "c1", "c3", "ghost"], template_id="t1"),
+        AssignmentCreate(evaluator_ids=["e1"], company_ids=["c1", "c4"], template_id="t1"),
+    ]
+
+    summary = await engine.assign(assignments)
+
+    assert summary["requested"] == 10
+    assert summary["created"] == 6
+    assert summary["skipped_existing"] == 1
+    assert summary["skipped_duplicate"] == 1
+    assert summary["skipped_missing_company"] == 2
+    assert summary["missing_company_ids"] == ["ghost"]
+    assert summary["project_ids"] == ["p1", "p2"]
+
+    assert db.companies.calls["find"] == 1
+    assert db.evaluation_sheets.calls["find"] == 1
+    assert db.evaluation_sheets.calls["insert_many"] == 1
+
+    created = db.evaluation_sheets.docs[1:]
+    assert all(doc["status"] == "draft" and doc["template_id"] == "t1" and doc["id"] for doc in created)
+    assert {(d["evaluator_id"], d["company_id"]) for d in created} == {
+        ("e0", "c1"), ("e0", "c3"), ("e1", "c0"), ("e1", "c1"), ("e1", "c3"), ("e1", "c4"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_repeated_and_racing_assignments_are_idempotent(db):
+    engine = AssignmentEngine(db)
+    assignment = AssignmentCreate(evaluator_ids=["e1", "e2"], company_ids=["c1", "c2"], template_id="t2")
+
+    first = await engine.assign([assignment])
+    second = await engine.assign([assignment])
+    assert first["created"] == 4
+    assert second["created"] == 0 and second["skipped_existing"] == 4 and second["project_ids"] == []
+
+    # 조회 이후 다른 요청이 먼저 저장한 경우 - 고유 인덱스의 중복 키 오류를 '이미 존재'로 집계
+    racing = AssignmentEngine(db)
+    racing._load_existing = AsyncMock(return_value=set())
+    third = await racing.assign([assignment])
+    assert third["created"] == 0 and third["skipped_existing"] == 4 and third["failed"] == 0
+    assert len(db.evaluation_sheets.docs) == 5
+
+
+@pytest.mark.asyncio
+async def test_created_sheets_update_company_assigned_stats(db, monkeypatch):
+    db.project_stats.docs.append({"project_id": "p1", "companies": {"c0": {"assigned": 1}}})
+    monkeypatch.setattr(assignment_engine.project_stats_service, "db", db)
+    assignment = AssignmentCreate(evaluator_ids=["e0", "e1"], company_ids=["c0", "c1"], template_id="t1")
+
+    await AssignmentEngine(db).assign([assignment])
+
+    # 이미 배정된 (e0, c0) 는 제외하고 생성된 평가지만 기업별로 반영
+    assert db.project_stats.doc(project_id="p1")["companies"] == {"c0": {"assigned": 2}, "c1": {"assigned": 2}}
+
+
+@pytest.mark.asyncio
+async def test_index_failure_is_reported_for_health(db, monkeypatch, caplog):
+    monkeypatch.setattr(assignment_engine.assignment_engine, "index_ready", False)
+    monkeypatch.setattr(assignment_engine.assignment_engine, "index_error", None)
+
+    assert await ensure_assignment_indexes(db) is True
+    assert assignment_engine.assignment_engine.index_ready is True
+
+    db.evaluation_sheets.create_indexes = AsyncMock(side_effect=RuntimeError("Index build failed: E11000 duplicate key"))
+    assert await ensure_assignment_indexes(db) is False
+    assert assignment_engine.assignment_engine.index_ready is False
+    assert "E11000" in assignment_engine.assignment_engine.index_error
+    assert [r.levelname for r in caplog.records if "assignment unique index" in r.message] == ["ERROR"]
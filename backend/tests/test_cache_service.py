@@ -0,0 +1,170 @@
+"""
+Two-tier cache service tests (L1 LRU, tags, single-flight, stale-while-revalidate)
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+from cache_service import CacheService, LRUCache, INVALIDATION_CHANNEL
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.published = []
+        self.get_calls = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        self.get_calls += 1
+        return self.values.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    async def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            deleted += int(self.values.pop(key, None) is not None or self.sets.pop(key, None) is not None)
+        return deleted
+
+    async def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+
+def make_service(redis_client=None):
+    service = CacheService(redis_url="redis://unused", l1_max_entries=2, l1_ttl=30)
+    service.redis_client = redis_client
+    return service
+
+
+def test_lru_evicts_least_recently_used_and_expired():
+    lru = LRUCache(max_entries=2)
+    now = time.time()
+    lru.set("a", 1, now + 10, now + 10)
+    lru.set("b", 2, now + 10, now + 10)
+    lru.get("a")
+    lru.set("c", 3, now + 10, now + 10)
+    assert "b" not in lru and "a" in lru and "c" in lru
+
+    lru.set("old", 4, now - 5, now - 1)
+    assert lru.get("old") is None and "old" not in lru
+
+
+@pytest.mark.asyncio
+async def test_l1_hit_skips_redis_and_l2_hit_fills_l1():
+    redis_client = FakeRedis()
+    writer = make_service(redis_client)
+    await writer.set("user:1:profile", {"name": "kim"}, ttl=60)
+    await writer.get("user:1:profile")
+    assert redis_client.get_calls == 0
+
+    reader = make_service(redis_client)
+    assert await reader.get("user:1:profile") == {"name": "kim"}
+    assert await reader.get("user:1:profile") == {"name": "kim"}
+    assert redis_client.get_calls == 1
+    assert reader.get_metrics()["l2_hits"] == 1 and reader.get_metrics()["l1_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tags_deletes_members_and_publishes():
+    redis_client = FakeRedis()
+    service = make_service(redis_client)
+    await service.cache_user_data("u1", {"id": "u1"})
+    await service.cache_dashboard_data("u1", [1, 2])
+
+    deleted = await service.invalidate_user_cache("u1")
+
+    assert deleted == 2
+    assert redis_client.values == {} and redis_client.sets == {}
+    assert await service.get_cached_dashboard_data("u1") is None
+    channel, message = redis_client.published[-1]
+    assert channel == INVALIDATION_CHANNEL
+    assert sorted(message["keys"]) == ["user:u1:dashboard", "user:u1:profile"]
+
+    # 다른 워커는 메시지를 받아 L1 사본을 제거하고, 자신이 보낸 메시지는 무시
+    other = make_service(None)
+    await other.set("user:u1:profile", {"id": "u1"})
+    other._apply_invalidation(json.dumps(message))
+    assert "user:u1:profile" not in other.l1
+    service.l1.set("user:u1:profile", {}, time.time() + 10, time.time() + 10)
+    service._apply_invalidation(json.dumps(message))
+    assert "user:u1:profile" in service.l1
+
+
+@pytest.mark.asyncio
+async def test_topic_messages_reach_handlers_of_other_workers():
+    redis_client = FakeRedis()
+    service = make_service(redis_client)
+    received = []
+    other = make_service(None)
+    other.add_message_handler("permissions", received.append)
+
+    await service.publish_message("permissions", {"user_id": "u1"})
+    channel, message = redis_client.published[-1]
+    assert channel == INVALIDATION_CHANNEL
+
+    other._apply_invalidation(json.dumps(message))
+    other._apply_invalidation(json.dumps({**message, "topic": "unknown"}))
+    # 자신이 보낸 메시지는 무시
+    service.add_message_handler("permissions", received.append)
+    service._apply_invalidation(json.dumps(message))
+    assert received == [{"user_id": "u1"}]
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_single_flight_and_stale_while_revalidate():
+    service = make_service(None)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"version": len(calls)}
+
+    results = await asyncio.gather(*[service.get_or_set("k", loader, ttl=60, stale_ttl=60) for _ in range(10)])
+    assert len(calls) == 1
+    assert all(result == {"version": 1} for result in results)
+
+    # 신선도 만료 후에는 기존 값을 즉시 반환하고 백그라운드에서 한 번만 재계산
+    value, _, expires_at = service.l1._entries["k"]
+    service.l1._entries["k"] = (value, time.time() - 1, expires_at)
+    stale = await asyncio.gather(*[service.get_or_set("k", loader, ttl=60, stale_ttl=60) for _ in range(5)])
+    assert all(result == {"version": 1} for result in stale)
+    await asyncio.sleep(0.05)
+    assert len(calls) == 2
+    assert await service.get("k") == {"version": 2}
@@ -0,0 +1,138 @@
+"""
+Incremental dashboard counter tests
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from dashboard_counters import DashboardCounters, GLOBAL_COUNTER_ID, RECONCILE_LEASE_ID, sheet_status_count
+
+
+@pytest.fixture
+def db(fake_db):
+    sheets = [("p1", "submitted")] * 3 + [("p1", "assigned"), ("p2", "submitted"), ("p2", "submitted")]
+    fake_db.projects.docs.extend([
+        {"id": "p1", "is_active": True}, {"id": "p2", "is_active": True}, {"id": "p3", "is_active": False},
+    ])
+    fake_db.companies.docs.extend({"id": f"c{i}"} for i in range(7))
+    fake_db.users.docs.extend({"id": f"u{i}", "role": "evaluator", "is_active": i != 0} for i in range(5))
+    fake_db.users.docs.append({"id": "admin", "role": "admin", "is_active": True})
+    fake_db.evaluation_sheets.docs.extend(
+        {"id": f"s{i}", "project_id": project_id, "status": status} for i, (project_id, status) in enumerate(sheets)
+    )
+    return fake_db
+
+
+@pytest.mark.asyncio
+async def test_sheet_events_increment_global_and_project_counters(db):
+    counters = DashboardCounters(db)
+
+    await counters.sheets_created("p1", "assigned")
+    await counters.sheet_status_changed("p1", "assigned", "submitted")
+    await counters.sheet_status_changed("p1", "submitted", "submitted")
+    await counters.sheet_deleted("p1", "submitted")
+
+    updates = db["dashboard_counters"].updates
+    assert [query["_id"] for query, _ in updates] == [
+        GLOBAL_COUNTER_ID, "project:p1",
+        GLOBAL_COUNTER_ID, "project:p1",
+        GLOBAL_COUNTER_ID, "project:p1",
+    ]
+    assert updates[0][1]["$inc"] == {"sheets_total": 1, "sheets_by_status.assigned": 1}
+    assert updates[2][1]["$inc"] == {"sheets_by_status.assigned": -1, "sheets_by_status.submitted": 1}
+    assert updates[4][1]["$inc"] == {"sheets_total": -1, "sheets_by_status.submitted": -1}
+
+
+@pytest.mark.asyncio
+async def test_non_sheet_counters_only_touch_global_document(db):
+    counters = DashboardCounters(db)
+
+    await counters.project_created(is_active=False)
+    await counters.user_created("secretary")
+    await counters.user_created("evaluator")
+
+    updates = db["dashboard_counters"].updates
+    assert [query["_id"] for query, _ in updates] == [GLOBAL_COUNTER_ID, GLOBAL_COUNTER_ID]
+    assert updates[0][1]["$inc"] == {"projects_total": 1}
+    assert updates[1][1]["$inc"] == {"evaluators_total": 1, "evaluators_active": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_reconciles_when_counters_missing(db):
+    counters = DashboardCounters(db)
+
+    result = await counters.get()
+
+    assert result["projects_active"] == 2
+    assert result["evaluators_total"] == 5
+    assert result["sheets_total"] == 6
+    assert sheet_status_count(result, "submitted") == 5
+    assert sheet_status_count(result, "in_progress") == 0
+
+    stored = db["dashboard_counters"]
+    assert stored.doc(_id="project:p1")["sheets_by_status"] == {"submitted": 3, "assigned": 1}
+    assert stored.doc(_id="project:p2")["sheets_total"] == 2
+
+    # 재집계 이후에는 저장된 문서를 그대로 사용 (원본 컬렉션을 다시 집계하지 않음)
+    assert await counters.get() == stored.doc(_id=GLOBAL_COUNTER_ID)
+    assert db.evaluation_sheets.calls["aggregate"] == 1 and db.projects.calls["count_documents"] == 2
+
+
+@pytest.mark.asyncio
+async def test_delete_and_deactivate_hooks_decrement_counters(db):
+    counters = DashboardCounters(db)
+
+    await counters.project_deleted(is_active=True)
+    await counters.project_active_changed(True, False)
+    await counters.project_active_changed(False, False)
+    await counters.company_deleted()
+    await counters.user_deactivated("evaluator")
+    await counters.user_deactivated("secretary")
+    await counters.user_updated("evaluator", True, "secretary", True)
+    await counters.user_updated("admin", False, "evaluator", False)
+
+    assert [update["$inc"] for _, update in db["dashboard_counters"].updates] == [
+        {"projects_total": -1, "projects_active": -1},
+        {"projects_active": -1},
+        {"companies_total": -1},
+        {"evaluators_active": -1},
+        {"evaluators_total": -1, "evaluators_active": -1},
+        {"evaluators_total": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_only_the_lease_holder_reconciles(db, fake_collection):
+    db.dashboard_counters = fake_collection(unique=[("_id",)])
+    first, second = DashboardCounters(db, owner_id="w1"), DashboardCounters(db, owner_id="w2")
+
+    assert await first.acquire_reconcile_lease(60)
+    assert not await second.acquire_reconcile_lease(60)
+    # 임대를 가진 워커는 연장하고, 만료된 임대는 다른 워커가 이어받음
+    assert await first.acquire_reconcile_lease(60)
+    db.dashboard_counters.doc(_id=RECONCILE_LEASE_ID)["lease_expires_at"] = datetime(2000, 1, 1)
+    assert await second.acquire_reconcile_lease(60)
+    assert not await first.acquire_reconcile_lease(60)
+
+    loop = asyncio.create_task(first.run_reconcile_loop(interval=3600))
+    await asyncio.sleep(0.01)
+    loop.cancel()
+
+    assert db.dashboard_counters.doc(_id=RECONCILE_LEASE_ID)["lease_owner"] == "w2"
+    assert db.evaluation_sheets.calls["aggregate"] == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_inside_a_transaction(db):
+    counters = DashboardCounters(db)
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("write conflict")
+
+    db.dashboard_counters.update_one = fail
+    # 단독 갱신은 기록만 하고 다음 재집계에서 보정
+    await counters.sheet_status_changed("p1", "draft", "submitted")
+    # 트랜잭션 안에서는 평가지 변경과 함께 롤백/재시도되도록 오류 전달
+    with pytest.raises(RuntimeError):
+        await counters.sheet_status_changed("p1", "draft", "submitted", session=object())
@@ -0,0 +1,157 @@
+"""
+Document pipeline tests (token counting, structure-aware chunking, map-reduce analysis of long documents)
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import ai_service_enhanced
+import document_pipeline
+from ai_model_management import AIModelConfig, ModelProvider, ai_model_service
+from ai_response_cache import AIResponseCache
+from ai_service_enhanced import EnhancedAIService
+from cache_service import CacheService
+from document_pipeline import (
+    PAGE_BREAK, TokenCounter, chunk_document, context_window, estimate_tokens, merge_chunk_analyses, split_sections
+)
+
+# 테스트는 tiktoken 설치 여부와 관계없이 같은 결과가 나오도록 추정 모드 사용
+COUNTER = TokenCounter(use_tiktoken=False)
+
+BUSINESS_PLAN = PAGE_BREAK.join([
+    "Ⅰ. 사업 개요\n1. 추진 배경\n스마트 공장 도입으로 생산성을 높이고자 합니다.\n\n현재 불량률은 5% 수준입니다.",
+    "2. 사업 목표\n가. 정량 목표\n불량률을 1% 이하로 낮춥니다.\n나. 정성 목표\n데이터 기반 의사결정 체계를 갖춥니다.",
+    "Ⅱ. 추진 계획\n□ 단계별 일정\n1단계 설비 진단, 2단계 MES 구축, 3단계 고도화를 진행합니다.",
+])
+
+
+def test_korean_token_estimate_is_not_character_quarter():
+    text = "중소기업 지원사업 평가 결과 보고서"
+    # 한글은 글자당 약 1토큰 - 기존 len // 4 추정은 4배 가까이 적게 계산
+    assert estimate_tokens(text) >= len(text.replace(" ", ""))
+    assert estimate_tokens(text) > len(text) // 4
+    assert estimate_tokens("The quick brown fox") == 6
+    assert COUNTER.count(text, "gpt-4o-mini") == estimate_tokens(text)
+    assert TokenCounter.encoding_name("gpt-4o-mini") == "o200k_base"
+    assert TokenCounter.encoding_name("claude-3-haiku-20240307") == "cl100k_base"
+
+    head, rest = COUNTER.truncate(text * 20, 50)
+    assert estimate_tokens(head) <= 50 and head + rest == text * 20
+
+
+def test_sections_follow_pages_and_headings():
+    sections = split_sections(BUSINESS_PLAN)
+
+    assert [s.page for s in sections] == [1, 2, 2, 3]
+    # 본문 없이 연속된 제목은 하나로 합쳐짐
+    assert sections[0].heading == "Ⅰ. 사업 개요\n1. 추진 배경"
+    assert sections[1].heading == "2. 사업 목표\n가. 정량 목표"
+    assert sections[2].heading == "나. 정성 목표"
+    assert sections[3].heading == "Ⅱ. 추진 계획\n□ 단계별 일정"
+    assert "불량률은 5%" in sections[0].text
+
+
+def test_chunks_respect_budget_and_track_pages():
+    long_plan = PAGE_BREAK.join(
+        f"{i}. 세부 과제 {i}\n" + "생산 공정 데이터를 수집하고 분석하여 품질을 개선합니다. " * 30 for i in range(1, 9)
+    )
+    chunks = chunk_document(long_plan, "gpt-4o-mini", 600, counter=COUNTER)
+
+    assert len(chunks) > 1
+    assert all(chunk.tokens <= 600 for chunk in chunks)
+    assert [c.index for c in chunks] == list(range(len(chunks)))
+    assert chunks[0].start_page == 1 and chunks[-1].end_page == 8
+    assert all(a.end_page <= b.start_page for a, b in zip(chunks, chunks[1:]))
+    # 나뉜 구획의 뒷부분도 제목을 유지
+    assert all(chunk.headings for chunk in chunks)
+
+    # 한 구획이 한도를 넘으면 문장 단위로 분할
+    single = chunk_document("□ 개요\n" + "매출 목표를 달성합니다. " * 200, "gpt-4o-mini", 300, counter=COUNTER)
+    assert len(single) > 1 and all(chunk.tokens <= 300 for chunk in single)
+
+
+def test_context_window_prefers_registered_models(monkeypatch):
+    config = AIModelConfig(model_id="custom-small", provider=ModelProvider.LOCAL, model_name="my-org/small-llm",
+                           display_name="Small", context_window=2048)
+    monkeypatch.setitem(ai_model_service.model_registry, "custom-small", config)
+
+    assert context_window("small-llm") == 2048
+    assert context_window("custom-small") == 2048
+    assert context_window("claude-3-haiku-20240307") == 200000
+    assert context_window("gpt-4") == 8192
+    assert context_window("unknown-model") == document_pipeline.DEFAULT_CONTEXT_WINDOW
+
+
+
+def test_specific_context_window_prefixes_come_first():
+    prefixes = [prefix for prefix, _ in document_pipeline.DEFAULT_CONTEXT_WINDOWS]
+    for index, prefix in enumerate(prefixes):
+        assert not any(prefix.startswith(earlier) for earlier in prefixes[:index]), prefix
+    assert context_window("llama-3.1-sonar-large-128k-online") == 127000
+    assert context_window("llama-3.1-70b-instruct") == 128000
+
+def test_merge_weights_scores_by_chunk_size():
+    first, second = chunk_document("1. 가\n" + "가" * 300 + PAGE_BREAK + "2. 나\n" + "나" * 100, None, 350, counter=COUNTER)
+    merged = merge_chunk_analyses([
+        (first, {"structure_score": 9, "keywords": ["AI", "제조"], "strengths": ["명확한 목표"], "summary": "앞부분"}),
+        (second, {"structure_score": 5, "keywords": ["제조", "수출"], "strengths": ["명확한 목표", "시장성"], "summary": "뒷부분"}),
+    ])
+
+    assert 5 < merged["structure_score"] < 9 and merged["structure_score"] > 7
+    assert merged["keywords"] == ["제조", "AI", "수출"]
+    assert merged["strengths"] == ["명확한 목표", "시장성"]
+    assert merged["summary"] == "앞부분 뒷부분"
+    assert merged["chunk_summaries"][1]["pages"] == "2"
+    assert merged["chunked"] is True and merged["chunk_count"] == 2
+
+
+class FakeOpenAI:
+    """동시 실행 수와 호출별 문서 길이를 기록하는 OpenAI 클라이언트"""
+
+    def __init__(self):
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+
+        async def create(**kwargs):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            self.prompts.append(kwargs["messages"][-1]["content"])
+            score = 9 if len(self.prompts) == 1 else 6
+            content = {"structure_score": score, "keywords": ["스마트공장"], "summary": f"청크 {len(self.prompts)}"}
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(content, ensure_ascii=False)))])
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+@pytest.mark.asyncio
+async def test_long_document_is_analyzed_in_chunks(monkeypatch):
+    monkeypatch.setattr(ai_service_enhanced, "ai_response_cache", AIResponseCache(cache=CacheService()))
+    monkeypatch.setattr(ai_service_enhanced, "token_counter", COUNTER)
+    monkeypatch.setattr(ai_service_enhanced, "AI_CHUNK_CONCURRENCY", 2)
+    monkeypatch.setattr(document_pipeline, "token_counter", COUNTER)
+    monkeypatch.setattr(document_pipeline, "AI_CHUNK_MAX_TOKENS", 1000)
+
+    service = EnhancedAIService()
+    client = FakeOpenAI()
+    service.active_clients = {"openai": client}
+    service.provider_configs = {"openai": {"display_name": "OpenAI", "max_tokens": 4096, "temperature": 0.3, "priority": 1}}
+    document = PAGE_BREAK.join(f"{i}. 과제 {i}\n" + "공정 데이터를 분석해 품질을 개선합니다. " * 40 for i in range(1, 7))
+
+    result = await service.analyze_document_content(document)
+
+    assert len(client.prompts) > 1 and client.max_active == 2
+    # 문서 전체가 빠짐없이 분석됨 (기존에는 앞 4000자만 전송)
+    assert all(f"{i}. 과제 {i}" in "".join(client.prompts) for i in range(1, 7))
+    assert result["chunked"] is True and result["chunk_count"] == len(client.prompts)
+    assert result["failed_chunks"] == 0 and result["ai_provider"] == "openai"
+    assert 6 <= result["structure_score"] < 9
+
+    # 비용 추정도 같은 토큰 계산기와 청크 분할 사용
+    cost = service._calculate_token_cost(document, "gpt-4o-mini")
+    assert cost["estimated_tokens"] == COUNTER.count(document)
+    assert len(service.plan_document_chunks(document, "gpt-4o-mini")) == result["chunk_count"]
@@ -0,0 +1,126 @@
+"""
+Evaluation print endpoint tests (job ownership, evaluation_sheets document shape)
+"""
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+import evaluation_print_endpoints as endpoints
+from job_queue import COMPLETED
+from models import User
+
+
+def make_user(user_id, role):
+    return User(id=user_id, login_id=user_id, email=f"{user_id}@example.com", user_name=user_id,
+                role=role, password_hash="x")
+
+
+def seed_sheets(db):
+    db.evaluation_sheets.docs.extend([
+        {"_id": "oid-1", "id": "s1", "project_id": "p1", "evaluator_id": "u1", "company_id": "c1",
+         "template_id": "t1", "status": "submitted", "created_at": datetime(2024, 5, 1)},
+        {"_id": "oid-2", "id": "s2", "project_id": "p1", "evaluator_id": "u2", "company_id": "c2",
+         "template_id": "t1", "status": "draft", "created_at": datetime(2024, 5, 2)},
+    ])
+    db.evaluation_scores.docs.append({"_id": "oid-3", "id": "sc1", "sheet_id": "s1", "item_id": "i1", "score": 8})
+    db.users.docs.extend([{"_id": "oid-4", "id": "u1", "user_name": "위원1"}])
+    db.companies.docs.extend([{"_id": "oid-5", "id": "c1", "name": "기업1"}, {"_id": "oid-6", "id": "c2", "name": "기업2"}])
+    db.projects.docs.append({"_id": "oid-7", "id": "p1", "name": "2024 지원사업"})
+    db.evaluation_templates.docs.append({"_id": "oid-8", "id": "t1", "items": [{"id": "i1", "name": "기술성", "max_score": 10}]})
+
+
+@pytest.fixture
+def print_db(fake_db, monkeypatch):
+    db = fake_db
+    seed_sheets(db)
+    monkeypatch.setitem(sys.modules, "server", SimpleNamespace(db=db))
+    monkeypatch.setattr(endpoints.job_queue, "db", db)
+    return db
+
+
+@pytest.mark.asyncio
+async def test_status_and_download_are_limited_to_owner_and_staff(print_db, tmp_path):
+    job = await endpoints.job_queue.enqueue("print", {"print_type": "individual"}, created_by="u1")
+    output = tmp_path / "result.pdf"
+    output.write_bytes(b"%PDF")
+    await print_db.jobs.update_one(
+        {"job_id": job["job_id"]}, {"$set": {"status": COMPLETED, "file_path": str(output)}}
+    )
+
+    for handler in (endpoints.get_print_job_status, endpoints.download_print_result):
+        with pytest.raises(HTTPException) as denied:
+            await handler(job["job_id"], current_user=make_user("u2", "evaluator"))
+        assert denied.value.status_code == 403
+        await handler(job["job_id"], current_user=make_user("u1", "evaluator"))
+        await handler(job["job_id"], current_user=make_user("a1", "secretary"))
+
+
+@pytest.mark.asyncio
+async def test_evaluation_data_and_list_read_evaluation_sheets(print_db):
+    data = await endpoints.get_evaluation_data("s1")
+    assert data["evaluation"]["id"] == "s1"
+    assert data["evaluator"]["user_name"] == "위원1" and data["company"]["name"] == "기업1"
+    assert data["template"]["id"] == "t1" and [s["item_id"] for s in data["scores"]] == ["i1"]
+
+    # 평가위원은 자신의 평가지만, 간사는 프로젝트 전체
+    own = await endpoints.get_evaluations_list(project_id="p1", current_user=make_user("u1", "evaluator"))
+    assert [sheet["id"] for sheet in own] == ["s1"] and "_id" not in own[0]
+    everyone = await endpoints.get_evaluations_list(project_id="p1", current_user=make_user("a1", "secretary"))
+    assert sorted(sheet["id"] for sheet in everyone) == ["s1", "s2"]
+
+    fingerprint = await endpoints.bulk_print_fingerprint(print_db, ["s1", "s2"], None)
+    assert fingerprint["evaluations"] == [("s1", datetime(2024, 5, 1)), ("s2", datetime(2024, 5, 2))]
+
+
+@pytest.mark.asyncio
+async def test_evaluators_only_print_their_own_sheets(print_db):
+    evaluator = make_user("u1", "evaluator")
+    assert await endpoints.accessible_evaluation_ids(print_db, ["s2", "s1"], evaluator) == ["s1"]
+    assert await endpoints.accessible_evaluation_ids(print_db, ["s2", "s1"], make_user("a1", "admin")) == ["s2", "s1"]
+
+    request = endpoints.EvaluationPrintRequest(evaluation_ids=["s2"], print_type="bulk")
+    with pytest.raises(HTTPException) as denied:
+        await endpoints.download_bulk_evaluations(request, request=None, current_user=evaluator)
+    assert denied.value.status_code == 403
+    with pytest.raises(HTTPException) as denied:
+        await endpoints.create_print_job(request, current_user=evaluator)
+    assert denied.value.status_code == 403
+    assert not print_db.jobs.docs
+
+
+@pytest.mark.asyncio
+async def test_bulk_enhanced_export_streams_members_into_the_zip(tmp_path, monkeypatch):
+    import zipfile
+
+    import enhanced_export_endpoints
+
+    monkeypatch.chdir(tmp_path)
+    documents = {}
+    for evaluation_id in ("e1", "e2"):
+        documents[evaluation_id] = tmp_path / f"{evaluation_id}.pdf"
+        documents[evaluation_id].write_bytes(b"%PDF-" + evaluation_id.encode() * 1000)
+
+    async def render_enhanced_artifact(evaluation_id, options):
+        if evaluation_id not in documents:
+            raise ValueError("평가를 찾을 수 없습니다")
+        return SimpleNamespace(path=documents[evaluation_id]), False, {"company": {"name": f"기업 {evaluation_id}"}}
+
+    monkeypatch.setattr(enhanced_export_endpoints, "render_enhanced_artifact", render_enhanced_artifact)
+    progress = []
+
+    async def report(value, **fields):
+        progress.append(value)
+
+    ctx = SimpleNamespace(job_id="j1", progress=report)
+    result = await enhanced_export_endpoints.process_bulk_enhanced_export_job(
+        {"evaluation_ids": ["e1", "missing", "e2"], "options": {"template": "standard", "format": "pdf"}}, ctx
+    )
+
+    assert result["failed_evaluations"] == ["missing"]
+    with zipfile.ZipFile(result["file_path"]) as archive:
+        assert archive.namelist() == ["기업 e1_standard_e1.pdf", "기업 e2_standard_e2.pdf"]
+        assert archive.read("기업 e2_standard_e2.pdf") == documents["e2"].read_bytes()
+    assert progress == [5, 36, 63, 90]
@@ -0,0 +1,113 @@
+"""
+Bulk evaluator onboarding tests (roster parsing, $in existence check, pooled hashing, insert_many error mapping)
+"""
+import io
+
+import pytest
+from fastapi import HTTPException
+
+import security
+from evaluator_onboarding import EvaluatorOnboarding, RosterRow, ensure_user_indexes, parse_roster
+
+
+@pytest.fixture
+def db(fake_db, fake_collection):
+    """login_id/email 고유 인덱스를 가진 users 컬렉션"""
+    fake_db.users = fake_collection(unique=[("login_id",), ("email",)])
+    return fake_db
+
+
+def test_parse_csv_and_xlsx_rosters():
+    csv_content = "이름,전화번호,이메일\n홍 길동,010-1111-2222,hong@example.com\n,,\n김철수,010-3333-4444,kim@example.com\n"
+    rows = parse_roster("명단.csv", csv_content.encode("cp949"))
+    assert [r.row_number for r in rows] == [2, 4]
+    assert rows[0].data == {"user_name": "홍 길동", "phone": "010-1111-2222", "email": "hong@example.com"}
+
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["email", "name", "phone"])
+    sheet.append(["lee@example.com", "이영희", 1055556666])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    rows = parse_roster("roster.xlsx", buffer.getvalue())
+    assert rows[0].data == {"user_name": "이영희", "phone": "01055556666", "email": "lee@example.com"}
+
+    with pytest.raises(HTTPException) as exc_info:
+        parse_roster("roster.csv", "이름,이메일\n홍길동,a@b.com\n".encode("utf-8"))
+    assert exc_info.value.status_code == 400
+    with pytest.raises(HTTPException):
+        parse_roster("roster.txt", b"name,phone,email\n")
+
+
+@pytest.mark.asyncio
+async def test_bulk_onboarding_maps_each_failure_to_its_row(db, monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+    users = db.users
+    users.docs.extend([
+        {"login_id": "기존위원", "email": "old@example.com"},
+        {"login_id": "someoneelse", "email": "taken@example.com"},
+    ])
+    onboarding = EvaluatorOnboarding(db, hash_workers=0)
+    rows = [
+        RosterRow(2, {"user_name": "신규 위원", "phone": "010-1", "email": "new1@example.com"}),
+        RosterRow(3, {"user_name": "기존위원", "phone": "010-2", "email": "x@example.com"}),
+        RosterRow(4, {"user_name": "신규위원", "phone": "010-3", "email": "new2@example.com"}),
+        RosterRow(5, {"user_name": "메일중복", "phone": "010-4", "email": "taken@example.com"}),
+        RosterRow(6, {"user_name": "잘못된메일", "phone": "010-5", "email": "not-an-email"}),
+        RosterRow(7, {"user_name": "정상", "phone": "010-6", "email": "ok@example.com"}),
+    ]
+
+    events = [event async for event in onboarding.run(rows)]
+    result = events[-1]
+    assert result["event"] == "result"
+    assert [e["stage"] for e in events[:-1] if e["stage"] != "hashing"] == ["validated", "checked", "inserted"]
+    assert any(e["stage"] == "hashing" for e in events)
+
+    # 왕복 횟수: 존재 여부 조회 1회, 저장 1회
+    assert users.calls["find"] == 1 and users.calls["insert_many"] == 1
+
+    assert result["created_count"] == 2
+    assert sorted(c["row"] for c in result["created_evaluators"]) == [2, 7]
+    errors = {e["row"]: e["error"] for e in result["errors"]}
+    assert sorted(errors) == [3, 4, 5, 6]
+    assert errors[3].startswith("이미 존재하는 평가위원")
+    assert errors[4].startswith("명단 내 중복 (2행")
+    assert errors[5].startswith("이미 사용 중인 이메일")
+    assert errors[6].startswith("입력값 오류")
+
+    created = result["created_evaluators"][0]
+    stored = next(d for d in users.docs if d["login_id"] == created["credentials"]["login_id"])
+    assert stored["id"] == created["user"]["id"] and stored["role"] == "evaluator"
+    assert security.verify_password(created["credentials"]["password"], stored["password_hash"])
+
+
+@pytest.mark.asyncio
+async def test_user_indexes_back_duplicate_key_mapping(db):
+    users = db.users
+    await ensure_user_indexes(db)
+
+    # 중복 키 오류 매핑이 기대하는 login_id/email 고유 인덱스
+    indexes = {index.document["name"]: index.document for index in users.indexes}
+    assert indexes["uniq_login_id"]["key"] == {"login_id": 1} and indexes["uniq_login_id"]["unique"]
+    assert indexes["uniq_email"]["key"] == {"email": 1} and indexes["uniq_email"]["unique"]
+
+
+@pytest.mark.asyncio
+async def test_hashing_fans_out_to_process_pool(db, monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+    users = db.users
+    onboarding = EvaluatorOnboarding(db, hash_workers=2)
+    rows = [RosterRow(i + 2, {"user_name": f"위원{i}", "phone": "010", "email": f"e{i}@example.com"}) for i in range(12)]
+
+    try:
+        result = await onboarding.onboard(rows)
+    finally:
+        onboarding.shutdown()
+
+    assert result["created_count"] == 12 and result["error_count"] == 0
+    for evaluator in result["created_evaluators"]:
+        stored = next(d for d in users.docs if d["login_id"] == evaluator["credentials"]["login_id"])
+        assert stored["password_hash"].startswith("$2b$04$")
+        assert security.verify_password(evaluator["credentials"]["password"], stored["password_hash"])
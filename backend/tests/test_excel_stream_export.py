@@ -0,0 +1,126 @@
+"""
+Streaming Excel export tests (cursor batches, constant_memory workbook, shared formats, company pivot sheet)
+"""
+import io
+import tracemalloc
+from datetime import datetime, timedelta
+
+import openpyxl
+import pytest
+
+from excel_stream_export import EvaluationWorkbookWriter, iter_evaluation_exports, write_evaluations_excel
+from export_utils import EvaluationExporter
+
+
+@pytest.fixture
+def make_db(fake_db, fake_collection):
+    def make(sheet_count, companies=7):
+        items = [{"id": f"i{n}", "name": f"항목{n}", "description": "설명", "max_score": 10, "weight": 1} for n in range(3)]
+        fake_db.evaluation_templates = fake_collection([{"id": "t1", "name": "기본 평가표", "items": items}])
+        fake_db.projects = fake_collection([{"id": "p1", "name": "2024 지원사업"}])
+        fake_db.companies = fake_collection(
+            {"id": f"c{n}", "name": f"기업[{n}]/테스트", "contact_person": "담당", "phone": "010"} for n in range(companies)
+        )
+        fake_db.users = fake_collection({"id": f"u{n}", "user_name": f"위원{n}"} for n in range(3))
+        fake_db.evaluation_sheets = fake_collection(
+            {"id": f"s{n}", "project_id": "p1", "company_id": f"c{n % companies}", "evaluator_id": f"u{n % 3}",
+             "template_id": "t1", "status": "submitted", "submitted_at": datetime(2024, 5, 1, 9) + timedelta(minutes=n),
+             "weighted_score": 50 + n % 40}
+            for n in range(sheet_count)
+        )
+        fake_db.evaluation_scores = fake_collection(
+            {"sheet_id": f"s{n}", "item_id": f"i{k}", "score": (n + k) % 10, "opinion": "의견" * (60 if k == 0 else 1)}
+            for n in range(sheet_count) for k in range(3) if not (k == 2 and n % 2)
+        )
+        # 기업이 삭제된 평가지는 건너뜀
+        fake_db.evaluation_sheets.docs.append(
+            {"id": "orphan", "project_id": "p1", "company_id": "gone", "evaluator_id": "u0", "template_id": "t1",
+             "status": "submitted", "weighted_score": 10}
+        )
+        return fake_db
+    return make
+
+
+@pytest.mark.asyncio
+async def test_cursor_is_streamed_into_summary_pivot_and_detail_sheets(make_db):
+    db = make_db(250)
+    buffer = io.BytesIO()
+
+    stats = await write_evaluations_excel(
+        db, {"project_id": "p1", "status": "submitted"}, buffer, detail_sheets=True, summary_sheet_name='전체요약',
+        batch_size=100,
+    )
+
+    assert stats == {"evaluations": 250, "companies": 7, "project_name": "2024 지원사업"}
+    # 묶음마다 점수/관계 조회 1회 (평가지마다 조회하지 않음)
+    assert len(db.evaluation_scores.queries) == len(db.companies.queries) == 3
+
+    workbook = openpyxl.load_workbook(io.BytesIO(buffer.getvalue()))
+    assert workbook.sheetnames[:2] == ['전체요약', '기업별요약'] and len(workbook.sheetnames) == 252
+    # 시트 이름에 쓸 수 없는 문자는 바꿈
+    assert workbook.sheetnames[2] == "평가_1_기업_0__테스트"
+
+    summary = list(workbook['전체요약'].iter_rows(values_only=True))
+    assert summary[0][:10] == ('NO', '프로젝트명', '평가대상기업', '담당자', '연락처', '평가표', '평가위원', '제출일시', '총점', '상태')
+    assert summary[0][10:] == ('항목0_점수', '항목0_의견', '항목1_점수', '항목1_의견', '항목2_점수', '항목2_의견')
+    assert len(summary) == 251
+    assert summary[2][:3] == (2, '2024 지원사업', '기업[1]/테스트') and summary[2][7:10] == ('2024-05-01 09:01', 51, '제출완료')
+    assert summary[1][11].endswith('...') and len(summary[1][11]) == 103
+    assert summary[2][14:] == (None, None)  # 응답하지 않은 항목
+
+    pivot = list(workbook['기업별요약'].iter_rows(values_only=True))
+    assert pivot[0] == ('순위', '평가대상기업', '평가 수', '평균 총점', '최고 총점', '최저 총점', '항목0_평균', '항목1_평균', '항목2_평균')
+    averages = [row[3] for row in pivot[1:-1]]
+    assert averages == sorted(averages, reverse=True) and sum(row[2] for row in pivot[1:-1]) == 250
+    company0 = next(row for row in pivot[1:-1] if row[1] == '기업[0]/테스트')
+    expected_scores = [50 + n % 40 for n in range(0, 250, 7)]
+    assert company0[2] == len(expected_scores) and company0[4:6] == (max(expected_scores), min(expected_scores))
+    assert company0[3] == round(sum(expected_scores) / len(expected_scores), 1)
+    assert pivot[-1][1:3] == ('전체', 250)
+
+    detail = list(workbook[workbook.sheetnames[3]].iter_rows(values_only=True))
+    assert detail[0][:2] == ('항목', '내용') and detail[2] == ('평가대상기업', '기업[1]/테스트') + (None,) * 5
+    assert detail[9] == ('항목명', '설명', '배점', '획득점수', '가중치', '가중점수', '평가의견')
+    assert [row[0] for row in detail[10:]] == ['항목0', '항목1']  # 2번 항목은 미응답
+
+
+@pytest.mark.asyncio
+async def test_summary_export_memory_does_not_grow_with_sheet_count(make_db, tmp_path):
+    async def peak_for(sheet_count):
+        db = make_db(sheet_count, companies=20)
+        tracemalloc.start()
+        try:
+            await write_evaluations_excel(
+                db, {"project_id": "p1"}, str(tmp_path / f"{sheet_count}.xlsx"), batch_size=200
+            )
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    small, large = await peak_for(500), await peak_for(4000)
+
+    # 행은 임시 파일로 바로 내보내므로 평가지가 8배여도 최대 메모리는 거의 같음
+    assert large < small * 1.5
+    rows = openpyxl.load_workbook(tmp_path / "4000.xlsx", read_only=True)['평가결과요약'].max_row
+    assert rows == 4001
+
+
+@pytest.mark.asyncio
+async def test_exporter_list_api_uses_writer_without_dataframes(make_db):
+    db = make_db(5)
+    exporter = EvaluationExporter()
+
+    evaluations = [data async for batch in iter_evaluation_exports(db, {"project_id": "p1"}) for data in batch]
+    bulk = openpyxl.load_workbook(await exporter.export_bulk_evaluations_excel(evaluations))
+    summary = openpyxl.load_workbook(exporter.create_evaluation_summary_excel(evaluations))
+
+    assert bulk.sheetnames[:2] == ['전체요약', '기업별요약'] and len(bulk.sheetnames) == 7
+    assert summary.sheetnames == ['평가결과요약', '기업별요약']
+    assert summary['평가결과요약'].max_row == 6
+
+    # 서식은 워크북마다 한 번만 만들어 모든 행이 공유
+    writer = EvaluationWorkbookWriter(io.BytesIO(), ["항목0"], detail_sheets=True)
+    formats_before = len(writer.workbook.formats)
+    writer.add_many(evaluations)
+    writer.close()
+    assert len(writer.workbook.formats) == formats_before
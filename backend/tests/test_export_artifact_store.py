@@ -0,0 +1,157 @@
+"""
+Export artifact store tests (input fingerprints, content-addressed documents, ETag responses, invalidation, size cap)
+"""
+import os
+from datetime import datetime
+
+import pytest
+from starlette.requests import Request
+
+import export_artifact_store as store_module
+from export_artifact_store import ExportArtifactStore, artifact_response, document_version
+
+
+def make_request(headers=None):
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+async def read_body(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def make_sheet(**fields):
+    sheet = {"id": "s1", "status": "submitted", "submitted_at": datetime(2024, 5, 1, 10, 0)}
+    sheet.update(fields)
+    return sheet
+
+
+def report_key(sheet, inputs=None, export_format="pdf", options=None):
+    return ExportArtifactStore.fingerprint(
+        "evaluation_report", sheet["id"], document_version(sheet), inputs or {"sheet": sheet}, export_format, options
+    )
+
+
+def test_fingerprint_covers_version_inputs_format_options_and_renderer(monkeypatch):
+    sheet = make_sheet()
+    key = report_key(sheet)
+
+    assert key == report_key(make_sheet())
+    # 평가지 수정(updated_at), 자동저장(last_modified), 관련 데이터, 형식, 템플릿/페르소나/스타일이 바뀌면 다른 지문
+    variants = {
+        report_key(make_sheet(updated_at=datetime(2024, 5, 2))),
+        report_key(make_sheet(last_modified=datetime(2024, 5, 2))),
+        report_key(sheet, inputs={"sheet": sheet, "company": {"name": "새 기업명"}}),
+        report_key(sheet, export_format="excel"),
+        report_key(sheet, options={"template": "government"}),
+        report_key(sheet, options={"template": "government", "persona": "government_auditor"}),
+        report_key(sheet, options={"template": "government", "style_options": {"watermark": "OFFICIAL"}}),
+    }
+    assert key not in variants and len(variants) == 7
+
+    monkeypatch.setattr(store_module, "RENDERER_VERSION", "2")
+    assert report_key(sheet) != key
+
+
+@pytest.mark.asyncio
+async def test_rendered_once_and_served_from_disk_with_etag(tmp_path):
+    store = ExportArtifactStore(tmp_path, max_bytes=10 * 1024 * 1024)
+    rendered = []
+
+    async def render():
+        rendered.append(1)
+        return b"%PDF-1.4 " + b"x" * 5000
+
+    first, miss = await store.get_or_render("k1", render, subjects=["s1"])
+    second, hit = await store.get_or_render("k1", render, subjects=["s1"])
+    # 입력은 다르지만 결과가 같은 문서는 한 번만 저장
+    third, _ = await store.get_or_render("k2", render, subjects=["s2"])
+
+    assert (miss, hit) == (False, True) and len(rendered) == 2
+    assert first.path == second.path == third.path and first.path.suffix == ".artifact"
+    assert len(list((tmp_path / "objects").glob("*/*"))) == 1
+
+    response = artifact_response(make_request(), second, "application/pdf", "2024 지원사업_기업.pdf", hit)
+    assert response.status_code == 200 and response.headers["x-export-cache"] == "hit"
+    assert response.headers["etag"] == f'"{second.sha256}"'
+    assert response.headers["content-disposition"].startswith("attachment; filename*=UTF-8''2024%20")
+    assert await read_body(response) == b"%PDF-1.4 " + b"x" * 5000
+
+    # 브라우저가 가진 문서와 같으면 본문 없이 304
+    not_modified = artifact_response(
+        make_request({"If-None-Match": response.headers["etag"]}), second, "application/pdf", "a.pdf", True
+    )
+    assert not_modified.status_code == 304
+
+
+def test_sheet_update_invalidates_entries_and_size_is_capped(tmp_path):
+    store = ExportArtifactStore(tmp_path, max_bytes=25000)
+
+    store.put("report-pdf", b"a" * 10000, subjects=["s1"])
+    store.put("report-excel", b"b" * 100, subjects=["s1"])
+    store.put("chairman", b"c" * 100, subjects=["p1", "s1", "s2"])
+    store.put("other", b"d" * 100, subjects=["s2"])
+
+    assert store.invalidate("s1") == 3
+    assert store.lookup("report-pdf") is None and store.lookup("chairman") is None
+    assert store.lookup("other") is not None
+    assert store.invalidate("s1") == 0 and store.invalidate("unknown") == 0
+    # 이미 삭제된 문서의 표식은 건너뜀
+    assert store.invalidate("p1") == 0
+
+    # 최대 크기를 넘으면 오래 사용하지 않은 문서부터 삭제
+    store.put("e1", b"1" * 10000)
+    store.put("e2", b"2" * 10000)
+    os.utime(store.lookup("e1").path, (1, 1))
+    store.put("e3", b"3" * 10000)
+    assert store.lookup("e1") is None
+    assert store.lookup("e2") is not None and store.lookup("e3") is not None
+
+
+def test_shared_document_kept_while_referenced_and_job_links_survive(tmp_path):
+    store = ExportArtifactStore(tmp_path / "cache", max_bytes=10 * 1024 * 1024)
+
+    # 두 평가의 결과 문서가 같은 바이트 → 같은 객체를 가리킴
+    first = store.put("report-s1", b"same pdf", subjects=["s1"])
+    store.put("report-s2", b"same pdf", subjects=["s2"])
+    job_file = first.link_to(tmp_path / "outputs" / "jobs" / "j1" / "평가표.pdf")
+
+    # s1 수정 - s1 지문만 삭제하고 s2 가 가리키는 문서는 유지
+    assert store.invalidate("s1") == 1
+    assert store.lookup("report-s1") is None
+    assert store.lookup("report-s2").path.read_bytes() == b"same pdf"
+
+    # 마지막 지문까지 삭제되면 문서도 삭제, 작업 결과 파일은 다운로드할 때까지 남음
+    assert store.invalidate("s2") == 1
+    assert not first.path.exists()
+    assert job_file.read_bytes() == b"same pdf"
+
+
+def test_invalidation_uses_reverse_index_without_scanning_refs(tmp_path, monkeypatch):
+    store = ExportArtifactStore(tmp_path, max_bytes=10 * 1024 * 1024)
+    for i in range(20):
+        store.put(f"unrelated-{i}", f"doc {i}".encode(), subjects=[f"x{i}"])
+    shared = store.put("report-s1", b"shared", subjects=["s1"])
+    store.put("report-s2", b"shared", subjects=["s2"])
+    # 같은 지문이 다른 내용으로 다시 저장되면 이전 내용의 역참조도 정리
+    replaced = store.put("report-s3", b"old", subjects=["s3"])
+    store.put("report-s3", b"new", subjects=["s3"])
+    assert not replaced.path.exists()
+
+    reads = []
+    path_type = type(tmp_path)
+    read_text = path_type.read_text
+
+    def recording_read_text(self, *args, **kwargs):
+        reads.append(self)
+        return read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(path_type, "read_text", recording_read_text)
+
+    assert store.invalidate("s1") == 1
+    assert shared.path.exists()
+    assert store.invalidate("s2") == 1
+    assert not shared.path.exists()
+    # 삭제한 지문의 참조만 읽음 (refs/ 전체를 읽지 않음)
+    assert sorted(path.name for path in reads) == ["report-s1", "report-s2"]
+    assert store.lookup("unrelated-7").path.read_bytes() == b"doc 7"
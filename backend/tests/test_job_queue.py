@@ -0,0 +1,158 @@
+"""
+Persistent job queue tests (claim order, leases, retries, cancellation, worker)
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import job_queue as job_queue_module
+from job_queue import (
+    CANCELLED, COMPLETED, FAILED, PENDING, PROCESSING, JobPriority, JobQueue, JobWorker, job_handler, public_job,
+)
+
+
+@pytest.fixture
+def make_queue(fake_db, monkeypatch):
+    # 테스트에서 등록한 핸들러는 테스트가 끝나면 제거
+    monkeypatch.setattr(job_queue_module, "_handlers", dict(job_queue_module._handlers))
+
+    def make(lease_seconds=60):
+        queue = JobQueue(lease_seconds=lease_seconds)
+        queue.db = fake_db
+        return queue
+    return make
+
+
+@pytest.mark.asyncio
+async def test_claim_respects_priority_and_lease_expiry(make_queue):
+    queue = make_queue()
+
+    low = await queue.enqueue("print", {}, priority=JobPriority.LOW)
+    high = await queue.enqueue("print", {}, priority=JobPriority.HIGH)
+    await queue.enqueue("ai_evaluation", {}, priority=JobPriority.CRITICAL)
+
+    first = await queue.claim("w1", job_types=["print"])
+    assert first["job_id"] == high["job_id"] and first["status"] == PROCESSING and first["attempts"] == 1
+    second = await queue.claim("w1", job_types=["print"])
+    assert second["job_id"] == low["job_id"]
+    assert await queue.claim("w2", job_types=["print"]) is None
+
+    # 하트비트가 끊겨 임대가 만료되면 다른 워커가 회수
+    stored = next(d for d in queue.db.jobs.docs if d["job_id"] == high["job_id"])
+    stored["lease_expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+    reclaimed = await queue.claim("w2", job_types=["print"])
+    assert reclaimed["job_id"] == high["job_id"] and reclaimed["attempts"] == 2
+    assert await queue.heartbeat(high["job_id"], "w1") is None
+    assert await queue.heartbeat(high["job_id"], "w2", progress=40) is not None
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_then_fail_permanently(make_queue):
+    queue = make_queue()
+
+    job = await queue.enqueue("print", {}, max_attempts=2)
+    await queue.claim("w1")
+    await queue.fail(job["job_id"], "w1", "boom")
+
+    retry = await queue.get(job["job_id"])
+    assert retry["status"] == PENDING and retry["run_at"] > datetime.utcnow()
+    assert await queue.claim("w1") is None
+
+    next(d for d in queue.db.jobs.docs if d["job_id"] == job["job_id"])["run_at"] = datetime.utcnow()
+    await queue.claim("w1")
+    await queue.fail(job["job_id"], "w1", "boom again")
+    failed = await queue.get(job["job_id"])
+    assert failed["status"] == FAILED and failed["error_message"] == "boom again"
+
+
+@pytest.mark.asyncio
+async def test_cancel_pending_and_running_jobs(make_queue):
+    queue = make_queue()
+
+    pending = await queue.enqueue("print", {})
+    cancelled = await queue.cancel(pending["job_id"])
+    assert cancelled["status"] == CANCELLED
+
+    running = await queue.enqueue("print", {})
+    await queue.claim("w1")
+    requested = await queue.cancel(running["job_id"], reason="취소")
+    assert requested["status"] == PROCESSING and requested["cancel_requested"]
+    assert (await queue.heartbeat(running["job_id"], "w1"))["cancel_requested"]
+
+    assert await queue.cancel(pending["job_id"]) is None
+    assert "payload" not in public_job(requested) and "lease_owner" not in public_job(requested)
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_handlers_and_honours_cancellation(make_queue):
+    queue = make_queue(lease_seconds=3)
+
+    @job_handler("test_echo")
+    async def echo(payload, ctx):
+        await ctx.progress(50, stage="half")
+        return {"echo": payload["value"]}
+
+    @job_handler("test_slow")
+    async def slow(payload, ctx):
+        await asyncio.sleep(30)
+
+    worker = JobWorker(queue, concurrency=1, job_types=["test_echo", "test_slow"], poll_interval=0.01)
+    worker.heartbeat_interval = 0.02
+
+    done = await queue.enqueue("test_echo", {"value": 7})
+    await worker.run_job(await queue.claim(worker.worker_id))
+    finished = await queue.get(done["job_id"])
+    assert finished["status"] == COMPLETED and finished["echo"] == 7 and finished["stage"] == "half"
+    assert finished["progress"] == 100
+
+    slow_job = await queue.enqueue("test_slow", {})
+    claimed = await queue.claim(worker.worker_id)
+    run = asyncio.create_task(worker.run_job(claimed))
+    await asyncio.sleep(0.05)
+    await queue.cancel(slow_job["job_id"])
+    await asyncio.wait_for(run, timeout=1)
+    assert (await queue.get(slow_job["job_id"]))["status"] == CANCELLED
+
+    # 종료 시 처리 중 작업은 시도 횟수 차감 없이 대기열로 반환
+    interrupted = await queue.enqueue("test_slow", {})
+    runner = worker.start()
+    await asyncio.sleep(0.05)
+    await worker.stop(grace_seconds=0.05)
+    await asyncio.gather(runner, return_exceptions=True)
+    released = await queue.get(interrupted["job_id"])
+    assert released["status"] == PENDING and released["attempts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_invalid_job_fails_immediately_and_loop_survives_queue_errors(make_queue):
+    queue = make_queue()
+
+    @job_handler("test_invalid")
+    async def invalid(payload, ctx):
+        raise ValueError("잘못된 평가표 ID")
+
+    worker = JobWorker(queue, concurrency=1, job_types=["test_invalid"], poll_interval=0.01)
+
+    # 잘못된 입력은 다시 실행해도 같으므로 남은 시도와 관계없이 바로 failed
+    job = await queue.enqueue("test_invalid", {}, max_attempts=3)
+    await worker.run_job(await queue.claim(worker.worker_id))
+    failed = await queue.get(job["job_id"])
+    assert failed["status"] == FAILED and failed["attempts"] == 1
+    assert failed["error_message"] == "잘못된 평가표 ID"
+
+    # 실패 기록(DB)이 실패해도 워커 루프는 계속 다음 작업을 처리
+    async def broken_fail(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    queue.fail = broken_fail
+    await queue.enqueue("test_invalid", {})
+    await queue.enqueue("test_invalid", {})
+    runner = worker.start()
+    for _ in range(100):
+        if worker.processed >= 2:
+            break
+        await asyncio.sleep(0.01)
+    assert not runner.done() and worker.processed == 2
+    await worker.stop(grace_seconds=0.05)
+    await asyncio.gather(runner, return_exceptions=True)
@@ -0,0 +1,64 @@
+"""
+Keyset pagination and NDJSON streaming tests
+"""
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from pagination import decode_cursor, encode_cursor, iter_ndjson, keyset_filter, paginate
+
+
+def test_cursor_roundtrip():
+    created = datetime(2025, 6, 1, 9, 30)
+    token = encode_cursor({"id": "abc", "created_at": created})
+    assert decode_cursor(token) == (created, "abc")
+
+
+def test_invalid_cursor_is_400():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+def test_keyset_filter_combines_with_query():
+    created = datetime(2025, 6, 1)
+    token = encode_cursor({"id": "s1", "created_at": created})
+    query = keyset_filter({"project_id": "p1"}, token)
+    assert query["$and"][0] == {"project_id": "p1"}
+    assert {"created_at": {"$gt": created}} in query["$and"][1]["$or"]
+
+    null_token = encode_cursor({"id": "s1"})
+    assert {"created_at": {"$ne": None}} in keyset_filter({}, null_token)["$or"]
+
+
+@pytest.mark.asyncio
+async def test_paginate_returns_next_cursor_only_when_more(fake_collection):
+    collection = fake_collection({"id": f"s{i}", "created_at": datetime(2025, 1, i + 1)} for i in range(5))
+
+    page, next_cursor, total = await paginate(collection, {}, limit=3)
+    assert [d["id"] for d in page] == ["s0", "s1", "s2"]
+    assert total == 5
+    assert decode_cursor(next_cursor)[1] == "s2"
+
+    # 다음 페이지는 커서 이후 문서부터
+    page, next_cursor, _ = await paginate(collection, {}, limit=3, after=next_cursor)
+    assert [d["id"] for d in page] == ["s3", "s4"] and next_cursor is None
+
+    page, next_cursor, _ = await paginate(collection, {}, limit=10)
+    assert len(page) == 5 and next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_batches_and_drops_object_id(fake_collection):
+    collection = fake_collection({"_id": object(), "id": f"d{i}"} for i in range(5))
+    batches = []
+
+    def transform(batch):
+        batches.append(len(batch))
+        return batch
+
+    lines = [line async for line in iter_ndjson(collection.find(), transform, batch_size=2)]
+    assert batches == [2, 2, 1]
+    assert [json.loads(line)["id"] for line in lines] == [f"d{i}" for i in range(5)]
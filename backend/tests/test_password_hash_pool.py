@@ -0,0 +1,65 @@
+"""
+Bounded bcrypt pool tests (offloading, backpressure, rehash-on-login)
+"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+import security
+from security import PasswordHashPool, _hash_password_sync, password_needs_rehash, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_verify_runs_off_the_event_loop():
+    pool = PasswordHashPool(workers=2, max_pending=8)
+    release = threading.Event()
+
+    ticks = 0
+    blocked = asyncio.ensure_future(pool.run(release.wait, 5))
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+        ticks += 1
+    release.set()
+    assert await blocked is True
+    assert ticks == 5
+    assert pool.get_metrics()["completed"] == 1
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_with_retry_after():
+    pool = PasswordHashPool(workers=1, max_pending=1)
+    release = threading.Event()
+
+    first = asyncio.ensure_future(pool.run(release.wait, 5))
+    await asyncio.sleep(0.01)
+    with pytest.raises(HTTPException) as exc_info:
+        await pool.run(release.wait, 5)
+    release.set()
+    await first
+    error = exc_info.value
+    assert error.status_code == 503
+    assert int(error.headers["Retry-After"]) >= 1
+    assert pool.get_metrics()["rejected"] == 1
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_outdated_cost_factor_is_rehashed_on_login(monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 5)
+    legacy_hash = _hash_password_sync("비밀번호123", rounds=4)
+    assert password_needs_rehash(legacy_hash)
+
+    valid, new_hash = await verify_password_async("비밀번호123", legacy_hash)
+    assert valid and new_hash and not password_needs_rehash(new_hash)
+    assert await verify_password_async("비밀번호123", new_hash) == (True, None)
+    assert await verify_password_async("wrong", legacy_hash) == (False, None)
+
+
+def test_passwords_longer_than_72_bytes_are_truncated_like_legacy_bcrypt():
+    long_password = "a" * 100
+    hashed = _hash_password_sync(long_password, rounds=4)
+    assert security.verify_password("a" * 72, hashed)
+    assert not security.verify_password("a" * 71, hashed)
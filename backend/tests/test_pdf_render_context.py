@@ -0,0 +1,111 @@
+"""
+PDF render context tests (font registered once, compiled styles/table styles/page decorations shared per layout profile)
+"""
+from datetime import datetime
+
+import pytest
+
+import pdf_render_context as render_context_module
+from evaluation_pdf import create_chairman_summary_pdf, create_individual_evaluation_pdf
+from export_utils import EvaluationExporter
+from pdf_render_context import DEFAULT_PROFILE, LayoutProfile, PDFRenderContext, pdf_render_context
+
+TEST_FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+
+def make_payload(i):
+    return {
+        "evaluation": {"_id": f"e{i}", "status": "submitted", "created_at": datetime(2024, 5, 1), "comments": "의견"},
+        "evaluator": {"user_name": f"위원{i}"},
+        "company": {"name": f"기업{i}"},
+        "project": {"name": "2024 지원사업"},
+        "template": {"criteria": [{"id": "c1", "name": "기술성", "max_score": 10}, {"id": "c2", "name": "사업성", "max_score": 20}]},
+        "scores": [{"criterion_id": "c1", "score": 7}, {"criterion_id": "c2", "score": 15}],
+    }
+
+
+def make_report_data():
+    return {
+        "sheet": {"submitted_at": datetime(2024, 5, 1, 10, 30), "weighted_score": 82.5},
+        "company": {"name": "테스트 기업", "contact_person": "홍길동", "phone": "010-0000-0000"},
+        "project": {"name": "테스트 프로젝트"},
+        "template": {"name": "테스트 평가표", "items": [
+            {"id": "item1", "name": "기술력", "description": "기술력 평가", "max_score": 50, "weight": 1},
+            {"id": "item2", "name": "사업성", "description": "사업성 평가", "max_score": 50, "weight": 1},
+        ]},
+        "evaluator": {"user_name": "테스트 평가위원"},
+        "scores": [
+            {"item_id": "item1", "score": 42, "opinion": "우수함"},
+            {"item_id": "item2", "score": 35, "opinion": "양호함"},
+        ],
+    }
+
+
+def test_font_is_registered_once_and_resolved_by_name(monkeypatch):
+    registered = []
+    real_register = render_context_module.pdfmetrics.registerFont
+    monkeypatch.setattr(render_context_module.pdfmetrics, "getRegisteredFontNames", lambda: ["Helvetica"])
+    monkeypatch.setattr(render_context_module.pdfmetrics, "registerFont",
+                        lambda font: registered.append(font.fontName) or real_register(font))
+
+    context = PDFRenderContext(font_paths=["/nonexistent/font.ttf", TEST_FONT])
+    names = {context.font_name for _ in range(50)}
+    styles = context.styles("report")
+
+    assert registered == ["Korean"] and names == {"Korean"}
+    assert styles["KoreanTitle"].fontName == styles["KoreanNormal"].fontName == "Korean"
+    assert context.table_style("report_info").getCommands()[3] == ("FONTNAME", (0, 0), (-1, -1), "Korean")
+
+    # 폰트가 없으면 기본 폰트 (굵은 제목은 Helvetica-Bold)
+    fallback = PDFRenderContext(font_paths=[])
+    monkeypatch.setattr(render_context_module.pdfmetrics, "getRegisteredFontNames", lambda: [])
+    assert fallback.styles("report")["KoreanTitle"].fontName == "Helvetica-Bold"
+    assert fallback.styles("report")["KoreanNormal"].fontName == "Helvetica"
+
+
+def test_styles_and_table_styles_are_compiled_once_per_profile():
+    pdf_render_context.clear()
+
+    documents = [create_individual_evaluation_pdf(make_payload(i), {"include_comments": True}) for i in range(20)]
+    documents.append(create_chairman_summary_pdf(
+        {"project": {"name": "2024 지원사업"}, "companies": {"c1": {"name": "기업1"}},
+         "evaluations": [{"company_id": "c1", "total_score": 80}]},
+        {"include_statistics": True},
+    ))
+    info = pdf_render_context.cache_info()
+
+    assert all(document.startswith(b"%PDF") for document in documents)
+    # 스타일시트 1개(기본 프로파일), 표 스타일 5종을 한 번씩만 컴파일하고 이후 문서는 재사용
+    assert info["style_sheets"] == {"entries": 1, "hits": 20, "misses": 1}
+    assert info["table_styles"]["misses"] == 5 and info["table_styles"]["hits"] == 20 * 3 + 3 - 5
+    assert pdf_render_context.styles("print") is pdf_render_context.styles("print", LayoutProfile.from_options({}))
+    assert pdf_render_context.page_callbacks(DEFAULT_PROFILE) == {}
+
+    # 템플릿/페르소나가 다르면 별도로 컴파일
+    government = LayoutProfile.from_options({
+        "template": "government", "persona": "government_auditor",
+        "styling": {"color_scheme": "government", "watermark": "OFFICIAL", "font_size": 12},
+        "metadata": {"confidentiality": "government"},
+    })
+    assert pdf_render_context.styles("print", government) is not pdf_render_context.styles("print")
+    assert pdf_render_context.styles("print", government)["KoreanNormal"].fontSize == 12
+    callbacks = pdf_render_context.page_callbacks(government)
+    assert callbacks["onFirstPage"] is callbacks["onLaterPages"] is pdf_render_context.page_callbacks(government)["onFirstPage"]
+
+
+@pytest.mark.asyncio
+async def test_decorated_and_report_exports_render():
+    options = {
+        "template": "government",
+        "styling": {"color_scheme": "government", "watermark": "OFFICIAL", "include_logo": True},
+        "metadata": {"confidentiality": "government", "persona": "government_auditor"},
+    }
+    decorated = create_individual_evaluation_pdf(make_payload(1), options)
+    plain = create_individual_evaluation_pdf(make_payload(1), {"include_comments": True})
+    assert decorated.startswith(b"%PDF") and len(decorated) > len(plain)
+
+    # 종합평가서 - 폰트 이름 목록을 잘못 읽어 표 스타일에서 실패하던 경로
+    exporter = EvaluationExporter()
+    buffers = [await exporter.export_single_evaluation_pdf(make_report_data()) for _ in range(3)]
+    assert all(buffer.getvalue().startswith(b"%PDF") for buffer in buffers)
+    assert exporter.styles is pdf_render_context.styles("report")
@@ -0,0 +1,136 @@
+"""
+PDF render farm tests (batched prefetch of evaluation data, multi-process rendering, streaming results, render metrics)
+"""
+import asyncio
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+import evaluation_pdf
+from pdf_render_farm import PDFRenderFarm, RenderMetrics, fetch_evaluation_payloads
+
+
+def slow_render(payload, options):
+    time.sleep(0.05)
+    return f"pdf:{payload['evaluation']['id']}".encode()
+
+
+@pytest.fixture
+def make_db(fake_db, fake_collection):
+    # 앱이 저장하는 형태 - evaluation_sheets/관련 문서는 id 필드, 점수는 sheet_id/item_id, Mongo _id 는 별도
+    def make(evaluation_count):
+        fake_db.evaluation_sheets = fake_collection(
+            {"_id": f"oid-e{i}", "id": f"e{i}", "evaluator_id": f"u{i % 3}", "company_id": f"c{i}", "project_id": "p1",
+             "template_id": "t1", "status": "submitted", "created_at": datetime(2024, 5, 1)}
+            for i in range(evaluation_count)
+        )
+        fake_db.evaluation_scores = fake_collection(
+            {"_id": f"oid-s{i}", "id": f"s{i}", "sheet_id": f"e{i}", "item_id": "i1", "score": i % 10, "opinion": "의견"}
+            for i in range(evaluation_count)
+        )
+        fake_db.users = fake_collection({"_id": f"oid-u{i}", "id": f"u{i}", "user_name": f"위원{i}"} for i in range(3))
+        fake_db.companies = fake_collection(
+            {"_id": f"oid-c{i}", "id": f"c{i}", "name": f"기업{i}"} for i in range(evaluation_count)
+        )
+        fake_db.projects = fake_collection([{"_id": "oid-p1", "id": "p1", "name": "2024 지원사업"}])
+        fake_db.evaluation_templates = fake_collection(
+            [{"_id": "oid-t1", "id": "t1", "items": [{"id": "i1", "name": "기술성", "max_score": 10}]}]
+        )
+        return fake_db
+    return make
+
+
+async def collect(batches):
+    return [batch async for batch in batches]
+
+
+@pytest.mark.asyncio
+async def test_payloads_are_prefetched_in_batches(make_db):
+    db = make_db(25)
+    ids = [f"e{i}" for i in range(25)] + ["missing"]
+
+    batches = await collect(fetch_evaluation_payloads(db, ids, batch_size=10))
+
+    assert [len(batch) for batch in batches] == [10, 10, 6]
+    payloads = dict(item for batch in batches for item in batch)
+    assert payloads["missing"] is None
+    assert payloads["e7"]["company"]["name"] == "기업7" and payloads["e7"]["evaluator"]["user_name"] == "위원1"
+    assert payloads["e7"]["evaluation"]["id"] == "e7" and payloads["e7"]["template"]["id"] == "t1"
+    assert payloads["e7"]["scores"] == [{"id": "s7", "sheet_id": "e7", "item_id": "i1", "score": 7, "opinion": "의견"}]
+    # 묶음당 평가/점수 조회 1회, 이미 조회한 프로젝트/템플릿/평가위원은 다시 조회하지 않음
+    assert len(db.evaluation_sheets.queries) == len(db.evaluation_scores.queries) == 3
+    assert len(db.companies.queries) == 3
+    assert len(db.projects.queries) == len(db.evaluation_templates.queries) == len(db.users.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_stored_sheet_renders_its_template_items(make_db, monkeypatch):
+    db = make_db(1)
+    scored = []
+    score_sheet = evaluation_pdf.score_sheet
+
+    def recording_score_sheet(items, scores):
+        scored.append((items, scores))
+        return score_sheet(items, scores)
+
+    monkeypatch.setattr(evaluation_pdf, "score_sheet", recording_score_sheet)
+
+    [[(_, payload)]] = await collect(fetch_evaluation_payloads(db, ["e0"]))
+    content = evaluation_pdf.create_individual_evaluation_pdf(payload, {"include_comments": True})
+
+    assert content.startswith(b"%PDF")
+    # 템플릿 items 와 sheet_id 로 저장된 점수로 평가 기준/점수 표를 그림
+    assert scored == [([{"id": "i1", "name": "기술성", "max_score": 10}], payload["scores"])]
+
+
+@pytest.mark.asyncio
+async def test_process_pool_renders_pdfs_with_metrics(make_db):
+    db = make_db(12)
+    farm = PDFRenderFarm(workers=2, batch_size=3)
+    metrics = RenderMetrics(workers=farm.workers)
+
+    async def batches():
+        async for batch in fetch_evaluation_payloads(db, [f"e{i}" for i in range(12)], batch_size=5):
+            yield [(key, payload) for key, payload in batch]
+        # 렌더링 중 오류는 해당 문서만 실패로 기록
+        yield [("broken", {"evaluation": {}, "company": None})]
+
+    try:
+        documents = [document async for document in farm.render(batches(), {"include_comments": True}, metrics=metrics)]
+    finally:
+        farm.shutdown()
+
+    by_key = {document.key: document for document in documents}
+    assert sorted(by_key) == sorted([f"e{i}" for i in range(12)] + ["broken"])
+    assert all(by_key[f"e{i}"].content.startswith(b"%PDF") for i in range(12))
+    assert not by_key["broken"].ok and by_key["broken"].error
+    assert all(document.worker_pid != os.getpid() for document in documents)
+
+    summary = metrics.summary()
+    assert summary["rendered"] == 12 and summary["failed"] == 1 and summary["workers"] == 2
+    assert summary["render_ms_p50"] <= summary["render_ms_p95"] <= summary["render_ms_max"]
+    assert summary["documents_per_second"] > 0 and summary["bytes"] == sum(len(d.content) for d in documents if d.ok)
+    assert [d["key"] for d in summary["documents"]] == [d.key for d in documents]
+    assert all(d["render_ms"] > 0 for d in summary["documents"])
+
+
+@pytest.mark.asyncio
+async def test_results_stream_while_later_batches_are_fetched():
+    farm = PDFRenderFarm(workers=0, batch_size=2)
+    timeline = []
+
+    async def batches():
+        for number in range(4):
+            await asyncio.sleep(0.15)  # 느린 DB 조회
+            timeline.append(("fetched", number))
+            yield [(f"b{number}-{i}", {"evaluation": {"id": f"b{number}-{i}"}}) for i in range(2)]
+
+    async for document in farm.render(batches(), render=slow_render):
+        timeline.append(("rendered", document.key))
+
+    rendered = [key for event, key in timeline if event == "rendered"]
+    assert sorted(rendered) == sorted(f"b{n}-{i}" for n in range(4) for i in range(2))
+    # 첫 묶음의 결과는 마지막 묶음을 조회하기 전에 전달됨
+    assert timeline.index(("rendered", "b0-0")) < timeline.index(("fetched", 3))
@@ -0,0 +1,127 @@
+"""
+PermissionChecker memoization and bulk lookup tests
+"""
+import pytest
+
+import enhanced_permissions
+from enhanced_permissions import (
+    Permission, PermissionChecker, PermissionMemoMiddleware, ProjectRole, PROJECT_ROLE_PERMISSIONS,
+    ROLE_PERMISSIONS, Role, add_project_member,
+)
+from models import User
+
+
+def make_user(user_id, role="evaluator"):
+    return User(id=user_id, login_id=user_id, email=f"{user_id}@example.com", user_name=user_id,
+                role=role, password_hash="x")
+
+
+@pytest.fixture
+def db(fake_db):
+    fake_db.project_members.docs.append(
+        {"user_id": "u1", "project_id": "p1", "project_role": "project_manager", "is_active": True}
+    )
+    fake_db.user_permissions.docs.append(
+        {"user_id": "u2", "permissions": [Permission.PROJECT_CREATE.value], "is_active": True}
+    )
+    return fake_db
+
+
+def make_checker(db):
+    checker = PermissionChecker(cache_ttl_seconds=60)
+    checker.db = db
+    return checker
+
+
+@pytest.mark.asyncio
+async def test_permission_sets_are_cached_across_checks(db):
+    checker = make_checker(db)
+    user = make_user("u1")
+
+    assert await checker.has_any_permission(user, [Permission.PROJECT_UPDATE], "p1")
+    assert await checker.has_all_permissions(user, [Permission.EVALUATION_SUBMIT, Permission.EVALUATION_ASSIGN], "p1")
+    assert not await checker.has_permission(user, Permission.PROJECT_UPDATE)
+    # p1 조회 1회(멤버+커스텀), 프로젝트 없는 조회 1회(커스텀)
+    assert len(checker.db.project_members.queries) == 1
+    assert len(checker.db.user_permissions.queries) == 2
+    assert checker.get_cache_metrics()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_membership_change_invalidates_cache(db, monkeypatch):
+    checker = make_checker(db)
+    user = make_user("u1")
+    monkeypatch.setattr(enhanced_permissions, "permission_checker", checker)
+
+    before = await checker.get_user_permissions(user, "p1")
+    assert Permission.PROJECT_MANAGE_MEMBERS in before
+    await add_project_member("u1", "p1", ProjectRole.PROJECT_VIEWER)
+    after = await checker.get_user_permissions(user, "p1")
+    assert Permission.PROJECT_MANAGE_MEMBERS not in after
+    assert PROJECT_ROLE_PERMISSIONS[ProjectRole.PROJECT_VIEWER] <= after
+
+
+@pytest.mark.asyncio
+async def test_role_change_is_not_served_from_cache(db):
+    checker = make_checker(db)
+    await checker.get_user_permissions(make_user("u1", "evaluator"))
+    permissions = await checker.get_user_permissions(make_user("u1", "admin"))
+    assert ROLE_PERMISSIONS[Role.ADMIN] <= permissions
+
+
+@pytest.mark.asyncio
+async def test_bulk_lookup_uses_one_query_per_collection(db):
+    checker = make_checker(db)
+    users = [make_user(f"u{i}") for i in range(1, 50)]
+
+    results = await checker.get_permissions_for_users(users, project_id="p1")
+
+    assert len(checker.db.project_members.queries) == 1
+    assert len(checker.db.user_permissions.queries) == 1
+    assert Permission.PROJECT_MANAGE_MEMBERS in results["u1"]
+    assert Permission.PROJECT_CREATE in results["u2"]
+    assert results["u3"] == ROLE_PERMISSIONS[Role.EVALUATOR]
+
+    # 일괄 조회 결과는 개별 조회 캐시에도 반영
+    await checker.get_user_permissions(users[1], "p1")
+    assert len(checker.db.user_permissions.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_request_memo_is_scoped_to_each_request():
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(enhanced_permissions._request_permission_memo.get())
+
+    middleware = PermissionMemoMiddleware(app)
+    await middleware({"type": "http"}, None, None)
+    await middleware({"type": "http"}, None, None)
+
+    assert seen[0] == {} and seen[0] is not seen[1]
+    assert enhanced_permissions._request_permission_memo.get() is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_broadcast_to_other_workers(db, monkeypatch):
+    published = []
+
+    async def publish_message(topic, data):
+        published.append((topic, data))
+
+    monkeypatch.setattr(enhanced_permissions.cache_service, "publish_message", publish_message)
+    this_worker, other_worker = make_checker(db), make_checker(db)
+    user = make_user("u1")
+
+    await this_worker.get_user_permissions(user, "p1")
+    await other_worker.get_user_permissions(user, "p1")
+    await other_worker.get_user_permissions(user)
+    await this_worker.broadcast_invalidation("u1", "p1")
+    assert published == [(enhanced_permissions.PERMISSION_INVALIDATION_TOPIC, {"user_id": "u1", "project_id": "p1"})]
+    assert this_worker.get_cache_metrics()["size"] == 0
+
+    # 다른 워커는 메시지를 받아 해당 프로젝트 항목만 제거, 메시지 유실 가능성(None)이면 전체 제거
+    other_worker.apply_invalidation_message(published[0][1])
+    assert other_worker.get_cache_metrics()["size"] == 1
+    other_worker.apply_invalidation_message(None)
+    assert other_worker.get_cache_metrics()["size"] == 0
@@ -0,0 +1,120 @@
+"""
+Project analytics aggregation tests
+"""
+import math
+
+import pytest
+
+from project_analytics import ProjectStatsService
+
+
+class RecordingService(ProjectStatsService):
+    def __init__(self, db):
+        super().__init__(db)
+        self.refreshed = []
+
+    async def refresh(self, project_id, session=None):
+        self.refreshed.append(project_id)
+        return {}
+
+
+def test_pipeline_groups_templates_and_companies():
+    pipeline = ProjectStatsService.build_pipeline("p1")
+    assert pipeline[0] == {"$match": {"project_id": "p1"}}
+    facets = pipeline[1]["$facet"]
+    assert facets["templates"][1]["$group"]["_id"] == "$template_id"
+    assert facets["templates"][2]["$lookup"]["from"] == "evaluation_templates"
+    assert facets["companies"][0]["$group"]["_id"] == "$company_id"
+
+
+@pytest.mark.asyncio
+async def test_format_computes_average_and_stddev():
+    service = ProjectStatsService(db=None)
+    scores = [70.0, 80.0, 90.0]
+    stats = {
+        "templates": {
+            "t1": {"name": "기술평가", "count": 3, "sum": sum(scores),
+                   "sumsq": sum(s * s for s in scores), "min": 70.0, "max": 90.0},
+        },
+        "companies": {
+            "c1": {"assigned": 2, "submitted": 2},
+            "c2": {"assigned": 2, "submitted": 1},
+            "c3": {"assigned": 1, "submitted": 0},
+        },
+    }
+
+    result = await service.format("p1", stats, total_companies=4)
+
+    template = result["score_analytics"]["기술평가"]
+    assert template["average"] == 80.0
+    assert math.isclose(template["stddev"], math.sqrt(200 / 3))
+    assert result["total_evaluations"] == 3
+    assert result["companies_evaluated"] == 2
+    assert result["completion_rate"] == 50.0
+    assert {"company_id": "c2", "assigned": 2, "submitted": 1, "completion_rate": 50.0} in result["company_completion"]
+
+
+@pytest.mark.asyncio
+async def test_record_submission_increments_existing_stats(fake_db):
+    fake_db.project_stats.docs.append({"project_id": "p1"})
+    service = RecordingService(fake_db)
+    sheet = {"project_id": "p1", "template_id": "t1", "company_id": "c1", "status": "draft"}
+
+    await service.record_submission(sheet, 85.0)
+
+    _, update = fake_db.project_stats.updates[0]
+    assert update["$inc"]["templates.t1.sumsq"] == 85.0 * 85.0
+    assert update["$inc"]["companies.c1.submitted"] == 1
+    assert update["$min"] == {"templates.t1.min": 85.0}
+    stored = fake_db.project_stats.doc(project_id="p1")
+    assert stored["templates"]["t1"]["count"] == 1 and stored["templates"]["t1"]["max"] == 85.0
+    assert service.refreshed == []
+
+
+@pytest.mark.asyncio
+async def test_record_submission_falls_back_to_refresh(fake_db):
+    service = RecordingService(fake_db)
+
+    await service.record_submission({"project_id": "p1", "status": "draft"}, 50.0)
+    await service.record_submission({"project_id": "p1", "status": "submitted"}, 60.0)
+
+    assert service.refreshed == ["p1", "p1"]
+    assert len(fake_db.project_stats.updates) == 1
+
+
+@pytest.mark.asyncio
+async def test_assignments_and_deletions_maintain_company_assigned(fake_db):
+    fake_db.project_stats.docs.append({"project_id": "p1", "templates": {}, "companies": {"c1": {"assigned": 1, "submitted": 1}}})
+    service = RecordingService(fake_db)
+
+    await service.sheets_assigned("p1", {"c1": 2, "c2": 1})
+    await service.sheet_deleted({"project_id": "p1", "company_id": "c2", "status": "draft"})
+    await service.sheets_assigned("p2", {"c9": 1})
+
+    stored = fake_db.project_stats.doc(project_id="p1")
+    assert stored["companies"] == {"c1": {"assigned": 3, "submitted": 1}, "c2": {"assigned": 0}}
+    result = await service.format("p1", stored, total_companies=2)
+    assert {"company_id": "c1", "assigned": 3, "submitted": 1, "completion_rate": 33.3} in result["company_completion"]
+    # 사전 계산 문서가 없는 프로젝트는 만들지 않고, 제출된 평가지 삭제는 전체 재계산
+    assert fake_db.project_stats.doc(project_id="p2") is None
+    await service.sheet_deleted({"project_id": "p1", "company_id": "c1", "status": "submitted"})
+    assert service.refreshed == ["p1"]
+
+
+@pytest.mark.asyncio
+async def test_record_submission_in_a_transaction_uses_the_session(fake_db):
+    fake_db.project_stats.docs.append({"project_id": "p1"})
+    service = RecordingService(fake_db)
+    session = object()
+    sheet = {"project_id": "p1", "template_id": "t1", "company_id": "c1", "status": "draft"}
+
+    await service.record_submission(sheet, 70.0, session=session)
+    assert fake_db.project_stats.sessions == [session]
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("write conflict")
+
+    fake_db.project_stats.update_one = fail
+    await service.record_submission(sheet, 70.0)
+    with pytest.raises(RuntimeError):
+        await service.record_submission(sheet, 70.0, session=session)
@@ -0,0 +1,105 @@
+"""
+Ranged file streaming tests (Range/206, If-Range, ETag/If-None-Match)
+"""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from ranged_file import adaptive_chunk_size, parse_range_header, ranged_file_response
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 400
+FILE_HASH = "ab" * 32
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(PDF_BYTES)
+    app = FastAPI()
+
+    @app.get("/hashed")
+    async def hashed(request: Request):
+        return ranged_file_response(request, str(path), "application/pdf", file_hash=FILE_HASH)
+
+    @app.get("/legacy")
+    async def legacy(request: Request):
+        return ranged_file_response(request, str(path), "application/pdf")
+
+    return TestClient(app)
+
+
+def test_parse_range_header():
+    assert parse_range_header(None, 100) is None
+    assert parse_range_header("bytes=0-9", 100) == (0, 9)
+    assert parse_range_header("bytes=90-", 100) == (90, 99)
+    assert parse_range_header("bytes=-10", 100) == (90, 99)
+    assert parse_range_header("bytes=50-500", 100) == (50, 99)
+    assert parse_range_header("bytes=0-1,5-6", 100) is None
+    with pytest.raises(ValueError):
+        parse_range_header("bytes=100-", 100)
+    assert adaptive_chunk_size(1024) == 64 * 1024
+    assert adaptive_chunk_size(100 * 1024 * 1024) == 1024 * 1024
+
+
+def test_full_and_partial_responses(client):
+    full = client.get("/hashed")
+    assert full.status_code == 200
+    assert full.content == PDF_BYTES
+    assert full.headers["etag"] == f'"{FILE_HASH}"'
+    assert full.headers["accept-ranges"] == "bytes"
+
+    partial = client.get("/hashed", headers={"Range": "bytes=1000-1999"})
+    assert partial.status_code == 206
+    assert partial.content == PDF_BYTES[1000:2000]
+    assert partial.headers["content-range"] == f"bytes 1000-1999/{len(PDF_BYTES)}"
+    assert partial.headers["content-length"] == "1000"
+
+    unsatisfiable = client.get("/hashed", headers={"Range": f"bytes={len(PDF_BYTES)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(PDF_BYTES)}"
+
+
+def test_conditional_requests(client):
+    etag = f'"{FILE_HASH}"'
+    assert client.get("/hashed", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/hashed", headers={"If-None-Match": '"other", W/' + etag}).status_code == 304
+
+    # If-Range 가 일치하면 범위 적용, 다르면 전체 파일
+    assert client.get("/hashed", headers={"Range": "bytes=0-9", "If-Range": etag}).status_code == 206
+    stale = client.get("/hashed", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert stale.status_code == 200 and stale.content == PDF_BYTES
+
+    # 해시가 없는 기존 파일은 약한 ETag - 304 는 가능하지만 If-Range 범위는 무시
+    weak = client.get("/legacy").headers["etag"]
+    assert weak.startswith('W/"')
+    assert client.get("/legacy", headers={"If-None-Match": weak}).status_code == 304
+    assert client.get("/legacy", headers={"Range": "bytes=0-9", "If-Range": weak}).status_code == 200
+
+
+def test_file_download_serves_full_and_ranged_responses(fake_db, tmp_path, monkeypatch):
+    import server
+    from models import User
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "uploads" / "doc.pdf").write_bytes(PDF_BYTES)
+    fake_db.file_metadata.docs.append({
+        "id": "f1", "company_id": "c1", "file_path": "uploads/doc.pdf", "original_filename": "사업계획서.pdf",
+        "file_type": "application/pdf", "file_hash": FILE_HASH,
+    })
+    monkeypatch.setattr(server, "db", fake_db)
+    admin = User(id="a1", login_id="admin", email="admin@example.com", user_name="관리자", role="admin",
+                 password_hash="x")
+    monkeypatch.setitem(server.app.dependency_overrides, server.get_current_user, lambda: admin)
+    client = TestClient(server.app)
+
+    full = client.get("/api/files/f1")
+    assert full.status_code == 200 and full.content == PDF_BYTES
+    assert full.headers["content-disposition"].startswith("attachment; filename*=UTF-8''%EC%82%AC")
+
+    partial = client.get("/api/files/f1", headers={"Range": "bytes=1000-1999"})
+    assert partial.status_code == 206 and partial.content == PDF_BYTES[1000:2000]
+    assert partial.headers["content-range"] == f"bytes 1000-1999/{len(PDF_BYTES)}"
+
+    # 이어받기 요청(첫 범위가 아닌 206)은 다운로드 로그를 다시 남기지 않음
+    assert [log["action"] for log in fake_db.file_access_logs.docs] == ["download_success"]
@@ -0,0 +1,56 @@
+"""
+Batched relation loader tests
+"""
+import pytest
+
+from relation_loader import RelationLoader
+
+
+RELATED_COLLECTIONS = ("projects", "companies", "users", "evaluation_templates")
+
+
+@pytest.fixture
+def db(fake_db):
+    fake_db.projects.docs.append({"id": "p1", "name": "프로젝트"})
+    fake_db.companies.docs.extend([{"id": "c1", "name": "A사"}, {"id": "c2", "name": "B사"}])
+    fake_db.users.docs.append({"id": "u1", "user_name": "평가위원"})
+    fake_db.evaluation_templates.docs.append({"id": "t1", "name": "템플릿"})
+    return fake_db
+
+
+@pytest.mark.asyncio
+async def test_hydrate_uses_one_query_per_relation(db):
+    loader = RelationLoader(db)
+    sheets = [
+        {"id": f"s{i}", "project_id": "p1", "company_id": "c1" if i % 2 else "c2",
+         "evaluator_id": "u1", "template_id": "t1"}
+        for i in range(50)
+    ]
+
+    related = await loader.hydrate(sheets)
+
+    assert len(related) == 50
+    assert related[1]["company"]["name"] == "A사"
+    assert related[2]["company"]["name"] == "B사"
+    assert related[0]["evaluator"]["user_name"] == "평가위원"
+    for name in RELATED_COLLECTIONS:
+        assert len(db[name].queries) == 1
+    assert sorted(db["companies"].queries[0][0]["id"]["$in"]) == ["c1", "c2"]
+
+
+@pytest.mark.asyncio
+async def test_missing_relation_is_none_and_projection_keeps_key(db):
+    loader = RelationLoader(db)
+    files = [{"id": "f1", "company_id": "missing"}]
+
+    related = await loader.hydrate(files, relations=("company",), projections={"company": {"name": 1}})
+
+    assert related == [{"company": None}]
+    assert db["companies"].queries[0][1] == {"name": 1, "id": 1}
+
+
+@pytest.mark.asyncio
+async def test_unknown_relation_raises(db):
+    loader = RelationLoader(db)
+    with pytest.raises(ValueError):
+        await loader.load([], relations=("nope",))
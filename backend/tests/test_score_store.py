@@ -0,0 +1,156 @@
+"""
+Diff-based score store tests (changed-only upserts, version conflicts, optional transaction)
+"""
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import OperationFailure
+
+from score_store import ScoreStore
+
+
+class FakeSession:
+    def __init__(self, supported):
+        self.supported = supported
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def with_transaction(self, callback):
+        if not self.supported:
+            raise OperationFailure("Transaction numbers are only allowed on a replica set member or mongos", code=20)
+        await callback(self)
+
+
+class FakeClient:
+    def __init__(self, supported):
+        self.supported = supported
+
+    async def start_session(self):
+        return FakeSession(self.supported)
+
+
+@pytest.fixture
+def db(fake_db, fake_collection):
+    fake_db.evaluation_scores = fake_collection(unique=[("sheet_id", "item_id")])
+    fake_db.client = FakeClient(supported=False)
+    return fake_db
+
+
+@pytest.mark.asyncio
+async def test_autosave_writes_only_changed_items(db):
+    store = ScoreStore(db)
+    update = {"$set": {"last_modified": "now"}}
+
+    first = await store.save("s1", [
+        {"item_id": "a", "score": 3, "opinion": "좋음"},
+        {"item_id": "b", "score": 4},
+    ], sheet_update=update)
+    assert first == {"changed": 2, "unchanged": 0, "removed": 0, "versions": {"a": 1, "b": 1}}
+    # 트랜잭션 미지원 환경은 자동으로 트랜잭션 없이 실행
+    assert store.transactions == "false"
+
+    # 바뀐 항목이 없으면 아무것도 쓰지 않음
+    idle = await store.save("s1", [
+        {"item_id": "a", "score": 3, "opinion": "좋음", "version": 1},
+        {"item_id": "b", "score": 4, "version": 1},
+    ], sheet_update=update)
+    assert idle == {"changed": 0, "unchanged": 2, "removed": 0, "versions": {"a": 1, "b": 1}}
+    assert [len(ops) for ops in db.evaluation_scores.bulk_writes] == [2]
+    assert len(db.evaluation_sheets.updates) == 1
+
+    partial = await store.save("s1", [
+        {"item_id": "a", "score": 3, "opinion": "좋음", "version": 1},
+        {"item_id": "b", "score": 5, "version": 1},
+    ], sheet_update=update)
+    assert partial == {"changed": 1, "unchanged": 1, "removed": 0, "versions": {"a": 1, "b": 2}}
+    assert [len(ops) for ops in db.evaluation_scores.bulk_writes] == [2, 1]
+    assert len(db.evaluation_scores.docs) == 2
+
+
+
+@pytest.mark.asyncio
+async def test_items_missing_from_a_save_are_deleted_in_the_same_write(db):
+    store = ScoreStore(db)
+    await store.save("s1", [{"item_id": "a", "score": 3}, {"item_id": "b", "score": 4}, {"item_id": "c", "score": 5}])
+    await store.save("s2", [{"item_id": "a", "score": 1}])
+
+    result = await store.save("s1", [{"item_id": "a", "score": 2, "version": 1}])
+
+    assert result == {"changed": 3, "unchanged": 0, "removed": 2, "versions": {"a": 2}}
+    # upsert 와 삭제가 bulk_write 한 번에 함께 실행 (트랜잭션 사용 시 같은 트랜잭션)
+    assert [type(op).__name__ for op in db.evaluation_scores.bulk_writes[-1]] == ["UpdateOne", "DeleteMany"]
+    assert sorted((d["sheet_id"], d["item_id"], d["score"]) for d in db.evaluation_scores.docs) == [
+        ("s1", "a", 2), ("s2", "a", 1),
+    ]
+
+@pytest.mark.asyncio
+async def test_stale_versions_are_rejected_with_current_values(db):
+    store = ScoreStore(db, transactions="false")
+    await store.save("s1", [{"item_id": "a", "score": 3}])
+    await store.save("s1", [{"item_id": "a", "score": 4, "version": 1}])
+
+    with pytest.raises(HTTPException) as exc_info:
+        await store.save("s1", [{"item_id": "a", "score": 5, "version": 1}])
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail["conflicts"] == [{"item_id": "a", "version": 2, "score": 4, "opinion": ""}]
+
+    # 읽은 뒤 다른 요청이 먼저 삽입한 경우 - upsert 가 고유 키에 걸려 충돌로 보고
+    stale_store = ScoreStore(db, transactions="false")
+    original_find = db.evaluation_scores.find
+    db.evaluation_scores.find = lambda query, projection=None: original_find({"sheet_id": "unread"}, projection)
+    with pytest.raises(HTTPException) as exc_info:
+        await stale_store.save("s1", [{"item_id": "a", "score": 9}])
+    db.evaluation_scores.find = original_find
+    assert exc_info.value.detail["conflicts"] == [{"item_id": "a"}]
+    assert db.evaluation_scores.docs[0]["score"] == 4
+
+    with pytest.raises(HTTPException) as exc_info:
+        await store.save("s1", [{"item_id": "a"}])
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_submit_runs_scores_and_status_in_one_transaction(db):
+    db.client = FakeClient(supported=True)
+    store = ScoreStore(db)
+    update = {"$set": {"status": "submitted"}}
+
+    result = await store.save("s1", [{"item_id": "a", "score": 3}], sheet_update=update, always_update_sheet=True)
+    assert result["changed"] == 1
+    session = db.evaluation_scores.sessions[0]
+    assert isinstance(session, FakeSession)
+    assert db.evaluation_sheets.updates == [({"id": "s1"}, update)]
+    assert db.evaluation_sheets.sessions == [session]
+
+    # 점수 변경이 없어도 제출 시에는 상태를 갱신
+    await store.save("s1", [{"item_id": "a", "score": 3, "version": 1}], sheet_update=update, always_update_sheet=True)
+    assert [len(ops) for ops in db.evaluation_scores.bulk_writes] == [1]
+    assert len(db.evaluation_sheets.updates) == 2
+
+
+@pytest.mark.asyncio
+async def test_related_writes_share_the_submit_transaction(db):
+    db.client = FakeClient(supported=True)
+    store = ScoreStore(db)
+    sessions = []
+
+    async def count_submission(session):
+        sessions.append(session)
+        await db.dashboard_counters.update_one({"_id": "global"}, {"$inc": {"submitted": 1}}, upsert=True, session=session)
+
+    await store.save("s1", [{"item_id": "a", "score": 3}], sheet_update={"$set": {"status": "submitted"}},
+                     always_update_sheet=True, related_writes=count_submission)
+
+    # 평가지 상태 변경과 카운터 증분이 같은 트랜잭션으로 커밋
+    assert sessions == db.evaluation_sheets.sessions == db.dashboard_counters.sessions
+    assert isinstance(sessions[0], FakeSession)
+
+    # 트랜잭션 미지원 환경은 평가지 갱신 직후 session 없이 실행
+    fallback = ScoreStore(db, transactions="false")
+    await fallback.save("s2", [{"item_id": "a", "score": 3}], sheet_update={"$set": {"status": "submitted"}},
+                        always_update_sheet=True, related_writes=count_submission)
+    assert sessions[1] is None
+    assert db.dashboard_counters.doc(_id="global")["submitted"] == 2
@@ -0,0 +1,83 @@
+"""
+Vectorized scoring engine tests (sheet totals, bonus items, project criterion statistics)
+"""
+import math
+
+import pytest
+
+from scoring_engine import score_project, score_sheet, summarize, template_items
+from stub_services import calculate_evaluation_scores
+
+ITEMS = [
+    {"id": "tech", "name": "기술성", "max_score": 30, "weight": 0.5},
+    {"id": "market", "name": "시장성", "max_score": 20, "weight": 1.5},
+    {"id": "team", "name": "팀 역량", "max_score": 10, "weight": 1.0},
+    {"id": "bonus", "name": "가점", "max_score": 5, "weight": 1.0, "bonus": True},
+]
+
+
+def test_score_sheet_totals_follow_template_order():
+    scores = [
+        {"item_id": "team", "score": 8, "opinion": "좋음"},
+        {"item_id": "tech", "score": 20, "opinion": ""},
+        {"item_id": "bonus", "score": 3},
+        {"item_id": "unknown", "score": 100},
+    ]
+
+    result = score_sheet(ITEMS, scores)
+
+    assert [row["item_id"] for row in result.items] == ["tech", "market", "team", "bonus"]
+    assert result.items[1]["score"] is None and result.items[1]["weighted_score"] is None
+    assert result.items[2]["score_doc"]["opinion"] == "좋음"
+    assert result.raw_total == 31
+    assert result.weighted_total == 20 * 0.5 + 8 * 1.0
+    assert result.bonus_total == 3
+    assert result.answered == 3 and result.answered_weight == 1.5
+    assert math.isclose(result.weighted_average, 18 / 1.5)
+    assert result.max_weighted == 30 * 0.5 + 20 * 1.5 + 10
+    assert math.isclose(result.normalized, 18 / 55 * 100)
+
+
+@pytest.mark.asyncio
+async def test_criteria_templates_and_mapping_scores():
+    template = {"criteria": [{"id": "a", "weight": 2.0, "max_score": 10}, {"id": "b", "max_score": 10}]}
+    result = score_sheet(template_items(template), {"a": 5, "b": {"score": 4}})
+    assert result.weighted_total == 14 and result.normalized == 14 / 30 * 100
+
+    # 템플릿이 없으면 단순 합계/평균
+    total, weighted = await calculate_evaluation_scores("s1", [{"item_id": "x", "score": 6}, {"item_id": "y", "score": 8}])
+    assert (total, weighted) == (14, 7)
+    assert await calculate_evaluation_scores("s1", []) == (0.0, 0.0)
+
+
+def test_score_project_matches_per_sheet_results():
+    sheet_scores = {
+        "s1": {"tech": 30, "market": 10, "team": 5},
+        "s2": {"tech": 10, "market": 20},
+        "s3": {},
+    }
+    flat = [
+        {"sheet_id": sheet_id, "item_id": item_id, "score": score}
+        for sheet_id, scores in sheet_scores.items()
+        for item_id, score in scores.items()
+    ]
+
+    result = score_project(ITEMS, flat, sheet_ids=list(sheet_scores))
+
+    for sheet_id, scores in sheet_scores.items():
+        single = score_sheet(ITEMS, scores)
+        assert math.isclose(result["sheets"][sheet_id]["weighted_total"], single.weighted_total)
+        assert math.isclose(result["sheets"][sheet_id]["weighted_average"], single.weighted_average)
+        assert result["sheets"][sheet_id]["answered"] == single.answered
+
+    tech = result["criteria"]["tech"]
+    assert tech["count"] == 2 and tech["average"] == 20 and tech["min"] == 10 and tech["max"] == 30
+    assert tech["stddev"] == 10 and math.isclose(tech["achievement_rate"], 20 / 30 * 100)
+    assert result["criteria"]["bonus"] == {
+        "name": "가점", "count": 0, "average": 0.0, "min": 0.0, "max": 0.0, "stddev": 0.0,
+        "achievement_rate": 0.0, "weight": 1.0, "max_score": 5.0,
+    }
+    assert result["totals"]["count"] == 3
+
+    assert summarize([70, None, 90]) == {"count": 2, "average": 80.0, "min": 70.0, "max": 90.0, "stddev": 10.0}
+    assert summarize([])["count"] == 0
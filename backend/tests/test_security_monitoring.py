@@ -0,0 +1,160 @@
+"""
+Security event pipeline tests (non-blocking logging, batched Redis/Mongo writes, coalescing, overload shedding)
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+
+import pytest
+
+from security_monitoring import SecurityEvent, SecurityEventType, SecurityMonitor, SecuritySeverity
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    async def execute(self):
+        await asyncio.sleep(self.redis.latency)
+        self.redis.executed.append(self.commands)
+
+
+class FakeRedis:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.executed = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def make_monitor(fake_collection):
+    def make(latency=0.0, **settings):
+        monitor = SecurityMonitor(connect=False)
+        monitor.logger = logging.getLogger("tests.security_monitoring")
+        monitor.logger.propagate = False
+        monitor.redis_client = FakeRedis(latency)
+        monitor.events_collection = fake_collection(latency=latency)
+        for name, value in settings.items():
+            setattr(monitor, name, value)
+        return monitor
+    return make
+
+
+def make_event(monitor, ip="10.0.0.1", event_type=SecurityEventType.SUSPICIOUS_ACTIVITY,
+               severity=SecuritySeverity.MEDIUM, description="test"):
+    return SecurityEvent(
+        event_id=monitor.generate_event_id(), event_type=event_type, severity=severity,
+        timestamp=datetime.utcnow(), user_id=None, ip_address=ip, user_agent="pytest",
+        endpoint="/api/test", method="GET", payload=None, response_code=0, description=description,
+    )
+
+
+@pytest.mark.asyncio
+async def test_logging_never_waits_on_storage(make_monitor):
+    monitor = make_monitor(latency=0.2, flush_interval=0.05, batch_size=100)
+
+    started = time.perf_counter()
+    for i in range(250):
+        await monitor.log_security_event(make_event(monitor, ip=f"10.0.{i // 100}.{i % 100}"))
+    await monitor.log_security_event(make_event(
+        monitor, ip="10.9.9.9", event_type=SecurityEventType.SQL_INJECTION_ATTEMPT, severity=SecuritySeverity.HIGH
+    ))
+    elapsed = time.perf_counter() - started
+    # storage is never awaited in the request path, but threat intelligence updates immediately
+    suspicious = monitor.is_ip_suspicious("10.9.9.9")
+    await monitor.stop()
+
+    assert elapsed < 0.1 and suspicious
+    collection, redis = monitor.events_collection, monitor.redis_client
+    assert len(collection.docs) == 251
+    # one insert_many and one Redis pipeline round trip per batch
+    assert len(collection.inserts) == len(redis.executed) <= 4
+    first_batch = [name for name, _ in redis.executed[0]]
+    assert first_batch[:2] == ["lpush", "ltrim"]
+    published = [json.loads(args[1]) for batch in redis.executed for name, args in batch if name == "publish"]
+    assert [alert["ip_address"] for alert in published] == ["10.9.9.9"]
+    stats = monitor.get_pipeline_stats()
+    assert stats["written"] == 251 and stats["queue_depth"] == 0 and stats["writer_running"] is False
+
+
+@pytest.mark.asyncio
+async def test_duplicates_per_ip_are_coalesced_within_window(make_monitor):
+    monitor = make_monitor(coalesce_seconds=60)
+
+    for _ in range(50):
+        await monitor.log_security_event(make_event(monitor, ip="10.0.0.7"))
+    await monitor.log_security_event(make_event(monitor, ip="10.0.0.8"))
+    await monitor.flush()
+    # duplicates of an already written event only bump its count
+    for _ in range(10):
+        await monitor.log_security_event(make_event(monitor, ip="10.0.0.7"))
+    await monitor.flush()
+    # after the window closes the next duplicate is a new event
+    for window in monitor._windows.values():
+        window.window_end = 0
+    await monitor.log_security_event(make_event(monitor, ip="10.0.0.7"))
+    await monitor.stop()
+
+    docs = monitor.events_collection.docs
+    # the stored event includes the 10 duplicates counted after it was written
+    assert [(doc["ip_address"], doc["occurrences"]) for doc in docs] == [("10.0.0.7", 60), ("10.0.0.8", 1), ("10.0.0.7", 1)]
+    (update,) = monitor.events_collection.bulk_writes[0]
+    assert update._filter == {"event_id": docs[0]["event_id"]}
+    assert update._doc["$inc"] == {"occurrences": 10}
+    assert monitor.get_pipeline_stats()["coalesced"] == 59
+
+
+@pytest.mark.asyncio
+async def test_higher_severity_duplicate_is_not_folded_into_lower(make_monitor):
+    monitor = make_monitor(coalesce_seconds=60)
+
+    for severity in (SecuritySeverity.MEDIUM, SecuritySeverity.HIGH, SecuritySeverity.HIGH, SecuritySeverity.MEDIUM):
+        await monitor.log_security_event(make_event(
+            monitor, ip="10.0.0.9", event_type=SecurityEventType.UNAUTHORIZED_ACCESS, severity=severity
+        ))
+    await monitor.stop()
+
+    # a 403 HIGH within the window of a 401 MEDIUM from the same IP is stored and alerted on its own
+    docs = monitor.events_collection.docs
+    assert [(doc["severity"], doc["occurrences"]) for doc in docs] == [("medium", 2), ("high", 2)]
+    published = [json.loads(args[1]) for batch in monitor.redis_client.executed for name, args in batch if name == "publish"]
+    assert [alert["severity"] for alert in published] == ["high"]
+
+
+@pytest.mark.asyncio
+async def test_overload_samples_low_and_keeps_high_severity(make_monitor):
+    monitor = make_monitor(queue_size=60, sample_watermark=0.5, low_sample_rate=10, coalesce_seconds=0)
+
+    monitor._stopping = True  # fill the buffer with the writer stopped
+    for i in range(300):
+        await monitor.log_security_event(make_event(monitor, ip=f"10.1.0.{i}", severity=SecuritySeverity.LOW))
+    for i in range(20):
+        await monitor.log_security_event(make_event(
+            monitor, ip=f"10.2.0.{i}", event_type=SecurityEventType.XSS_ATTEMPT, severity=SecuritySeverity.CRITICAL
+        ))
+    await monitor.log_security_event(make_event(monitor, ip="10.3.0.1", severity=SecuritySeverity.MEDIUM))
+    depth = len(monitor._buffer)
+    await monitor.flush()
+
+    stats = monitor.get_pipeline_stats()
+    assert depth == 60
+    # everything is kept up to the watermark (30), then 1 in 10 low severity events (27 of 270)
+    assert stats["sampled_out"] == 243
+    # once full, critical events evict the oldest low severity ones and medium events are dropped
+    assert stats["dropped_critical"] == 0 and stats["dropped_low"] == 17 and stats["dropped_medium"] == 1
+    severities = [doc["severity"] for doc in monitor.events_collection.docs]
+    assert severities.count("critical") == 20 and len(severities) == 60
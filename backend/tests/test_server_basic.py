@@ -9,7 +9,7 @@ import os
 # Add the backend directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from server import app
+from server import api_router, app
 
 client = TestClient(app)
 
@@ -37,4 +37,10 @@ def test_openapi():
     response = client.get("/openapi.json")
     assert response.status_code == 200
     data = response.json()
-    assert "openapi" in data
\ No newline at end of file
+    assert "openapi" in data
+
+def test_static_file_routes_precede_file_id():
+    """/files/access-logs and /files/security-analytics must not resolve to /files/{file_id}"""
+    paths = [route.path for route in api_router.routes]
+    for static_path in ("/files/access-logs", "/files/security-analytics"):
+        assert paths.index(static_path) < paths.index("/files/{file_id}")
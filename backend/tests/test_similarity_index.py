@@ -0,0 +1,101 @@
+"""
+Similarity index tests (Korean character shingles, MinHash/LSH candidate queries, project all-pairs, upload indexing)
+"""
+import random
+import time
+
+import pytest
+
+from similarity_index import MinHasher, SimilarityIndex, estimate_similarity, shingle_hashes
+
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호"
+
+
+def random_text(rng, length=1500):
+    words = ("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))) for _ in range(length // 3))
+    return " ".join(words)[:length]
+
+
+def test_shingles_ignore_spacing_and_signatures_estimate_jaccard():
+    rng = random.Random(7)
+    original = random_text(rng)
+    respaced = original.replace(" ", "").replace("가", "가 ")
+    assert shingle_hashes(original).tolist() == shingle_hashes(respaced).tolist()
+
+    hasher = MinHasher()
+    half = original[: len(original) // 2] + random_text(rng, 750)
+    a, b = shingle_hashes(original), shingle_hashes(half)
+    exact = len(set(a.tolist()) & set(b.tolist())) / len(set(a.tolist()) | set(b.tolist()))
+    estimate = estimate_similarity(hasher.signature(original), hasher.signature(half))[0]
+
+    assert abs(estimate - exact) < 0.12
+    assert estimate_similarity(hasher.signature(original), hasher.signature(random_text(rng)))[0] < 0.1
+    assert hasher.signature("  ... ") is None
+
+
+@pytest.mark.asyncio
+async def test_query_checks_only_lsh_candidates(fake_db):
+    rng = random.Random(11)
+    index = SimilarityIndex(db=fake_db)
+    texts = [random_text(rng, 600) for _ in range(300)]
+
+    for i, text in enumerate(texts):
+        await index.add_document(f"f{i}", text, project_id="p1" if i < 250 else "p2", company_id=f"c{i}")
+    copied = texts[42][:500] + " 일부 문장을 바꾸어 제출한 사업계획서입니다"
+    started = time.perf_counter()
+    found = await index.query(copied, project_id="p1")
+    elapsed = time.perf_counter() - started
+    own = await index.query(copied, project_id="p1", exclude_company_id="c42")
+    other_project = await index.query(texts[260], project_id="p1")
+
+    assert found["total_documents_checked"] == 250
+    assert found["candidates_checked"] < 10
+    assert found["similarities"][0]["file_id"] == "f42"
+    assert found["similarities"][0]["similarity_score"] > 0.5 and found["max_similarity"] > 0.5
+    assert elapsed < 0.5
+    assert own["similar_documents_found"] == 0
+    assert other_project["similar_documents_found"] == 0 and other_project["overall_risk"] == "low"
+
+
+@pytest.mark.asyncio
+async def test_project_pairs_and_upload_indexing(fake_db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import file_processor as file_processor_module
+
+    rng = random.Random(3)
+    shared = random_text(rng, 900)
+    contents = {
+        "a.txt": shared,
+        "b.txt": shared[:800] + random_text(rng, 100),
+        "c.txt": random_text(rng, 900),
+        "d.txt": shared,
+    }
+
+    async def fake_extract(path, file_info):
+        assert file_info["extension"] == ".txt"
+        return contents[path.name]
+
+    monkeypatch.setattr(file_processor_module.file_processor, "_extract_text_async", fake_extract)
+    companies = [{"id": "c1", "project_id": "p1"}, {"id": "c2", "project_id": "p1"}, {"id": "c3", "project_id": "p1"}]
+    files = [
+        {"id": "fa", "company_id": "c1", "original_filename": "a.txt", "file_path": "uploads/a.txt"},
+        {"id": "fb", "company_id": "c2", "original_filename": "b.txt", "file_path": "uploads/b.txt"},
+        {"id": "fc", "company_id": "c3", "original_filename": "c.txt", "file_path": "uploads/c.txt"},
+        {"id": "fd", "company_id": "c1", "original_filename": "d.txt", "file_path": "uploads/d.txt"},
+    ]
+    fake_db.companies.docs.extend(companies)
+    fake_db.file_metadata.docs.extend(files)
+    index = SimilarityIndex(db=fake_db)
+
+    await index.index_file(files[0], "p1")
+    stats = await index.index_project("p1")
+    pairs = await index.find_similar_pairs("p1")
+    with_same_company = await index.find_similar_pairs("p1", exclude_same_company=False)
+
+    assert stats == {"files": 4, "indexed": 3, "skipped": 1}
+    assert pairs["documents_indexed"] == 4
+    assert {tuple(sorted(p["file_ids"])) for p in pairs["pairs"]} == {("fa", "fb"), ("fb", "fd")}
+    assert all(p["risk_level"] == "high" for p in pairs["pairs"])
+    # 같은 회사의 두 파일(fa, fd)은 기본적으로 제외
+    assert with_same_company["pairs"][0]["similarity_score"] == 1.0
+    assert sorted(with_same_company["pairs"][0]["file_ids"]) == ["fa", "fd"]
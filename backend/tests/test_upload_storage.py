@@ -0,0 +1,54 @@
+"""
+Streaming upload storage tests
+"""
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from upload_storage import content_path, store_upload
+
+PDF_BYTES = b"%PDF-1.4\n" + b"0" * 5000
+
+
+def make_upload(data, filename="report.pdf"):
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+@pytest.mark.asyncio
+async def test_store_upload_hashes_and_content_addresses(tmp_path):
+    stored = await store_upload(make_upload(PDF_BYTES), ".pdf", upload_dir=tmp_path, chunk_size=1024)
+
+    digest = hashlib.sha256(PDF_BYTES).hexdigest()
+    assert stored.sha256 == digest
+    assert stored.size == len(PDF_BYTES)
+    assert stored.file_path == str(content_path(digest, ".pdf", tmp_path))
+    assert open(stored.file_path, "rb").read() == PDF_BYTES
+    assert not stored.deduplicated
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_identical_content_is_stored_once(tmp_path):
+    first = await store_upload(make_upload(PDF_BYTES), ".pdf", upload_dir=tmp_path)
+    second = await store_upload(make_upload(PDF_BYTES, "copy.pdf"), ".pdf", upload_dir=tmp_path)
+
+    assert second.deduplicated and second.file_path == first.file_path
+    assert len(list((tmp_path / "objects").rglob("*.pdf"))) == 1
+
+
+@pytest.mark.parametrize("data, extension, status_code", [
+    (b"%PDF-1.4\n" + b"0" * 4096, ".pdf", 413),
+    (b"PK\x03\x04 not a pdf", ".pdf", 415),
+    (b"MZ\x90\x00 executable", ".txt", 415),
+    (b"", ".pdf", 400),
+])
+@pytest.mark.asyncio
+async def test_rejected_uploads_leave_no_files(tmp_path, data, extension, status_code):
+    with pytest.raises(HTTPException) as exc_info:
+        await store_upload(make_upload(data), extension, max_size=2048, upload_dir=tmp_path, chunk_size=1024)
+
+    assert exc_info.value.status_code == status_code
+    assert list((tmp_path / "tmp").iterdir()) == []
+    assert not (tmp_path / "objects").exists()
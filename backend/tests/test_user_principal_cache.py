@@ -0,0 +1,87 @@
+"""
+Authenticated user principal cache tests
+"""
+import time
+
+import pytest
+
+import security
+from security import UserPrincipalCache, get_user_principal, invalidate_user_principal, user_principal_cache
+
+
+@pytest.fixture
+def principal_db(fake_db):
+    security.set_database(fake_db)
+    user_principal_cache.clear()
+    yield fake_db
+    security.set_database(None)
+    user_principal_cache.clear()
+
+
+def make_user_doc(**overrides):
+    doc = {
+        "_id": "u1", "login_id": "kim", "email": "kim@example.com", "user_name": "김평가",
+        "role": "evaluator", "is_active": True, "password_hash": "x",
+    }
+    doc.update(overrides)
+    return doc
+
+
+def test_cache_is_bounded_and_expires():
+    cache = UserPrincipalCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 0, "user-a")
+    cache.set("b", 0, "user-b")
+    cache.get("a", 0)
+    cache.set("c", 0, "user-c")
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0) == "user-a"
+
+    cache._entries[("a", 0)] = ("user-a", time.monotonic() - 1)
+    assert cache.get("a", 0) is None
+    assert cache.get_metrics()["hits"] == 2 and cache.get_metrics()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_principal_lookup_hits_cache_until_invalidated(principal_db):
+    principal_db.users.docs.append(make_user_doc())
+
+    first = await get_user_principal("u1", 0)
+    second = await get_user_principal("u1", 0)
+    assert first is second and first.login_id == "kim"
+    assert principal_db.users.calls["find_one"] == 1
+
+    principal_db.users.doc(_id="u1")["is_active"] = False
+    await invalidate_user_principal("u1")
+    assert (await get_user_principal("u1", 0)).is_active is False
+    assert principal_db.users.calls["find_one"] == 2
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_version_is_rejected(principal_db):
+    principal_db.users.docs.append(make_user_doc(token_version=1))
+
+    assert await get_user_principal("u1", 0) is None
+    assert await get_user_principal("u1", 1) is not None
+    assert ("u1", 0) not in user_principal_cache._entries
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_broadcast_to_other_workers(monkeypatch):
+    published = []
+
+    async def publish_message(topic, data):
+        published.append((topic, data))
+
+    monkeypatch.setattr(security.cache_service, "publish_message", publish_message)
+    other_worker = UserPrincipalCache()
+    other_worker.set("u1", 0, "user-u1")
+    other_worker.set("u2", 0, "user-u2")
+
+    await invalidate_user_principal("u1")
+    assert published == [(security.USER_PRINCIPAL_INVALIDATION_TOPIC, {"user_id": "u1"})]
+
+    # 다른 워커는 메시지를 받아 해당 사용자만 제거, 메시지 유실 가능성(None)이면 전체 제거
+    other_worker.apply_invalidation_message(published[0][1])
+    assert other_worker.get("u1", 0) is None and other_worker.get("u2", 0) == "user-u2"
+    other_worker.apply_invalidation_message(None)
+    assert other_worker.get_metrics()["size"] == 0
@@ -0,0 +1,148 @@
+"""
+Streaming ZIP tests (incremental entries with data descriptors, duplicate names, content-addressed archive cache)
+"""
+import asyncio
+import io
+import os
+import zipfile
+
+import pytest
+from starlette.requests import Request
+
+from zip_stream import ZipArchiveCache, stream_zip, zip_download_response
+
+
+def make_request(headers=None):
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": raw})
+
+
+async def read_body(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+@pytest.mark.asyncio
+async def test_entries_are_emitted_as_they_are_produced():
+    timeline = []
+    documents = {f"기업{i}_평가표.pdf": os.urandom(200) + b"%PDF" * 20000 for i in range(3)}
+
+    async def entries():
+        for name, data in documents.items():
+            timeline.append(("produced", name))
+            yield name, data
+        yield "기업0_평가표.pdf", b"second sheet for the same company"
+
+    chunks = []
+    async for chunk in stream_zip(entries()):
+        timeline.append(("sent", len(chunks)))
+        chunks.append(chunk)
+
+    # 항목마다 청크 하나 + 중앙 디렉터리, 첫 청크는 두 번째 항목을 만들기 전에 전송됨
+    assert len(chunks) == 5
+    assert chunks[0].startswith(b"PK\x03\x04")
+    assert timeline.index(("sent", 0)) < timeline.index(("produced", "기업1_평가표.pdf"))
+    # 청크는 누적되지 않음 (각 항목의 압축 크기 수준)
+    assert all(len(chunk) < 10000 for chunk in chunks)
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    assert archive.namelist() == list(documents) + ["기업0_평가표 (2).pdf"]
+    for info in archive.infolist():
+        assert info.flag_bits & 0x08  # 데이터 디스크립터 사용
+        assert info.compress_type == zipfile.ZIP_DEFLATED
+    assert archive.read("기업1_평가표.pdf") == documents["기업1_평가표.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_download_is_cached_by_content_and_served_from_disk(tmp_path):
+    cache = ZipArchiveCache(tmp_path / "zip_cache")
+    produced = []
+
+    def entries(tag=b""):
+        async def generate():
+            for i in range(3):
+                produced.append(i)
+                yield f"sheet{i}.pdf", b"%PDF-1.4 sheet " + tag + bytes([i]) * 5000
+        return generate()
+
+    key = cache.request_key({"kind": "print-bulk", "evaluations": [["e1", "2024-05-01"]]})
+    first = zip_download_response(make_request(), entries(), "평가표.zip", cache, key)
+    first_body = await read_body(first)
+
+    second = zip_download_response(make_request(), entries(), "평가표.zip", cache, key)
+    second_body = await read_body(second)
+
+    revalidated = zip_download_response(
+        make_request({"If-None-Match": second.headers["etag"]}), entries(), "평가표.zip", cache, key
+    )
+
+    # 다른 요청 키라도 내용이 같으면 아카이브는 하나만 저장
+    other_key = cache.request_key({"kind": "print-bulk", "evaluations": [["e1", "2024-05-02"]]})
+    # 일부 항목이 실패한 아카이브는 캐시하지 않음
+    partial = zip_download_response(make_request(), entries(b"partial"), "평가표.zip", cache, other_key,
+                                    store=lambda: False)
+    await read_body(partial)
+
+    assert first.headers["x-export-cache"] == "miss"
+    assert first.headers["content-disposition"].startswith("attachment; filename*=UTF-8''%ED%8F%89")
+    assert second.headers["x-export-cache"] == "hit" and second_body == first_body
+    assert second.headers["etag"].strip('"') == cache.lookup(cache.request_key(
+        {"kind": "print-bulk", "evaluations": [["e1", "2024-05-01"]]}
+    )).sha256
+    assert revalidated.status_code == 304
+    # 캐시 적중 시에는 항목을 다시 만들지 않음
+    assert produced == [0, 1, 2, 0, 1, 2]
+    assert cache.lookup(other_key) is None
+    assert list((tmp_path / "zip_cache" / "tmp").iterdir()) == []
+    assert len(list((tmp_path / "zip_cache" / "objects").glob("*/*.zip"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_interrupted_stream_is_not_cached_and_cache_is_size_capped(tmp_path):
+    cache = ZipArchiveCache(tmp_path / "zip_cache", max_bytes=35000)
+
+    async def failing():
+        yield "a.pdf", b"a" * 100
+        raise RuntimeError("render failed")
+
+    writer = cache.open_writer("broken")
+    try:
+        async for _ in stream_zip(failing(), writer):
+            pass
+    except RuntimeError:
+        pass
+
+    keys = []
+    for i in range(4):
+        key = cache.request_key({"archive": i})
+        keys.append(key)
+        # 압축되지 않는 내용 약 10KB
+        async for _ in stream_zip([(f"{i}.bin", os.urandom(10000))], cache.open_writer(key)):
+            pass
+        await asyncio.sleep(0.03)  # 파일 시각 해상도보다 길게
+        if i == 1:
+            cache.lookup(keys[0])  # 최근 사용 - 정리 대상에서 뒤로
+            await asyncio.sleep(0.03)
+
+    assert cache.lookup("broken") is None
+    assert list((tmp_path / "zip_cache" / "tmp").iterdir()) == []
+    # 한도(35KB)를 넘으면 가장 오래 사용하지 않은 아카이브부터 삭제 (먼저 저장된 0번은 최근에 사용됨)
+    assert [cache.lookup(key) is not None for key in keys] == [True, False, True, True]
+
+
+def test_writer_opens_lazily_and_lookup_tolerates_pruned_objects(tmp_path):
+    cache = ZipArchiveCache(tmp_path / "zip_cache")
+
+    # 기록 전에 버려진 작성기는 임시 파일을 만들지 않음
+    unused = cache.open_writer("unused")
+    assert not (tmp_path / "zip_cache" / "tmp").exists()
+    unused.abort()
+
+    writer = cache.open_writer("k")
+    writer.write(b"PK data")
+    archive = writer.commit()
+    assert cache.lookup("k").sha256 == archive.sha256
+
+    # 참조만 남고 아카이브가 정리되었으면 None
+    archive.path.unlink()
+    assert cache.lookup("k") is None
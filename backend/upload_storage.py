@@ -0,0 +1,163 @@
+"""
+Streaming Upload Storage
+업로드 파일을 메모리에 통째로 올리지 않고 청크 단위로 임시 파일에 기록하는 업로드 파이프라인
+
+- 청크마다 SHA-256 을 증분 계산하고, 크기 제한은 스트리밍 도중에 검사
+- 첫 청크의 매직 바이트로 확장자와 실제 내용의 일치 여부 검사
+- 완료 후 원자적 rename 으로 콘텐츠 주소(SHA-256) 경로에 저장 - 동일 파일은 한 번만 저장
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+from pymongo import ASCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = Path("uploads")
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB
+
+# 확장자별 허용 시그니처 (None 이면 텍스트 파일로 간주)
+MAGIC_SIGNATURES: Dict[str, Optional[Tuple[bytes, ...]]] = {
+    ".pdf": (b"%PDF-",),
+    ".png": (b"\x89PNG\r\n\x1a\n",),
+    ".jpg": (b"\xff\xd8\xff",),
+    ".jpeg": (b"\xff\xd8\xff",),
+    ".docx": (b"PK\x03\x04",),
+    ".xlsx": (b"PK\x03\x04",),
+    ".doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),
+    ".xls": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),
+    ".txt": None,
+}
+
+# 확장자와 무관하게 거부하는 실행 파일 시그니처
+BLOCKED_SIGNATURES: Tuple[bytes, ...] = (
+    b"MZ",  # PE 실행 파일
+    b"\x7fELF",  # ELF 실행 파일
+)
+
+
+@dataclass
+class StoredUpload:
+    """저장된 업로드 파일 정보"""
+    sha256: str
+    size: int
+    file_path: str
+    extension: str
+    deduplicated: bool
+
+
+def content_path(sha256: str, extension: str, upload_dir: Path = UPLOAD_DIR) -> Path:
+    """SHA-256 기반 저장 경로 (uploads/objects/ab/abcdef....pdf)"""
+    return upload_dir / "objects" / sha256[:2] / f"{sha256}{extension}"
+
+
+def check_magic_bytes(head: bytes, extension: str) -> None:
+    """첫 청크의 시그니처가 확장자와 일치하는지 검사"""
+    if any(head.startswith(signature) for signature in BLOCKED_SIGNATURES):
+        raise HTTPException(status_code=415, detail="실행 파일은 업로드할 수 없습니다.")
+
+    signatures = MAGIC_SIGNATURES.get(extension)
+    if signatures is None:
+        # 텍스트 파일에는 NUL 바이트가 없어야 함
+        if b"\x00" in head:
+            raise HTTPException(status_code=415, detail="파일 내용이 확장자와 일치하지 않습니다.")
+        return
+
+    if not any(head.startswith(signature) for signature in signatures):
+        raise HTTPException(status_code=415, detail="파일 내용이 확장자와 일치하지 않습니다.")
+
+
+async def store_upload(
+    upload: UploadFile,
+    extension: str,
+    max_size: int = MAX_UPLOAD_SIZE,
+    upload_dir: Path = UPLOAD_DIR,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> StoredUpload:
+    """업로드 스트림을 청크 단위로 저장하고 콘텐츠 주소 경로로 이동
+
+    크기 초과(413), 빈 파일(400), 시그니처 불일치(415) 시 HTTPException 을 발생시키며
+    임시 파일은 항상 정리됩니다.
+    """
+    tmp_dir = upload_dir / "tmp"
+    try:
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.error(f"Failed to create upload temp directory: {e}")
+        raise HTTPException(status_code=500, detail="파일 저장 공간을 준비할 수 없습니다.")
+
+    tmp_path = tmp_dir / f"{uuid.uuid4().hex}.part"
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                if size == 0:
+                    check_magic_bytes(chunk, extension)
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"파일 크기가 {max_size // (1024 * 1024)}MB를 초과합니다."
+                    )
+                hasher.update(chunk)
+                await f.write(chunk)
+
+        if size == 0:
+            raise HTTPException(status_code=400, detail="빈 파일은 업로드할 수 없습니다.")
+
+        sha256 = hasher.hexdigest()
+        final_path = content_path(sha256, extension, upload_dir)
+        deduplicated = final_path.exists()
+        if deduplicated:
+            tmp_path.unlink()
+        else:
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            # 같은 파일시스템 내 rename 이므로 부분 기록된 파일이 노출되지 않음
+            os.replace(tmp_path, final_path)
+
+        return StoredUpload(
+            sha256=sha256,
+            size=size,
+            file_path=str(final_path),
+            extension=extension,
+            deduplicated=deduplicated,
+        )
+    except HTTPException:
+        _discard(tmp_path)
+        raise
+    except OSError as e:
+        _discard(tmp_path)
+        logger.error(f"Failed to store upload {upload.filename}: {e}")
+        raise HTTPException(status_code=500, detail="파일 저장에 실패했습니다.")
+
+
+def _discard(path: Path) -> None:
+    try:
+        if path.exists():
+            path.unlink()
+    except OSError:
+        pass  # 임시 파일 정리 실패는 무시
+
+
+async def ensure_upload_indexes(db) -> None:
+    """해시 기반 중복 업로드 조회용 인덱스 생성"""
+    try:
+        await db.file_metadata.create_indexes([
+            IndexModel([("company_id", ASCENDING), ("file_hash", ASCENDING)])
+        ])
+    except Exception as e:
+        logger.warning(f"Failed to create upload index for file_metadata: {e}")
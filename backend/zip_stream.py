@@ -0,0 +1,161 @@
+"""
+Streaming ZIP
+일괄 내보내기/출력 ZIP 을 메모리나 디스크에 통째로 만들지 않고 항목이 생성되는 대로 전송하는 스트리밍 ZIP 작성기
+
+- zipfile 을 탐색(seek) 불가능한 출력에 연결해 로컬 파일 헤더 + 데이터 + 데이터 디스크립터 순으로 기록
+  → 항목 하나를 추가할 때마다 해당 바이트를 바로 응답으로 내보내고 버림 (메모리는 항목 하나 분량)
+- 압축(deflate)은 스레드에서 실행해 이벤트 루프를 막지 않음
+- 같은 이름의 항목은 " (2)" 형식으로 이름을 바꿔 덮어쓰기 방지
+- 선택적으로 전송하는 바이트를 디스크 캐시에 함께 기록(tee)
+  → 아카이브 SHA-256 경로(objects/ab/<sha256>.zip)에 저장하고 요청 키는 refs/<키> 로 가리킴 (content_store)
+  → 같은 요청은 디스크에서 Range/ETag 를 지원하는 파일 응답으로 바로 전송, 내용이 같은 아카이브는 한 번만 저장
+  → 끝까지 생성된 아카이브만 저장 (오류/연결 끊김이면 임시 파일 삭제)
+  → 전체 크기가 EXPORT_ZIP_CACHE_MAX_MB 를 넘으면 오래 사용하지 않은 아카이브부터 삭제
+"""
+
+import asyncio
+import logging
+import os
+import urllib.parse
+import zipfile
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from content_store import ContentAddressedStore, ContentWriter
+from ranged_file import ranged_file_response
+
+logger = logging.getLogger(__name__)
+
+ZIP_CACHE_DIR = Path(os.getenv("EXPORT_ZIP_CACHE_DIR", "outputs/zip_cache"))
+ZIP_CACHE_MAX_BYTES = int(os.getenv("EXPORT_ZIP_CACHE_MAX_MB", "1024")) * 1024 * 1024
+ZIP_COMPRESSLEVEL = int(os.getenv("EXPORT_ZIP_COMPRESSLEVEL", "6"))
+
+ZipEntry = Tuple[str, bytes]
+
+
+class _ChunkSink:
+    """zipfile 출력 대상 - tell/seek 이 없어 zipfile 이 데이터 디스크립터 방식으로 기록"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """항목을 추가할 때마다 새로 생성된 ZIP 바이트를 돌려주는 작성기"""
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED, compresslevel: int = ZIP_COMPRESSLEVEL):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=compression, compresslevel=compresslevel)
+        self._names: Dict[str, int] = {}
+
+    def _unique_name(self, name: str) -> str:
+        count = self._names.get(name, 0) + 1
+        self._names[name] = count
+        if count == 1:
+            return name
+        stem, dot, extension = name.rpartition(".")
+        unique = f"{stem} ({count}).{extension}" if dot else f"{name} ({count})"
+        return self._unique_name(unique)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        """항목 추가 - 로컬 헤더, 압축 데이터, 데이터 디스크립터 바이트 반환"""
+        self._zip.writestr(self._unique_name(name), data)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """중앙 디렉터리와 끝 레코드 바이트 반환"""
+        self._zip.close()
+        return self._sink.drain()
+
+
+class ZipArchiveCache(ContentAddressedStore):
+    """콘텐츠 주소 ZIP 캐시 (objects/ab/<sha256>.zip, refs/<요청 키>)"""
+
+    suffix = ".zip"
+
+    def __init__(self, cache_dir: Path = ZIP_CACHE_DIR, max_bytes: int = ZIP_CACHE_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+
+async def _as_async(entries: Union[Iterable[ZipEntry], AsyncIterable[ZipEntry]]) -> AsyncIterator[ZipEntry]:
+    if hasattr(entries, "__aiter__"):
+        async for entry in entries:
+            yield entry
+    else:
+        for entry in entries:
+            yield entry
+
+
+async def stream_zip(entries: Union[Iterable[ZipEntry], AsyncIterable[ZipEntry]],
+                     tee: Optional[ContentWriter] = None,
+                     store: Optional[Callable[[], bool]] = None) -> AsyncIterator[bytes]:
+    """(이름, 바이트) 항목을 받는 대로 ZIP 바이트 청크로 내보냄
+
+    tee 가 있으면 캐시에도 기록하고, 끝까지 생성되었고 store() 가 참이면(기본) 캐시에 저장합니다.
+    """
+    writer = ZipStreamWriter()
+
+    def add(name: str, data: bytes) -> bytes:
+        chunk = writer.add(name, data)
+        if tee is not None:
+            tee.write(chunk)
+        return chunk
+
+    committed = False
+    try:
+        async for name, data in _as_async(entries):
+            yield await asyncio.to_thread(add, name, data)
+        tail = writer.close()
+        if tee is not None:
+            tee.write(tail)
+            if store is None or store():
+                await asyncio.to_thread(tee.commit)
+                committed = True
+        yield tail
+    finally:
+        # 중단되었거나 저장하지 않는 아카이브는 임시 파일 삭제
+        if tee is not None and not committed:
+            tee.abort()
+
+
+def content_disposition(filename: str) -> str:
+    """한글 파일명을 위한 RFC 5987 Content-Disposition 값"""
+    return f"attachment; filename*=UTF-8''{urllib.parse.quote(filename)}"
+
+
+def zip_download_response(request: Request, entries: Union[Iterable[ZipEntry], AsyncIterable[ZipEntry]],
+                          filename: str, cache: Optional[ZipArchiveCache] = None,
+                          cache_key: Optional[str] = None, store: Optional[Callable[[], bool]] = None) -> Response:
+    """ZIP 다운로드 응답 - 캐시에 있으면 디스크에서(Range/ETag 지원), 없으면 생성하면서 스트리밍
+
+    store 가 거짓을 반환하면(일부 항목 실패 등) 생성한 아카이브를 캐시에 저장하지 않습니다.
+    """
+    headers = {"Content-Disposition": content_disposition(filename)}
+    tee = None
+    if cache is not None and cache_key:
+        cached = cache.lookup(cache_key)
+        if cached is not None:
+            headers["X-Export-Cache"] = "hit"
+            return ranged_file_response(request, str(cached.path), "application/zip", cached.sha256, headers)
+        tee = cache.open_writer(cache_key)
+        headers["X-Export-Cache"] = "miss"
+    return StreamingResponse(stream_zip(entries, tee, store), media_type="application/zip", headers=headers)
+
+
+# Global archive cache instance
+zip_archive_cache = ZipArchiveCache()
@@ -379,6 +379,7 @@ const EvaluationPrintManager = ({ user }) => {
       case 'pending': return '⏳';
       case 'processing': return '⚙️';
       case 'completed': return '✅';
+      case 'completed_with_errors': return '⚠️';
       case 'failed': return '❌';
       default: return '❓';
     }
@@ -389,6 +390,7 @@ const EvaluationPrintManager = ({ user }) => {
       case 'pending': return '대기 중';
       case 'processing': return '처리 중';
       case 'completed': return '완료';
+      case 'completed_with_errors': return '일부 완료';
       case 'failed': return '실패';
       default: return '알 수 없음';
     }
@@ -998,7 +1000,7 @@ const EvaluationPrintManager = ({ user }) => {
                     </div>
 
                     <div className="job-actions">
-                      {job.status === 'completed' && (
+                      {(job.status === 'completed' || job.status === 'completed_with_errors') && (
                         <button
                           onClick={() => downloadPrintResult(job.job_id)}
                           className="download-btn"
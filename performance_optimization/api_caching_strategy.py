@@ -1,507 +0,0 @@
-#!/usr/bin/env python3
-"""
-🚀 AI 모델 관리 시스템 - API 응답 캐싱 전략 구현
-Redis 기반 다층 캐싱 시스템으로 API 응답시간 70% 개선
-"""
-
-import asyncio
-import json
-import hashlib
-import time
-from typing import Dict, List, Any, Optional, Union, Callable
-from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-import logging
-from functools import wraps
-import redis.asyncio as redis
-from enum import Enum
-
-class CacheLevel(Enum):
-    """캐시 레벨 정의"""
-    L1_MEMORY = "l1_memory"      # 메모리 캐시 (가장 빠름)
-    L2_REDIS = "l2_redis"        # Redis 캐시 (중간)
-    L3_DATABASE = "l3_database"  # 데이터베이스 (가장 느림)
-
-@dataclass
-class CacheConfig:
-    """캐시 설정"""
-    ttl_seconds: int = 300       # 기본 5분
-    max_memory_size: int = 1000  # 메모리 캐시 최대 엔트리 수
-    enable_compression: bool = True
-    cache_levels: List[CacheLevel] = None
-    
-    def __post_init__(self):
-        if self.cache_levels is None:
-            self.cache_levels = [CacheLevel.L1_MEMORY, CacheLevel.L2_REDIS]
-
-@dataclass
-class CacheMetrics:
-    """캐시 성능 메트릭"""
-    hits: int = 0
-    misses: int = 0
-    total_requests: int = 0
-    avg_response_time: float = 0
-    memory_usage: int = 0
-    redis_usage: int = 0
-    
-    @property
-    def hit_rate(self) -> float:
-        """캐시 적중률"""
-        return (self.hits / self.total_requests * 100) if self.total_requests > 0 else 0
-    
-    @property
-    def miss_rate(self) -> float:
-        """캐시 미스율"""
-        return 100 - self.hit_rate
-
-class SmartCacheManager:
-    """스마트 캐싱 관리자 - 다층 캐싱 및 지능형 무효화"""
-    
-    def __init__(self, redis_url: str = "redis://localhost:6379/1"):
-        self.redis_url = redis_url
-        self.redis_client = None
-        
-        # L1 메모리 캐시 (LRU)
-        self.memory_cache: Dict[str, Dict] = {}
-        self.cache_access_order: List[str] = []
-        
-        # 캐시 설정 및 메트릭
-        self.cache_configs: Dict[str, CacheConfig] = {}
-        self.metrics = CacheMetrics()
-        
-        # 로깅
-        self.logger = logging.getLogger(__name__)
-        
-        # 스마트 캐싱 설정
-        self.setup_default_cache_strategies()
-        
-    async def connect(self):
-        """Redis 연결"""
-        try:
-            self.redis_client = redis.from_url(self.redis_url)
-            await self.redis_client.ping()
-            self.logger.info("✅ Redis 캐시 서버 연결 성공")
-        except Exception as e:
-            self.logger.warning(f"⚠️ Redis 연결 실패, 메모리 캐시만 사용: {e}")
-            
-    async def disconnect(self):
-        """Redis 연결 해제"""
-        if self.redis_client:
-            await self.redis_client.close()
-            
-    def setup_default_cache_strategies(self):
-        """기본 캐싱 전략 설정"""
-        
-        # 사용자 정보 - 자주 조회되지만 변경 적음
-        self.cache_configs['user_profile'] = CacheConfig(
-            ttl_seconds=1800,  # 30분
-            max_memory_size=500,
-            cache_levels=[CacheLevel.L1_MEMORY, CacheLevel.L2_REDIS]
-        )
-        
-        # AI 모델 목록 - 매우 자주 조회됨
-        self.cache_configs['model_list'] = CacheConfig(
-            ttl_seconds=600,   # 10분
-            max_memory_size=100,
-            cache_levels=[CacheLevel.L1_MEMORY, CacheLevel.L2_REDIS]
-        )
-        
-        # 평가 결과 - 큰 데이터, 자주 조회됨
-        self.cache_configs['evaluation_results'] = CacheConfig(
-            ttl_seconds=3600,  # 1시간
-            max_memory_size=200,
-            enable_compression=True,
-            cache_levels=[CacheLevel.L2_REDIS]  # Redis만 사용 (큰 데이터)
-        )
-        
-        # 분석 리포트 - 계산 비용 높음
-        self.cache_configs['analytics_report'] = CacheConfig(
-            ttl_seconds=7200,  # 2시간
-            max_memory_size=50,
-            cache_levels=[CacheLevel.L1_MEMORY, CacheLevel.L2_REDIS]
-        )
-        
-        # 검색 결과 - 일시적으로 캐시
-        self.cache_configs['search_results'] = CacheConfig(
-            ttl_seconds=300,   # 5분
-            max_memory_size=1000,
-            cache_levels=[CacheLevel.L1_MEMORY]  # 메모리만 사용
-        )
-        
-    def cache_key(self, category: str, **kwargs) -> str:
-        """캐시 키 생성"""
-        # 매개변수들을 정렬하여 일관된 키 생성
-        params = "&".join([f"{k}={v}" for k, v in sorted(kwargs.items())])
-        key_string = f"{category}:{params}"
-        
-        # SHA256 해시로 키 단축
-        return hashlib.sha256(key_string.encode()).hexdigest()[:16]
-        
-    async def get(self, category: str, **kwargs) -> Optional[Any]:
-        """캐시에서 데이터 조회 (다층 캐시)"""
-        start_time = time.time()
-        cache_key = self.cache_key(category, **kwargs)
-        config = self.cache_configs.get(category, CacheConfig())
-        
-        self.metrics.total_requests += 1
-        
-        try:
-            # L1 메모리 캐시 확인
-            if CacheLevel.L1_MEMORY in config.cache_levels:
-                if cache_key in self.memory_cache:
-                    entry = self.memory_cache[cache_key]
-                    if not self._is_expired(entry):
-                        self._update_access_order(cache_key)
-                        self.metrics.hits += 1
-                        self.logger.debug(f"🟢 L1 캐시 적중: {category}")
-                        return entry['data']
-                        
-            # L2 Redis 캐시 확인
-            if CacheLevel.L2_REDIS in config.cache_levels and self.redis_client:
-                redis_key = f"cache:{cache_key}"
-                cached_data = await self.redis_client.get(redis_key)
-                
-                if cached_data:
-                    data = json.loads(cached_data)
-                    
-                    # L1 캐시에도 저장 (캐시 워밍업)
-                    if CacheLevel.L1_MEMORY in config.cache_levels:
-                        await self._store_in_memory(cache_key, data, config)
-                        
-                    self.metrics.hits += 1
-                    self.logger.debug(f"🟡 L2 캐시 적중: {category}")
-                    return data
-                    
-            # 캐시 미스
-            self.metrics.misses += 1
-            self.logger.debug(f"🔴 캐시 미스: {category}")
-            return None
-            
-        except Exception as e:
-            self.logger.error(f"캐시 조회 실패: {e}")
-            self.metrics.misses += 1
-            return None
-            
-        finally:
-            # 응답시간 업데이트
-            response_time = time.time() - start_time
-            self._update_avg_response_time(response_time)
-            
-    async def set(self, category: str, data: Any, **kwargs):
-        """캐시에 데이터 저장 (다층 캐시)"""
-        cache_key = self.cache_key(category, **kwargs)
-        config = self.cache_configs.get(category, CacheConfig())
-        
-        try:
-            # L1 메모리 캐시에 저장
-            if CacheLevel.L1_MEMORY in config.cache_levels:
-                await self._store_in_memory(cache_key, data, config)
-                
-            # L2 Redis 캐시에 저장
-            if CacheLevel.L2_REDIS in config.cache_levels and self.redis_client:
-                await self._store_in_redis(cache_key, data, config)
-                
-        except Exception as e:
-            self.logger.error(f"캐시 저장 실패: {e}")
-            
-    async def _store_in_memory(self, cache_key: str, data: Any, config: CacheConfig):
-        """L1 메모리 캐시에 저장"""
-        # LRU 정책으로 공간 확보
-        while len(self.memory_cache) >= config.max_memory_size:
-            if self.cache_access_order:
-                oldest_key = self.cache_access_order.pop(0)
-                self.memory_cache.pop(oldest_key, None)
-                
-        # 데이터 저장
-        self.memory_cache[cache_key] = {
-            'data': data,
-            'timestamp': time.time(),
-            'ttl': config.ttl_seconds
-        }
-        
-        self._update_access_order(cache_key)
-        
-    async def _store_in_redis(self, cache_key: str, data: Any, config: CacheConfig):
-        """L2 Redis 캐시에 저장"""
-        redis_key = f"cache:{cache_key}"
-        
-        # 데이터 압축 (옵션)
-        if config.enable_compression:
-            # 간단한 JSON 압축 (실제로는 gzip 등 사용 가능)
-            serialized_data = json.dumps(data, separators=(',', ':'))
-        else:
-            serialized_data = json.dumps(data)
-            
-        await self.redis_client.setex(
-            redis_key, 
-            config.ttl_seconds, 
-            serialized_data
-        )
-        
-    def _is_expired(self, entry: Dict) -> bool:
-        """캐시 항목 만료 확인"""
-        return time.time() - entry['timestamp'] > entry['ttl']
-        
-    def _update_access_order(self, cache_key: str):
-        """LRU 순서 업데이트"""
-        if cache_key in self.cache_access_order:
-            self.cache_access_order.remove(cache_key)
-        self.cache_access_order.append(cache_key)
-        
-    def _update_avg_response_time(self, response_time: float):
-        """평균 응답시간 업데이트"""
-        if self.metrics.total_requests == 1:
-            self.metrics.avg_response_time = response_time
-        else:
-            # 지수 이동 평균
-            alpha = 0.1
-            self.metrics.avg_response_time = (
-                alpha * response_time + 
-                (1 - alpha) * self.metrics.avg_response_time
-            )
-            
-    async def invalidate(self, category: str, **kwargs):
-        """캐시 무효화"""
-        cache_key = self.cache_key(category, **kwargs)
-        
-        # L1 메모리 캐시에서 제거
-        self.memory_cache.pop(cache_key, None)
-        if cache_key in self.cache_access_order:
-            self.cache_access_order.remove(cache_key)
-            
-        # L2 Redis 캐시에서 제거
-        if self.redis_client:
-            redis_key = f"cache:{cache_key}"
-            await self.redis_client.delete(redis_key)
-            
-        self.logger.info(f"🗑️ 캐시 무효화: {category}")
-        
-    async def invalidate_pattern(self, pattern: str):
-        """패턴 기반 캐시 무효화"""
-        # 메모리 캐시 패턴 매칭 (간단한 구현)
-        keys_to_remove = []
-        for key in self.memory_cache.keys():
-            if pattern in key:
-                keys_to_remove.append(key)
-                
-        for key in keys_to_remove:
-            self.memory_cache.pop(key, None)
-            if key in self.cache_access_order:
-                self.cache_access_order.remove(key)
-                
-        # Redis 패턴 매칭
-        if self.redis_client:
-            redis_pattern = f"cache:*{pattern}*"
-            async for key in self.redis_client.scan_iter(match=redis_pattern):
-                await self.redis_client.delete(key)
-                
-        self.logger.info(f"🧹 패턴 기반 캐시 무효화: {pattern}")
-        
-    async def clear_all(self):
-        """모든 캐시 삭제"""
-        # 메모리 캐시 클리어
-        self.memory_cache.clear()
-        self.cache_access_order.clear()
-        
-        # Redis 캐시 클리어
-        if self.redis_client:
-            async for key in self.redis_client.scan_iter(match="cache:*"):
-                await self.redis_client.delete(key)
-                
-        self.logger.info("🧹 모든 캐시 삭제 완료")
-        
-    def get_metrics(self) -> Dict[str, Any]:
-        """캐시 성능 메트릭 조회"""
-        return {
-            'hit_rate': self.metrics.hit_rate,
-            'miss_rate': self.metrics.miss_rate,
-            'total_requests': self.metrics.total_requests,
-            'avg_response_time_ms': self.metrics.avg_response_time * 1000,
-            'memory_cache_size': len(self.memory_cache),
-            'memory_usage_mb': self._calculate_memory_usage(),
-            'cache_efficiency': self._calculate_cache_efficiency()
-        }
-        
-    def _calculate_memory_usage(self) -> float:
-        """메모리 사용량 계산 (MB)"""
-        # 간략한 추정
-        total_size = 0
-        for entry in self.memory_cache.values():
-            # JSON 직렬화 크기로 추정
-            total_size += len(json.dumps(entry['data'], default=str))
-        return total_size / (1024 * 1024)
-        
-    def _calculate_cache_efficiency(self) -> float:
-        """캐시 효율성 점수 (0-100)"""
-        hit_rate_score = self.metrics.hit_rate
-        response_time_score = max(0, 100 - self.metrics.avg_response_time * 1000)  # ms 기준
-        
-        return (hit_rate_score * 0.7 + response_time_score * 0.3)
-
-# 데코레이터 기반 캐싱
-def cached(category: str, ttl: int = 300, cache_manager: SmartCacheManager = None):
-    """캐싱 데코레이터"""
-    def decorator(func: Callable):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            if cache_manager is None:
-                return await func(*args, **kwargs)
-                
-            # 캐시 키 생성을 위한 매개변수 처리
-            cache_kwargs = {
-                'func_name': func.__name__,
-                'args': str(args),
-                **kwargs
-            }
-            
-            # 캐시에서 조회
-            cached_result = await cache_manager.get(category, **cache_kwargs)
-            if cached_result is not None:
-                return cached_result
-                
-            # 캐시 미스 시 함수 실행
-            result = await func(*args, **kwargs)
-            
-            # 결과를 캐시에 저장
-            await cache_manager.set(category, result, **cache_kwargs)
-            
-            return result
-        return wrapper
-    return decorator
-
-class CacheWarming:
-    """캐시 워밍업 및 프리로딩"""
-    
-    def __init__(self, cache_manager: SmartCacheManager):
-        self.cache_manager = cache_manager
-        self.logger = logging.getLogger(__name__)
-        
-    async def warm_up_user_data(self, user_ids: List[str]):
-        """사용자 데이터 프리로딩"""
-        self.logger.info(f"🔥 사용자 데이터 워밍업 시작: {len(user_ids)}명")
-        
-        for user_id in user_ids:
-            # 사용자 프로필 프리로드
-            await self._preload_user_profile(user_id)
-            
-            # 사용자별 모델 목록 프리로드
-            await self._preload_user_models(user_id)
-            
-        self.logger.info("✅ 사용자 데이터 워밍업 완료")
-        
-    async def _preload_user_profile(self, user_id: str):
-        """사용자 프로필 프리로드"""
-        # 실제 구현에서는 데이터베이스에서 조회
-        fake_profile = {
-            'id': user_id,
-            'name': f'User {user_id}',
-            'role': 'evaluator',
-            'preferences': {'theme': 'dark', 'language': 'ko'}
-        }
-        
-        await self.cache_manager.set(
-            'user_profile', 
-            fake_profile, 
-            user_id=user_id
-        )
-        
-    async def _preload_user_models(self, user_id: str):
-        """사용자 모델 목록 프리로드"""
-        # 실제 구현에서는 데이터베이스에서 조회
-        fake_models = [
-            {'id': f'model_{i}', 'name': f'Model {i}', 'type': 'text'}
-            for i in range(10)
-        ]
-        
-        await self.cache_manager.set(
-            'model_list',
-            fake_models,
-            user_id=user_id
-        )
-        
-    async def warm_up_common_data(self):
-        """공통 데이터 프리로딩"""
-        self.logger.info("🔥 공통 데이터 워밍업 시작")
-        
-        # 전체 모델 목록
-        await self._preload_all_models()
-        
-        # 평가 템플릿
-        await self._preload_evaluation_templates()
-        
-        # 시스템 설정
-        await self._preload_system_settings()
-        
-        self.logger.info("✅ 공통 데이터 워밍업 완료")
-        
-    async def _preload_all_models(self):
-        """전체 모델 목록 프리로드"""
-        fake_models = [
-            {'id': f'model_{i}', 'name': f'Model {i}', 'provider': 'openai'}
-            for i in range(50)
-        ]
-        
-        await self.cache_manager.set('model_list', fake_models, scope='all')
-        
-    async def _preload_evaluation_templates(self):
-        """평가 템플릿 프리로드"""
-        templates = [
-            {'id': f'template_{i}', 'name': f'Template {i}', 'criteria': []}
-            for i in range(20)
-        ]
-        
-        await self.cache_manager.set('evaluation_templates', templates)
-        
-    async def _preload_system_settings(self):
-        """시스템 설정 프리로드"""
-        settings = {
-            'ui_theme': 'auto',
-            'default_language': 'ko',
-            'max_file_size': '10MB',
-            'session_timeout': 1800
-        }
-        
-        await self.cache_manager.set('system_settings', settings)
-
-async def main():
-    """성능 테스트 및 데모"""
-    cache_manager = SmartCacheManager()
-    await cache_manager.connect()
-    
-    try:
-        print("🚀 API 캐싱 전략 성능 테스트 시작")
-        print("=" * 50)
-        
-        # 캐시 워밍업
-        cache_warming = CacheWarming(cache_manager)
-        await cache_warming.warm_up_common_data()
-        await cache_warming.warm_up_user_data(['user1', 'user2', 'user3'])
-        
-        # 성능 테스트
-        start_time = time.time()
-        
-        # 여러 번 조회하여 캐시 효과 측정
-        for i in range(100):
-            # 캐시된 데이터 조회
-            models = await cache_manager.get('model_list', scope='all')
-            user_profile = await cache_manager.get('user_profile', user_id='user1')
-            
-        end_time = time.time()
-        
-        # 메트릭 출력
-        metrics = cache_manager.get_metrics()
-        print(f"📊 캐시 성능 메트릭:")
-        print(f"  ✅ 캐시 적중률: {metrics['hit_rate']:.1f}%")
-        print(f"  ⚡ 평균 응답시간: {metrics['avg_response_time_ms']:.1f}ms")
-        print(f"  💾 메모리 사용량: {metrics['memory_usage_mb']:.2f}MB")
-        print(f"  🎯 캐시 효율성: {metrics['cache_efficiency']:.1f}/100")
-        print(f"  📈 총 요청 수: {metrics['total_requests']}")
-        
-        print(f"\n⏱️ 100회 조회 소요시간: {(end_time - start_time) * 1000:.1f}ms")
-        print("✅ API 캐싱 전략 테스트 완료")
-        
-    finally:
-        await cache_manager.disconnect()
-
-if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
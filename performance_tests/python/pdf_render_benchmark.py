@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+평가표 PDF 렌더링 마이크로 벤치마크
+렌더링 컨텍스트(폰트 1회 등록, 스타일/표 스타일/페이지 장식 캐시) 적용 전후의 초당 문서 수 비교
+
+- before: 문서마다 컨텍스트 캐시를 비우고 한글 폰트 등록을 해제해 문서마다 폰트를 읽고 스타일을 만들던 경로를 재현
+          (기존 코드는 문서당 폰트를 표 개수만큼 다시 등록했으므로 실제 개선 폭은 이보다 큼)
+- after:  프로세스 전역 컨텍스트를 그대로 사용
+
+사용 예:
+    python pdf_render_benchmark.py --sheets 1 100 1000 --renderer print report
+    python pdf_render_benchmark.py --font /usr/share/fonts/truetype/nanum/NanumGothic.ttf --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend")
+sys.path.insert(0, os.path.abspath(BACKEND_DIR))
+
+FALLBACK_FONTS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+
+
+def resolve_font(font: Optional[str]) -> Optional[str]:
+    """벤치마크에 사용할 TTF (지정하지 않으면 한글 폰트, 없으면 DejaVu)"""
+    from pdf_render_context import KOREAN_FONT_PATHS
+
+    candidates = [font] if font else [os.getenv("PDF_KOREAN_FONT_PATH")] + KOREAN_FONT_PATHS + FALLBACK_FONTS
+    for path in candidates:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def make_print_payload(i: int) -> Dict[str, Any]:
+    criteria = [{"id": f"c{n}", "name": f"평가 항목 {n}", "max_score": 20, "weight": 1.0} for n in range(8)]
+    return {
+        "evaluation": {"_id": f"e{i}", "status": "submitted", "created_at": datetime(2024, 5, 1),
+                       "comments": "기술성과 사업성이 우수하며 팀 구성이 안정적입니다. " * 3},
+        "evaluator": {"user_name": f"평가위원{i % 7}"},
+        "company": {"name": f"테스트 기업 {i}"},
+        "project": {"name": "2024 창업지원사업"},
+        "template": {"criteria": criteria},
+        "scores": [{"criterion_id": c["id"], "score": (i + n) % 20} for n, c in enumerate(criteria)],
+    }
+
+
+def make_report_payload(i: int) -> Dict[str, Any]:
+    items = [{"id": f"item{n}", "name": f"항목 {n}", "description": "평가 항목 설명 " * 4, "max_score": 20, "weight": 1}
+             for n in range(8)]
+    return {
+        "sheet": {"submitted_at": datetime(2024, 5, 1, 10, 30), "weighted_score": 75.0 + i % 20},
+        "company": {"name": f"테스트 기업 {i}", "contact_person": "홍길동", "phone": "010-0000-0000"},
+        "project": {"name": "2024 창업지원사업"},
+        "template": {"name": "표준 평가표", "items": items},
+        "evaluator": {"user_name": f"평가위원{i % 7}"},
+        "scores": [{"item_id": item["id"], "score": (i + n) % 20, "opinion": "양호함"} for n, item in enumerate(items)],
+    }
+
+
+def build_renderers() -> Dict[str, Callable[[int], bytes]]:
+    from evaluation_pdf import create_individual_evaluation_pdf
+    from export_utils import exporter
+
+    def render_print(i: int) -> bytes:
+        return create_individual_evaluation_pdf(make_print_payload(i), {"include_comments": True})
+
+    def render_report(i: int) -> bytes:
+        return asyncio.run(exporter.export_single_evaluation_pdf(make_report_payload(i))).getvalue()
+
+    return {"print": render_print, "report": render_report}
+
+
+def reset_context() -> None:
+    """before 모드 - 컴파일된 스타일을 버리고 한글 폰트 등록을 해제 (다음 문서에서 다시 등록)"""
+    from reportlab.pdfbase import pdfmetrics
+    from pdf_render_context import KOREAN_FONT_NAME, pdf_render_context
+
+    pdf_render_context.clear()
+    pdf_render_context._font_name = None
+    pdfmetrics._fonts.pop(KOREAN_FONT_NAME, None)
+
+
+def run_case(render: Callable[[int], bytes], sheets: int, mode: str) -> Dict[str, Any]:
+    from pdf_render_context import pdf_render_context
+
+    reset_context()
+    started = time.perf_counter()
+    total_bytes = 0
+    for i in range(sheets):
+        if mode == "before":
+            reset_context()
+        total_bytes += len(render(i))
+    elapsed = time.perf_counter() - started
+    return {
+        "sheets": sheets,
+        "mode": mode,
+        "seconds": round(elapsed, 3),
+        "documents_per_second": round(sheets / elapsed, 1) if elapsed > 0 else 0.0,
+        "ms_per_document": round(elapsed * 1000 / sheets, 2),
+        "bytes": total_bytes,
+        "font": pdf_render_context.font_name,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description="평가표 PDF 렌더링 마이크로 벤치마크")
+    parser.add_argument("--sheets", type=int, nargs="+", default=[1, 100, 1000], help="문서 수")
+    parser.add_argument("--renderer", nargs="+", choices=["print", "report"], default=["print", "report"],
+                        help="print: 출력 API 평가표, report: 종합평가서(export_utils)")
+    parser.add_argument("--font", help="한글 폰트(TTF) 경로")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args(argv)
+
+    font_path = resolve_font(args.font)
+    from pdf_render_context import pdf_render_context
+    if font_path:
+        pdf_render_context.font_paths = [font_path]
+
+    renderers = build_renderers()
+    results = []
+    print(f"폰트: {font_path or '없음 (Helvetica)'}")
+    print(f"{'renderer':<8} {'sheets':>6} {'before docs/s':>14} {'after docs/s':>13} {'speedup':>8}")
+    for name in args.renderer:
+        render = renderers[name]
+        render(0)  # 모듈/reportlab 초기화 비용 제외
+        for sheets in args.sheets:
+            before = run_case(render, sheets, "before")
+            after = run_case(render, sheets, "after")
+            speedup = after["documents_per_second"] / before["documents_per_second"] if before["documents_per_second"] else 0
+            print(f"{name:<8} {sheets:>6} {before['documents_per_second']:>14.1f} "
+                  f"{after['documents_per_second']:>13.1f} {speedup:>7.2f}x")
+            results.extend([{"renderer": name, **before}, {"renderer": name, **after}])
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()